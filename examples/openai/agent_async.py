@@ -0,0 +1,201 @@
+"""
+Asyncio edition of the example agent loop.
+
+`run.py` drives one conversation per thread: the model call, supervision and the
+tools all block. The functions here mirror `chat_with_openai`,
+`execute_tool_call(s)` and `start_chatbot` on top of an `AsyncOpenAI` client, so
+a single event loop can drive hundreds of conversations at once while each of
+them waits on the model or on the control plane.
+
+Tools may be coroutine functions (e.g. `async def` tools decorated with
+`@supervise`) or plain functions. Plain functions are run on the default thread
+pool so that a blocking tool, or a blocking supervisor such as a human review,
+does not stall every other conversation on the loop.
+
+Nothing in this module depends on the Asteroid SDK; `run_async.py` wires it up
+with supervised tools and a wrapped client, and `load_test.py` drives it against
+a local mock of the OpenAI API.
+"""
+
+import asyncio
+import inspect
+import json
+import time
+from typing import Any, Callable, Dict, List, Optional
+from uuid import UUID
+
+from openai import AsyncOpenAI
+
+from tool_schema import tool_schemas
+from turn_timing import DEFAULT_MAX_TURNS, ModelCallTimer, TurnTimings
+
+DEFAULT_MODEL = "gpt-4o"
+
+
+async def chat_with_openai_async(
+    messages: List[Dict],
+    tools: List[Dict],
+    client: AsyncOpenAI,
+    parallel_tool_calls: bool = False,
+    model: str = DEFAULT_MODEL
+):
+    """
+    Interact with the OpenAI GPT model without blocking the event loop.
+
+    Parameters:
+        messages (List[Dict]): The conversation history.
+        tools (List[Dict]): The OpenAI tool definitions available to the assistant.
+        client (AsyncOpenAI): The async OpenAI client instance.
+        parallel_tool_calls (bool): Whether the model may return several tool calls in one turn.
+        model (str): The model to use.
+
+    Returns:
+        The completion response from the OpenAI API.
+    """
+    return await client.chat.completions.create(
+        model=model,
+        messages=messages,
+        tools=tools,
+        parallel_tool_calls=parallel_tool_calls
+    )
+
+
+async def execute_tool_call_async(tool_call, tools: List[Callable], verbose: bool = True) -> Any:
+    """
+    Execute a tool call as decided by the assistant.
+
+    Parameters:
+        tool_call: The tool call object from the assistant's response.
+        tools (List[Callable]): The list of available tool functions, sync or async.
+        verbose (bool): Print the tool calls and their results.
+
+    Returns:
+        The result of the tool function execution.
+    """
+    function_name = tool_call.function.name
+    arguments = json.loads(tool_call.function.arguments)
+    if verbose:
+        print(f"Executing tool call: {function_name} with arguments: {arguments}")
+
+    # Map function names to actual functions
+    for tool in tools:
+        if tool.__name__ == function_name:
+            # Dataclass, model and enum parameters arrive as plain JSON values
+            kwargs = tool_schemas.convert_arguments(tool, arguments)
+            if inspect.iscoroutinefunction(tool):
+                result = await tool(**kwargs)
+            else:
+                result = await asyncio.to_thread(tool, **kwargs)
+                # A sync wrapper around an async tool hands back the coroutine
+                if inspect.isawaitable(result):
+                    result = await result
+            if verbose:
+                print(f"Tool call {function_name} result: {result}")
+            return result
+
+    print("Function not found.")
+    return "Function not found."
+
+
+async def execute_tool_calls_async(tool_calls, tools: List[Callable], verbose: bool = True) -> List[Dict]:
+    """
+    Execute all tool calls from one assistant turn concurrently.
+
+    Parameters:
+        tool_calls: The tool call objects from the assistant's response.
+        tools (List[Callable]): The list of available tool functions.
+        verbose (bool): Print the tool calls and their results.
+
+    Returns:
+        List[Dict]: One tool message per tool call, in the order the assistant made them.
+    """
+    results = await asyncio.gather(*(execute_tool_call_async(tool_call, tools, verbose) for tool_call in tool_calls))
+
+    return [
+        {
+            "role": "tool",
+            "content": json.dumps(result),
+            "tool_call_id": tool_call.id
+        }
+        for tool_call, result in zip(tool_calls, results)
+    ]
+
+
+async def start_chatbot_async(
+    start_prompt: str,
+    tools: List[Callable],
+    run_id: Optional[UUID],
+    client: AsyncOpenAI,
+    parallel_tool_calls: bool = False,
+    max_turns: int = DEFAULT_MAX_TURNS,
+    on_turn: Optional[Callable[[TurnTimings], None]] = None,
+    model_timer: Optional[ModelCallTimer] = None,
+    model: str = DEFAULT_MODEL,
+    verbose: bool = True
+) -> List[Dict]:
+    """
+    Run one chatbot conversation on the event loop.
+
+    Parameters:
+        start_prompt (str): The initial prompt for the assistant.
+        tools (List[Callable]): The list of available tool functions, sync or async.
+        run_id (Optional[UUID]): The ID of the current run, None when running without a control plane.
+        client (AsyncOpenAI): The async OpenAI client instance, wrapped or not.
+        parallel_tool_calls (bool): Let the model return several tool calls per turn and run them concurrently.
+        max_turns (int): Maximum number of model calls before the run is stopped.
+        on_turn (Optional[Callable[[TurnTimings], None]]): Called with the latency breakdown of every turn.
+        model_timer (Optional[ModelCallTimer]): Timer installed on the unwrapped client, used to separate
+            model latency from supervision latency. Without it the whole call counts as model latency.
+        model (str): The model to use.
+        verbose (bool): Print the tool calls and their results.
+
+    Returns:
+        List[Dict]: The conversation history
+    """
+    # Initialize conversation messages
+    messages = [
+        {"role": "system", "content": "You are a helpful assistant."},
+        {"role": "user", "content": start_prompt}
+    ]
+
+    # Create OpenAI tool definitions
+    openai_tools = tool_schemas.get_all(tools)
+
+    for turn in range(max_turns):
+        timings = TurnTimings(turn=turn)
+
+        # Get the assistant's response to the conversation so far
+        start = time.perf_counter()
+        response = await chat_with_openai_async(messages, openai_tools, client, parallel_tool_calls, model)
+        elapsed = time.perf_counter() - start
+
+        if model_timer:
+            model_timer.record(timings, elapsed)
+        else:
+            timings.model_seconds = elapsed
+
+        assistant_message = response.choices[0].message
+        messages.append(assistant_message)
+
+        # The run is over once the assistant stops making tool calls
+        if not assistant_message.tool_calls:
+            if on_turn:
+                on_turn(timings)
+            break
+
+        # Only the first tool call is answered unless parallel tool calls are enabled
+        tool_calls = assistant_message.tool_calls if parallel_tool_calls else assistant_message.tool_calls[:1]
+
+        start = time.perf_counter()
+        tool_responses = await execute_tool_calls_async(tool_calls, tools, verbose)
+        timings.tool_seconds = time.perf_counter() - start
+        timings.tool_calls = len(tool_responses)
+
+        messages.extend(tool_responses)
+
+        if on_turn:
+            on_turn(timings)
+    else:
+        print(f"Stopping run {run_id} after reaching the maximum of {max_turns} turns.")
+
+    return messages
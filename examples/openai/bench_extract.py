@@ -0,0 +1,124 @@
+"""
+Benchmark BeautifulSoup against streaming text extraction on saved HTML pages.
+
+For every page in the corpus, compares the old path (read the whole page, build a
+BeautifulSoup tree, join the <p> text) with `extract_text_from_chunks`, reporting
+wall time and peak Python memory (tracemalloc) per page.
+
+If no corpus directory is given, a few large synthetic pages with inline scripts
+and styles are generated in a temporary directory.
+
+Usage:
+    python bench_extract.py --corpus ./saved_pages --max-chars 4000
+"""
+
+import argparse
+import statistics
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Iterator, List, Tuple
+
+from bs4 import BeautifulSoup
+
+from extractor import DEFAULT_CHUNK_SIZE, DEFAULT_MAX_CHARS, extract_text_from_chunks
+
+
+def generate_corpus(directory: Path, pages: int, paragraphs: int) -> List[Path]:
+    """
+    Write synthetic HTML pages that look like bloated news articles.
+
+    Parameters:
+        directory (Path): Where to write the pages.
+        pages (int): Number of pages to write.
+        paragraphs (int): Number of paragraphs per page.
+
+    Returns:
+        List[Path]: The written files.
+    """
+    script = "<script>" + "var tracking = {id: 1, events: []};" * 2000 + "</script>"
+    style = "<style>" + ".c{color:red;margin:0 auto;}" * 2000 + "</style>"
+    paragraph = "<div class='wrap'><p>Artificial intelligence events in San Francisco bring researchers together. <a href='#'>More</a></p></div>"
+    files = []
+    for i in range(pages):
+        path = directory / f"page_{i}.html"
+        path.write_text(
+            f"<html><head>{style}{script}</head><body>" + paragraph * paragraphs + script + "</body></html>",
+            encoding="utf-8",
+        )
+        files.append(path)
+    return files
+
+
+def read_chunks(path: Path, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[bytes]:
+    """
+    Yield a file in chunks, the way `Response.iter_content` yields a body.
+    """
+    with open(path, "rb") as f:
+        while chunk := f.read(chunk_size):
+            yield chunk
+
+
+def extract_beautifulsoup(path: Path, max_chars: int) -> str:
+    # The current path: whole body in memory, full tree, no budget
+    soup = BeautifulSoup(path.read_bytes(), 'html.parser')
+    paragraphs = soup.find_all('p')
+    return ' '.join([p.get_text() for p in paragraphs])
+
+
+def extract_streaming(path: Path, max_chars: int) -> str:
+    return extract_text_from_chunks(read_chunks(path), max_chars=max_chars)
+
+
+def measure(fn: Callable[[Path, int], str], path: Path, max_chars: int) -> Tuple[float, int, int]:
+    """
+    Run one extraction and measure it.
+
+    Returns:
+        Tuple[float, int, int]: Seconds taken, peak bytes allocated and characters extracted.
+    """
+    tracemalloc.start()
+    start = time.perf_counter()
+    text = fn(path, max_chars)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak, len(text)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", type=Path, help="Directory of saved .html files")
+    parser.add_argument("--max-chars", type=int, default=DEFAULT_MAX_CHARS, help="Character budget for the streaming extractor")
+    parser.add_argument("--pages", type=int, default=5, help="Synthetic pages to generate when no corpus is given")
+    parser.add_argument("--paragraphs", type=int, default=20000, help="Paragraphs per synthetic page")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.corpus:
+            files = sorted(args.corpus.glob("*.html")) + sorted(args.corpus.glob("*.htm"))
+        else:
+            files = generate_corpus(Path(tmp), args.pages, args.paragraphs)
+
+        if not files:
+            raise SystemExit(f"No .html files found in {args.corpus}")
+
+        results = {"beautifulsoup": [], "streaming": []}
+        print(f"{'page':<30} {'size':>9} {'strategy':<14} {'time':>9} {'peak mem':>10} {'chars':>9}")
+        for path in files:
+            size = path.stat().st_size
+            for name, fn in (("beautifulsoup", extract_beautifulsoup), ("streaming", extract_streaming)):
+                elapsed, peak, chars = measure(fn, path, args.max_chars)
+                results[name].append((elapsed, peak))
+                print(f"{path.name[:30]:<30} {size / 1e6:>7.1f}MB {name:<14} {elapsed * 1000:>7.1f}ms {peak / 1e6:>8.1f}MB {chars:>9}")
+
+    print()
+    for name, rows in results.items():
+        times = [r[0] for r in rows]
+        peaks = [r[1] for r in rows]
+        print(f"{name:<14} median {statistics.median(times) * 1000:.1f}ms, max peak {max(peaks) / 1e6:.1f}MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Benchmark sequential against concurrent fetching of search result pages.
+
+Starts a local stub HTTP server whose pages each take a fixed time to respond,
+then fetches the same set of pages the old way (one `requests.get` after another)
+and with `PageFetcher`.
+
+Usage:
+    python bench_fetch.py --pages 5 --delay 0.5 --repeat 3
+"""
+
+import argparse
+import statistics
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, List
+
+import requests
+
+from fetcher import PageFetcher, extract_paragraph_text
+
+PAGE = ("<html><body>" + "<p>Lorem ipsum dolor sit amet, consectetur adipiscing elit.</p>" * 200 + "</body></html>").encode()
+
+
+def start_stub_server(delay: float) -> ThreadingHTTPServer:
+    """
+    Start an HTTP server on a free local port that answers every GET after `delay` seconds.
+
+    Parameters:
+        delay (float): Seconds to wait before responding.
+
+    Returns:
+        ThreadingHTTPServer: The running server.
+    """
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            time.sleep(delay)
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html")
+            self.send_header("Content-Length", str(len(PAGE)))
+            self.end_headers()
+            self.wfile.write(PAGE)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def fetch_sequential(urls: List[str]) -> List[str]:
+    """
+    Fetch the pages one after another, as the search tools used to.
+
+    Parameters:
+        urls (List[str]): URLs to fetch.
+
+    Returns:
+        List[str]: Extracted content of every page.
+    """
+    return [extract_paragraph_text(requests.get(url, timeout=5)) for url in urls]
+
+
+def time_runs(fn: Callable[[], object], repeat: int) -> List[float]:
+    """
+    Time `repeat` calls of `fn`.
+
+    Returns:
+        List[float]: Wall-clock duration of each call in seconds.
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=5, help="Number of result pages per tool call")
+    parser.add_argument("--delay", type=float, default=0.5, help="Seconds each page takes to respond")
+    parser.add_argument("--repeat", type=int, default=3, help="Number of timed runs per strategy")
+    args = parser.parse_args()
+
+    server = start_stub_server(args.delay)
+    host, port = server.server_address
+    # Distinct paths so that nothing is deduplicated
+    urls = [f"http://{host}:{port}/page/{i}" for i in range(args.pages)]
+
+    fetcher = PageFetcher(max_workers=max(args.pages, 1))
+
+    sequential = time_runs(lambda: fetch_sequential(urls), args.repeat)
+    # Same extraction on both sides so only the fetching strategy differs
+    concurrent = time_runs(lambda: fetcher.fetch_all(urls, extract=extract_paragraph_text), args.repeat)
+
+    server.shutdown()
+
+    seq_median = statistics.median(sequential)
+    con_median = statistics.median(concurrent)
+    print(f"\n{args.pages} pages, {args.delay}s per page, {args.repeat} runs")
+    print(f"sequential: median {seq_median:.3f}s (min {min(sequential):.3f}s)")
+    print(f"concurrent: median {con_median:.3f}s (min {min(concurrent):.3f}s)")
+    print(f"speedup:    {seq_median / con_median:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
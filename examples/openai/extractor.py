@@ -0,0 +1,153 @@
+"""
+Streaming, bounded-memory text extraction for search result pages.
+
+Instead of downloading a whole page and building a BeautifulSoup tree just to join
+its <p> text, the response body is read in chunks and fed to an incremental
+`html.parser.HTMLParser`. Text inside <script>, <style> and similar elements is
+skipped, and reading stops as soon as the character budget is reached, so the
+memory used per page stays roughly constant and the output handed to the LLM is
+bounded.
+"""
+
+import codecs
+from html.parser import HTMLParser
+from typing import Iterable, List, Optional
+
+import requests
+
+# Defaults
+DEFAULT_MAX_CHARS = 4000  # Characters of text kept per page
+DEFAULT_MAX_BYTES = 5 * 1024 * 1024  # Bytes read per page before giving up
+DEFAULT_CHUNK_SIZE = 16 * 1024
+CHARS_PER_TOKEN = 4  # Rough average for English text, used to turn a token budget into characters
+
+SKIPPED_TAGS = {'script', 'style', 'noscript', 'template', 'svg'}
+
+
+class ParagraphTextParser(HTMLParser):
+    """
+    Incremental parser that collects the text of <p> elements up to a character budget.
+    """
+
+    def __init__(self, max_chars: int):
+        super().__init__(convert_charrefs=True)
+        self.max_chars = max_chars
+        self.parts: List[str] = []
+        self.length = 0
+        self.paragraph_depth = 0
+        self.skip_depth = 0
+        self.done = False
+
+    def handle_starttag(self, tag, attrs):
+        if tag in SKIPPED_TAGS:
+            self.skip_depth += 1
+        elif tag == 'p':
+            # Separate paragraphs the same way ' '.join([p.get_text() ...]) does
+            if self.paragraph_depth == 0 and self.parts:
+                self._append(' ')
+            self.paragraph_depth += 1
+
+    def handle_endtag(self, tag):
+        if tag in SKIPPED_TAGS and self.skip_depth > 0:
+            self.skip_depth -= 1
+        elif tag == 'p' and self.paragraph_depth > 0:
+            self.paragraph_depth -= 1
+
+    def handle_data(self, data):
+        if self.paragraph_depth > 0 and self.skip_depth == 0:
+            self._append(data)
+
+    def _append(self, text: str):
+        if self.done:
+            return
+        remaining = self.max_chars - self.length
+        if len(text) >= remaining:
+            text = text[:remaining]
+            self.done = True
+        self.parts.append(text)
+        self.length += len(text)
+
+    def text(self) -> str:
+        return ''.join(self.parts)
+
+
+def extract_text_from_chunks(
+    chunks: Iterable[bytes],
+    encoding: Optional[str] = None,
+    max_chars: int = DEFAULT_MAX_CHARS,
+    max_bytes: Optional[int] = DEFAULT_MAX_BYTES,
+) -> str:
+    """
+    Extract paragraph text from an HTML document delivered as byte chunks.
+
+    Parameters:
+        chunks (Iterable[bytes]): The document body.
+        encoding (Optional[str]): Character encoding of the body, UTF-8 if unknown.
+        max_chars (int): Stop once this many characters of text have been collected.
+        max_bytes (Optional[int]): Stop after reading this many bytes, None for no limit.
+
+    Returns:
+        str: The text of all <p> elements, truncated to `max_chars`.
+    """
+    try:
+        decoder = codecs.getincrementaldecoder(encoding or 'utf-8')(errors='replace')
+    except LookupError:
+        decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+
+    parser = ParagraphTextParser(max_chars)
+    read = 0
+    for chunk in chunks:
+        if not chunk:
+            continue
+        parser.feed(decoder.decode(chunk))
+        read += len(chunk)
+        if parser.done or (max_bytes is not None and read >= max_bytes):
+            break
+
+    # Flush whatever the decoder and the parser still buffer, however reading stopped
+    parser.feed(decoder.decode(b'', final=True))
+    parser.close()
+
+    return parser.text()
+
+
+def extract_text_streaming(
+    response: requests.Response,
+    max_chars: Optional[int] = DEFAULT_MAX_CHARS,
+    max_tokens: Optional[int] = None,
+    max_bytes: Optional[int] = DEFAULT_MAX_BYTES,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> str:
+    """
+    Extract paragraph text from a streamed response without reading more than needed.
+
+    The response should have been requested with `stream=True`; the rest of the
+    body is left unread once the budget is reached.
+
+    Parameters:
+        response (requests.Response): The response to extract text from.
+        max_chars (Optional[int]): Character budget for the extracted text.
+        max_tokens (Optional[int]): Token budget, converted to characters with CHARS_PER_TOKEN.
+            Takes precedence over `max_chars` when given.
+        max_bytes (Optional[int]): Maximum number of body bytes to read.
+        chunk_size (int): Number of bytes read at a time.
+
+    Returns:
+        str: The text of all <p> elements, truncated to the budget.
+    """
+    if max_tokens is not None:
+        max_chars = max_tokens * CHARS_PER_TOKEN
+    if max_chars is None:
+        max_chars = DEFAULT_MAX_CHARS
+
+    # requests falls back to ISO-8859-1 for any text/* response without a charset,
+    # which mangles UTF-8 pages, so only trust the encoding when it was declared
+    content_type = response.headers.get('Content-Type', '')
+    encoding = response.encoding if 'charset=' in content_type.lower() else None
+
+    return extract_text_from_chunks(
+        response.iter_content(chunk_size=chunk_size),
+        encoding=encoding,
+        max_chars=max_chars,
+        max_bytes=max_bytes,
+    )
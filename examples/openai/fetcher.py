@@ -0,0 +1,172 @@
+"""
+Concurrent page fetching for the search tools.
+
+`internet_search` in run.py and `search_duckduckgo_and_get_content` in testing.py
+both need the content of every result URL. Fetching them one at a time makes a
+tool call cost the sum of all page latencies; here every URL is fetched on a
+bounded thread pool that shares one pooled `requests.Session`, and the whole call
+is bounded by an overall deadline, so a call costs roughly the slowest page.
+
+Bodies are streamed and, by default, handed to `extractor.extract_text_streaming`,
+which stops reading a page once its text budget is reached.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Callable, Dict, List, Optional
+
+import requests
+from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+
+from extractor import extract_text_streaming
+
+# Defaults
+DEFAULT_MAX_WORKERS = 8
+DEFAULT_TIMEOUT = 5  # Seconds allowed for a single request (connect and read)
+DEFAULT_DEADLINE = 8  # Seconds allowed for a whole fetch_all call
+
+
+def extract_paragraph_text(response: requests.Response) -> str:
+    """
+    Extract the text of all <p> elements from a response by parsing the whole page.
+
+    This reads the full body into memory; `extract_text_streaming` is the default
+    used by the fetcher.
+
+    Parameters:
+        response (requests.Response): The response to extract text from.
+
+    Returns:
+        str: The paragraph text joined with spaces.
+    """
+    soup = BeautifulSoup(response.content, 'html.parser')
+    paragraphs = soup.find_all('p')
+    return ' '.join([p.get_text() for p in paragraphs])
+
+
+def create_session(pool_size: int = DEFAULT_MAX_WORKERS) -> requests.Session:
+    """
+    Create a session whose connection pool is large enough for every worker.
+
+    Parameters:
+        pool_size (int): Number of connections to keep per host.
+
+    Returns:
+        requests.Session: A session with pooled HTTP and HTTPS adapters.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+class PageFetcher:
+    """
+    Fetches many pages concurrently on a bounded worker pool.
+
+    The pool and the session are created once and reused by every call, so
+    keep-alive connections survive between tool calls.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        timeout: float = DEFAULT_TIMEOUT,
+        deadline: float = DEFAULT_DEADLINE,
+        session: Optional[requests.Session] = None,
+    ):
+        """
+        Parameters:
+            max_workers (int): Maximum number of pages fetched at the same time.
+            timeout (float): Timeout for a single request in seconds.
+            deadline (float): Overall time budget for a fetch_all call in seconds.
+            session (Optional[requests.Session]): Session to share between workers.
+        """
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.deadline = deadline
+        self.session = session or create_session(max_workers)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="fetch")
+
+    def _fetch(self, url: str, extract: Callable[[requests.Response], str]) -> str:
+        with self.session.get(url, timeout=self.timeout, stream=True) as response:
+            return extract(response)
+
+    def fetch_all(
+        self,
+        urls: List[str],
+        extract: Callable[[requests.Response], str] = extract_text_streaming,
+        deadline: Optional[float] = None,
+    ) -> Dict[str, str]:
+        """
+        Fetch all URLs concurrently and extract their text.
+
+        Pages that fail, or that have not finished when the deadline expires,
+        are reported with empty content rather than raising.
+
+        Parameters:
+            urls (List[str]): URLs to fetch.
+            extract (Callable[[requests.Response], str]): Turns a response into text.
+                It runs on the worker thread, so reading the body counts towards the deadline.
+            deadline (Optional[float]): Overrides the fetcher's overall deadline for this call.
+
+        Returns:
+            Dict[str, str]: Extracted content keyed by URL, in the order of `urls`.
+        """
+        deadline = self.deadline if deadline is None else deadline
+        start = time.monotonic()
+
+        futures = {url: self._executor.submit(self._fetch, url, extract) for url in dict.fromkeys(urls)}
+        _, not_done = wait(futures.values(), timeout=deadline)
+
+        contents = {}
+        for url, future in futures.items():
+            if future in not_done:
+                # Requests that are already running finish in the background, bounded by the request timeout
+                future.cancel()
+                print(f"Deadline of {deadline}s exceeded fetching content from {url}")
+                contents[url] = ''
+                continue
+            try:
+                contents[url] = future.result()
+            except Exception as e:
+                print(f"Error fetching content from {url}: {str(e)}")
+                contents[url] = ''
+
+        print(f"Fetched {len(futures) - len(not_done)}/{len(futures)} pages in {time.monotonic() - start:.2f}s")
+        return contents
+
+
+_default_fetcher: Optional[PageFetcher] = None
+_default_fetcher_lock = threading.Lock()
+
+
+def get_fetcher() -> PageFetcher:
+    """
+    Return the process-wide fetcher, creating it on first use.
+
+    Returns:
+        PageFetcher: The shared fetcher.
+    """
+    global _default_fetcher
+    with _default_fetcher_lock:
+        if _default_fetcher is None:
+            _default_fetcher = PageFetcher()
+        return _default_fetcher
+
+
+def fetch_pages(urls: List[str], **kwargs) -> Dict[str, str]:
+    """
+    Fetch all URLs concurrently with the shared fetcher.
+
+    Parameters:
+        urls (List[str]): URLs to fetch.
+        **kwargs: Passed through to PageFetcher.fetch_all.
+
+    Returns:
+        Dict[str, str]: Extracted content keyed by URL.
+    """
+    return get_fetcher().fetch_all(urls, **kwargs)
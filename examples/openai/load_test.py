@@ -0,0 +1,202 @@
+"""
+Load test for the asyncio agent loop against a local mock of the OpenAI API.
+
+Starts a stub `/v1/chat/completions` endpoint that answers after a fixed delay.
+For the first `--turns - 1` requests of a conversation it asks for a tool call,
+then it answers with a final message. `--runs` conversations are driven by
+`start_chatbot_async` on a single event loop, at most `--concurrency` at a time,
+and the script reports completed runs per second and the p50/p99 latency of a
+turn (model call plus tool calls).
+
+No Asteroid server or OpenAI key is needed; the numbers measure the overhead of
+the agent loop itself and how many conversations one worker can keep in flight.
+
+Usage:
+    python load_test.py --runs 500 --concurrency 200 --turns 5 --model-delay 0.2
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List
+
+from openai import AsyncOpenAI
+
+from agent_async import start_chatbot_async
+from turn_timing import TurnTimings
+
+MOCK_VALUES = {"string": "load test", "integer": 1, "number": 1.0, "boolean": True}
+
+
+def mock_arguments(tool: Dict[str, Any]) -> str:
+    """
+    Build arguments that satisfy a tool definition.
+
+    Parameters:
+        tool (Dict[str, Any]): An OpenAI tool definition from the request.
+
+    Returns:
+        str: The arguments as a JSON string.
+    """
+    properties = tool["function"]["parameters"].get("properties", {})
+    return json.dumps({name: MOCK_VALUES.get(schema.get("type"), "load test") for name, schema in properties.items()})
+
+
+def mock_completion(request: Dict[str, Any], turns: int) -> Dict[str, Any]:
+    """
+    Build the chat completion the mock endpoint returns for a request.
+
+    Parameters:
+        request (Dict[str, Any]): The chat completion request body.
+        turns (int): Number of model calls per conversation.
+
+    Returns:
+        Dict[str, Any]: A chat completion response body.
+    """
+    # Every earlier turn of this conversation ended with an assistant message
+    turn = sum(1 for message in request["messages"] if message.get("role") == "assistant")
+    tools = request.get("tools") or []
+
+    if turn < turns - 1 and tools:
+        message = {
+            "role": "assistant",
+            "content": None,
+            "tool_calls": [{
+                "id": f"call_{turn}",
+                "type": "function",
+                "function": {"name": tools[0]["function"]["name"], "arguments": mock_arguments(tools[0])}
+            }]
+        }
+        finish_reason = "tool_calls"
+    else:
+        message = {"role": "assistant", "content": "All done."}
+        finish_reason = "stop"
+
+    return {
+        "id": f"chatcmpl-mock-{turn}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": request.get("model", "mock"),
+        "choices": [{"index": 0, "message": message, "finish_reason": finish_reason, "logprobs": None}],
+        "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}
+    }
+
+
+def start_mock_server(delay: float, turns: int) -> ThreadingHTTPServer:
+    """
+    Start a mock OpenAI API on a free local port.
+
+    Parameters:
+        delay (float): Seconds to wait before answering a chat completion.
+        turns (int): Number of model calls per conversation.
+
+    Returns:
+        ThreadingHTTPServer: The running server.
+    """
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            time.sleep(delay)
+            payload = json.dumps(mock_completion(json.loads(body), turns)).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, format, *args):
+            pass
+
+    class Server(ThreadingHTTPServer):
+        # Hundreds of clients connect at once when the test starts
+        request_queue_size = 1024
+
+    server = Server(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def percentile(values: List[float], pct: int) -> float:
+    """
+    Return the given percentile of the values.
+    """
+    if len(values) < 2:
+        return values[0] if values else 0.0
+    return statistics.quantiles(values, n=100, method="inclusive")[pct - 1]
+
+
+async def run_load(client: AsyncOpenAI, runs: int, concurrency: int, turns: int, tool_delay: float) -> Dict[str, Any]:
+    """
+    Drive `runs` conversations, at most `concurrency` at a time.
+
+    Returns:
+        Dict[str, Any]: Wall time, completed and failed runs, and the timings of every turn.
+    """
+    async def lookup(query: str) -> str:
+        """
+        Look something up.
+        """
+        await asyncio.sleep(tool_delay)
+        return f"Result for {query}"
+
+    semaphore = asyncio.Semaphore(concurrency)
+    turn_timings: List[TurnTimings] = []
+
+    async def one_run():
+        async with semaphore:
+            await start_chatbot_async(
+                "Look up something, then answer.",
+                [lookup],
+                None,
+                client,
+                max_turns=turns,
+                on_turn=turn_timings.append,
+                verbose=False
+            )
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*(one_run() for _ in range(runs)), return_exceptions=True)
+    elapsed = time.perf_counter() - start
+
+    errors = [r for r in results if isinstance(r, Exception)]
+    if errors:
+        print(f"{len(errors)} runs failed, first error: {errors[0]!r}")
+
+    return {"seconds": elapsed, "completed": runs - len(errors), "failed": len(errors), "turns": turn_timings}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=500, help="Total number of conversations")
+    parser.add_argument("--concurrency", type=int, default=200, help="Conversations in flight at the same time")
+    parser.add_argument("--turns", type=int, default=5, help="Model calls per conversation")
+    parser.add_argument("--model-delay", type=float, default=0.2, help="Seconds the mock model takes per call")
+    parser.add_argument("--tool-delay", type=float, default=0.05, help="Seconds each tool call takes")
+    args = parser.parse_args()
+
+    server = start_mock_server(args.model_delay, args.turns)
+    host, port = server.server_address
+    client = AsyncOpenAI(base_url=f"http://{host}:{port}/v1", api_key="mock", max_retries=0)
+
+    result = asyncio.run(run_load(client, args.runs, args.concurrency, args.turns, args.tool_delay))
+    server.shutdown()
+
+    totals = [t.total_seconds for t in result["turns"]]
+    models = [t.model_seconds for t in result["turns"]]
+    print(f"\n{args.runs} runs x {args.turns} turns, concurrency {args.concurrency}, "
+          f"model delay {args.model_delay}s, tool delay {args.tool_delay}s")
+    print(f"completed:  {result['completed']} runs in {result['seconds']:.2f}s ({result['failed']} failed)")
+    print(f"throughput: {result['completed'] / result['seconds']:.1f} runs/s, {len(totals) / result['seconds']:.1f} turns/s")
+    print(f"turn:       p50 {percentile(totals, 50) * 1000:.1f}ms, p99 {percentile(totals, 99) * 1000:.1f}ms")
+    print(f"model call: p50 {percentile(models, 50) * 1000:.1f}ms, p99 {percentile(models, 99) * 1000:.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -23,6 +23,7 @@
 #    - [Chat Function with OpenAI](#Chat-Function-with-OpenAI)
 #    - [Executing Tool Calls](#Executing-Tool-Calls)
 #    - [Updating Messages](#Updating-Messages)
+#    - [Timing Turns](#Timing-Turns)
 #    - [Starting the Chatbot](#Starting-the-Chatbot)
 # 6. [Running the Assistant](#Running-the-Assistant)
 # 7. [Conclusion](#Conclusion)
@@ -44,18 +45,20 @@
 # We start with importing the necessary libraries and initializing the OpenAI client.
 
 import json
-import inspect
-from typing import Callable, Any, List, Dict, get_type_hints, Optional
-from enum import Enum
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Any, List, Dict, Optional
 from uuid import UUID
 
-import requests
-from bs4 import BeautifulSoup
 from openai import OpenAI
 from openai.types.chat import ChatCompletionMessage
 from duckduckgo_search import DDGS
 import os
 
+from fetcher import fetch_pages
+from tool_schema import tool_schemas
+from turn_timing import DEFAULT_MAX_TURNS, ModelCallTimer, TurnTimings, print_turn_timings
+
 os.environ["ASTEROID_API_URL"] = "http://localhost:8080/api/v1"
 # os.environ["OPENAI_API_KEY"] = "your-api-key"
 
@@ -184,7 +187,7 @@ def check_email_address_supervisor(whitelisted_emails: List[str]) -> ToolCallSup
 
 # ### `internet_search`
 # 
-# Searches the internet using DuckDuckGo and retrieves content from the results. We use the `supervise()` decorator without any supervision functions to allow the LLM to call the tool freely.
+# Searches the internet using DuckDuckGo and retrieves content from the results. The result pages are fetched concurrently with a shared connection pool and an overall deadline (see `fetcher.py`), so the tool takes about as long as the slowest page. We use the `supervise()` decorator without any supervision functions to allow the LLM to call the tool freely.
 
 @supervise()
 def internet_search(query: str, max_results: int = 3) -> str:
@@ -213,23 +216,18 @@ def internet_search(query: str, max_results: int = 3) -> str:
                 max_results=max_results
             )
 
+            search_results = list(search_results)
+
+            # Fetch content from all links concurrently
+            contents = fetch_pages([r['href'] for r in search_results])
+
             for r in search_results:
                 result = {
                     'title': r['title'],
                     'href': r['href'],
                     'snippet': r['body'],
-                    'content': ''
+                    'content': contents.get(r['href'], '')
                 }
-                try:
-                    # Fetch content from the link
-                    response = requests.get(r['href'], timeout=5)
-                    soup = BeautifulSoup(response.content, 'html.parser')
-                    # Extract text content from the web page
-                    paragraphs = soup.find_all('p')
-                    text_content = ' '.join([p.get_text() for p in paragraphs])
-                    result['content'] = text_content
-                except Exception as e:
-                    print(f"Error fetching content from {r['href']}: {str(e)}")
                 results.append(result)
 
             # Combine content from all results
@@ -329,7 +327,7 @@ def book_flight(departure_city: str, arrival_city: str, datetime: str, maximum_p
 
 # ### Creating OpenAI Tools
 # 
-# We need to create tool definitions that conform to OpenAI's expected schema.
+# We need to create tool definitions that conform to OpenAI's expected schema. The definitions are built by `tool_schema.py`, which reflects over each function only once and caches the serialized schema, so starting another conversation with the same tools does not repeat the work. Parameters can use `Optional`, `List[...]`, `Literal`, enums, dataclasses and pydantic models.
 
 def create_openai_tool(func: Callable) -> dict:
     """
@@ -341,85 +339,21 @@ def create_openai_tool(func: Callable) -> dict:
     Returns:
         dict: A dictionary representing the tool definition.
     """
-    signature = inspect.signature(func)
-    type_hints = get_type_hints(func)
-
-    def python_type_to_json_type(py_type: Any) -> str:
-        """
-        Convert a Python type to a JSON schema type.
-
-        Parameters:
-            py_type (Any): The Python type to convert.
-
-        Returns:
-            str: The corresponding JSON type as a string.
-        """
-        if py_type == str:
-            return "string"
-        elif py_type == int:
-            return "integer"
-        elif py_type == float:
-            return "number"
-        elif py_type == bool:
-            return "boolean"
-        elif py_type == dict:
-            return "object"
-        elif py_type == list:
-            return "array"
-        elif isinstance(py_type, type) and issubclass(py_type, Enum):
-            return "string"
-        else:
-            return "string"  # Default to string for unsupported types
-
-    parameters: Dict[str, Any] = {
-        "type": "object",
-        "properties": {},
-        "additionalProperties": False  # Ensure no additional properties are allowed
-    }
-
-    required_params = []
-
-    for param_name, param in signature.parameters.items():
-        param_type = type_hints.get(param_name, str)
-        param_schema = {
-            "type": python_type_to_json_type(param_type),
-            "description": param_name
-        }
-
-        # If the parameter has an Enum type, add the enum options
-        if isinstance(param_type, type) and issubclass(param_type, Enum):
-            param_schema["enum"] = [e.value for e in param_type]
-
-        parameters["properties"][param_name] = param_schema
-
-        # Include all parameters in required when strict is True
-        required_params.append(param_name)
-
-    parameters["required"] = required_params
-
-    # Build the function definition
-    return {
-        "type": "function",
-        "function": {
-            "name": func.__name__,
-            "description": func.__doc__ or "",
-            "parameters": parameters,
-            "strict": True
-        }
-    }
+    return tool_schemas.get(func)
 
 
 # ### Chat Function with OpenAI
 # 
 # Handles interaction with the OpenAI GPT model.
 
-def chat_with_openai(messages: List[Dict], tools: List[Callable], client: OpenAI):
+def chat_with_openai(messages: List[Dict], tools: List[Callable], client: OpenAI, parallel_tool_calls: bool = False):
     """
     Interact with the OpenAI GPT model.
 
     Parameters:
         messages (List[Dict]): The conversation history.
         tools (List[Callable]): The list of tools available to the assistant.
+        parallel_tool_calls (bool): Whether the model may return several tool calls in one turn.
 
     Returns:
         The completion response from the OpenAI API.
@@ -428,14 +362,14 @@ def chat_with_openai(messages: List[Dict], tools: List[Callable], client: OpenAI
         model="gpt-4o",
         messages=messages,
         tools=tools,
-        parallel_tool_calls=False
+        parallel_tool_calls=parallel_tool_calls
     )
     return completion
 
 
 # ### Executing Tool Calls
 # 
-# Executes the tool calls as decided by the assistant.
+# Executes the tool calls as decided by the assistant. When parallel tool calls are enabled, all tool calls returned in a turn are dispatched at the same time on a worker pool. Each one still goes through its own `@supervise` chain, and all results are sent back to the model in a single follow-up request.
 
 def execute_tool_call(tool_call, tools):
     """
@@ -455,7 +389,8 @@ def execute_tool_call(tool_call, tools):
     # Map function names to actual functions
     for tool in tools:
         if tool.__name__ == function_name:
-            result = tool(**arguments)
+            # Dataclass, model and enum parameters arrive as plain JSON values
+            result = tool(**tool_schemas.convert_arguments(tool, arguments))
             print(f"Tool call {function_name} result: {result}")
             return result
 
@@ -463,15 +398,49 @@ def execute_tool_call(tool_call, tools):
     return "Function not found."
 
 
+def execute_tool_calls(tool_calls, tools, max_workers: Optional[int] = None) -> List[Dict]:
+    """
+    Execute all tool calls from one assistant turn concurrently.
+
+    Parameters:
+        tool_calls: The tool call objects from the assistant's response.
+        tools (List[Callable]): The list of available tool functions.
+        max_workers (Optional[int]): Maximum number of tool calls run at the same time, defaults to one per call.
+
+    Returns:
+        List[Dict]: One tool message per tool call, in the order the assistant made them.
+    """
+    with ThreadPoolExecutor(max_workers=max_workers or len(tool_calls)) as executor:
+        results = list(executor.map(lambda tool_call: execute_tool_call(tool_call, tools), tool_calls))
+
+    return [
+        {
+            "role": "tool",
+            "content": json.dumps(result),
+            "tool_call_id": tool_call.id
+        }
+        for tool_call, result in zip(tool_calls, results)
+    ]
+
+
+# ### Timing Turns
+# 
+# Long-horizon agents run hundreds of turns, so the loop reports how long each turn spent in the model, in supervision and in the tools. With the Asteroid-wrapped client, supervision of the tool calls returned by the model happens inside the wrapped `chat.completions.create` call. `ModelCallTimer` (see `turn_timing.py`) times the raw model call underneath the wrapper, so the rest of the wrapped call can be attributed to supervision. `TurnTimings` holds the breakdown of a turn and `print_turn_timings` is a turn hook that prints it.
+
 # ### Starting the Chatbot
 # 
-# The main loop that starts the chatbot and handles user interaction.
+# The main loop that starts the chatbot and handles user interaction. It is an iterative driver over an append-only message list, and it stops when the assistant answers without a tool call or after `max_turns` model calls.
 
 def start_chatbot(
     start_prompt: str,
     tools: List[Callable],
     run_id: UUID,
-    client: OpenAI
+    client: OpenAI,
+    parallel_tool_calls: bool = False,
+    max_workers: Optional[int] = None,
+    max_turns: int = DEFAULT_MAX_TURNS,
+    on_turn: Optional[Callable[[TurnTimings], None]] = None,
+    model_timer: Optional[ModelCallTimer] = None
 ) -> List[Dict]:  # Modified to return messages
     """
     Run the chatbot interaction without CLI/Jupyter interface.
@@ -481,51 +450,71 @@ def start_chatbot(
         tools (List[Callable]): The list of available tool functions.
         run_id (UUID): The ID of the current run.
         client (OpenAI): The OpenAI client instance.
+        parallel_tool_calls (bool): Let the model return several tool calls per turn and run them concurrently.
+        max_workers (Optional[int]): Maximum number of tool calls run at the same time in parallel mode.
+        max_turns (int): Maximum number of model calls before the run is stopped.
+        on_turn (Optional[Callable[[TurnTimings], None]]): Called with the latency breakdown of every turn.
+        model_timer (Optional[ModelCallTimer]): Timer installed on the unwrapped client, used to separate
+            model latency from supervision latency. Without it the whole call counts as model latency.
 
     Returns:
         List[Dict]: The conversation history
     """
     # Initialize conversation messages
-    messages = [{"role": "system", "content": "You are a helpful assistant."}]
+    messages = [
+        {"role": "system", "content": "You are a helpful assistant."},
+        {"role": "user", "content": start_prompt}
+    ]
 
     # Create OpenAI tool definitions
     openai_tools = [create_openai_tool(func) for func in tools]
 
-    def process_assistant_response(assistant_message):
-        nonlocal messages
+    for turn in range(max_turns):
+        timings = TurnTimings(turn=turn)
 
-        # Check if the assistant is making a tool call
-        if assistant_message.tool_calls:
+        # Get the assistant's response to the conversation so far
+        start = time.perf_counter()
+        response = chat_with_openai(messages, openai_tools, client, parallel_tool_calls)
+        elapsed = time.perf_counter() - start
+
+        if model_timer:
+            model_timer.record(timings, elapsed)
+        else:
+            timings.model_seconds = elapsed
+
+        assistant_message = response.choices[0].message
+        messages.append(assistant_message)
+
+        # The run is over once the assistant stops making tool calls
+        if not assistant_message.tool_calls:
+            if on_turn:
+                on_turn(timings)
+            break
+
+        start = time.perf_counter()
+        if parallel_tool_calls:
+            # Execute every tool call of this turn at the same time
+            tool_responses = execute_tool_calls(assistant_message.tool_calls, tools, max_workers)
+        else:
             tool_call = assistant_message.tool_calls[0]
 
             # Execute the tool call
             result = execute_tool_call(tool_call, tools)
 
-            tool_response = {
+            tool_responses = [{
                 "role": "tool",
                 "content": json.dumps(result),
                 "tool_call_id": tool_call.id
-            }
-
-            messages = messages + [tool_response]
-
-            # Now get the assistant's response to the tool execution
-            response = chat_with_openai(messages, openai_tools, client)
-            assistant_message = response.choices[0].message
-            messages = messages + [assistant_message]
+            }]
+        timings.tool_seconds = time.perf_counter() - start
+        timings.tool_calls = len(tool_responses)
 
-            # Process the assistant's response recursively
-            process_assistant_response(assistant_message)
+        messages.extend(tool_responses)
 
-    # Start the conversation
-    user_message = {"role": "user", "content": start_prompt}
-    messages = messages + [user_message]
-
-    # Get assistant's initial response
-    response = chat_with_openai(messages, openai_tools, client)
-    assistant_message = response.choices[0].message
-    messages = messages + [assistant_message]
-    process_assistant_response(assistant_message)
+        if on_turn:
+            on_turn(timings)
+    else:
+        print(f"Stopping after reaching the maximum of {max_turns} turns.")
 
     return messages
 
@@ -551,16 +540,25 @@ tools = [
     book_flight
 ]
 
-# Initialize the OpenAI client
+# Initialize the OpenAI client, timing raw model calls so supervision latency can be reported separately
 client = OpenAI()
+model_timer = ModelCallTimer(client)
 
 # Important! For this to work, Asteroid server needs to be running, contact Asteroid to get access
 run_id = asteroid_init(project_name="Email Assistant")
 # When you wrap the client, all supervised functions will be registered
 wrapped_client = asteroid_openai_client(client, run_id)
 
-# Start the chatbot
-start_chatbot(start_prompt, tools, run_id, wrapped_client)
+# Start the chatbot, running independent tool calls of a turn in parallel
+start_chatbot(
+    start_prompt,
+    tools,
+    run_id,
+    wrapped_client,
+    parallel_tool_calls=True,
+    on_turn=print_turn_timings,
+    model_timer=model_timer
+)
 
 asteroid_end(run_id)
 # In the web browser, you should see the supervisors in action at http://localhost:3000/.
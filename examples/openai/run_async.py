@@ -0,0 +1,205 @@
+"""
+Asyncio edition of the email assistant in `run.py`.
+
+The same assistant, tools and supervisors, but the tools are `async def`
+functions decorated with `@supervise`, the OpenAI client is an `AsyncOpenAI`
+client wrapped by Asteroid, and every conversation runs as a task on one event
+loop (see `agent_async.py`). Several runs can therefore be supervised at the
+same time from a single process.
+
+Important! For this to work, Asteroid server needs to be running, contact Asteroid to get access.
+
+Usage:
+    python run_async.py --runs 3
+"""
+
+import argparse
+import asyncio
+import os
+from typing import Dict, List
+
+from openai import AsyncOpenAI
+from duckduckgo_search import DDGS
+
+from agent_async import start_chatbot_async
+from fetcher import fetch_pages
+from turn_timing import ModelCallTimer, print_turn_timings
+
+os.environ.setdefault("ASTEROID_API_URL", "http://localhost:8080/api/v1")
+
+from asteroid_sdk.supervision import supervise
+from asteroid_sdk.supervision.supervisors import human_supervisor, llm_supervisor
+from asteroid_sdk.wrappers.openai import asteroid_end, asteroid_openai_client, asteroid_init
+
+# Policies
+EMAIL_INVITATION_POLICY = (
+    "Ensure that the email invitation is clear, concise, and includes all necessary details about the event. "
+    "Verify that the recipient's email address is correct given the previous messages."
+)
+
+CORRECT_TOOL_PARAMETERS_POLICY = (
+    "Make sure that the tool parameters are correct given the previous messages. If incorrect, fix them."
+)
+
+
+def search_and_fetch(query: str, max_results: int) -> str:
+    """
+    Search DuckDuckGo and fetch the content of the results. Blocking, run it on a thread.
+
+    Parameters:
+        query (str): Query to search the internet with.
+        max_results (int): Maximum number of results to fetch content from.
+
+    Returns:
+        str: Concatenated content from the search results.
+    """
+    with DDGS() as ddgs:
+        search_results = list(ddgs.text(query, region="wt-wt", safesearch="moderate", max_results=max_results))
+
+    # Fetch content from all links concurrently
+    contents = fetch_pages([r['href'] for r in search_results])
+
+    combined_content = '\n'.join([contents[r['href']] for r in search_results if contents.get(r['href'])])
+    return combined_content if combined_content else f"No content found for '{query}'."
+
+
+@supervise()
+async def internet_search(query: str, max_results: int = 3) -> str:
+    """
+    Search the internet for information using DuckDuckGo and fetch content from the first few links.
+
+    Parameters:
+        query (str): Query to search the internet with.
+        max_results (int): Maximum number of results to fetch content from.
+
+    Returns:
+        str: Concatenated content from the search results.
+    """
+    try:
+        return await asyncio.to_thread(search_and_fetch, query, max_results)
+    except Exception as e:
+        print(f"Error performing search: {str(e)}")
+        return f"Error performing search for '{query}'."
+
+
+@supervise(supervision_functions=[
+    [llm_supervisor(instructions=EMAIL_INVITATION_POLICY), human_supervisor()]
+])
+async def send_email(to: str, subject: str, body: str):
+    """
+    Send an email to the specified recipient.
+
+    Parameters:
+        to (str): Recipient's email address.
+        subject (str): Subject of the email.
+        body (str): Body content of the email.
+
+    Returns:
+        str: A message indicating the result of the email sending process.
+    """
+    # Mocking the email sending process
+    return f"Email sent to {to} with subject '{subject}'"
+
+
+@supervise(supervision_functions=[[llm_supervisor(instructions=CORRECT_TOOL_PARAMETERS_POLICY)]])
+async def create_calendar_event(title: str, start_time: str, end_time: str):
+    """
+    Create a calendar event.
+
+    Parameters:
+        title (str): Title of the event.
+        start_time (str): Start time of the event.
+        end_time (str): End time of the event.
+
+    Returns:
+        str: A message indicating the result of the calendar event creation process.
+    """
+    # Mocking the calendar event creation process
+    return f"Event '{title}' created from {start_time} to {end_time}"
+
+
+@supervise(supervision_functions=[[human_supervisor()]])
+async def book_flight(departure_city: str, arrival_city: str, datetime: str, maximum_price: float):
+    """
+    Book a flight ticket.
+
+    Parameters:
+        departure_city (str): Departure city.
+        arrival_city (str): Arrival city.
+        datetime (str): Departure date and time.
+        maximum_price (float): Maximum acceptable price for the flight.
+
+    Returns:
+        str: A message indicating the result of the flight booking process.
+    """
+    # Mocking the flight booking process
+    return f"Flight booked from {departure_city} to {arrival_city} on {datetime}."
+
+
+# Define the initial prompt for the chatbot
+START_PROMPT = (
+    "Go and find the most interesting events happening in AI next week in San Francisco. "
+    "Then create a calendar event for the most interesting one. When done, invite joe@asteroid.ai to the event."
+    "where you should send invitations for that event. After the email is sent, submit a flight booking request for me"
+    "from London to San Francisco to attend that event. Make sure that the flight price is less than 1000 GBP."
+    "You don't need to ask permission for the flight booking, just book it using your best judgement."
+)
+
+# List of tools available to the assistant
+TOOLS = [
+    internet_search,
+    send_email,
+    create_calendar_event,
+    book_flight
+]
+
+
+async def supervised_run(start_prompt: str) -> List[Dict]:
+    """
+    Register a run with Asteroid and drive one conversation to completion.
+
+    Parameters:
+        start_prompt (str): The initial prompt for the assistant.
+
+    Returns:
+        List[Dict]: The conversation history
+    """
+    # Each run gets its own client, so the timer and the wrapper only see this run's calls
+    client = AsyncOpenAI()
+    model_timer = ModelCallTimer(client)
+
+    # Registering and ending runs are blocking HTTP calls to the control plane
+    run_id = await asyncio.to_thread(asteroid_init, project_name="Email Assistant")
+    try:
+        # When you wrap the client, all supervised functions will be registered
+        wrapped_client = asteroid_openai_client(client, run_id)
+        return await start_chatbot_async(
+            start_prompt,
+            TOOLS,
+            run_id,
+            wrapped_client,
+            parallel_tool_calls=True,
+            on_turn=print_turn_timings,
+            model_timer=model_timer
+        )
+    finally:
+        await asyncio.to_thread(asteroid_end, run_id)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=1, help="Number of conversations to run concurrently")
+    args = parser.parse_args()
+
+    results = await asyncio.gather(*(supervised_run(START_PROMPT) for _ in range(args.runs)), return_exceptions=True)
+    for i, result in enumerate(results):
+        if isinstance(result, Exception):
+            print(f"Run {i} failed: {str(result)}")
+        else:
+            print(f"Run {i} finished after {len(result)} messages")
+
+    # In the web browser, you should see the supervisors of every run in action at http://localhost:3000/.
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
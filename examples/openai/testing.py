@@ -1,7 +1,6 @@
 from duckduckgo_search import DDGS
 from typing import List, Dict, Optional
-import requests
-from bs4 import BeautifulSoup
+from fetcher import fetch_pages
 
 def search_duckduckgo_and_get_content(
     query: str,
@@ -31,22 +30,18 @@ def search_duckduckgo_and_get_content(
                 max_results=max_results
             )
             
+            search_results = list(search_results)
+
+            # Fetch content from all links concurrently
+            contents = fetch_pages([r['href'] for r in search_results])
+
             for r in search_results:
                 result = {
                     'title': r['title'],
                     'href': r['href'],
                     'snippet': r['body'],
-                    'content': ''
+                    'content': contents.get(r['href'], '')
                 }
-                try:
-                    response = requests.get(r['href'], timeout=5)
-                    soup = BeautifulSoup(response.content, 'html.parser')
-                    # Extract text content from the web page
-                    paragraphs = soup.find_all('p')
-                    text_content = ' '.join([p.get_text() for p in paragraphs])
-                    result['content'] = text_content
-                except Exception as e:
-                    print(f"Error fetching content from {r['href']}: {str(e)}")
                 results.append(result)
                 
             return results
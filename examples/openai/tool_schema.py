@@ -0,0 +1,400 @@
+"""
+Cached OpenAI tool definitions for the example agents.
+
+Building a tool definition means reflecting over the function with
+`inspect.signature` and `get_type_hints`. `start_chatbot` needs the definition of
+every tool on every run, so the registry builds each definition once, keyed by
+the function object, and keeps it as serialized JSON bytes. Every lookup after
+the first one only decodes those bytes, which also hands each caller its own copy.
+The registry also converts the JSON arguments of a tool call back to the
+annotated types, so dataclass, model, enum and set parameters receive instances
+rather than raw dicts, strings and lists.
+
+Besides the simple types, parameters may be annotated with `Optional[...]`,
+unions, `List[...]` and other sequences, `Literal[...]`, enums, dataclasses and
+pydantic models. Nested objects follow the rules of OpenAI's strict mode: every
+property is required and no additional properties are allowed. Parameters that
+strict mode can't describe, such as `Dict[...]` or a recursive model, produce an
+open object schema, and the tool is then declared with strict mode off.
+"""
+
+import collections.abc
+import dataclasses
+import functools
+import inspect
+import json
+import threading
+import types
+from enum import Enum
+from typing import Any, Callable, Dict, Iterable, List, Literal, Optional, Set, Union, get_args, get_origin, get_type_hints
+
+try:
+    from pydantic import BaseModel
+except ImportError:  # pydantic is optional
+    BaseModel = None
+
+JSON_TYPES = {
+    str: "string",
+    int: "integer",
+    float: "number",
+    bool: "boolean",
+    dict: "object",
+    list: "array",
+}
+
+# Origins of the generic types that are described as JSON arrays, e.g. List[str] or Sequence[int]
+SEQUENCE_TYPES = {
+    list, set, frozenset, tuple,
+    collections.abc.Sequence, collections.abc.MutableSequence,
+    collections.abc.Set, collections.abc.MutableSet,
+    collections.abc.Collection, collections.abc.Iterable,
+}
+
+# Origin of `X | Y` annotations, Python 3.10 and later
+UNION_TYPES = {Union, getattr(types, "UnionType", Union)}
+
+
+def is_pydantic_model(py_type: Any) -> bool:
+    return BaseModel is not None and isinstance(py_type, type) and issubclass(py_type, BaseModel)
+
+
+def literal_schema(values: Iterable[Any]) -> Dict[str, Any]:
+    """
+    Build the schema of a fixed set of values, as used by `Literal` and `Enum`.
+
+    Parameters:
+        values (Iterable[Any]): The allowed values.
+
+    Returns:
+        Dict[str, Any]: An `enum` schema, typed when all values share a JSON type.
+    """
+    values = list(values)
+    schema: Dict[str, Any] = {}
+    json_types = {JSON_TYPES.get(type(value)) for value in values}
+    if len(json_types) == 1 and None not in json_types:
+        schema["type"] = json_types.pop()
+    schema["enum"] = values
+    return schema
+
+
+def object_schema(py_type: type, seen: Set[type]) -> Dict[str, Any]:
+    """
+    Build the schema of a dataclass or pydantic model from its field annotations.
+
+    Parameters:
+        py_type (type): The dataclass or model class.
+        seen (Set[type]): Classes already being expanded, to stop on recursive models.
+
+    Returns:
+        Dict[str, Any]: A strict object schema.
+    """
+    if py_type in seen:
+        # A recursive model cannot be expanded inline
+        return {"type": "object"}
+    seen = seen | {py_type}
+
+    hints = get_type_hints(py_type)
+    if is_pydantic_model(py_type):
+        fields = getattr(py_type, "model_fields", None) or getattr(py_type, "__fields__", {})
+        names = list(fields)
+    else:
+        names = [field.name for field in dataclasses.fields(py_type)]
+
+    return {
+        "type": "object",
+        "properties": {name: type_to_schema(hints.get(name, str), seen) for name in names},
+        "required": names,
+        "additionalProperties": False,
+    }
+
+
+def type_to_schema(py_type: Any, seen: Optional[Set[type]] = None) -> Dict[str, Any]:
+    """
+    Convert a Python type annotation to a JSON schema.
+
+    Parameters:
+        py_type (Any): The type annotation to convert.
+        seen (Optional[Set[type]]): Models already being expanded, used internally.
+
+    Returns:
+        Dict[str, Any]: The corresponding JSON schema.
+    """
+    seen = seen or set()
+    origin = get_origin(py_type)
+    args = get_args(py_type)
+
+    if origin in UNION_TYPES:
+        options = [type_to_schema(arg, seen) for arg in args if arg is not type(None)]
+        if type(None) in args:
+            options.append({"type": "null"})
+        return options[0] if len(options) == 1 else {"anyOf": options}
+
+    if origin is Literal:
+        return literal_schema(args)
+
+    if origin in SEQUENCE_TYPES:
+        schema: Dict[str, Any] = {"type": "array"}
+        if origin is tuple and args and args[-1] is not Ellipsis:
+            # Fixed-length tuples are described by the type of their first element
+            args = args[:1]
+        if args:
+            schema["items"] = type_to_schema(args[0], seen)
+        return schema
+
+    if origin in (dict, collections.abc.Mapping, collections.abc.MutableMapping):
+        return {"type": "object"}
+
+    if isinstance(py_type, type):
+        if issubclass(py_type, Enum):
+            return literal_schema(e.value for e in py_type)
+        if dataclasses.is_dataclass(py_type) or is_pydantic_model(py_type):
+            return object_schema(py_type, seen)
+        if py_type in JSON_TYPES:
+            return {"type": JSON_TYPES[py_type]}
+        for base, json_type in JSON_TYPES.items():
+            if issubclass(py_type, base):
+                return {"type": json_type}
+
+    return {"type": "string"}  # Default to string for unsupported types
+
+
+def is_strict_schema(schema: Any) -> bool:
+    """
+    Check that a schema meets OpenAI's strict mode: every object lists its properties,
+    requires all of them and allows no others.
+
+    Parameters:
+        schema (Any): The schema, or part of a schema, to check.
+
+    Returns:
+        bool: Whether the tool can be declared with `"strict": True`.
+    """
+    if isinstance(schema, list):
+        return all(is_strict_schema(item) for item in schema)
+    if not isinstance(schema, dict):
+        return True
+
+    if schema.get("type") == "object":
+        properties = schema.get("properties")
+        if properties is None or schema.get("additionalProperties") is not False:
+            return False
+        if set(schema.get("required", [])) != set(properties):
+            return False
+        if not all(is_strict_schema(value) for value in properties.values()):
+            return False
+
+    return is_strict_schema(schema.get("items")) and is_strict_schema(schema.get("anyOf", []))
+
+
+def build_tool_schema(func: Callable) -> Dict[str, Any]:
+    """
+    Create an OpenAI tool definition from a function, conforming to OpenAI's expected schema.
+
+    Parameters:
+        func (Callable): The function to create a tool definition for.
+
+    Returns:
+        Dict[str, Any]: A dictionary representing the tool definition.
+    """
+    signature = inspect.signature(func)
+    type_hints = get_type_hints(func)
+
+    parameters: Dict[str, Any] = {
+        "type": "object",
+        "properties": {},
+        "additionalProperties": False  # Ensure no additional properties are allowed
+    }
+
+    required_params = []
+
+    for param_name, param in signature.parameters.items():
+        param_schema = type_to_schema(type_hints.get(param_name, str))
+        param_schema["description"] = param_name
+
+        parameters["properties"][param_name] = param_schema
+
+        # Include all parameters in required when strict is True
+        required_params.append(param_name)
+
+    parameters["required"] = required_params
+
+    # Build the function definition
+    return {
+        "type": "function",
+        "function": {
+            "name": func.__name__,
+            "description": func.__doc__ or "",
+            "parameters": parameters,
+            "strict": is_strict_schema(parameters)
+        }
+    }
+
+
+@functools.lru_cache(maxsize=None)
+def field_types(py_type: type) -> Dict[str, Any]:
+    """
+    Return the field annotations of a dataclass, resolved once per class.
+    """
+    return get_type_hints(py_type)
+
+
+def convert_argument(value: Any, py_type: Any) -> Any:
+    """
+    Convert a value decoded from JSON to the type it is annotated with.
+
+    Parameters:
+        value (Any): The decoded value.
+        py_type (Any): The type annotation of the parameter or field.
+
+    Returns:
+        Any: The converted value; values of simple or unsupported types are returned as is.
+
+    Raises:
+        TypeError, ValueError: If the value doesn't fit the annotated type.
+    """
+    if value is None:
+        return None
+
+    origin = get_origin(py_type)
+    args = get_args(py_type)
+
+    if origin in UNION_TYPES:
+        # Use the first option the value converts to
+        for arg in args:
+            if arg is type(None):
+                continue
+            try:
+                return convert_argument(value, arg)
+            except (TypeError, ValueError):
+                continue
+        return value
+
+    if origin in SEQUENCE_TYPES:
+        if not isinstance(value, list):
+            raise TypeError(f"expected a list for {py_type}, got {type(value).__name__}")
+        if origin is tuple and args and args[-1] is not Ellipsis:
+            items = [convert_argument(item, arg) for item, arg in zip(value, args)]
+        else:
+            items = [convert_argument(item, args[0]) for item in value] if args else list(value)
+        if origin in (set, frozenset, tuple):
+            return origin(items)
+        if origin in (collections.abc.Set, collections.abc.MutableSet):
+            return set(items)
+        return items
+
+    if origin in (dict, collections.abc.Mapping, collections.abc.MutableMapping):
+        if not isinstance(value, dict):
+            raise TypeError(f"expected an object for {py_type}, got {type(value).__name__}")
+        if len(args) == 2:
+            return {key: convert_argument(item, args[1]) for key, item in value.items()}
+        return value
+
+    if isinstance(py_type, type):
+        if isinstance(value, py_type):
+            return value
+        if issubclass(py_type, Enum):
+            return py_type(value)
+        if is_pydantic_model(py_type):
+            validate = getattr(py_type, "model_validate", None) or py_type.parse_obj
+            return validate(value)
+        if dataclasses.is_dataclass(py_type):
+            if not isinstance(value, dict):
+                raise TypeError(f"expected an object for {py_type.__name__}, got {type(value).__name__}")
+            hints = field_types(py_type)
+            return py_type(**{name: convert_argument(item, hints.get(name, Any)) for name, item in value.items()})
+        if py_type is float and isinstance(value, int) and not isinstance(value, bool):
+            return float(value)
+
+    return value
+
+
+class ToolSchemaRegistry:
+    """
+    Builds the tool definition of each function once and keeps it as serialized JSON.
+
+    Entries are keyed by the function object itself, so two functions with the
+    same name never share a definition, and a function is only reflected over
+    the first time it is looked up.
+    """
+
+    def __init__(self):
+        self._schemas: Dict[Callable, bytes] = {}
+        self._type_hints: Dict[Callable, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def get_bytes(self, func: Callable) -> bytes:
+        """
+        Return the serialized tool definition of a function, building it on first use.
+
+        Parameters:
+            func (Callable): The tool function.
+
+        Returns:
+            bytes: The tool definition as UTF-8 encoded JSON.
+        """
+        schema = self._schemas.get(func)
+        if schema is not None:
+            return schema
+
+        # Built outside the lock; if two threads race, both produce the same bytes
+        schema = json.dumps(build_tool_schema(func), separators=(",", ":")).encode("utf-8")
+        with self._lock:
+            return self._schemas.setdefault(func, schema)
+
+    def get(self, func: Callable) -> Dict[str, Any]:
+        """
+        Return the tool definition of a function.
+
+        Parameters:
+            func (Callable): The tool function.
+
+        Returns:
+            Dict[str, Any]: A fresh copy of the tool definition that the caller may modify.
+        """
+        return json.loads(self.get_bytes(func))
+
+    def get_all(self, funcs: Iterable[Callable]) -> List[Dict[str, Any]]:
+        """
+        Return the tool definitions of several functions, in order.
+
+        Parameters:
+            funcs (Iterable[Callable]): The tool functions.
+
+        Returns:
+            List[Dict[str, Any]]: The tool definitions.
+        """
+        return [self.get(func) for func in funcs]
+
+    def convert_arguments(self, func: Callable, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Convert the JSON arguments of a tool call to the types the function is annotated with.
+
+        Parameters:
+            func (Callable): The tool function.
+            arguments (Dict[str, Any]): The arguments decoded from the tool call.
+
+        Returns:
+            Dict[str, Any]: The keyword arguments to call the function with.
+        """
+        hints = self._type_hints.get(func)
+        if hints is None:
+            hints = get_type_hints(func)
+            with self._lock:
+                hints = self._type_hints.setdefault(func, hints)
+
+        return {name: convert_argument(value, hints.get(name, Any)) for name, value in arguments.items()}
+
+    def __len__(self) -> int:
+        return len(self._schemas)
+
+    def clear(self):
+        """
+        Forget every cached definition, e.g. after a tool's signature changed.
+        """
+        with self._lock:
+            self._schemas.clear()
+            self._type_hints.clear()
+
+
+# Registry shared by every agent in the process
+tool_schemas = ToolSchemaRegistry()
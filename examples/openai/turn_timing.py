@@ -0,0 +1,104 @@
+"""
+Per-turn latency accounting for the example agents.
+
+Long-horizon agents run hundreds of turns, so both the synchronous (`run.py`) and
+the asyncio (`agent_async.py`) loops report how long each turn spent in the
+model, in supervision and in the tools. With the Asteroid-wrapped client,
+supervision of the tool calls returned by the model happens inside the wrapped
+`chat.completions.create` call. `ModelCallTimer` times the raw model call
+underneath the wrapper, so the rest of the wrapped call can be attributed to
+supervision.
+"""
+
+import inspect
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Optional
+
+# Maximum number of model calls in a single run of the chatbot
+DEFAULT_MAX_TURNS = 100
+
+
+@dataclass
+class TurnTimings:
+    """
+    Latency breakdown of one turn: a model call followed by the tool calls it asked for.
+    """
+    turn: int
+    model_seconds: float = 0.0
+    supervision_seconds: float = 0.0
+    tool_seconds: float = 0.0
+    tool_calls: int = 0
+
+    @property
+    def total_seconds(self) -> float:
+        return self.model_seconds + self.supervision_seconds + self.tool_seconds
+
+
+class ModelCallTimer:
+    """
+    Times the raw model call of an OpenAI or AsyncOpenAI client. Install it on the client before wrapping it.
+
+    The duration is kept in a context variable, so concurrent conversations on
+    threads or asyncio tasks each read back their own model call.
+    """
+
+    def __init__(self, client: Any):
+        """
+        Parameters:
+            client (Any): The unwrapped OpenAI or AsyncOpenAI client instance.
+        """
+        self._seconds: ContextVar[Optional[float]] = ContextVar("model_call_seconds", default=None)
+        create = client.chat.completions.create
+
+        if inspect.iscoroutinefunction(create):
+            async def timed_create(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return await create(*args, **kwargs)
+                finally:
+                    self._seconds.set(time.perf_counter() - start)
+        else:
+            def timed_create(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return create(*args, **kwargs)
+                finally:
+                    self._seconds.set(time.perf_counter() - start)
+
+        client.chat.completions.create = timed_create
+
+    def pop(self) -> Optional[float]:
+        """
+        Return and clear the duration of the last model call made in this context.
+
+        Returns:
+            Optional[float]: Seconds taken, or None if no call was timed.
+        """
+        seconds = self._seconds.get()
+        self._seconds.set(None)
+        return seconds
+
+    def record(self, timings: TurnTimings, elapsed: float):
+        """
+        Split the duration of a wrapped model call into model and supervision time.
+
+        Parameters:
+            timings (TurnTimings): The timings of the current turn.
+            elapsed (float): Seconds taken by the wrapped call.
+        """
+        model_seconds = self.pop()
+        timings.model_seconds = elapsed if model_seconds is None else model_seconds
+        timings.supervision_seconds = elapsed - timings.model_seconds
+
+
+def print_turn_timings(timings: TurnTimings):
+    """
+    Default turn hook that prints the latency breakdown of a turn.
+    """
+    print(
+        f"Turn {timings.turn}: model {timings.model_seconds:.2f}s, "
+        f"supervision {timings.supervision_seconds:.2f}s, "
+        f"tools {timings.tool_seconds:.2f}s ({timings.tool_calls} calls)"
+    )
@@ -12,8 +12,10 @@ import (
 )
 
 type Server struct {
-	Hub   *Hub
-	Store Store
+	Hub       *Hub
+	Store     Store
+	Processor *Processor
+	Decisions *DecisionCache
 }
 
 func sendErrorResponse(w http.ResponseWriter, status int, message string, details string) {
@@ -34,15 +36,17 @@ func InitAPI(store Store) {
 
 	humanReviewChan := make(chan SupervisionRequest, 100)
 
-	hub := NewHub(store, humanReviewChan)
-	go hub.Run()
-
 	processor := NewProcessor(store, humanReviewChan)
 	go processor.Start(context.Background())
 
+	hub := NewHub(store, humanReviewChan, processor)
+	go hub.Run()
+
 	server := Server{
-		Hub:   hub,
-		Store: store,
+		Hub:       hub,
+		Store:     store,
+		Processor: processor,
+		Decisions: hub.Decisions,
 	}
 
 	apiHandler := Handler(server)
@@ -78,8 +82,8 @@ func (s Server) CreateProject(w http.ResponseWriter, r *http.Request) {
 	apiCreateProjectHandler(w, r, s.Store)
 }
 
-func (s Server) GetProjects(w http.ResponseWriter, r *http.Request) {
-	apiGetProjectsHandler(w, r, s.Store)
+func (s Server) GetProjects(w http.ResponseWriter, r *http.Request, params GetProjectsParams) {
+	apiGetProjectsHandler(w, r, params, s.Store)
 }
 
 func (s Server) GetProject(w http.ResponseWriter, r *http.Request, id uuid.UUID) {
@@ -94,24 +98,28 @@ func (s Server) CreateRun(w http.ResponseWriter, r *http.Request, taskId uuid.UU
 	apiCreateRunHandler(w, r, taskId, s.Store)
 }
 
-func (s Server) GetProjectTasks(w http.ResponseWriter, r *http.Request, id uuid.UUID) {
-	apiGetProjectTasksHandler(w, r, id, s.Store)
+func (s Server) CreateTaskRuns(w http.ResponseWriter, r *http.Request, taskId uuid.UUID) {
+	apiCreateTaskRunsHandler(w, r, taskId, s.Store)
+}
+
+func (s Server) GetProjectTasks(w http.ResponseWriter, r *http.Request, id uuid.UUID, params GetProjectTasksParams) {
+	apiGetProjectTasksHandler(w, r, id, params, s.Store)
 }
 
 func (s Server) GetRun(w http.ResponseWriter, r *http.Request, id uuid.UUID) {
 	apiGetRunHandler(w, r, id, s.Store)
 }
 
-func (s Server) GetTaskRuns(w http.ResponseWriter, r *http.Request, id uuid.UUID) {
-	apiGetTaskRunsHandler(w, r, id, s.Store)
+func (s Server) GetTaskRuns(w http.ResponseWriter, r *http.Request, id uuid.UUID, params GetTaskRunsParams) {
+	apiGetTaskRunsHandler(w, r, id, params, s.Store)
 }
 
 func (s Server) GetTask(w http.ResponseWriter, r *http.Request, id uuid.UUID) {
 	apiGetTaskHandler(w, r, id, s.Store)
 }
 
-func (s Server) GetRunTools(w http.ResponseWriter, r *http.Request, id uuid.UUID) {
-	apiGetRunToolsHandler(w, r, id, s.Store)
+func (s Server) GetRunTools(w http.ResponseWriter, r *http.Request, id uuid.UUID, params GetRunToolsParams) {
+	apiGetRunToolsHandler(w, r, id, params, s.Store)
 }
 
 func (s Server) CreateRunTool(w http.ResponseWriter, r *http.Request, id uuid.UUID) {
@@ -130,20 +138,20 @@ func (s Server) GetSupervisor(w http.ResponseWriter, r *http.Request, id uuid.UU
 	apiGetSupervisorHandler(w, r, id, s.Store)
 }
 
-func (s Server) CreateToolSupervisorChains(w http.ResponseWriter, r *http.Request, toolId uuid.UUID) {
-	apiCreateToolSupervisorChainsHandler(w, r, toolId, s.Store)
+func (s Server) CreateToolSupervisorChains(w http.ResponseWriter, r *http.Request, toolId uuid.UUID, params CreateToolSupervisorChainsParams) {
+	apiCreateToolSupervisorChainsHandler(w, r, toolId, params, s.Store)
 }
 
-func (s Server) GetToolSupervisorChains(w http.ResponseWriter, r *http.Request, toolId uuid.UUID) {
-	apiGetToolSupervisorChainsHandler(w, r, toolId, s.Store)
+func (s Server) GetToolSupervisorChains(w http.ResponseWriter, r *http.Request, toolId uuid.UUID, params GetToolSupervisorChainsParams) {
+	apiGetToolSupervisorChainsHandler(w, r, toolId, params, s.Store)
 }
 
 func (s Server) GetToolCall(w http.ResponseWriter, r *http.Request, id uuid.UUID) {
 	apiGetToolCallHandler(w, r, id, s.Store)
 }
 
-func (s Server) GetProjectTools(w http.ResponseWriter, r *http.Request, id uuid.UUID) {
-	apiGetProjectToolsHandler(w, r, id, s.Store)
+func (s Server) GetProjectTools(w http.ResponseWriter, r *http.Request, id uuid.UUID, params GetProjectToolsParams) {
+	apiGetProjectToolsHandler(w, r, id, params, s.Store)
 }
 
 func (s Server) GetTool(w http.ResponseWriter, r *http.Request, id uuid.UUID) {
@@ -151,7 +159,7 @@ func (s Server) GetTool(w http.ResponseWriter, r *http.Request, id uuid.UUID) {
 }
 
 func (s Server) CreateSupervisionRequest(w http.ResponseWriter, r *http.Request, toolCallId uuid.UUID, chainId uuid.UUID, supervisorId uuid.UUID) {
-	apiCreateSupervisionRequestHandler(w, r, toolCallId, chainId, supervisorId, s.Store)
+	apiCreateSupervisionRequestHandler(w, r, toolCallId, chainId, supervisorId, s.Store, s.Processor, s.Decisions)
 }
 
 func (s Server) GetSupervisionRequestStatus(w http.ResponseWriter, r *http.Request, supervisionRequestId uuid.UUID) {
@@ -159,7 +167,19 @@ func (s Server) GetSupervisionRequestStatus(w http.ResponseWriter, r *http.Reque
 }
 
 func (s Server) CreateSupervisionResult(w http.ResponseWriter, r *http.Request, supervisionRequestId uuid.UUID) {
-	apiCreateSupervisionResultHandler(w, r, supervisionRequestId, s.Store)
+	apiCreateSupervisionResultHandler(w, r, supervisionRequestId, s.Store, s.Hub.ToolCallSubscriptions, s.Decisions)
+}
+
+func (s Server) CreateSupervisionRequests(w http.ResponseWriter, r *http.Request) {
+	apiCreateSupervisionRequestsHandler(w, r, s.Store, s.Processor, s.Decisions)
+}
+
+func (s Server) GetSupervisionRequestStatuses(w http.ResponseWriter, r *http.Request) {
+	apiGetSupervisionRequestStatusesHandler(w, r, s.Store)
+}
+
+func (s Server) CreateSupervisionResults(w http.ResponseWriter, r *http.Request) {
+	apiCreateSupervisionResultsHandler(w, r, s.Store, s.Hub.ToolCallSubscriptions, s.Decisions)
 }
 
 func (s Server) GetSupervisionResult(w http.ResponseWriter, r *http.Request, supervisionRequestId uuid.UUID) {
@@ -170,6 +190,14 @@ func (s Server) GetHubStats(w http.ResponseWriter, r *http.Request) {
 	apiGetHubStatsHandler(w, r, s.Hub)
 }
 
+func (s Server) GetProcessorStats(w http.ResponseWriter, r *http.Request) {
+	apiGetProcessorStatsHandler(w, r, s.Processor)
+}
+
+func (s Server) GetStoreStats(w http.ResponseWriter, r *http.Request) {
+	apiGetStoreStatsHandler(w, r, s.Store)
+}
+
 func (s Server) GetSupervisionReviewPayload(w http.ResponseWriter, r *http.Request, supervisionRequestId uuid.UUID) {
 	apiGetSupervisionReviewPayloadHandler(w, r, supervisionRequestId, s.Store)
 }
@@ -182,6 +210,10 @@ func (s Server) GetToolCallState(w http.ResponseWriter, r *http.Request, toolCal
 	apiGetToolCallStateHandler(w, r, toolCallId, s.Store)
 }
 
+func (s Server) StreamToolCallState(w http.ResponseWriter, r *http.Request, toolCallId string) {
+	apiStreamToolCallStateHandler(w, r, toolCallId, s.Store, s.Hub.ToolCallSubscriptions)
+}
+
 func (s Server) GetRunStatus(w http.ResponseWriter, r *http.Request, runId uuid.UUID) {
 	apiGetRunStatusHandler(w, r, runId, s.Store)
 }
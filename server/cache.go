@@ -0,0 +1,359 @@
+package asteroid
+
+import (
+	"container/list"
+	"context"
+	"log"
+	"os"
+	"slices"
+	"strconv"
+	"sync"
+
+	"github.com/google/uuid"
+)
+
+// Default number of entries kept in each entity cache of a CachedStore
+const DEFAULT_STORE_CACHE_SIZE = 10000
+
+// lruCache is a size-bounded map that evicts the least recently used entry when it is full
+type lruCache[K comparable, V any] struct {
+	name     string
+	capacity int
+
+	mu        sync.Mutex
+	entries   map[K]*list.Element
+	order     *list.List // most recently used at the front
+	hits      int64
+	misses    int64
+	evictions int64
+}
+
+type lruEntry[K comparable, V any] struct {
+	key   K
+	value V
+}
+
+func newLRUCache[K comparable, V any](name string, capacity int) *lruCache[K, V] {
+	return &lruCache[K, V]{
+		name:     name,
+		capacity: capacity,
+		entries:  make(map[K]*list.Element),
+		order:    list.New(),
+	}
+}
+
+func (c *lruCache[K, V]) get(key K) (V, bool) {
+	return c.getValid(key, nil)
+}
+
+// getValid is get for entries that can go stale. An entry that valid rejects is dropped, and the lookup
+// counts as a miss.
+func (c *lruCache[K, V]) getValid(key K, valid func(V) bool) (V, bool) {
+	c.mu.Lock()
+	defer c.mu.Unlock()
+
+	element, ok := c.entries[key]
+	if ok && valid != nil && !valid(element.Value.(*lruEntry[K, V]).value) {
+		c.order.Remove(element)
+		delete(c.entries, key)
+		ok = false
+	}
+	if !ok {
+		c.misses++
+		var zero V
+		return zero, false
+	}
+	c.hits++
+	c.order.MoveToFront(element)
+	return element.Value.(*lruEntry[K, V]).value, true
+}
+
+func (c *lruCache[K, V]) add(key K, value V) {
+	c.mu.Lock()
+	defer c.mu.Unlock()
+
+	if element, ok := c.entries[key]; ok {
+		element.Value.(*lruEntry[K, V]).value = value
+		c.order.MoveToFront(element)
+		return
+	}
+
+	c.entries[key] = c.order.PushFront(&lruEntry[K, V]{key: key, value: value})
+	if c.order.Len() > c.capacity {
+		oldest := c.order.Back()
+		c.order.Remove(oldest)
+		delete(c.entries, oldest.Value.(*lruEntry[K, V]).key)
+		c.evictions++
+	}
+}
+
+func (c *lruCache[K, V]) stats() CacheStats {
+	c.mu.Lock()
+	defer c.mu.Unlock()
+
+	stats := CacheStats{
+		Name:      c.name,
+		Size:      c.order.Len(),
+		Capacity:  c.capacity,
+		Hits:      c.hits,
+		Misses:    c.misses,
+		Evictions: c.evictions,
+	}
+	if lookups := c.hits + c.misses; lookups > 0 {
+		stats.HitRate = float64(c.hits) / float64(lookups)
+	}
+	return stats
+}
+
+func (c *lruCache[K, V]) remove(key K) {
+	c.mu.Lock()
+	defer c.mu.Unlock()
+
+	if element, ok := c.entries[key]; ok {
+		c.order.Remove(element)
+		delete(c.entries, key)
+	}
+}
+
+// readThrough returns the cached value for key, or loads it from the store and caches it. Callers get
+// their own deep copy of the value, made with copyValue, so changing it doesn't change what later
+// callers see. Lookups that find nothing aren't cached, because the entity may still be created.
+func readThrough[K comparable, V any](cache *lruCache[K, V], key K, copyValue func(V) V, load func() (*V, error)) (*V, error) {
+	if value, ok := cache.get(key); ok {
+		value = copyValue(value)
+		return &value, nil
+	}
+
+	loaded, err := load()
+	if err != nil || loaded == nil {
+		return loaded, err
+	}
+	cache.add(key, copyValue(*loaded))
+
+	return loaded, nil
+}
+
+func copyRef[T any](value *T) *T {
+	if value == nil {
+		return nil
+	}
+	copied := *value
+	return &copied
+}
+
+// copyJSONValue copies a value decoded from JSON, along with the maps and slices nested in it
+func copyJSONValue(value interface{}) interface{} {
+	switch v := value.(type) {
+	case map[string]interface{}:
+		return copyAttributes(v)
+	case []interface{}:
+		copied := make([]interface{}, len(v))
+		for i, item := range v {
+			copied[i] = copyJSONValue(item)
+		}
+		return copied
+	default:
+		return v
+	}
+}
+
+func copyAttributes(attributes map[string]interface{}) map[string]interface{} {
+	if attributes == nil {
+		return nil
+	}
+	copied := make(map[string]interface{}, len(attributes))
+	for key, value := range attributes {
+		copied[key] = copyJSONValue(value)
+	}
+	return copied
+}
+
+func copySupervisor(supervisor Supervisor) Supervisor {
+	supervisor.Attributes = copyAttributes(supervisor.Attributes)
+	supervisor.Id = copyRef(supervisor.Id)
+	supervisor.DecisionCacheTtlSeconds = copyRef(supervisor.DecisionCacheTtlSeconds)
+	return supervisor
+}
+
+func copySupervisorChain(chain SupervisorChain) SupervisorChain {
+	if chain.Supervisors != nil {
+		supervisors := make([]Supervisor, len(chain.Supervisors))
+		for i, supervisor := range chain.Supervisors {
+			supervisors[i] = copySupervisor(supervisor)
+		}
+		chain.Supervisors = supervisors
+	}
+	return chain
+}
+
+func copyTool(tool Tool) Tool {
+	tool.Attributes = copyAttributes(tool.Attributes)
+	tool.Id = copyRef(tool.Id)
+	if tool.IgnoredAttributes != nil {
+		ignored := slices.Clone(*tool.IgnoredAttributes)
+		tool.IgnoredAttributes = &ignored
+	}
+	return tool
+}
+
+func copyToolCall(toolCall AsteroidToolCall) AsteroidToolCall {
+	toolCall.Arguments = copyRef(toolCall.Arguments)
+	toolCall.CallId = copyRef(toolCall.CallId)
+	toolCall.CreatedAt = copyRef(toolCall.CreatedAt)
+	toolCall.Name = copyRef(toolCall.Name)
+	return toolCall
+}
+
+func copyProject(project Project) Project {
+	project.RunResultTags = slices.Clone(project.RunResultTags)
+	return project
+}
+
+func copyId(id uuid.UUID) uuid.UUID {
+	return id
+}
+
+type toolNameKey struct {
+	runId uuid.UUID
+	name  string
+}
+
+type chainToolCallKey struct {
+	chainId    uuid.UUID
+	toolCallId uuid.UUID
+}
+
+// CachedStore keeps the control-plane entities that never change once created (supervisors, supervisor
+// chains, tools, tool calls, projects and the chain execution of a tool call) in memory in front of
+// another store. Everything else goes straight to the wrapped store.
+type CachedStore struct {
+	Store
+
+	supervisors     *lruCache[uuid.UUID, Supervisor]
+	chains          *lruCache[uuid.UUID, SupervisorChain]
+	tools           *lruCache[uuid.UUID, Tool]
+	toolNames       *lruCache[toolNameKey, Tool]
+	toolCalls       *lruCache[uuid.UUID, AsteroidToolCall]
+	projects        *lruCache[uuid.UUID, Project]
+	projectNames    *lruCache[string, Project]
+	chainExecutions *lruCache[chainToolCallKey, uuid.UUID]
+}
+
+var _ StatsStore = &CachedStore{}
+
+// NewCachedStore wraps a store with entity caches of STORE_CACHE_SIZE entries each
+func NewCachedStore(store Store) *CachedStore {
+	size := DEFAULT_STORE_CACHE_SIZE
+	if value := os.Getenv("STORE_CACHE_SIZE"); value != "" {
+		parsed, err := strconv.Atoi(value)
+		if err != nil || parsed <= 0 {
+			log.Printf("Invalid STORE_CACHE_SIZE %q, using %d", value, DEFAULT_STORE_CACHE_SIZE)
+		} else {
+			size = parsed
+		}
+	}
+
+	return &CachedStore{
+		Store:           store,
+		supervisors:     newLRUCache[uuid.UUID, Supervisor]("supervisors", size),
+		chains:          newLRUCache[uuid.UUID, SupervisorChain]("supervisor_chains", size),
+		tools:           newLRUCache[uuid.UUID, Tool]("tools", size),
+		toolNames:       newLRUCache[toolNameKey, Tool]("tools_by_name", size),
+		toolCalls:       newLRUCache[uuid.UUID, AsteroidToolCall]("tool_calls", size),
+		projects:        newLRUCache[uuid.UUID, Project]("projects", size),
+		projectNames:    newLRUCache[string, Project]("projects_by_name", size),
+		chainExecutions: newLRUCache[chainToolCallKey, uuid.UUID]("chain_executions", size),
+	}
+}
+
+func (s *CachedStore) GetSupervisor(ctx context.Context, id uuid.UUID) (*Supervisor, error) {
+	return readThrough(s.supervisors, id, copySupervisor, func() (*Supervisor, error) {
+		return s.Store.GetSupervisor(ctx, id)
+	})
+}
+
+func (s *CachedStore) GetSupervisorChain(ctx context.Context, id uuid.UUID) (*SupervisorChain, error) {
+	return readThrough(s.chains, id, copySupervisorChain, func() (*SupervisorChain, error) {
+		return s.Store.GetSupervisorChain(ctx, id)
+	})
+}
+
+func (s *CachedStore) GetTool(ctx context.Context, id uuid.UUID) (*Tool, error) {
+	return readThrough(s.tools, id, copyTool, func() (*Tool, error) {
+		return s.Store.GetTool(ctx, id)
+	})
+}
+
+// CreateTool drops the run's cached tool of the same name, as the run may be registering a changed
+// definition under that name
+func (s *CachedStore) CreateTool(
+	ctx context.Context,
+	runId uuid.UUID,
+	attributes map[string]interface{},
+	name string,
+	description string,
+	ignoredAttributes []string,
+	code string,
+) (*Tool, error) {
+	tool, err := s.Store.CreateTool(ctx, runId, attributes, name, description, ignoredAttributes, code)
+	s.toolNames.remove(toolNameKey{runId: runId, name: name})
+	return tool, err
+}
+
+func (s *CachedStore) GetToolFromNameAndRunId(ctx context.Context, name string, runId uuid.UUID) (*Tool, error) {
+	return readThrough(s.toolNames, toolNameKey{runId: runId, name: name}, copyTool, func() (*Tool, error) {
+		return s.Store.GetToolFromNameAndRunId(ctx, name, runId)
+	})
+}
+
+func (s *CachedStore) GetToolCall(ctx context.Context, id uuid.UUID) (*AsteroidToolCall, error) {
+	return readThrough(s.toolCalls, id, copyToolCall, func() (*AsteroidToolCall, error) {
+		return s.Store.GetToolCall(ctx, id)
+	})
+}
+
+func (s *CachedStore) GetProject(ctx context.Context, id uuid.UUID) (*Project, error) {
+	return readThrough(s.projects, id, copyProject, func() (*Project, error) {
+		return s.Store.GetProject(ctx, id)
+	})
+}
+
+func (s *CachedStore) GetProjectFromName(ctx context.Context, name string) (*Project, error) {
+	return readThrough(s.projectNames, name, copyProject, func() (*Project, error) {
+		return s.Store.GetProjectFromName(ctx, name)
+	})
+}
+
+func (s *CachedStore) GetChainExecutionFromChainAndToolCall(ctx context.Context, chainId uuid.UUID, toolCallId uuid.UUID) (*uuid.UUID, error) {
+	key := chainToolCallKey{chainId: chainId, toolCallId: toolCallId}
+	return readThrough(s.chainExecutions, key, copyId, func() (*uuid.UUID, error) {
+		return s.Store.GetChainExecutionFromChainAndToolCall(ctx, chainId, toolCallId)
+	})
+}
+
+// Unwrap returns the store the caches are in front of
+func (s *CachedStore) Unwrap() Store {
+	return s.Store
+}
+
+// Stats reports the caches, together with the wrapped store's stats if it has any
+func (s *CachedStore) Stats() StoreStats {
+	var stats StoreStats
+	if statsStore, ok := s.Store.(StatsStore); ok {
+		stats = statsStore.Stats()
+	}
+
+	caches := []CacheStats{
+		s.supervisors.stats(),
+		s.chains.stats(),
+		s.tools.stats(),
+		s.toolNames.stats(),
+		s.toolCalls.stats(),
+		s.projects.stats(),
+		s.projectNames.stats(),
+		s.chainExecutions.stats(),
+	}
+	stats.Caches = &caches
+
+	return stats
+}
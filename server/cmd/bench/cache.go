@@ -0,0 +1,218 @@
+package main
+
+import (
+	"bytes"
+	"context"
+	"database/sql"
+	"database/sql/driver"
+	"encoding/json"
+	"flag"
+	"fmt"
+	"net/http"
+	"net/http/httptest"
+	"os"
+	"sync/atomic"
+	"time"
+
+	asteroid "github.com/asteroidai/asteroid/server"
+	"github.com/google/uuid"
+)
+
+// runCache counts the database round trips of creating a supervision request through the API, from the
+// handler's lookups to the processor handing the request to a reviewer, with and without the entity
+// caches in front of the store
+func runCache(args []string) error {
+	fs := flag.NewFlagSet("cache", flag.ExitOnError)
+	toolCalls := fs.Int("tool-calls", 200, "tool calls supervised in each pass")
+	supervisors := fs.Int("supervisors", 3, "supervisors in the chain, each gets a supervision request per tool call")
+	warmup := fs.Int("warmup", 10, "tool calls supervised before measuring")
+	if err := fs.Parse(args); err != nil {
+		return err
+	}
+
+	// Keep sweeps out of the measurements, every request is delivered through Enqueue
+	os.Setenv("SUPERVISION_SWEEP_INTERVAL", time.Hour.String())
+
+	var roundTrips atomic.Int64
+	store, err := openHookedStore(connHooks{
+		statement: func(context.Context, driver.QueryerContext, string, []driver.NamedValue) {
+			roundTrips.Add(1)
+		},
+		transaction: func(string) {
+			roundTrips.Add(1)
+		},
+	})
+	if err != nil {
+		return err
+	}
+	defer store.Close()
+
+	// Tool calls are inserted over a separate connection so they don't count as round trips
+	db, err := sql.Open("postgres", os.Getenv("DATABASE_URL"))
+	if err != nil {
+		return fmt.Errorf("error opening database: %w", err)
+	}
+	defer db.Close()
+
+	ctx := context.Background()
+	f, err := newFixture(ctx, store, "bench-cache", asteroid.HumanSupervisor)
+	if err != nil {
+		return fmt.Errorf("error creating fixture: %w", err)
+	}
+	supervisorIds, err := f.useChain(ctx, store, *supervisors, asteroid.HumanSupervisor)
+	if err != nil {
+		return fmt.Errorf("error creating chain: %w", err)
+	}
+
+	cached := asteroid.NewCachedStore(store)
+	passes := []struct {
+		name  string
+		store asteroid.Store
+	}{
+		{"uncached", store},
+		{"cached", cached},
+	}
+
+	for _, pass := range passes {
+		p := &supervisionPass{store: pass.store, db: db, f: f, supervisorIds: supervisorIds, roundTrips: &roundTrips}
+		if err := p.run(ctx, *warmup); err != nil {
+			return err
+		}
+		p.reset()
+		if err := p.run(ctx, *toolCalls); err != nil {
+			return err
+		}
+
+		requests := len(p.latencies)
+		fmt.Printf("\n%s: %d supervision requests, %d supervisors per chain\n", pass.name, requests, *supervisors)
+		fmt.Printf("  round trips: %.2f per supervision request\n", float64(p.trips)/float64(requests))
+		fmt.Printf("  request to assignment: %s\n", p.latencies)
+	}
+
+	fmt.Printf("\ncaches\n")
+	for _, c := range *cached.Stats().Caches {
+		fmt.Printf("  %-18s hit rate %5.1f%%  (%d hits, %d misses, %d entries)\n",
+			c.Name, 100*c.HitRate, c.Hits, c.Misses, c.Size)
+	}
+
+	return nil
+}
+
+// useChain replaces the fixture's chain with one of n new supervisors on the same tool, returned in
+// chain order
+func (f *fixture) useChain(ctx context.Context, store asteroid.Store, n int, supervisorType asteroid.SupervisorType) ([]uuid.UUID, error) {
+	supervisorIds := make([]uuid.UUID, 0, n)
+	for i := 0; i < n; i++ {
+		id, err := store.CreateSupervisor(ctx, asteroid.Supervisor{
+			Name:       fmt.Sprintf("bench-%d", i),
+			Type:       supervisorType,
+			CreatedAt:  time.Now(),
+			Attributes: map[string]interface{}{},
+		})
+		if err != nil {
+			return nil, err
+		}
+		supervisorIds = append(supervisorIds, id)
+	}
+
+	chainIds, err := store.CreateSupervisorChains(ctx, f.ToolId, f.RunId, []asteroid.ChainRequest{{SupervisorIds: &supervisorIds}})
+	if err != nil {
+		return nil, err
+	}
+	f.ChainId = chainIds[0]
+	f.SupervisorId = supervisorIds[0]
+	return supervisorIds, nil
+}
+
+// supervisionPass creates supervision requests through the API handler against one store
+type supervisionPass struct {
+	store         asteroid.Store
+	db            *sql.DB
+	f             *fixture
+	supervisorIds []uuid.UUID
+	roundTrips    *atomic.Int64
+
+	trips     int64
+	latencies latencies
+}
+
+func (p *supervisionPass) reset() {
+	p.trips = 0
+	p.latencies = nil
+}
+
+func (p *supervisionPass) run(ctx context.Context, toolCalls int) error {
+	reviews := make(chan asteroid.SupervisionRequest, 100)
+	processor := asteroid.NewProcessor(p.store, reviews)
+
+	ctx, cancel := context.WithCancel(ctx)
+	defer cancel()
+	go processor.Start(ctx)
+
+	server := httptest.NewServer(asteroid.Handler(asteroid.Server{Store: p.store, Processor: processor}))
+	defer server.Close()
+
+	for i := 0; i < toolCalls; i++ {
+		toolCallId, executionId, err := p.f.newToolCall(ctx, p.db)
+		if err != nil {
+			return err
+		}
+
+		for position, supervisorId := range p.supervisorIds {
+			before := p.roundTrips.Load()
+			start := time.Now()
+
+			id, err := p.createSupervisionRequest(server.URL, toolCallId, supervisorId, executionId, position)
+			if err != nil {
+				return err
+			}
+			if err := awaitReview(ctx, reviews, id, 10*time.Second); err != nil {
+				return err
+			}
+
+			p.latencies = append(p.latencies, time.Since(start))
+			p.trips += p.roundTrips.Load() - before
+
+			// Mark it assigned, as the hub would, so that it isn't picked up again by a later pass
+			status := asteroid.SupervisionStatus{Status: asteroid.Assigned, CreatedAt: time.Now(), SupervisionRequestId: &id}
+			if err := p.store.CreateSupervisionStatus(ctx, id, status); err != nil {
+				return fmt.Errorf("error marking supervision request assigned: %w", err)
+			}
+		}
+	}
+
+	return nil
+}
+
+func (p *supervisionPass) createSupervisionRequest(
+	baseURL string,
+	toolCallId uuid.UUID,
+	supervisorId uuid.UUID,
+	executionId uuid.UUID,
+	position int,
+) (uuid.UUID, error) {
+	body, _ := json.Marshal(asteroid.SupervisionRequest{
+		ChainexecutionId: &executionId,
+		SupervisorId:     supervisorId,
+		PositionInChain:  position,
+	})
+	url := fmt.Sprintf("%s/tool_call/%s/chain/%s/supervisor/%s/supervision_request", baseURL, toolCallId, p.f.ChainId, supervisorId)
+
+	resp, err := http.Post(url, "application/json", bytes.NewReader(body))
+	if err != nil {
+		return uuid.Nil, fmt.Errorf("error creating supervision request: %w", err)
+	}
+	defer resp.Body.Close()
+
+	if resp.StatusCode != http.StatusCreated {
+		var errorResponse asteroid.ErrorResponse
+		_ = json.NewDecoder(resp.Body).Decode(&errorResponse)
+		return uuid.Nil, fmt.Errorf("error creating supervision request: %s: %s", resp.Status, errorResponse.Error)
+	}
+
+	var id uuid.UUID
+	if err := json.NewDecoder(resp.Body).Decode(&id); err != nil {
+		return uuid.Nil, fmt.Errorf("error decoding supervision request ID: %w", err)
+	}
+	return id, nil
+}
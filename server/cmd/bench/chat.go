@@ -0,0 +1,149 @@
+package main
+
+import (
+	"context"
+	"encoding/json"
+	"flag"
+	"fmt"
+	"sync"
+	"time"
+
+	asteroid "github.com/asteroidai/asteroid/server"
+	"github.com/google/uuid"
+)
+
+// runChat measures how many chat turns per second CreateChatRequest can store, with every tool call
+// of a turn on a tool that has a supervisor chain so that chain executions are created too
+func runChat(args []string) error {
+	fs := flag.NewFlagSet("chat", flag.ExitOnError)
+	turns := fs.Int("turns", 2000, "chat turns to store")
+	concurrency := fs.Int("concurrency", 8, "turns stored at the same time")
+	choices := fs.Int("choices", 1, "choices per turn")
+	toolCalls := fs.Int("tool-calls", 2, "tool calls per choice")
+	requestMessages := fs.Int("request-messages", 0, "request messages stored with each turn")
+	if err := fs.Parse(args); err != nil {
+		return err
+	}
+
+	ctx := context.Background()
+	store, db, err := openDatabase()
+	if err != nil {
+		return err
+	}
+	defer store.Close()
+	defer db.Close()
+
+	f, err := newFixture(ctx, store, "bench-chat", asteroid.HumanSupervisor)
+	if err != nil {
+		return fmt.Errorf("error creating fixture: %w", err)
+	}
+
+	request, _ := json.Marshal(map[string]interface{}{
+		"model":    "bench",
+		"messages": []map[string]string{{"role": "user", "content": "What is the weather like?"}},
+	})
+	response, _ := json.Marshal(map[string]interface{}{"id": "chatcmpl-bench", "object": "chat.completion"})
+
+	jobs := make(chan struct{})
+	results := make(chan time.Duration, *turns)
+	errs := make(chan error, *concurrency)
+
+	var wg sync.WaitGroup
+	start := time.Now()
+	for i := 0; i < *concurrency; i++ {
+		wg.Add(1)
+		go func() {
+			defer wg.Done()
+			for range jobs {
+				chatChoices := benchChoices(f.ToolId, *choices, *toolCalls)
+				messages := benchMessages(*requestMessages)
+
+				turnStart := time.Now()
+				_, err := store.CreateChatRequest(ctx, f.RunId, request, response, chatChoices, "openai", messages)
+				if err != nil {
+					errs <- err
+					return
+				}
+				results <- time.Since(turnStart)
+			}
+		}()
+	}
+
+	for i := 0; i < *turns; i++ {
+		select {
+		case jobs <- struct{}{}:
+		case err := <-errs:
+			close(jobs)
+			wg.Wait()
+			return fmt.Errorf("error storing chat turn: %w", err)
+		}
+	}
+	close(jobs)
+	wg.Wait()
+	elapsed := time.Since(start)
+
+	select {
+	case err := <-errs:
+		return fmt.Errorf("error storing chat turn: %w", err)
+	default:
+	}
+	close(results)
+
+	stored := make(latencies, 0, *turns)
+	for d := range results {
+		stored = append(stored, d)
+	}
+
+	fmt.Printf("\n%d turns, %d choices x %d tool calls, %d request messages, concurrency %d\n",
+		len(stored), *choices, *toolCalls, *requestMessages, *concurrency)
+	fmt.Printf("  throughput: %.1f turns/s\n", float64(len(stored))/elapsed.Seconds())
+	fmt.Printf("  turn:       %s\n", stored)
+
+	return nil
+}
+
+// benchChoices builds the choices of one chat turn, with fresh IDs as the OpenAI converter assigns them
+func benchChoices(toolId uuid.UUID, choices int, toolCalls int) []asteroid.AsteroidChoice {
+	result := make([]asteroid.AsteroidChoice, 0, choices)
+	for i := 0; i < choices; i++ {
+		calls := make([]asteroid.AsteroidToolCall, 0, toolCalls)
+		for j := 0; j < toolCalls; j++ {
+			callId := "call_" + uuid.NewString()
+			name := "bench"
+			arguments := `{"location": "London"}`
+			calls = append(calls, asteroid.AsteroidToolCall{
+				Id:        uuid.New(),
+				CallId:    &callId,
+				ToolId:    toolId,
+				Name:      &name,
+				Arguments: &arguments,
+			})
+		}
+
+		messageId := uuid.New()
+		result = append(result, asteroid.AsteroidChoice{
+			AsteroidId:   uuid.NewString(),
+			FinishReason: asteroid.ToolCalls,
+			Index:        i,
+			Message: asteroid.AsteroidMessage{
+				Id:        &messageId,
+				Role:      asteroid.AsteroidMessageRoleAssistant,
+				ToolCalls: &calls,
+			},
+		})
+	}
+	return result
+}
+
+func benchMessages(n int) []asteroid.AsteroidMessage {
+	messages := make([]asteroid.AsteroidMessage, 0, n)
+	for i := 0; i < n; i++ {
+		id := uuid.New()
+		messages = append(messages, asteroid.AsteroidMessage{
+			Id:      &id,
+			Role:    asteroid.AsteroidMessageRoleUser,
+			Content: fmt.Sprintf("Message %d of the conversation so far", i),
+		})
+	}
+	return messages
+}
@@ -0,0 +1,203 @@
+package main
+
+import (
+	"bytes"
+	"compress/gzip"
+	"context"
+	"encoding/base64"
+	"encoding/json"
+	"flag"
+	"fmt"
+	"math/rand"
+	"net/http"
+	"net/http/httptest"
+	"runtime"
+	"strings"
+	"time"
+
+	asteroid "github.com/asteroidai/asteroid/server"
+	"github.com/google/uuid"
+)
+
+// chatFormatStore answers the only store calls CreateNewChat makes, from memory, so that the time
+// measured is the handler's own work on the chat rather than the database's
+type chatFormatStore struct {
+	asteroid.Store
+	tool asteroid.Tool
+}
+
+func (s *chatFormatStore) GetToolFromNameAndRunId(_ context.Context, _ string, _ uuid.UUID) (*asteroid.Tool, error) {
+	tool := s.tool
+	return &tool, nil
+}
+
+func (s *chatFormatStore) CreateChatRequest(
+	_ context.Context,
+	_ uuid.UUID,
+	_, _ []byte,
+	_ []asteroid.AsteroidChoice,
+	_ string,
+	_ []asteroid.AsteroidMessage,
+) (*uuid.UUID, error) {
+	id := uuid.New()
+	return &id, nil
+}
+
+type chatFormat struct {
+	name        string
+	contentType string
+	gzip        bool
+}
+
+var chatFormats = []chatFormat{
+	{"base64", "application/json", false},
+	{"base64+gzip", "application/json", true},
+	{"raw", asteroid.RAW_CHAT_CONTENT_TYPE, false},
+	{"raw+gzip", asteroid.RAW_CHAT_CONTENT_TYPE, true},
+}
+
+// runChatFormat compares the formats CreateNewChat accepts by the bytes a turn takes on the wire and
+// the server's time and allocations to handle it. No database needed.
+func runChatFormat(args []string) error {
+	fs := flag.NewFlagSet("chat-format", flag.ExitOnError)
+	turns := fs.Int("turns", 500, "chat turns sent in each format")
+	messages := fs.Int("messages", 40, "messages of conversation history sent with each turn")
+	messageWords := fs.Int("message-words", 120, "words per message")
+	toolCalls := fs.Int("tool-calls", 2, "tool calls in the response")
+	if err := fs.Parse(args); err != nil {
+		return err
+	}
+
+	runId := uuid.New()
+	toolId := uuid.New()
+	store := &chatFormatStore{tool: asteroid.Tool{Id: &toolId, RunId: runId, Name: "bench"}}
+	handler := asteroid.Handler(asteroid.Server{Store: store})
+
+	request, response := benchChatTurn(*messages, *messageWords, *toolCalls)
+	url := fmt.Sprintf("/run/%s/chat", runId)
+
+	fmt.Printf("\n%d turns per format, %d messages of %d words, %d tool calls\n", *turns, *messages, *messageWords, *toolCalls)
+	fmt.Printf("  %-12s %10s %10s  %s\n", "format", "bytes", "alloc", "server time")
+	for _, format := range chatFormats {
+		body, err := encodeChatTurn(format, request, response)
+		if err != nil {
+			return err
+		}
+
+		// Warm up, and check the server accepts the format
+		if err := postChatTurn(handler, url, format, body); err != nil {
+			return fmt.Errorf("%s: %w", format.name, err)
+		}
+
+		var before, after runtime.MemStats
+		runtime.GC()
+		runtime.ReadMemStats(&before)
+
+		handled := make(latencies, 0, *turns)
+		for i := 0; i < *turns; i++ {
+			start := time.Now()
+			if err := postChatTurn(handler, url, format, body); err != nil {
+				return fmt.Errorf("%s: %w", format.name, err)
+			}
+			handled = append(handled, time.Since(start))
+		}
+
+		runtime.ReadMemStats(&after)
+		alloc := (after.TotalAlloc - before.TotalAlloc) / uint64(*turns)
+
+		fmt.Printf("  %-12s %10d %10d  %s\n", format.name, len(body), alloc, handled)
+	}
+
+	return nil
+}
+
+func postChatTurn(handler http.Handler, url string, format chatFormat, body []byte) error {
+	r := httptest.NewRequest(http.MethodPost, url, bytes.NewReader(body))
+	r.Header.Set("Content-Type", format.contentType)
+	if format.gzip {
+		r.Header.Set("Content-Encoding", "gzip")
+	}
+
+	w := httptest.NewRecorder()
+	handler.ServeHTTP(w, r)
+	if w.Code != http.StatusOK {
+		return fmt.Errorf("error creating chat: %d: %s", w.Code, w.Body.String())
+	}
+	return nil
+}
+
+func encodeChatTurn(format chatFormat, request, response []byte) ([]byte, error) {
+	var body []byte
+	var err error
+	if format.contentType == asteroid.RAW_CHAT_CONTENT_TYPE {
+		body, err = json.Marshal(map[string]json.RawMessage{"request": request, "response": response})
+	} else {
+		body, err = json.Marshal(asteroid.AsteroidChat{
+			RequestData:  base64.StdEncoding.EncodeToString(request),
+			ResponseData: base64.StdEncoding.EncodeToString(response),
+		})
+	}
+	if err != nil || !format.gzip {
+		return body, err
+	}
+
+	var compressed bytes.Buffer
+	zw := gzip.NewWriter(&compressed)
+	if _, err := zw.Write(body); err != nil {
+		return nil, err
+	}
+	if err := zw.Close(); err != nil {
+		return nil, err
+	}
+	return compressed.Bytes(), nil
+}
+
+// benchChatTurn builds the JSON of a chat completion request carrying the conversation so far, and of
+// a response that calls tools, as the wrapped OpenAI client would upload them
+func benchChatTurn(messages int, words int, toolCalls int) ([]byte, []byte) {
+	vocabulary := strings.Fields(`the agent tool call result file search weather report user assistant
+		request response query data value error retry plan step check update list read write run task
+		model token output input summary context memory review approve reject reason because which`)
+	random := rand.New(rand.NewSource(1))
+	text := func() string {
+		var b strings.Builder
+		for i := 0; i < words; i++ {
+			if i > 0 {
+				b.WriteByte(' ')
+			}
+			b.WriteString(vocabulary[random.Intn(len(vocabulary))])
+		}
+		return b.String()
+	}
+
+	history := make([]map[string]interface{}, 0, messages)
+	for i := 0; i < messages; i++ {
+		role := "user"
+		if i%2 == 1 {
+			role = "assistant"
+		}
+		history = append(history, map[string]interface{}{"role": role, "content": text()})
+	}
+
+	calls := make([]map[string]interface{}, 0, toolCalls)
+	for i := 0; i < toolCalls; i++ {
+		calls = append(calls, map[string]interface{}{
+			"id":       fmt.Sprintf("call_%d", i),
+			"type":     "function",
+			"function": map[string]string{"name": "bench", "arguments": `{"location": "London"}`},
+		})
+	}
+
+	request, _ := json.Marshal(map[string]interface{}{"model": "bench", "messages": history})
+	response, _ := json.Marshal(map[string]interface{}{
+		"id":     "chatcmpl-bench",
+		"object": "chat.completion",
+		"model":  "bench",
+		"choices": []map[string]interface{}{{
+			"index":         0,
+			"finish_reason": "tool_calls",
+			"message":       map[string]interface{}{"role": "assistant", "content": text(), "tool_calls": calls},
+		}},
+	})
+	return request, response
+}
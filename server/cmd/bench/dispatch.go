@@ -0,0 +1,171 @@
+package main
+
+import (
+	"context"
+	"database/sql"
+	"flag"
+	"fmt"
+	"os"
+	"strconv"
+	"strings"
+	"time"
+
+	asteroid "github.com/asteroidai/asteroid/server"
+	database "github.com/asteroidai/asteroid/server/db"
+	"github.com/google/uuid"
+)
+
+// runDispatch measures the time from creating a human supervision request to the processor handing it
+// to the hub, with the request delivered as an event and with the sweep alone (the old polling loop),
+// at growing numbers of historical supervision requests.
+func runDispatch(args []string) error {
+	fs := flag.NewFlagSet("dispatch", flag.ExitOnError)
+	history := fs.String("history", "1000,100000", "comma-separated numbers of historical supervision requests to measure at")
+	samples := fs.Int("samples", 200, "supervision requests timed with event delivery at each history size")
+	pollSamples := fs.Int("poll-samples", 20, "supervision requests timed with the sweep alone at each history size")
+	pollInterval := fs.Duration("poll-interval", 2*time.Second, "sweep interval of the polling baseline")
+	if err := fs.Parse(args); err != nil {
+		return err
+	}
+
+	var sizes []int
+	for _, value := range strings.Split(*history, ",") {
+		size, err := strconv.Atoi(strings.TrimSpace(value))
+		if err != nil {
+			return fmt.Errorf("invalid history size %q: %w", value, err)
+		}
+		sizes = append(sizes, size)
+	}
+
+	ctx := context.Background()
+	store, db, err := openDatabase()
+	if err != nil {
+		return err
+	}
+	defer store.Close()
+	defer db.Close()
+
+	f, err := newFixture(ctx, store, "bench-dispatch", asteroid.HumanSupervisor)
+	if err != nil {
+		return fmt.Errorf("error creating fixture: %w", err)
+	}
+
+	seeded := 0
+	for _, size := range sizes {
+		fmt.Printf("seeding %d historical supervision requests...\n", size-seeded)
+		if err := f.seedHistory(ctx, db, size-seeded); err != nil {
+			return err
+		}
+		if size > seeded {
+			seeded = size
+		}
+
+		// A long sweep interval keeps sweeps out of the event measurements
+		event, err := measureDispatch(ctx, store, db, f, *samples, true, time.Hour)
+		if err != nil {
+			return err
+		}
+		poll, err := measureDispatch(ctx, store, db, f, *pollSamples, false, *pollInterval)
+		if err != nil {
+			return err
+		}
+		sweep, err := measureSweep(ctx, store, 10)
+		if err != nil {
+			return err
+		}
+
+		fmt.Printf("\nhistory %d supervision requests\n", seeded)
+		fmt.Printf("  request to assignment, event:  %s\n", event)
+		fmt.Printf("  request to assignment, sweep:  %s\n", poll)
+		fmt.Printf("  pending sweep query:           %s\n\n", sweep)
+	}
+
+	return nil
+}
+
+// measureDispatch creates supervision requests one at a time and times how long each takes to come out
+// of the processor on the human review channel
+func measureDispatch(
+	ctx context.Context,
+	store *database.PostgresqlStore,
+	db *sql.DB,
+	f *fixture,
+	samples int,
+	enqueue bool,
+	sweepInterval time.Duration,
+) (latencies, error) {
+	os.Setenv("SUPERVISION_SWEEP_INTERVAL", sweepInterval.String())
+
+	reviews := make(chan asteroid.SupervisionRequest, 100)
+	processor := asteroid.NewProcessor(store, reviews)
+
+	ctx, cancel := context.WithCancel(ctx)
+	defer cancel()
+	go processor.Start(ctx)
+
+	result := make(latencies, 0, samples)
+	for i := 0; i < samples; i++ {
+		toolCallId, executionId, err := f.newToolCall(ctx, db)
+		if err != nil {
+			return nil, err
+		}
+
+		request := asteroid.SupervisionRequest{
+			ChainexecutionId: &executionId,
+			SupervisorId:     f.SupervisorId,
+			PositionInChain:  0,
+		}
+
+		start := time.Now()
+		id, err := store.CreateSupervisionRequest(ctx, request, f.ChainId, toolCallId)
+		if err != nil {
+			return nil, fmt.Errorf("error creating supervision request: %w", err)
+		}
+		if enqueue {
+			request.Id = id
+			processor.Enqueue(ctx, request, asteroid.HumanSupervisor)
+		}
+
+		if err := awaitReview(ctx, reviews, *id, sweepInterval+10*time.Second); err != nil {
+			return nil, err
+		}
+		result = append(result, time.Since(start))
+
+		// Mark it assigned, as the hub would, so that later sweeps skip it
+		status := asteroid.SupervisionStatus{Status: asteroid.Assigned, CreatedAt: time.Now(), SupervisionRequestId: id}
+		if err := store.CreateSupervisionStatus(ctx, *id, status); err != nil {
+			return nil, fmt.Errorf("error marking supervision request assigned: %w", err)
+		}
+	}
+
+	return result, nil
+}
+
+func awaitReview(ctx context.Context, reviews chan asteroid.SupervisionRequest, id uuid.UUID, timeout time.Duration) error {
+	deadline := time.After(timeout)
+	for {
+		select {
+		case review := <-reviews:
+			if review.Id != nil && *review.Id == id {
+				return nil
+			}
+		case <-deadline:
+			return fmt.Errorf("supervision request was not dispatched within %s", timeout)
+		case <-ctx.Done():
+			return ctx.Err()
+		}
+	}
+}
+
+// measureSweep times the query the recovery sweep runs
+func measureSweep(ctx context.Context, store *database.PostgresqlStore, runs int) (latencies, error) {
+	result := make(latencies, 0, runs)
+	for i := 0; i < runs; i++ {
+		start := time.Now()
+		if _, err := store.GetSupervisionRequestsForStatus(ctx, asteroid.Pending); err != nil {
+			return nil, fmt.Errorf("error sweeping pending requests: %w", err)
+		}
+		result = append(result, time.Since(start))
+	}
+	return result, nil
+}
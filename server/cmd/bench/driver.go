@@ -0,0 +1,168 @@
+package main
+
+import (
+	"context"
+	"database/sql"
+	"database/sql/driver"
+	"fmt"
+	"os"
+
+	database "github.com/asteroidai/asteroid/server/db"
+	"github.com/lib/pq"
+)
+
+// connHooks observe what the store sends to Postgres
+type connHooks struct {
+	// statement is called before every statement runs, with the connection that is about to run it
+	statement func(ctx context.Context, conn driver.QueryerContext, query string, args []driver.NamedValue)
+	// transaction is called when a transaction begins, commits or rolls back
+	transaction func(event string)
+}
+
+// openHookedStore connects a store whose connections call the hooks
+func openHookedStore(hooks connHooks) (*database.PostgresqlStore, error) {
+	connector, err := pq.NewConnector(os.Getenv("DATABASE_URL"))
+	if err != nil {
+		return nil, fmt.Errorf("error creating connector: %w", err)
+	}
+
+	store, err := database.NewPostgresqlStoreWithDB(sql.OpenDB(hookConnector{connector, hooks}))
+	if err != nil {
+		return nil, fmt.Errorf("error connecting store: %w", err)
+	}
+	return store, nil
+}
+
+type hookConnector struct {
+	driver.Connector
+	hooks connHooks
+}
+
+func (c hookConnector) Connect(ctx context.Context) (driver.Conn, error) {
+	conn, err := c.Connector.Connect(ctx)
+	if err != nil {
+		return nil, err
+	}
+	return &hookConn{Conn: conn, hooks: c.hooks}, nil
+}
+
+type hookConn struct {
+	driver.Conn
+	hooks connHooks
+}
+
+func (c *hookConn) beforeStatement(ctx context.Context, query string, args []driver.NamedValue) {
+	if c.hooks.statement == nil {
+		return
+	}
+	if queryer, ok := c.Conn.(driver.QueryerContext); ok {
+		c.hooks.statement(ctx, queryer, query, args)
+	}
+}
+
+func (c *hookConn) onTransaction(event string) {
+	if c.hooks.transaction != nil {
+		c.hooks.transaction(event)
+	}
+}
+
+func (c *hookConn) QueryContext(ctx context.Context, query string, args []driver.NamedValue) (driver.Rows, error) {
+	queryer, ok := c.Conn.(driver.QueryerContext)
+	if !ok {
+		return nil, driver.ErrSkip
+	}
+	c.beforeStatement(ctx, query, args)
+	return queryer.QueryContext(ctx, query, args)
+}
+
+func (c *hookConn) ExecContext(ctx context.Context, query string, args []driver.NamedValue) (driver.Result, error) {
+	execer, ok := c.Conn.(driver.ExecerContext)
+	if !ok {
+		return nil, driver.ErrSkip
+	}
+	c.beforeStatement(ctx, query, args)
+	return execer.ExecContext(ctx, query, args)
+}
+
+// PrepareContext prepares a statement whose executions call the hooks like plain queries do
+func (c *hookConn) PrepareContext(ctx context.Context, query string) (driver.Stmt, error) {
+	var stmt driver.Stmt
+	var err error
+	if preparer, ok := c.Conn.(driver.ConnPrepareContext); ok {
+		stmt, err = preparer.PrepareContext(ctx, query)
+	} else {
+		stmt, err = c.Conn.Prepare(query)
+	}
+	if err != nil {
+		return nil, err
+	}
+	return &hookStmt{Stmt: stmt, conn: c, query: query}, nil
+}
+
+func (c *hookConn) BeginTx(ctx context.Context, opts driver.TxOptions) (driver.Tx, error) {
+	var tx driver.Tx
+	var err error
+	if beginner, ok := c.Conn.(driver.ConnBeginTx); ok {
+		tx, err = beginner.BeginTx(ctx, opts)
+	} else {
+		tx, err = c.Conn.Begin()
+	}
+	if err != nil {
+		return nil, err
+	}
+	c.onTransaction("begin")
+	return &hookTx{Tx: tx, conn: c}, nil
+}
+
+func (c *hookConn) Ping(ctx context.Context) error {
+	if pinger, ok := c.Conn.(driver.Pinger); ok {
+		return pinger.Ping(ctx)
+	}
+	return nil
+}
+
+func (c *hookConn) CheckNamedValue(value *driver.NamedValue) error {
+	if checker, ok := c.Conn.(driver.NamedValueChecker); ok {
+		return checker.CheckNamedValue(value)
+	}
+	return driver.ErrSkip
+}
+
+type hookStmt struct {
+	driver.Stmt
+	conn  *hookConn
+	query string
+}
+
+func (s *hookStmt) QueryContext(ctx context.Context, args []driver.NamedValue) (driver.Rows, error) {
+	queryer, ok := s.Stmt.(driver.StmtQueryContext)
+	if !ok {
+		return nil, fmt.Errorf("driver statement does not take a context")
+	}
+	s.conn.beforeStatement(ctx, s.query, args)
+	return queryer.QueryContext(ctx, args)
+}
+
+func (s *hookStmt) ExecContext(ctx context.Context, args []driver.NamedValue) (driver.Result, error) {
+	execer, ok := s.Stmt.(driver.StmtExecContext)
+	if !ok {
+		return nil, fmt.Errorf("driver statement does not take a context")
+	}
+	s.conn.beforeStatement(ctx, s.query, args)
+	return execer.ExecContext(ctx, args)
+}
+
+type hookTx struct {
+	driver.Tx
+	conn *hookConn
+}
+
+func (t *hookTx) Commit() error {
+	t.conn.onTransaction("commit")
+	return t.Tx.Commit()
+}
+
+func (t *hookTx) Rollback() error {
+	t.conn.onTransaction("rollback")
+	return t.Tx.Rollback()
+}
@@ -0,0 +1,623 @@
+package main
+
+import (
+	"context"
+	"database/sql"
+	"database/sql/driver"
+	"encoding/json"
+	"flag"
+	"fmt"
+	"io"
+	"os"
+	"sort"
+	"strings"
+	"sync"
+	"sync/atomic"
+	"time"
+
+	asteroid "github.com/asteroidai/asteroid/server"
+	database "github.com/asteroidai/asteroid/server/db"
+	"github.com/google/uuid"
+)
+
+// runExplain loads a dataset of about a million rows, calls the store's methods against it and checks
+// the plan of every statement they send, failing if any of them scans a large table sequentially
+func runExplain(args []string) error {
+	fs := flag.NewFlagSet("explain", flag.ExitOnError)
+	projects := fs.Int("projects", 100, "projects to seed, each with about 9,400 rows below it")
+	minRows := fs.Float64("min-rows", 10000, "tables with at least this many rows must not be scanned sequentially")
+	verbose := fs.Bool("v", false, "print the plan of every statement")
+	if err := fs.Parse(args); err != nil {
+		return err
+	}
+
+	ctx := context.Background()
+	db, err := sql.Open("postgres", os.Getenv("DATABASE_URL"))
+	if err != nil {
+		return fmt.Errorf("error opening database: %w", err)
+	}
+	defer db.Close()
+
+	plans := &planLog{plans: make(map[string]*statementPlan)}
+	store, err := openHookedStore(connHooks{statement: plans.explain})
+	if err != nil {
+		return err
+	}
+	defer store.Close()
+
+	fmt.Printf("seeding %d projects...\n", *projects)
+	start := time.Now()
+	s, err := seedExplain(ctx, db, *projects)
+	if err != nil {
+		return err
+	}
+	if _, err := db.ExecContext(ctx, `ANALYZE`); err != nil {
+		return fmt.Errorf("error analyzing: %w", err)
+	}
+	fmt.Printf("seeded in %s\n", time.Since(start).Round(time.Second))
+
+	sizes, err := tableSizes(ctx, db)
+	if err != nil {
+		return err
+	}
+
+	// A failed operation stops the run, but the plans recorded up to it are still reported
+	var opErr error
+	plans.recording.Store(true)
+	for _, op := range explainOperations(s) {
+		plans.setOperation(op.name)
+		if err := op.run(ctx, store); err != nil {
+			opErr = fmt.Errorf("%s: %w", op.name, err)
+			break
+		}
+	}
+	plans.recording.Store(false)
+
+	violations := plans.report(os.Stdout, sizes, *minRows, *verbose)
+	if opErr != nil {
+		return opErr
+	}
+	if violations > 0 {
+		return fmt.Errorf("%d statements scan a table of %.0f or more rows sequentially", violations, *minRows)
+	}
+	return nil
+}
+
+// explainSample holds IDs from one seeded tool call and everything above it
+type explainSample struct {
+	ProjectId    uuid.UUID
+	ProjectName  string
+	TaskId       uuid.UUID
+	RunId        uuid.UUID
+	ToolId       uuid.UUID
+	ToolName     string
+	ChainId      uuid.UUID
+	SupervisorId uuid.UUID
+	MessageId    uuid.UUID
+	ToolCallId   uuid.UUID
+	CallId       string
+	ExecutionId  uuid.UUID
+	RequestId    uuid.UUID
+}
+
+// seedExplain inserts the dataset in one transaction. Every project has 10 tasks of 10 runs, every run
+// 2 tools with a single-supervisor chain each and 5 chat turns, and every turn calls both tools. Every
+// tool call has a supervision request, of which one in 20 is left pending and the rest are completed.
+func seedExplain(ctx context.Context, db *sql.DB, projects int) (*explainSample, error) {
+	tx, err := db.BeginTx(ctx, nil)
+	if err != nil {
+		return nil, fmt.Errorf("error starting transaction: %w", err)
+	}
+	defer func() {
+		_ = tx.Rollback()
+	}()
+
+	prefix := fmt.Sprintf("explain-%d-", time.Now().UnixNano())
+	statements := []string{
+		fmt.Sprintf(`CREATE TEMP TABLE seed_project ON COMMIT DROP AS
+			SELECT gen_random_uuid() AS id, i FROM generate_series(1, %d) i`, projects),
+		fmt.Sprintf(`INSERT INTO project (id, name, created_at)
+			SELECT id, '%s' || i, now() - i * interval '1 minute' FROM seed_project`, prefix),
+
+		`CREATE TEMP TABLE seed_task ON COMMIT DROP AS
+			SELECT gen_random_uuid() AS id, p.id AS project_id, g.n AS i FROM seed_project p, generate_series(1, 10) g(n)`,
+		`INSERT INTO task (id, project_id, name, created_at)
+			SELECT id, project_id, 'task-' || i, now() - i * interval '1 minute' FROM seed_task`,
+
+		`CREATE TEMP TABLE seed_run ON COMMIT DROP AS
+			SELECT gen_random_uuid() AS id, t.id AS task_id, g.n AS i FROM seed_task t, generate_series(1, 10) g(n)`,
+		`INSERT INTO run (id, task_id, created_at)
+			SELECT id, task_id, now() - i * interval '1 minute' FROM seed_run`,
+
+		`CREATE TEMP TABLE seed_supervisor ON COMMIT DROP AS
+			SELECT gen_random_uuid() AS id, i FROM generate_series(0, 9) i`,
+		`INSERT INTO supervisor (id, name, type)
+			SELECT id, 'supervisor-' || i, CASE WHEN i % 2 = 0 THEN 'human_supervisor' ELSE 'client_supervisor' END
+			FROM seed_supervisor`,
+
+		`CREATE TEMP TABLE seed_tool ON COMMIT DROP AS
+			SELECT gen_random_uuid() AS id, gen_random_uuid() AS chain_id, s.id AS supervisor_id, r.id AS run_id, g.n AS i
+			FROM seed_run r
+			CROSS JOIN generate_series(1, 2) g(n)
+			JOIN seed_supervisor s ON s.i = (r.i + g.n) % 10`,
+		`INSERT INTO tool (id, run_id, project_id, name, description)
+			SELECT t.id, t.run_id, ta.project_id, 'tool-' || t.i, 'Seeded tool'
+			FROM seed_tool t
+			JOIN seed_run r ON r.id = t.run_id
+			JOIN seed_task ta ON ta.id = r.task_id`,
+		`INSERT INTO run_tool (run_id, tool_id) SELECT run_id, id FROM seed_tool`,
+		`INSERT INTO chain (id) SELECT chain_id FROM seed_tool`,
+		`INSERT INTO chain_tool (tool_id, chain_id) SELECT id, chain_id FROM seed_tool`,
+		`INSERT INTO run_tool_chain (run_id, tool_id, chain_id) SELECT run_id, id, chain_id FROM seed_tool`,
+		`INSERT INTO chain_supervisor (supervisor_id, chain_id, position_in_chain)
+			SELECT supervisor_id, chain_id, 0 FROM seed_tool`,
+
+		`CREATE TEMP TABLE seed_chat ON COMMIT DROP AS
+			SELECT gen_random_uuid() AS id, gen_random_uuid() AS choice_id, gen_random_uuid() AS msg_id, r.id AS run_id, g.n AS i
+			FROM seed_run r, generate_series(1, 5) g(n)`,
+		`INSERT INTO chat (id, run_id, created_at)
+			SELECT id, run_id, now() - i * interval '1 minute' FROM seed_chat`,
+		`INSERT INTO choice (id, chat_id) SELECT choice_id, id FROM seed_chat`,
+		`INSERT INTO msg (id, choice_id, msg_data)
+			SELECT msg_id, choice_id, '{"role": "assistant"}' FROM seed_chat`,
+
+		`CREATE TEMP TABLE seed_toolcall ON COMMIT DROP AS
+			SELECT gen_random_uuid() AS id, gen_random_uuid() AS execution_id, gen_random_uuid() AS request_id,
+				c.msg_id, t.id AS tool_id, t.chain_id, t.supervisor_id
+			FROM seed_chat c
+			JOIN seed_tool t ON t.run_id = c.run_id`,
+		`INSERT INTO toolcall (id, call_id, tool_id, msg_id)
+			SELECT id, 'call_' || id, tool_id, msg_id FROM seed_toolcall`,
+		`INSERT INTO chainexecution (id, toolcall_id, chain_id)
+			SELECT execution_id, id, chain_id FROM seed_toolcall`,
+		`INSERT INTO supervisionrequest (id, chainexecution_id, supervisor_id, position_in_chain)
+			SELECT request_id, execution_id, supervisor_id, 0 FROM seed_toolcall`,
+		`INSERT INTO supervisionrequest_status (supervisionrequest_id, status)
+			SELECT request_id, 'pending' FROM seed_toolcall`,
+		`INSERT INTO supervisionrequest_status (supervisionrequest_id, status)
+			SELECT request_id, 'completed' FROM seed_toolcall WHERE abs(hashtext(id::text)) % 20 <> 0`,
+		`INSERT INTO supervisionrequest_current_status (supervisionrequest_id, status_id, status, created_at)
+			SELECT DISTINCT ON (ss.supervisionrequest_id) ss.supervisionrequest_id, ss.id, ss.status, ss.created_at
+			FROM supervisionrequest_status ss
+			JOIN seed_toolcall t ON t.request_id = ss.supervisionrequest_id
+			ORDER BY ss.supervisionrequest_id, ss.id DESC`,
+		`INSERT INTO supervisionresult (supervisionrequest_id, decision, reasoning)
+			SELECT request_id, 'approve', 'Seeded' FROM seed_toolcall WHERE abs(hashtext(id::text)) % 20 <> 0`,
+	}
+	for _, statement := range statements {
+		if _, err := tx.ExecContext(ctx, statement); err != nil {
+			return nil, fmt.Errorf("error seeding: %w\n%s", err, statement)
+		}
+	}
+
+	var s explainSample
+	err = tx.QueryRowContext(ctx, `
+		SELECT p.id, p.name, ta.id, r.id, tl.id, tl.name, tc.chain_id, tc.supervisor_id, tc.msg_id,
+			tc.id, 'call_' || tc.id, tc.execution_id, tc.request_id
+		FROM seed_toolcall tc
+		JOIN tool tl ON tl.id = tc.tool_id
+		JOIN run r ON r.id = tl.run_id
+		JOIN task ta ON ta.id = r.task_id
+		JOIN project p ON p.id = ta.project_id
+		ORDER BY random()
+		LIMIT 1`).Scan(
+		&s.ProjectId, &s.ProjectName, &s.TaskId, &s.RunId, &s.ToolId, &s.ToolName, &s.ChainId, &s.SupervisorId,
+		&s.MessageId, &s.ToolCallId, &s.CallId, &s.ExecutionId, &s.RequestId,
+	)
+	if err != nil {
+		return nil, fmt.Errorf("error sampling seeded rows: %w", err)
+	}
+
+	if err := tx.Commit(); err != nil {
+		return nil, fmt.Errorf("error committing seed: %w", err)
+	}
+
+	return &s, nil
+}
+
+func tableSizes(ctx context.Context, db *sql.DB) (map[string]float64, error) {
+	rows, err := db.QueryContext(ctx, `
+		SELECT relname, reltuples FROM pg_class
+		WHERE relkind = 'r' AND relnamespace = 'public'::regnamespace`)
+	if err != nil {
+		return nil, fmt.Errorf("error getting table sizes: %w", err)
+	}
+	defer rows.Close()
+
+	sizes := make(map[string]float64)
+	for rows.Next() {
+		var name string
+		var size float64
+		if err := rows.Scan(&name, &size); err != nil {
+			return nil, fmt.Errorf("error scanning table size: %w", err)
+		}
+		sizes[name] = size
+	}
+	return sizes, rows.Err()
+}
+
+type explainOperation struct {
+	name string
+	run  func(ctx context.Context, store *database.PostgresqlStore) error
+}
+
+// explainOperations calls every store method on the sampled rows. Reads come first so that they run
+// against the seeded data only.
+func explainOperations(s *explainSample) []explainOperation {
+	now := time.Now()
+	page := asteroid.Page{Limit: 50}
+	cursor := &asteroid.Cursor{CreatedAt: &now, Id: uuid.Nil}
+	var requestId *uuid.UUID
+
+	return []explainOperation{
+		{"GetProject", func(ctx context.Context, store *database.PostgresqlStore) error {
+			_, err := store.GetProject(ctx, s.ProjectId)
+			return err
+		}},
+		{"GetProjectFromName", func(ctx context.Context, store *database.PostgresqlStore) error {
+			_, err := store.GetProjectFromName(ctx, s.ProjectName)
+			return err
+		}},
+		{"GetProjects", func(ctx context.Context, store *database.PostgresqlStore) error {
+			return store.GetProjects(ctx, asteroid.Page{After: cursor, Limit: 50}, func(asteroid.Project) error { return nil })
+		}},
+		{"GetProjectTasks", func(ctx context.Context, store *database.PostgresqlStore) error {
+			return store.GetProjectTasks(ctx, s.ProjectId, page, func(asteroid.Task) error { return nil })
+		}},
+		{"GetProjectTools", func(ctx context.Context, store *database.PostgresqlStore) error {
+			return store.GetProjectTools(ctx, s.ProjectId, page, func(asteroid.Tool) error { return nil })
+		}},
+		{"GetTask", func(ctx context.Context, store *database.PostgresqlStore) error {
+			_, err := store.GetTask(ctx, s.TaskId)
+			return err
+		}},
+		{"GetRuns", func(ctx context.Context, store *database.PostgresqlStore) error {
+			_, err := store.GetRuns(ctx, s.TaskId)
+			return err
+		}},
+		{"GetTaskRuns", func(ctx context.Context, store *database.PostgresqlStore) error {
+			return store.GetTaskRuns(ctx, s.TaskId, page, func(asteroid.Run) error { return nil })
+		}},
+		{"GetRun", func(ctx context.Context, store *database.PostgresqlStore) error {
+			_, err := store.GetRun(ctx, s.RunId)
+			return err
+		}},
+		{"GetRunTools", func(ctx context.Context, store *database.PostgresqlStore) error {
+			return store.GetRunTools(ctx, s.RunId, page, func(asteroid.Tool) error { return nil })
+		}},
+		{"GetTool", func(ctx context.Context, store *database.PostgresqlStore) error {
+			_, err := store.GetTool(ctx, s.ToolId)
+			return err
+		}},
+		{"GetToolFromNameAndRunId", func(ctx context.Context, store *database.PostgresqlStore) error {
+			_, err := store.GetToolFromNameAndRunId(ctx, s.ToolName, s.RunId)
+			return err
+		}},
+		{"GetSupervisor", func(ctx context.Context, store *database.PostgresqlStore) error {
+			_, err := store.GetSupervisor(ctx, s.SupervisorId)
+			return err
+		}},
+		{"GetSupervisors", func(ctx context.Context, store *database.PostgresqlStore) error {
+			_, err := store.GetSupervisors(ctx, s.ProjectId)
+			return err
+		}},
+		{"GetSupervisorChains", func(ctx context.Context, store *database.PostgresqlStore) error {
+			_, err := store.GetSupervisorChains(ctx, s.ToolId, &s.RunId)
+			return err
+		}},
+		{"GetSupervisorChain", func(ctx context.Context, store *database.PostgresqlStore) error {
+			_, err := store.GetSupervisorChain(ctx, s.ChainId)
+			return err
+		}},
+		{"GetToolCall", func(ctx context.Context, store *database.PostgresqlStore) error {
+			_, err := store.GetToolCall(ctx, s.ToolCallId)
+			return err
+		}},
+		{"GetToolCallFromCallId", func(ctx context.Context, store *database.PostgresqlStore) error {
+			_, err := store.GetToolCallFromCallId(ctx, s.CallId)
+			return err
+		}},
+		{"GetChainExecutionsFromToolCall", func(ctx context.Context, store *database.PostgresqlStore) error {
+			_, err := store.GetChainExecutionsFromToolCall(ctx, s.ToolCallId)
+			return err
+		}},
+		{"GetExecutionFromChainId", func(ctx context.Context, store *database.PostgresqlStore) error {
+			_, err := store.GetExecutionFromChainId(ctx, s.ChainId)
+			return err
+		}},
+		{"GetChainExecution", func(ctx context.Context, store *database.PostgresqlStore) error {
+			_, _, err := store.GetChainExecution(ctx, s.ExecutionId)
+			return err
+		}},
+		{"GetChainExecutionFromChainAndToolCall", func(ctx context.Context, store *database.PostgresqlStore) error {
+			_, err := store.GetChainExecutionFromChainAndToolCall(ctx, s.ChainId, s.ToolCallId)
+			return err
+		}},
+		{"GetChainExecutionState", func(ctx context.Context, store *database.PostgresqlStore) error {
+			_, err := store.GetChainExecutionState(ctx, s.ExecutionId)
+			return err
+		}},
+		{"GetToolCallChainExecutionStates", func(ctx context.Context, store *database.PostgresqlStore) error {
+			_, err := store.GetToolCallChainExecutionStates(ctx, s.ToolCallId)
+			return err
+		}},
+		{"GetSupervisionRequest", func(ctx context.Context, store *database.PostgresqlStore) error {
+			_, err := store.GetSupervisionRequest(ctx, s.RequestId)
+			return err
+		}},
+		{"GetChainExecutionSupervisionRequests", func(ctx context.Context, store *database.PostgresqlStore) error {
+			_, err := store.GetChainExecutionSupervisionRequests(ctx, s.ExecutionId)
+			return err
+		}},
+		{"GetSupervisionRequestStatus", func(ctx context.Context, store *database.PostgresqlStore) error {
+			_, err := store.GetSupervisionRequestStatus(ctx, s.RequestId)
+			return err
+		}},
+		{"GetSupervisionResultFromRequestID", func(ctx context.Context, store *database.PostgresqlStore) error {
+			_, err := store.GetSupervisionResultFromRequestID(ctx, s.RequestId)
+			return err
+		}},
+		{"GetSupervisionRequestsForStatus", func(ctx context.Context, store *database.PostgresqlStore) error {
+			_, err := store.GetSupervisionRequestsForStatus(ctx, asteroid.Pending)
+			return err
+		}},
+		{"CountSupervisionRequests", func(ctx context.Context, store *database.PostgresqlStore) error {
+			_, err := store.CountSupervisionRequests(ctx, asteroid.Pending)
+			return err
+		}},
+		{"ClaimSupervisionRequests", func(ctx context.Context, store *database.PostgresqlStore) error {
+			_, err := store.ClaimSupervisionRequests(ctx, "bench-explain", 10, time.Second)
+			return err
+		}},
+		{"ClaimSupervisionRequest", func(ctx context.Context, store *database.PostgresqlStore) error {
+			_, err := store.ClaimSupervisionRequest(ctx, "bench-explain", s.RequestId, time.Second)
+			return err
+		}},
+		{"RenewSupervisionRequestLeases", func(ctx context.Context, store *database.PostgresqlStore) error {
+			_, err := store.RenewSupervisionRequestLeases(ctx, "bench-explain", []uuid.UUID{s.RequestId}, time.Second)
+			return err
+		}},
+		{"ReleaseSupervisionRequestLeases", func(ctx context.Context, store *database.PostgresqlStore) error {
+			return store.ReleaseSupervisionRequestLeases(ctx, "bench-explain", []uuid.UUID{s.RequestId})
+		}},
+		{"GetChat", func(ctx context.Context, store *database.PostgresqlStore) error {
+			_, _, err := store.GetChat(ctx, s.RunId, 1)
+			return err
+		}},
+		{"GetRunChatCount", func(ctx context.Context, store *database.PostgresqlStore) error {
+			_, err := store.GetRunChatCount(ctx, s.RunId)
+			return err
+		}},
+		{"GetMessage", func(ctx context.Context, store *database.PostgresqlStore) error {
+			_, err := store.GetMessage(ctx, s.MessageId)
+			return err
+		}},
+
+		{"CreateProject", func(ctx context.Context, store *database.PostgresqlStore) error {
+			return store.CreateProject(ctx, asteroid.Project{
+				Id: uuid.New(), Name: s.ProjectName + "-new", CreatedAt: now, RunResultTags: []string{},
+			})
+		}},
+		{"CreateTask", func(ctx context.Context, store *database.PostgresqlStore) error {
+			_, err := store.CreateTask(ctx, asteroid.Task{ProjectId: s.ProjectId, Name: "task-new", CreatedAt: now})
+			return err
+		}},
+		{"CreateRun", func(ctx context.Context, store *database.PostgresqlStore) error {
+			_, err := store.CreateRun(ctx, asteroid.Run{TaskId: s.TaskId, CreatedAt: now})
+			return err
+		}},
+		{"CreateTool", func(ctx context.Context, store *database.PostgresqlStore) error {
+			_, err := store.CreateTool(ctx, s.RunId, map[string]interface{}{}, "tool-new", "", nil, "")
+			return err
+		}},
+		{"CreateSupervisor", func(ctx context.Context, store *database.PostgresqlStore) error {
+			_, err := store.CreateSupervisor(ctx, asteroid.Supervisor{
+				Name: "supervisor-new", Type: asteroid.HumanSupervisor, CreatedAt: now, Attributes: map[string]interface{}{},
+			})
+			return err
+		}},
+		{"CreateSupervisorChains", func(ctx context.Context, store *database.PostgresqlStore) error {
+			supervisorIds := []uuid.UUID{s.SupervisorId}
+			_, err := store.CreateSupervisorChains(ctx, s.ToolId, s.RunId, []asteroid.ChainRequest{{SupervisorIds: &supervisorIds}})
+			return err
+		}},
+		{"CreateChatRequest", func(ctx context.Context, store *database.PostgresqlStore) error {
+			request := []byte(`{"model": "explain", "messages": [{"role": "user", "content": "Hello"}]}`)
+			_, err := store.CreateChatRequest(
+				ctx, s.RunId, request, []byte(`{}`), benchChoices(s.ToolId, 1, 2), "openai", benchMessages(2),
+			)
+			return err
+		}},
+		{"UpdateMessage", func(ctx context.Context, store *database.PostgresqlStore) error {
+			return store.UpdateMessage(ctx, s.MessageId, asteroid.AsteroidMessage{
+				Id: &s.MessageId, Role: asteroid.AsteroidMessageRoleAssistant,
+			})
+		}},
+		{"UpdateRunStatus", func(ctx context.Context, store *database.PostgresqlStore) error {
+			return store.UpdateRunStatus(ctx, s.RunId, asteroid.Completed)
+		}},
+		{"UpdateRunResult", func(ctx context.Context, store *database.PostgresqlStore) error {
+			return store.UpdateRunResult(ctx, s.RunId, "success")
+		}},
+		{"CreateSupervisionRequest", func(ctx context.Context, store *database.PostgresqlStore) (err error) {
+			requestId, err = store.CreateSupervisionRequest(ctx, asteroid.SupervisionRequest{
+				ChainexecutionId: &s.ExecutionId,
+				SupervisorId:     s.SupervisorId,
+				PositionInChain:  1,
+			}, s.ChainId, s.ToolCallId)
+			return err
+		}},
+		{"CreateSupervisionStatus", func(ctx context.Context, store *database.PostgresqlStore) error {
+			return store.CreateSupervisionStatus(ctx, *requestId, asteroid.SupervisionStatus{
+				Status: asteroid.Completed, CreatedAt: now, SupervisionRequestId: requestId,
+			})
+		}},
+		{"CreateSupervisionResult", func(ctx context.Context, store *database.PostgresqlStore) error {
+			_, err := store.CreateSupervisionResult(ctx, asteroid.SupervisionResult{
+				Decision: asteroid.Approve, Reasoning: "explain", CreatedAt: now, SupervisionRequestId: *requestId,
+			}, *requestId)
+			return err
+		}},
+	}
+}
+
+// planLog records the plan of every statement sent while recording is on, by statement text
+type planLog struct {
+	recording atomic.Bool
+
+	mu        sync.Mutex
+	operation string
+	plans     map[string]*statementPlan
+}
+
+type statementPlan struct {
+	query      string
+	operations map[string]bool
+	plan       json.RawMessage
+	seqScans   []string
+	err        error
+}
+
+type planNode struct {
+	NodeType     string     `json:"Node Type"`
+	RelationName string     `json:"Relation Name"`
+	Plans        []planNode `json:"Plans"`
+}
+
+func (n planNode) seqScans() []string {
+	var tables []string
+	if n.NodeType == "Seq Scan" {
+		tables = append(tables, n.RelationName)
+	}
+	for _, child := range n.Plans {
+		tables = append(tables, child.seqScans()...)
+	}
+	return tables
+}
+
+func (l *planLog) setOperation(name string) {
+	l.mu.Lock()
+	defer l.mu.Unlock()
+	l.operation = name
+}
+
+// explainable reports whether a statement is one EXPLAIN accepts
+func explainable(query string) bool {
+	fields := strings.Fields(query)
+	if len(fields) == 0 {
+		return false
+	}
+	switch strings.ToUpper(fields[0]) {
+	case "SELECT", "INSERT", "UPDATE", "DELETE", "WITH":
+		return true
+	}
+	return false
+}
+
+// explain plans a statement on the connection that is about to run it, so that statements inside a
+// transaction see the transaction's writes. EXPLAIN without ANALYZE doesn't execute the statement.
+func (l *planLog) explain(ctx context.Context, queryer driver.QueryerContext, query string, args []driver.NamedValue) {
+	if !l.recording.Load() || !explainable(query) {
+		return
+	}
+
+	l.mu.Lock()
+	p, ok := l.plans[query]
+	if !ok {
+		p = &statementPlan{query: query, operations: make(map[string]bool)}
+		l.plans[query] = p
+	}
+	p.operations[l.operation] = true
+	l.mu.Unlock()
+	if ok {
+		return
+	}
+
+	plan, err := explainQuery(ctx, queryer, query, args)
+	if err != nil {
+		p.err = err
+		return
+	}
+
+	var root []struct {
+		Plan planNode `json:"Plan"`
+	}
+	if err := json.Unmarshal(plan, &root); err != nil || len(root) == 0 {
+		p.err = fmt.Errorf("error parsing plan: %v", err)
+		return
+	}
+	p.plan = plan
+	p.seqScans = root[0].Plan.seqScans()
+}
+
+func explainQuery(ctx context.Context, queryer driver.QueryerContext, query string, args []driver.NamedValue) (json.RawMessage, error) {
+	rows, err := queryer.QueryContext(ctx, "EXPLAIN (FORMAT JSON) "+query, args)
+	if err != nil {
+		return nil, err
+	}
+	defer rows.Close()
+
+	dest := make([]driver.Value, len(rows.Columns()))
+	if err := rows.Next(dest); err != nil {
+		return nil, err
+	}
+	switch plan := dest[0].(type) {
+	case []byte:
+		return append(json.RawMessage(nil), plan...), nil
+	case string:
+		return json.RawMessage(plan), nil
+	default:
+		return nil, fmt.Errorf("unexpected plan type %T", dest[0])
+	}
+}
+
+// report prints every statement with the operations that sent it and returns how many of them scan a
+// large table sequentially or couldn't be planned
+func (l *planLog) report(w io.Writer, sizes map[string]float64, minRows float64, verbose bool) int {
+	l.mu.Lock()
+	defer l.mu.Unlock()
+
+	plans := make([]*statementPlan, 0, len(l.plans))
+	for _, p := range l.plans {
+		plans = append(plans, p)
+	}
+	sort.Slice(plans, func(i, j int) bool { return plans[i].query < plans[j].query })
+
+	violations := 0
+	for _, p := range plans {
+		operations := make([]string, 0, len(p.operations))
+		for name := range p.operations {
+			operations = append(operations, name)
+		}
+		sort.Strings(operations)
+
+		var problems []string
+		if p.err != nil {
+			problems = append(problems, fmt.Sprintf("could not be planned: %v", p.err))
+		}
+		for _, table := range p.seqScans {
+			if sizes[table] >= minRows {
+				problems = append(problems, fmt.Sprintf("sequential scan on %s (%.0f rows)", table, sizes[table]))
+			}
+		}
+
+		status := "ok  "
+		if len(problems) > 0 {
+			status = "FAIL"
+			violations++
+		}
+		fmt.Fprintf(w, "%s %s\n", status, strings.Join(operations, ", "))
+		for _, problem := range problems {
+			fmt.Fprintf(w, "       %s\n", problem)
+		}
+		if verbose || len(problems) > 0 {
+			fmt.Fprintf(w, "       %s\n", strings.Join(strings.Fields(p.query), " "))
+		}
+		if verbose && p.plan != nil {
+			fmt.Fprintf(w, "       %s\n", p.plan)
+		}
+	}
+
+	fmt.Fprintf(w, "\n%d statements checked, %d failed\n", len(plans), violations)
+	return violations
+}
@@ -0,0 +1,154 @@
+package main
+
+import (
+	"context"
+	"database/sql"
+	"fmt"
+	"sort"
+	"time"
+
+	asteroid "github.com/asteroidai/asteroid/server"
+	"github.com/google/uuid"
+)
+
+// fixture is a project with one run, one tool and a single-supervisor chain on that tool
+type fixture struct {
+	ProjectId    uuid.UUID
+	RunId        uuid.UUID
+	ToolId       uuid.UUID
+	SupervisorId uuid.UUID
+	ChainId      uuid.UUID
+}
+
+func newFixture(ctx context.Context, store asteroid.Store, name string, supervisorType asteroid.SupervisorType) (*fixture, error) {
+	now := time.Now()
+	f := &fixture{ProjectId: uuid.New()}
+
+	err := store.CreateProject(ctx, asteroid.Project{
+		Id:            f.ProjectId,
+		Name:          fmt.Sprintf("%s-%d", name, now.UnixNano()),
+		CreatedAt:     now,
+		RunResultTags: []string{"success", "failure"},
+	})
+	if err != nil {
+		return nil, err
+	}
+
+	taskId, err := store.CreateTask(ctx, asteroid.Task{ProjectId: f.ProjectId, Name: name, CreatedAt: now})
+	if err != nil {
+		return nil, err
+	}
+
+	f.RunId, err = store.CreateRun(ctx, asteroid.Run{TaskId: *taskId, CreatedAt: now})
+	if err != nil {
+		return nil, err
+	}
+
+	tool, err := store.CreateTool(ctx, f.RunId, map[string]interface{}{}, name, name, nil, "")
+	if err != nil {
+		return nil, err
+	}
+	f.ToolId = *tool.Id
+
+	f.SupervisorId, err = store.CreateSupervisor(ctx, asteroid.Supervisor{
+		Name:       name,
+		Type:       supervisorType,
+		CreatedAt:  now,
+		Attributes: map[string]interface{}{},
+	})
+	if err != nil {
+		return nil, err
+	}
+
+	supervisorIds := []uuid.UUID{f.SupervisorId}
+	chainIds, err := store.CreateSupervisorChains(ctx, f.ToolId, f.RunId, []asteroid.ChainRequest{{SupervisorIds: &supervisorIds}})
+	if err != nil {
+		return nil, err
+	}
+	f.ChainId = chainIds[0]
+
+	return f, nil
+}
+
+// newToolCall inserts a tool call on the fixture's tool together with its chain execution
+func (f *fixture) newToolCall(ctx context.Context, db *sql.DB) (uuid.UUID, uuid.UUID, error) {
+	toolCallId, executionId := uuid.New(), uuid.New()
+
+	_, err := db.ExecContext(ctx, `
+		INSERT INTO toolcall (id, call_id, tool_id, tool_call_data)
+		VALUES ($1, $2, $3, '{}')`, toolCallId, "call_"+toolCallId.String(), f.ToolId)
+	if err != nil {
+		return uuid.Nil, uuid.Nil, fmt.Errorf("error inserting tool call: %w", err)
+	}
+
+	_, err = db.ExecContext(ctx, `
+		INSERT INTO chainexecution (id, toolcall_id, chain_id)
+		VALUES ($1, $2, $3)`, executionId, toolCallId, f.ChainId)
+	if err != nil {
+		return uuid.Nil, uuid.Nil, fmt.Errorf("error inserting chain execution: %w", err)
+	}
+
+	return toolCallId, executionId, nil
+}
+
+// seedHistory inserts n supervision requests that went through pending, assigned and completed
+func (f *fixture) seedHistory(ctx context.Context, db *sql.DB, n int) error {
+	if n <= 0 {
+		return nil
+	}
+
+	_, executionId, err := f.newToolCall(ctx, db)
+	if err != nil {
+		return err
+	}
+
+	_, err = db.ExecContext(ctx, `
+		INSERT INTO supervisionrequest (id, chainexecution_id, supervisor_id, position_in_chain)
+		SELECT gen_random_uuid(), $1, $2, 0 FROM generate_series(1, $3)`, executionId, f.SupervisorId, n)
+	if err != nil {
+		return fmt.Errorf("error seeding supervision requests: %w", err)
+	}
+
+	// One statement per status so that status IDs increase in the order the statuses were reached
+	for _, status := range []asteroid.Status{asteroid.Pending, asteroid.Assigned, asteroid.Completed} {
+		_, err = db.ExecContext(ctx, `
+			INSERT INTO supervisionrequest_status (supervisionrequest_id, status)
+			SELECT id, $2 FROM supervisionrequest WHERE chainexecution_id = $1`, executionId, status)
+		if err != nil {
+			return fmt.Errorf("error seeding %s statuses: %w", status, err)
+		}
+	}
+
+	_, err = db.ExecContext(ctx, `
+		INSERT INTO supervisionrequest_current_status (supervisionrequest_id, status_id, status, created_at)
+		SELECT DISTINCT ON (ss.supervisionrequest_id) ss.supervisionrequest_id, ss.id, ss.status, ss.created_at
+		FROM supervisionrequest_status ss
+		JOIN supervisionrequest sr ON sr.id = ss.supervisionrequest_id
+		WHERE sr.chainexecution_id = $1
+		ORDER BY ss.supervisionrequest_id, ss.id DESC`, executionId)
+	if err != nil {
+		return fmt.Errorf("error seeding current statuses: %w", err)
+	}
+
+	return nil
+}
+
+// latencies summarises a set of durations
+type latencies []time.Duration
+
+func (l latencies) percentile(p float64) time.Duration {
+	if len(l) == 0 {
+		return 0
+	}
+	sorted := append(latencies(nil), l...)
+	sort.Slice(sorted, func(i, j int) bool { return sorted[i] < sorted[j] })
+	return sorted[int(p*float64(len(sorted)-1))]
+}
+
+func (l latencies) String() string {
+	return fmt.Sprintf("p50 %8s  p99 %8s  max %8s  (n=%d)",
+		l.percentile(0.5).Round(10*time.Microsecond),
+		l.percentile(0.99).Round(10*time.Microsecond),
+		l.percentile(1).Round(10*time.Microsecond),
+		len(l))
+}
@@ -0,0 +1,155 @@
+package main
+
+import (
+	"bytes"
+	"context"
+	"encoding/json"
+	"flag"
+	"fmt"
+	"net/http"
+	"net/http/httptest"
+	"time"
+
+	asteroid "github.com/asteroidai/asteroid/server"
+	database "github.com/asteroidai/asteroid/server/db"
+	"github.com/google/uuid"
+)
+
+// runHandlers times each step of a tool call going through the API handlers, from uploading the chat
+// turn that makes the call to reading the call's state once it is decided. With -store memory the
+// handlers run on the in-memory store, which gives the cost of the server's own work as a baseline
+// for the same steps run with -store postgres.
+func runHandlers(args []string) error {
+	fs := flag.NewFlagSet("handlers", flag.ExitOnError)
+	storeKind := fs.String("store", "memory", "store the handlers run on: memory, or postgres to use DATABASE_URL")
+	turns := fs.Int("turns", 500, "chat turns sent")
+	messages := fs.Int("messages", 10, "messages of conversation history sent with each turn")
+	messageWords := fs.Int("message-words", 50, "words per message")
+	toolCalls := fs.Int("tool-calls", 2, "tool calls in each turn, each supervised and decided")
+	if err := fs.Parse(args); err != nil {
+		return err
+	}
+
+	var store asteroid.Store
+	switch *storeKind {
+	case "memory":
+		store = database.NewMemoryStore()
+	case "postgres":
+		postgres, db, err := openDatabase()
+		if err != nil {
+			return err
+		}
+		defer postgres.Close()
+		defer db.Close()
+		store = postgres
+	default:
+		return fmt.Errorf("unknown store %q, use memory or postgres", *storeKind)
+	}
+	store = asteroid.NewCachedStore(store)
+
+	ctx := context.Background()
+	// The tool calls made by benchChatTurn are of a tool named bench. A client supervisor's requests
+	// aren't queued, so the processor doesn't need to be running.
+	f, err := newFixture(ctx, store, "bench", asteroid.ClientSupervisor)
+	if err != nil {
+		return fmt.Errorf("error creating fixture: %w", err)
+	}
+
+	reviews := make(chan asteroid.SupervisionRequest, 100)
+	processor := asteroid.NewProcessor(store, reviews)
+	hub := asteroid.NewHub(store, reviews, processor)
+	handler := asteroid.Handler(asteroid.Server{Hub: hub, Store: store, Processor: processor, Decisions: hub.Decisions})
+
+	request, response := benchChatTurn(*messages, *messageWords, *toolCalls)
+	chatBody, err := encodeChatTurn(chatFormat{contentType: asteroid.RAW_CHAT_CONTENT_TYPE}, request, response)
+	if err != nil {
+		return err
+	}
+	requestBody, _ := json.Marshal(asteroid.SupervisionRequest{SupervisorId: f.SupervisorId})
+
+	chats := make(latencies, 0, *turns)
+	requests := make(latencies, 0, *turns**toolCalls)
+	results := make(latencies, 0, *turns**toolCalls)
+	states := make(latencies, 0, *turns**toolCalls)
+
+	start := time.Now()
+	for i := 0; i < *turns; i++ {
+		var chatIds asteroid.ChatIds
+		elapsed, err := benchRequest(handler, http.MethodPost, fmt.Sprintf("/run/%s/chat", f.RunId), asteroid.RAW_CHAT_CONTENT_TYPE, chatBody, &chatIds)
+		if err != nil {
+			return fmt.Errorf("error creating chat: %w", err)
+		}
+		chats = append(chats, elapsed)
+
+		for _, choice := range chatIds.ChoiceIds {
+			for _, ids := range choice.ToolCallIds {
+				if ids.ToolCallId == nil {
+					return fmt.Errorf("chat %s returned a tool call without an ID", chatIds.ChatId)
+				}
+				toolCallId := *ids.ToolCallId
+
+				var requestId uuid.UUID
+				url := fmt.Sprintf("/tool_call/%s/chain/%s/supervisor/%s/supervision_request", toolCallId, f.ChainId, f.SupervisorId)
+				elapsed, err := benchRequest(handler, http.MethodPost, url, "application/json", requestBody, &requestId)
+				if err != nil {
+					return fmt.Errorf("error creating supervision request: %w", err)
+				}
+				requests = append(requests, elapsed)
+
+				resultBody, _ := json.Marshal(asteroid.SupervisionResult{
+					CreatedAt:            time.Now(),
+					Decision:             asteroid.Approve,
+					Reasoning:            "bench",
+					SupervisionRequestId: requestId,
+				})
+				url = fmt.Sprintf("/supervision_request/%s/result", requestId)
+				elapsed, err = benchRequest(handler, http.MethodPost, url, "application/json", resultBody, nil)
+				if err != nil {
+					return fmt.Errorf("error creating supervision result: %w", err)
+				}
+				results = append(results, elapsed)
+
+				elapsed, err = benchRequest(handler, http.MethodGet, fmt.Sprintf("/tool_call/%s/state", toolCallId), "", nil, nil)
+				if err != nil {
+					return fmt.Errorf("error getting tool call state: %w", err)
+				}
+				states = append(states, elapsed)
+			}
+		}
+	}
+	total := time.Since(start)
+
+	fmt.Printf("\n%s store, %d turns of %d messages of %d words, %d tool calls each, in %s\n",
+		*storeKind, *turns, *messages, *messageWords, *toolCalls, total.Round(time.Millisecond))
+	fmt.Printf("  chat turn:           %s\n", chats)
+	fmt.Printf("  supervision request: %s\n", requests)
+	fmt.Printf("  supervision result:  %s\n", results)
+	fmt.Printf("  tool call state:     %s\n", states)
+
+	return nil
+}
+
+// benchRequest sends a request to the handler, decoding the response into out unless it is nil, and
+// returns the time the handler took
+func benchRequest(handler http.Handler, method string, url string, contentType string, body []byte, out interface{}) (time.Duration, error) {
+	r := httptest.NewRequest(method, url, bytes.NewReader(body))
+	if contentType != "" {
+		r.Header.Set("Content-Type", contentType)
+	}
+	w := httptest.NewRecorder()
+
+	start := time.Now()
+	handler.ServeHTTP(w, r)
+	elapsed := time.Since(start)
+
+	if w.Code < 200 || w.Code > 299 {
+		return 0, fmt.Errorf("%s %s: %d: %s", method, url, w.Code, w.Body.String())
+	}
+	if out != nil {
+		if err := json.Unmarshal(w.Body.Bytes(), out); err != nil {
+			return 0, fmt.Errorf("error decoding response of %s %s: %w", method, url, err)
+		}
+	}
+
+	return elapsed, nil
+}
@@ -0,0 +1,87 @@
+// Command bench runs performance scenarios against a scratch Postgres database, or in memory for the
+// scenarios that say so.
+//
+// The database is taken from DATABASE_URL and must already have the schema from db/init loaded. The
+// migrations in db/migrations are applied when the store connects.
+// Scenarios write their own fixtures and leave them behind, so don't point this at a database
+// you care about.
+//
+// Usage:
+//
+//	go run ./cmd/bench <scenario> [flags]
+package main
+
+import (
+	"database/sql"
+	"fmt"
+	"log"
+	"os"
+	"sort"
+	"strings"
+
+	database "github.com/asteroidai/asteroid/server/db"
+	_ "github.com/lib/pq"
+)
+
+type scenario struct {
+	description string
+	run         func(args []string) error
+}
+
+var scenarios = map[string]scenario{
+	"cache":       {"database round trips per supervision request with and without the entity caches", runCache},
+	"chat":        {"chat turns per second stored by CreateChatRequest", runChat},
+	"chat-format": {"bytes on the wire and server time per chat turn in each CreateNewChat format, no database needed", runChatFormat},
+	"dispatch":    {"latency from creating a supervision request to handing it to a reviewer", runDispatch},
+	"explain":     {"check that no store query scans a large table sequentially", runExplain},
+	"handlers":    {"handler time per step of a supervised tool call, on the in-memory store unless -store postgres", runHandlers},
+	"scheduler":   {"simulated reviewers taking reviews from the hub's scheduler, no database needed", runScheduler},
+}
+
+func usage() {
+	names := make([]string, 0, len(scenarios))
+	for name := range scenarios {
+		names = append(names, name)
+	}
+	sort.Strings(names)
+
+	var b strings.Builder
+	fmt.Fprintf(&b, "Usage: go run ./cmd/bench <scenario> [flags]\n\nScenarios:\n")
+	for _, name := range names {
+		fmt.Fprintf(&b, "  %-12s %s\n", name, scenarios[name].description)
+	}
+	fmt.Fprintf(&b, "\nRun a scenario with -h to see its flags.\n")
+	fmt.Fprint(os.Stderr, b.String())
+}
+
+func main() {
+	if len(os.Args) < 2 {
+		usage()
+		os.Exit(2)
+	}
+
+	s, ok := scenarios[os.Args[1]]
+	if !ok {
+		usage()
+		os.Exit(2)
+	}
+
+	if err := s.run(os.Args[2:]); err != nil {
+		log.Fatalf("%s: %v", os.Args[1], err)
+	}
+}
+
+// openDatabase connects both the store under test and a raw connection used to seed fixtures
+func openDatabase() (*database.PostgresqlStore, *sql.DB, error) {
+	store, err := database.NewPostgresqlStore()
+	if err != nil {
+		return nil, nil, fmt.Errorf("error connecting store: %w", err)
+	}
+
+	db, err := sql.Open("postgres", os.Getenv("DATABASE_URL"))
+	if err != nil {
+		return nil, nil, fmt.Errorf("error opening database: %w", err)
+	}
+
+	return store, db, nil
+}
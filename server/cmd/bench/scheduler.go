@@ -0,0 +1,330 @@
+package main
+
+import (
+	"flag"
+	"fmt"
+	"math/rand"
+	"strconv"
+	"strings"
+	"sync"
+	"sync/atomic"
+	"time"
+
+	asteroid "github.com/asteroidai/asteroid/server"
+	"github.com/google/uuid"
+)
+
+// runScheduler simulates thousands of reviewers taking reviews from the hub's scheduler at a high request
+// rate, some of them over slow connections, and compares it with the hub's previous first-fit assignment.
+// It doesn't need a database.
+func runScheduler(args []string) error {
+	fs := flag.NewFlagSet("scheduler", flag.ExitOnError)
+	reviewers := fs.Int("reviewers", 2000, "virtual reviewers")
+	rate := fs.Int("rate", 20000, "supervision requests per second")
+	duration := fs.Duration("duration", 5*time.Second, "how long requests are submitted for")
+	capacities := fs.String("capacity", "4,8,16", "comma-separated capacities, assigned to reviewers in turn")
+	reviewTime := fs.Duration("review-time", 200*time.Millisecond, "mean time a reviewer takes over a review")
+	writeTime := fs.Duration("write-time", 100*time.Microsecond, "time to write a review to a reviewer's connection")
+	slow := fs.Float64("slow", 0.01, "fraction of reviewers with a slow connection")
+	slowWriteTime := fs.Duration("slow-write-time", 50*time.Millisecond, "time to write a review over a slow connection")
+	sweepInterval := fs.Duration("sweep-interval", time.Second, "how often the first-fit baseline retries reviews no reviewer took")
+	if err := fs.Parse(args); err != nil {
+		return err
+	}
+
+	var caps []int
+	for _, value := range strings.Split(*capacities, ",") {
+		capacity, err := strconv.Atoi(strings.TrimSpace(value))
+		if err != nil || capacity < 1 {
+			return fmt.Errorf("invalid capacity %q", value)
+		}
+		caps = append(caps, capacity)
+	}
+
+	sim := simulation{
+		reviewers:     *reviewers,
+		rate:          *rate,
+		duration:      *duration,
+		capacities:    caps,
+		reviewTime:    *reviewTime,
+		writeTime:     *writeTime,
+		slow:          *slow,
+		slowWriteTime: *slowWriteTime,
+	}
+
+	schedulers := []struct {
+		name string
+		new  func() simScheduler
+	}{
+		{"least loaded", func() simScheduler { return &heapScheduler{scheduler: asteroid.NewScheduler()} }},
+		{"first fit", func() simScheduler { return newFirstFitScheduler(*sweepInterval) }},
+	}
+
+	fmt.Printf("%d reviewers (capacity %s, %.1f%% slow), %d requests/s for %s, mean review %s\n",
+		*reviewers, *capacities, 100**slow, *rate, *duration, *reviewTime)
+	for _, s := range schedulers {
+		result := sim.run(s.new())
+		fmt.Printf("\n%s\n", s.name)
+		// A scheduler that blocks while delivering holds up submission too
+		fmt.Printf("  submitted %d (%.0f/s), delivered %d\n", result.submitted, result.submitRate, len(result.delivery))
+		fmt.Printf("  request to delivery:       %s\n", result.delivery)
+		fmt.Printf("  reviews per capacity slot: min %.1f  mean %.1f  max %.1f\n", result.minShare, result.meanShare, result.maxShare)
+	}
+
+	return nil
+}
+
+// simScheduler is the part of a reviewer scheduler the simulation drives
+type simScheduler interface {
+	add(capacity int) simReviewer
+	submit(request asteroid.SupervisionRequest)
+	stop()
+}
+
+type simReviewer interface {
+	queue() <-chan asteroid.SupervisionRequest
+	complete(id uuid.UUID)
+}
+
+type simulation struct {
+	reviewers     int
+	rate          int
+	duration      time.Duration
+	capacities    []int
+	reviewTime    time.Duration
+	writeTime     time.Duration
+	slow          float64
+	slowWriteTime time.Duration
+}
+
+type simResult struct {
+	submitted  int
+	submitRate float64
+	delivery   latencies
+	minShare   float64
+	meanShare  float64
+	maxShare   float64
+}
+
+func (sim simulation) run(s simScheduler) simResult {
+	var mu sync.Mutex
+	delivery := make(latencies, 0, sim.rate*int(sim.duration/time.Second+1))
+	var outstanding sync.WaitGroup
+
+	completed := make([]atomic.Int64, sim.reviewers)
+	capacity := make([]int, sim.reviewers)
+	for i := 0; i < sim.reviewers; i++ {
+		capacity[i] = sim.capacities[i%len(sim.capacities)]
+		reviewer := s.add(capacity[i])
+
+		write := sim.writeTime
+		if rand.Float64() < sim.slow {
+			write = sim.slowWriteTime
+		}
+
+		// Each reviewer writes reviews to its connection one at a time, as WritePump does, and reviews
+		// them concurrently up to its capacity
+		go func(i int) {
+			for request := range reviewer.queue() {
+				time.Sleep(write)
+
+				mu.Lock()
+				delivery = append(delivery, time.Since(request.Status.CreatedAt))
+				mu.Unlock()
+
+				id := *request.Id
+				review := time.Duration(rand.ExpFloat64() * float64(sim.reviewTime))
+				time.AfterFunc(review, func() {
+					reviewer.complete(id)
+					completed[i].Add(1)
+					outstanding.Done()
+				})
+			}
+		}(i)
+	}
+
+	// Submit in batches every millisecond to reach high rates without a timer per request
+	start := time.Now()
+	submitted := 0
+	ticker := time.NewTicker(time.Millisecond)
+	for now := range ticker.C {
+		elapsed := now.Sub(start)
+		if elapsed >= sim.duration {
+			break
+		}
+		for due := int(elapsed.Seconds() * float64(sim.rate)); submitted < due; submitted++ {
+			id := uuid.New()
+			outstanding.Add(1)
+			s.submit(asteroid.SupervisionRequest{
+				Id:           &id,
+				SupervisorId: id,
+				Status:       &asteroid.SupervisionStatus{Status: asteroid.Pending, CreatedAt: time.Now()},
+			})
+		}
+	}
+	ticker.Stop()
+	submitRate := float64(submitted) / time.Since(start).Seconds()
+
+	// Let the reviewers work through what they were given, up to a limit for schedulers that fall behind
+	done := make(chan struct{})
+	go func() {
+		outstanding.Wait()
+		close(done)
+	}()
+	select {
+	case <-done:
+	case <-time.After(sim.duration + 10*sim.reviewTime):
+	}
+	s.stop()
+
+	result := simResult{submitted: submitted, submitRate: submitRate, minShare: -1}
+	mu.Lock()
+	result.delivery = append(latencies(nil), delivery...)
+	mu.Unlock()
+
+	total := 0.0
+	for i := range completed {
+		share := float64(completed[i].Load()) / float64(capacity[i])
+		total += share
+		if result.minShare < 0 || share < result.minShare {
+			result.minShare = share
+		}
+		if share > result.maxShare {
+			result.maxShare = share
+		}
+	}
+	result.meanShare = total / float64(sim.reviewers)
+
+	return result
+}
+
+// heapScheduler drives the hub's scheduler
+type heapScheduler struct {
+	scheduler *asteroid.Scheduler
+	reviewers []*asteroid.Reviewer
+}
+
+type heapReviewer struct {
+	scheduler *asteroid.Scheduler
+	reviewer  *asteroid.Reviewer
+}
+
+func (s *heapScheduler) add(capacity int) simReviewer {
+	r := s.scheduler.Add(capacity)
+	s.reviewers = append(s.reviewers, r)
+	return heapReviewer{scheduler: s.scheduler, reviewer: r}
+}
+
+func (s *heapScheduler) submit(request asteroid.SupervisionRequest) {
+	s.scheduler.Submit(request)
+}
+
+func (s *heapScheduler) stop() {
+	for _, r := range s.reviewers {
+		s.scheduler.Remove(r)
+	}
+}
+
+func (r heapReviewer) queue() <-chan asteroid.SupervisionRequest {
+	return r.reviewer.Queue
+}
+
+func (r heapReviewer) complete(id uuid.UUID) {
+	r.scheduler.Complete(r.reviewer, id)
+}
+
+// firstFitScheduler is how the hub assigned reviews before the scheduler: the first reviewer with room,
+// in map order, gets the review through an unbuffered send made while holding the lock. Reviews no
+// reviewer has room for are left for the next sweep.
+type firstFitScheduler struct {
+	mu        sync.Mutex
+	reviewers map[*firstFitReviewer]bool
+	pending   []asteroid.SupervisionRequest
+	stopped   bool
+	done      chan struct{}
+}
+
+type firstFitReviewer struct {
+	scheduler *firstFitScheduler
+	send      chan asteroid.SupervisionRequest
+	capacity  int
+	assigned  map[uuid.UUID]bool
+}
+
+func newFirstFitScheduler(sweepInterval time.Duration) *firstFitScheduler {
+	s := &firstFitScheduler{
+		reviewers: make(map[*firstFitReviewer]bool),
+		done:      make(chan struct{}),
+	}
+
+	go func() {
+		ticker := time.NewTicker(sweepInterval)
+		defer ticker.Stop()
+		for {
+			select {
+			case <-s.done:
+				return
+			case <-ticker.C:
+				s.mu.Lock()
+				pending := s.pending
+				s.pending = nil
+				s.mu.Unlock()
+				for _, request := range pending {
+					s.submit(request)
+				}
+			}
+		}
+	}()
+
+	return s
+}
+
+func (s *firstFitScheduler) add(capacity int) simReviewer {
+	r := &firstFitReviewer{
+		scheduler: s,
+		send:      make(chan asteroid.SupervisionRequest),
+		capacity:  capacity,
+		assigned:  make(map[uuid.UUID]bool),
+	}
+	s.mu.Lock()
+	s.reviewers[r] = true
+	s.mu.Unlock()
+	return r
+}
+
+func (s *firstFitScheduler) submit(request asteroid.SupervisionRequest) {
+	s.mu.Lock()
+	defer s.mu.Unlock()
+
+	if s.stopped {
+		return
+	}
+	for r := range s.reviewers {
+		if len(r.assigned) < r.capacity {
+			r.send <- request
+			r.assigned[*request.Id] = true
+			return
+		}
+	}
+	s.pending = append(s.pending, request)
+}
+
+func (s *firstFitScheduler) stop() {
+	close(s.done)
+	s.mu.Lock()
+	defer s.mu.Unlock()
+	s.stopped = true
+	for r := range s.reviewers {
+		close(r.send)
+	}
+}
+
+func (r *firstFitReviewer) queue() <-chan asteroid.SupervisionRequest {
+	return r.send
+}
+
+func (r *firstFitReviewer) complete(id uuid.UUID) {
+	r.scheduler.mu.Lock()
+	delete(r.assigned, id)
+	r.scheduler.mu.Unlock()
+}
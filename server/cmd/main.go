@@ -2,17 +2,38 @@ package main
 
 import (
 	"log"
+	"os"
 
 	asteroid "github.com/asteroidai/asteroid/server"
 	database "github.com/asteroidai/asteroid/server/db"
 )
 
+// Store the server runs on unless STORE says otherwise
+const DEFAULT_STORE = "postgres"
+
 func main() {
-	db, err := database.NewPostgresqlStore()
-	if err != nil {
-		log.Fatalf("Failed to connect to the database: %v", err)
+	kind := os.Getenv("STORE")
+	if kind == "" {
+		kind = DEFAULT_STORE
+	}
+
+	var store asteroid.Store
+	switch kind {
+	case "memory":
+		// Everything is lost when the server stops, so this is only for benchmarks and trying things out
+		log.Println("Using the in-memory store")
+		store = database.NewMemoryStore()
+	default:
+		if kind != DEFAULT_STORE {
+			log.Printf("Invalid STORE %q, using %s", kind, DEFAULT_STORE)
+		}
+		db, err := database.NewPostgresqlStore()
+		if err != nil {
+			log.Fatalf("Failed to connect to the database: %v", err)
+		}
+		defer db.Close()
+		store = db
 	}
-	defer db.Close()
 
-	asteroid.InitAPI(db)
+	asteroid.InitAPI(asteroid.NewCachedStore(store))
 }
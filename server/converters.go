@@ -5,6 +5,7 @@ import (
 	"encoding/base64"
 	"encoding/json"
 	"fmt"
+	"io"
 
 	"github.com/google/uuid"
 	"github.com/sashabaranov/go-openai"
@@ -192,7 +193,24 @@ func (c *OpenAIConverter) ConvertToolCall(
 	}, nil
 }
 
-func (c *OpenAIConverter) ValidateB64EncodedRequest(encodedData string) ([]byte, error) {
+// OpenAIChat is a chat completion request and its response, parsed once and then both stored and
+// converted
+type OpenAIChat struct {
+	Request  openai.ChatCompletionRequest  `json:"request"`
+	Response openai.ChatCompletionResponse `json:"response"`
+}
+
+// DecodeRawChat parses a chat sent as raw JSON
+func (c *OpenAIConverter) DecodeRawChat(body io.Reader) (*OpenAIChat, error) {
+	var chat OpenAIChat
+	if err := json.NewDecoder(body).Decode(&chat); err != nil {
+		return nil, fmt.Errorf("invalid chat format: %w", err)
+	}
+
+	return &chat, nil
+}
+
+func (c *OpenAIConverter) DecodeB64EncodedRequest(encodedData string) (*openai.ChatCompletionRequest, error) {
 	decodedRequest, err := base64.StdEncoding.DecodeString(encodedData)
 	if err != nil {
 		return nil, fmt.Errorf("invalid base64 format: %w", err)
@@ -203,15 +221,10 @@ func (c *OpenAIConverter) ValidateB64EncodedRequest(encodedData string) ([]byte,
 		return nil, fmt.Errorf("invalid request format: %w", err)
 	}
 
-	b, err := json.Marshal(v)
-	if err != nil {
-		return nil, fmt.Errorf("error marshalling request: %w", err)
-	}
-
-	return b, nil
+	return &v, nil
 }
 
-func (c *OpenAIConverter) ValidateB64EncodedResponse(encodedData string) ([]byte, error) {
+func (c *OpenAIConverter) DecodeB64EncodedResponse(encodedData string) (*openai.ChatCompletionResponse, error) {
 	decodedResponse, err := base64.StdEncoding.DecodeString(encodedData)
 	if err != nil {
 		return nil, fmt.Errorf("invalid base64 format: %w", err)
@@ -222,6 +235,29 @@ func (c *OpenAIConverter) ValidateB64EncodedResponse(encodedData string) ([]byte
 		return nil, fmt.Errorf("invalid response format: %w", err)
 	}
 
+	return &v, nil
+}
+
+func (c *OpenAIConverter) ValidateB64EncodedRequest(encodedData string) ([]byte, error) {
+	v, err := c.DecodeB64EncodedRequest(encodedData)
+	if err != nil {
+		return nil, err
+	}
+
+	b, err := json.Marshal(v)
+	if err != nil {
+		return nil, fmt.Errorf("error marshalling request: %w", err)
+	}
+
+	return b, nil
+}
+
+func (c *OpenAIConverter) ValidateB64EncodedResponse(encodedData string) ([]byte, error) {
+	v, err := c.DecodeB64EncodedResponse(encodedData)
+	if err != nil {
+		return nil, err
+	}
+
 	b, err := json.Marshal(v)
 	if err != nil {
 		return nil, fmt.Errorf("error marshalling response: %w", err)
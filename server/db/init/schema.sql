@@ -1,13 +1,21 @@
+-- The baseline schema. Later changes are versioned migrations in db/migrations, which the server
+-- applies when it connects.
+
 -- First drop tables in reverse dependency order
 DROP TABLE IF EXISTS msg CASCADE;
 DROP TABLE IF EXISTS choice CASCADE;
 DROP TABLE IF EXISTS chat CASCADE;
+DROP TABLE IF EXISTS chat_message_content CASCADE;
 DROP TABLE IF EXISTS supervisionresult CASCADE;
+DROP TABLE IF EXISTS supervisionrequest_lease CASCADE;
+DROP TABLE IF EXISTS supervisionrequest_current_status CASCADE;
 DROP TABLE IF EXISTS supervisionrequest_status CASCADE;
 DROP TABLE IF EXISTS supervisionrequest CASCADE;
 DROP TABLE IF EXISTS chainexecution CASCADE;
 DROP TABLE IF EXISTS toolcall CASCADE;
+DROP TABLE IF EXISTS run_tool_chain CASCADE;
 DROP TABLE IF EXISTS chain_tool CASCADE;
+DROP TABLE IF EXISTS run_tool CASCADE;
 DROP TABLE IF EXISTS chain_supervisor CASCADE;
 DROP TABLE IF EXISTS user_project CASCADE;
 DROP TABLE IF EXISTS tool CASCADE;
@@ -17,6 +25,7 @@ DROP TABLE IF EXISTS supervisor CASCADE;
 DROP TABLE IF EXISTS project CASCADE;
 DROP TABLE IF EXISTS asteroid_user CASCADE;
 DROP TABLE IF EXISTS task CASCADE;
+DROP TABLE IF EXISTS schema_migrations CASCADE;
 
 -- Create tables in dependency order (tables with no foreign keys first)
 CREATE TABLE asteroid_user (
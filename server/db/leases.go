@@ -0,0 +1,108 @@
+package database
+
+import (
+	"context"
+	"database/sql"
+	"errors"
+	"fmt"
+	"time"
+
+	asteroid "github.com/asteroidai/asteroid/server"
+	"github.com/google/uuid"
+	"github.com/lib/pq"
+)
+
+var _ asteroid.LeaseStore = &PostgresqlStore{}
+
+func (s *PostgresqlStore) ClaimSupervisionRequests(ctx context.Context, holder string, limit int, ttl time.Duration) ([]asteroid.SupervisionRequest, error) {
+	rows, err := s.queryContext(
+		ctx,
+		claimSupervisionRequestsQuery,
+		holder,
+		ttl.Milliseconds(),
+		limit,
+		asteroid.Pending,
+		asteroid.Assigned,
+		asteroid.HumanSupervisor,
+	)
+	if err != nil {
+		return nil, fmt.Errorf("error claiming supervision requests: %w", err)
+	}
+	defer rows.Close()
+
+	var requests []asteroid.SupervisionRequest
+	for rows.Next() {
+		var request asteroid.SupervisionRequest
+		var requestStatus asteroid.SupervisionStatus
+		if err := rows.Scan(
+			&request.Id,
+			&request.SupervisorId,
+			&request.PositionInChain,
+			&request.ChainexecutionId,
+			&requestStatus.Id,
+			&requestStatus.SupervisionRequestId,
+			&requestStatus.Status,
+			&requestStatus.CreatedAt,
+		); err != nil {
+			return nil, fmt.Errorf("error scanning claimed supervision request: %w", err)
+		}
+		request.Status = &requestStatus
+		requests = append(requests, request)
+	}
+	if err := rows.Err(); err != nil {
+		return nil, fmt.Errorf("error iterating claimed supervision requests: %w", err)
+	}
+
+	return requests, nil
+}
+
+func (s *PostgresqlStore) ClaimSupervisionRequest(ctx context.Context, holder string, id uuid.UUID, ttl time.Duration) (bool, error) {
+	var claimed uuid.UUID
+	err := s.queryRowContext(
+		ctx,
+		claimSupervisionRequestQuery,
+		id,
+		holder,
+		ttl.Milliseconds(),
+		asteroid.Pending,
+		asteroid.Assigned,
+	).Scan(&claimed)
+	if errors.Is(err, sql.ErrNoRows) {
+		return false, nil
+	}
+	if err != nil {
+		return false, fmt.Errorf("error claiming supervision request: %w", err)
+	}
+
+	return true, nil
+}
+
+func (s *PostgresqlStore) RenewSupervisionRequestLeases(ctx context.Context, holder string, ids []uuid.UUID, ttl time.Duration) (int, error) {
+	if len(ids) == 0 {
+		return 0, nil
+	}
+
+	result, err := s.execContext(ctx, renewSupervisionRequestLeasesQuery, holder, pq.Array(ids), ttl.Milliseconds())
+	if err != nil {
+		return 0, fmt.Errorf("error renewing supervision request leases: %w", err)
+	}
+
+	renewed, err := result.RowsAffected()
+	if err != nil {
+		return 0, fmt.Errorf("error getting renewed lease count: %w", err)
+	}
+
+	return int(renewed), nil
+}
+
+func (s *PostgresqlStore) ReleaseSupervisionRequestLeases(ctx context.Context, holder string, ids []uuid.UUID) error {
+	if len(ids) == 0 {
+		return nil
+	}
+
+	if _, err := s.execContext(ctx, releaseSupervisionRequestLeasesQuery, holder, pq.Array(ids)); err != nil {
+		return fmt.Errorf("error releasing supervision request leases: %w", err)
+	}
+
+	return nil
+}
@@ -0,0 +1,1540 @@
+package database
+
+import (
+	"bytes"
+	"context"
+	"encoding/json"
+	"fmt"
+	"maps"
+	"slices"
+	"sync"
+	"time"
+
+	asteroid "github.com/asteroidai/asteroid/server"
+	"github.com/google/uuid"
+)
+
+// MemoryStore keeps everything in memory, with a map for every lookup the PostgreSQL store makes with a
+// query. It follows PostgresqlStore's behaviour, including sharing tool definitions and reusing chains,
+// so that the server and its benchmarks can run without a database. Nothing survives a restart.
+type MemoryStore struct {
+	mu sync.RWMutex
+
+	projects       map[uuid.UUID]asteroid.Project
+	projectsByName map[string]uuid.UUID
+
+	tasks         map[uuid.UUID]asteroid.Task
+	tasksByValues map[memoryTaskKey]uuid.UUID
+	projectTasks  map[uuid.UUID][]uuid.UUID
+
+	runs     map[uuid.UUID]asteroid.Run
+	taskRuns map[uuid.UUID][]uuid.UUID
+
+	// tools holds the tool definitions, which the runs of a project share as in run_tool
+	tools         map[uuid.UUID]memoryTool
+	toolsByHash   map[memoryToolKey]uuid.UUID
+	projectTools  map[uuid.UUID][]uuid.UUID
+	runTools      map[uuid.UUID][]uuid.UUID
+	runToolsByKey map[memoryRunToolKey]bool
+	// runToolNames holds the lowest ID of the run's tools with each name, as GetToolFromNameAndRunId
+	// returns
+	runToolNames map[memoryRunToolName]uuid.UUID
+
+	supervisors         map[uuid.UUID]asteroid.Supervisor
+	supervisorsByValues map[string]uuid.UUID
+
+	// chains holds the supervisor IDs of each chain in order. toolChains holds every chain of a tool
+	// definition, and runToolChains the ones each run registered, as in run_tool_chain.
+	chains        map[uuid.UUID][]uuid.UUID
+	toolChains    map[uuid.UUID][]uuid.UUID
+	runToolChains map[memoryRunToolKey][]uuid.UUID
+	chainsByKey   map[string]uuid.UUID
+
+	toolCalls         map[uuid.UUID]memoryToolCall
+	toolCallsByCallId map[string]uuid.UUID
+
+	executions                   map[uuid.UUID]asteroid.ChainExecution
+	chainExecutions              map[uuid.UUID][]uuid.UUID
+	toolCallExecutions           map[uuid.UUID][]uuid.UUID
+	executionsByChainAndToolCall map[memoryChainToolCallKey]uuid.UUID
+
+	// requests are held without their status, which is kept in statuses
+	requests          map[uuid.UUID]asteroid.SupervisionRequest
+	executionRequests map[uuid.UUID][]uuid.UUID
+	statuses          map[uuid.UUID]asteroid.SupervisionStatus
+	requestsByStatus  map[asteroid.Status]map[uuid.UUID]bool
+	lastStatusId      int
+	results           map[uuid.UUID]asteroid.SupervisionResult
+
+	// chats holds the chats of each run, oldest first
+	chats    map[uuid.UUID][]memoryChat
+	messages map[uuid.UUID]asteroid.AsteroidMessage
+}
+
+// Check if MemoryStore implements asteroid.Store
+var _ asteroid.Store = &MemoryStore{}
+
+type memoryTaskKey struct {
+	projectId   uuid.UUID
+	name        string
+	description string
+}
+
+type memoryToolKey struct {
+	projectId uuid.UUID
+	hash      string
+}
+
+type memoryRunToolKey struct {
+	runId  uuid.UUID
+	toolId uuid.UUID
+}
+
+type memoryRunToolName struct {
+	runId uuid.UUID
+	name  string
+}
+
+type memoryChainToolCallKey struct {
+	chainId    uuid.UUID
+	toolCallId uuid.UUID
+}
+
+// memoryTool is a tool definition and the project it belongs to
+type memoryTool struct {
+	tool      asteroid.Tool
+	projectId uuid.UUID
+}
+
+// memoryToolCall is a tool call, the JSON it was stored as, which is what GetToolCall returns as its
+// arguments, and the run whose chat made it
+type memoryToolCall struct {
+	toolCall asteroid.AsteroidToolCall
+	data     string
+	runId    uuid.UUID
+}
+
+type memoryChat struct {
+	id       uuid.UUID
+	request  []byte
+	response []byte
+	format   string
+}
+
+// NewMemoryStore creates an empty in-memory store
+func NewMemoryStore() *MemoryStore {
+	return &MemoryStore{
+		projects:                     make(map[uuid.UUID]asteroid.Project),
+		projectsByName:               make(map[string]uuid.UUID),
+		tasks:                        make(map[uuid.UUID]asteroid.Task),
+		tasksByValues:                make(map[memoryTaskKey]uuid.UUID),
+		projectTasks:                 make(map[uuid.UUID][]uuid.UUID),
+		runs:                         make(map[uuid.UUID]asteroid.Run),
+		taskRuns:                     make(map[uuid.UUID][]uuid.UUID),
+		tools:                        make(map[uuid.UUID]memoryTool),
+		toolsByHash:                  make(map[memoryToolKey]uuid.UUID),
+		projectTools:                 make(map[uuid.UUID][]uuid.UUID),
+		runTools:                     make(map[uuid.UUID][]uuid.UUID),
+		runToolsByKey:                make(map[memoryRunToolKey]bool),
+		runToolNames:                 make(map[memoryRunToolName]uuid.UUID),
+		supervisors:                  make(map[uuid.UUID]asteroid.Supervisor),
+		supervisorsByValues:          make(map[string]uuid.UUID),
+		chains:                       make(map[uuid.UUID][]uuid.UUID),
+		toolChains:                   make(map[uuid.UUID][]uuid.UUID),
+		runToolChains:                make(map[memoryRunToolKey][]uuid.UUID),
+		chainsByKey:                  make(map[string]uuid.UUID),
+		toolCalls:                    make(map[uuid.UUID]memoryToolCall),
+		toolCallsByCallId:            make(map[string]uuid.UUID),
+		executions:                   make(map[uuid.UUID]asteroid.ChainExecution),
+		chainExecutions:              make(map[uuid.UUID][]uuid.UUID),
+		toolCallExecutions:           make(map[uuid.UUID][]uuid.UUID),
+		executionsByChainAndToolCall: make(map[memoryChainToolCallKey]uuid.UUID),
+		requests:                     make(map[uuid.UUID]asteroid.SupervisionRequest),
+		executionRequests:            make(map[uuid.UUID][]uuid.UUID),
+		statuses:                     make(map[uuid.UUID]asteroid.SupervisionStatus),
+		requestsByStatus:             make(map[asteroid.Status]map[uuid.UUID]bool),
+		results:                      make(map[uuid.UUID]asteroid.SupervisionResult),
+		chats:                        make(map[uuid.UUID][]memoryChat),
+		messages:                     make(map[uuid.UUID]asteroid.AsteroidMessage),
+	}
+}
+
+// Close does nothing, as there is no connection to close
+func (s *MemoryStore) Close() error {
+	return nil
+}
+
+// compareUUIDs orders UUIDs as Postgres does, byte by byte
+func compareUUIDs(a, b uuid.UUID) int {
+	return bytes.Compare(a[:], b[:])
+}
+
+// listNewestFirst hands rows to each in the order of the store's listings by created_at, newest first,
+// starting after the page's cursor. It is called without the lock held, so the callback can take its time.
+func listNewestFirst[T any](rows []T, key func(T) (time.Time, uuid.UUID), page asteroid.Page, each func(T) error) error {
+	slices.SortFunc(rows, func(a, b T) int {
+		aTime, aId := key(a)
+		bTime, bId := key(b)
+		if c := bTime.Compare(aTime); c != 0 {
+			return c
+		}
+		return compareUUIDs(bId, aId)
+	})
+
+	sent := 0
+	for _, row := range rows {
+		if page.After != nil && page.After.CreatedAt != nil {
+			createdAt, id := key(row)
+			c := createdAt.Compare(*page.After.CreatedAt)
+			if c > 0 || (c == 0 && compareUUIDs(id, page.After.Id) >= 0) {
+				continue
+			}
+		}
+		if page.Limit > 0 && sent == page.Limit {
+			return nil
+		}
+		if err := each(row); err != nil {
+			return err
+		}
+		sent++
+	}
+
+	return nil
+}
+
+// listTools hands tools to each by ID, starting after the page's cursor
+func listTools(tools []asteroid.Tool, page asteroid.Page, each func(asteroid.Tool) error) error {
+	slices.SortFunc(tools, func(a, b asteroid.Tool) int { return compareUUIDs(*a.Id, *b.Id) })
+
+	sent := 0
+	for _, tool := range tools {
+		if page.After != nil && compareUUIDs(*tool.Id, page.After.Id) <= 0 {
+			continue
+		}
+		if page.Limit > 0 && sent == page.Limit {
+			return nil
+		}
+		if err := each(tool); err != nil {
+			return err
+		}
+		sent++
+	}
+
+	return nil
+}
+
+// ProjectStore implementation
+func (s *MemoryStore) CreateProject(ctx context.Context, project asteroid.Project) error {
+	s.mu.Lock()
+	defer s.mu.Unlock()
+
+	if _, ok := s.projects[project.Id]; ok {
+		return fmt.Errorf("error creating project: project %s already exists", project.Id)
+	}
+	if _, ok := s.projectsByName[project.Name]; ok {
+		return fmt.Errorf("error creating project: project %q already exists", project.Name)
+	}
+
+	project.RunResultTags = slices.Clone(project.RunResultTags)
+	s.projects[project.Id] = project
+	s.projectsByName[project.Name] = project.Id
+
+	return nil
+}
+
+func (s *MemoryStore) GetProject(ctx context.Context, id uuid.UUID) (*asteroid.Project, error) {
+	s.mu.RLock()
+	defer s.mu.RUnlock()
+
+	project, ok := s.projects[id]
+	if !ok {
+		return nil, nil
+	}
+	project.RunResultTags = slices.Clone(project.RunResultTags)
+
+	return &project, nil
+}
+
+func (s *MemoryStore) GetProjectFromName(ctx context.Context, name string) (*asteroid.Project, error) {
+	s.mu.RLock()
+	id, ok := s.projectsByName[name]
+	s.mu.RUnlock()
+	if !ok {
+		return nil, nil
+	}
+
+	return s.GetProject(ctx, id)
+}
+
+func (s *MemoryStore) GetProjects(ctx context.Context, page asteroid.Page, each func(asteroid.Project) error) error {
+	s.mu.RLock()
+	projects := make([]asteroid.Project, 0, len(s.projects))
+	for _, project := range s.projects {
+		project.RunResultTags = slices.Clone(project.RunResultTags)
+		projects = append(projects, project)
+	}
+	s.mu.RUnlock()
+
+	return listNewestFirst(projects, func(p asteroid.Project) (time.Time, uuid.UUID) { return p.CreatedAt, p.Id }, page, each)
+}
+
+// TaskStore implementation
+func (s *MemoryStore) CreateTask(ctx context.Context, task asteroid.Task) (*uuid.UUID, error) {
+	s.mu.Lock()
+	defer s.mu.Unlock()
+
+	if _, ok := s.projects[task.ProjectId]; !ok {
+		return nil, fmt.Errorf("error creating task: project not found: %s", task.ProjectId)
+	}
+
+	key := memoryTaskKey{projectId: task.ProjectId, name: task.Name}
+	if task.Description != nil {
+		key.description = *task.Description
+	}
+	// A task without a description never matches an existing one, as NULL = NULL isn't true in Postgres
+	if task.Description != nil {
+		if existingId, ok := s.tasksByValues[key]; ok {
+			return &existingId, nil
+		}
+	}
+
+	id := uuid.New()
+	task.Id = id
+	if task.Description != nil {
+		description := *task.Description
+		task.Description = &description
+		s.tasksByValues[key] = id
+	}
+	s.tasks[id] = task
+	s.projectTasks[task.ProjectId] = append(s.projectTasks[task.ProjectId], id)
+
+	return &id, nil
+}
+
+func (s *MemoryStore) GetTask(ctx context.Context, id uuid.UUID) (*asteroid.Task, error) {
+	s.mu.RLock()
+	defer s.mu.RUnlock()
+
+	task, ok := s.tasks[id]
+	if !ok {
+		return nil, nil
+	}
+
+	return copyTask(task), nil
+}
+
+func (s *MemoryStore) GetProjectTasks(ctx context.Context, projectId uuid.UUID, page asteroid.Page, each func(asteroid.Task) error) error {
+	s.mu.RLock()
+	tasks := make([]asteroid.Task, 0, len(s.projectTasks[projectId]))
+	for _, id := range s.projectTasks[projectId] {
+		tasks = append(tasks, *copyTask(s.tasks[id]))
+	}
+	s.mu.RUnlock()
+
+	return listNewestFirst(tasks, func(t asteroid.Task) (time.Time, uuid.UUID) { return t.CreatedAt, t.Id }, page, each)
+}
+
+func copyTask(task asteroid.Task) *asteroid.Task {
+	if task.Description != nil {
+		description := *task.Description
+		task.Description = &description
+	}
+	return &task
+}
+
+// RunStore implementation
+func (s *MemoryStore) CreateRun(ctx context.Context, run asteroid.Run) (uuid.UUID, error) {
+	s.mu.Lock()
+	defer s.mu.Unlock()
+
+	if _, ok := s.tasks[run.TaskId]; !ok {
+		return uuid.UUID{}, fmt.Errorf("task not found: %s", run.TaskId)
+	}
+
+	return s.createRun(run.TaskId, run.CreatedAt), nil
+}
+
+func (s *MemoryStore) createRun(taskId uuid.UUID, createdAt time.Time) uuid.UUID {
+	id := uuid.New()
+	status := asteroid.Pending
+	s.runs[id] = asteroid.Run{Id: id, TaskId: taskId, CreatedAt: createdAt, Status: &status}
+	s.taskRuns[taskId] = append(s.taskRuns[taskId], id)
+	return id
+}
+
+// CreateRuns creates runs of a task with their tools and the tools' supervisor chains. Everything is
+// checked before anything is stored, so either all of the batch is created or none of it is.
+func (s *MemoryStore) CreateRuns(
+	ctx context.Context,
+	taskId uuid.UUID,
+	runs []asteroid.RunBatchItem,
+) ([]asteroid.RunBatchItemResult, error) {
+	s.mu.Lock()
+	defer s.mu.Unlock()
+
+	task, ok := s.tasks[taskId]
+	if !ok {
+		return nil, fmt.Errorf("error creating runs: task not found: %s", taskId)
+	}
+
+	hashes := make([][][]byte, len(runs))
+	for i, run := range runs {
+		hashes[i] = make([][]byte, len(run.Tools))
+		for j, tool := range run.Tools {
+			hash, err := toolDefinitionHash(tool.Name, tool.Description, tool.Attributes, ignoredAttributesOf(tool.IgnoredAttributes), tool.Code)
+			if err != nil {
+				return nil, err
+			}
+			hashes[i][j] = hash
+
+			if tool.Chains == nil {
+				continue
+			}
+			for _, chain := range *tool.Chains {
+				if chain.SupervisorIds == nil {
+					return nil, fmt.Errorf("supervisor IDs are required to make a chain of supervisors")
+				}
+				if err := s.checkSupervisors(*chain.SupervisorIds); err != nil {
+					return nil, err
+				}
+			}
+		}
+	}
+
+	now := time.Now()
+	results := make([]asteroid.RunBatchItemResult, 0, len(runs))
+	for i, run := range runs {
+		runId := s.createRun(taskId, now)
+		result := asteroid.RunBatchItemResult{
+			RunId: runId,
+			Tools: make([]asteroid.RunBatchToolResult, 0, len(run.Tools)),
+		}
+
+		for j, tool := range run.Tools {
+			toolId := s.createTool(task.ProjectId, runId, hashes[i][j], asteroid.Tool{
+				Attributes:        tool.Attributes,
+				Code:              tool.Code,
+				Description:       tool.Description,
+				IgnoredAttributes: tool.IgnoredAttributes,
+				Name:              tool.Name,
+			})
+
+			toolResult := asteroid.RunBatchToolResult{ToolId: toolId, Name: tool.Name, ChainIds: make([]uuid.UUID, 0)}
+			if tool.Chains != nil {
+				for _, chain := range *tool.Chains {
+					chainId := s.createChain(toolId, *chain.SupervisorIds)
+					s.linkChain(runId, toolId, chainId)
+					toolResult.ChainIds = append(toolResult.ChainIds, chainId)
+				}
+			}
+			result.Tools = append(result.Tools, toolResult)
+		}
+		results = append(results, result)
+	}
+
+	return results, nil
+}
+
+func (s *MemoryStore) GetRun(ctx context.Context, id uuid.UUID) (*asteroid.Run, error) {
+	s.mu.RLock()
+	defer s.mu.RUnlock()
+
+	run, ok := s.runs[id]
+	if !ok {
+		return nil, nil
+	}
+
+	return copyRun(run), nil
+}
+
+func (s *MemoryStore) GetRuns(ctx context.Context, taskId uuid.UUID) ([]asteroid.Run, error) {
+	s.mu.RLock()
+	defer s.mu.RUnlock()
+
+	var runs []asteroid.Run
+	for _, id := range s.taskRuns[taskId] {
+		runs = append(runs, *copyRun(s.runs[id]))
+	}
+
+	return runs, nil
+}
+
+func (s *MemoryStore) GetTaskRuns(ctx context.Context, taskId uuid.UUID, page asteroid.Page, each func(asteroid.Run) error) error {
+	s.mu.RLock()
+	runs := make([]asteroid.Run, 0, len(s.taskRuns[taskId]))
+	for _, id := range s.taskRuns[taskId] {
+		runs = append(runs, *copyRun(s.runs[id]))
+	}
+	s.mu.RUnlock()
+
+	return listNewestFirst(runs, func(r asteroid.Run) (time.Time, uuid.UUID) { return r.CreatedAt, r.Id }, page, each)
+}
+
+func (s *MemoryStore) UpdateRunStatus(ctx context.Context, runId uuid.UUID, status asteroid.Status) error {
+	s.mu.Lock()
+	defer s.mu.Unlock()
+
+	// As with an UPDATE, a run that doesn't exist is left alone
+	if run, ok := s.runs[runId]; ok {
+		run.Status = &status
+		s.runs[runId] = run
+	}
+
+	return nil
+}
+
+func (s *MemoryStore) UpdateRunResult(ctx context.Context, runId uuid.UUID, result string) error {
+	s.mu.Lock()
+	defer s.mu.Unlock()
+
+	if run, ok := s.runs[runId]; ok {
+		run.Result = &result
+		s.runs[runId] = run
+	}
+
+	return nil
+}
+
+func copyRun(run asteroid.Run) *asteroid.Run {
+	if run.Status != nil {
+		status := *run.Status
+		run.Status = &status
+	}
+	if run.Result != nil {
+		result := *run.Result
+		run.Result = &result
+	}
+	return &run
+}
+
+// ToolStore implementation
+
+// CreateTool links a run to a tool definition, creating the definition unless the run's project already
+// has an identical one
+func (s *MemoryStore) CreateTool(
+	ctx context.Context,
+	runId uuid.UUID,
+	attributes map[string]interface{},
+	name string,
+	description string,
+	ignoredAttributes []string,
+	code string,
+) (*asteroid.Tool, error) {
+	if ignoredAttributes == nil {
+		ignoredAttributes = []string{}
+	}
+
+	hash, err := toolDefinitionHash(name, description, attributes, ignoredAttributes, code)
+	if err != nil {
+		return nil, err
+	}
+
+	s.mu.Lock()
+	defer s.mu.Unlock()
+
+	run, ok := s.runs[runId]
+	if !ok {
+		return nil, fmt.Errorf("run not found: %s", runId)
+	}
+
+	tool := asteroid.Tool{
+		Attributes:        attributes,
+		Code:              code,
+		Description:       description,
+		IgnoredAttributes: &ignoredAttributes,
+		Name:              name,
+	}
+	id := s.createTool(s.tasks[run.TaskId].ProjectId, runId, hash, tool)
+
+	tool.Id = &id
+	tool.RunId = runId
+	return copyTool(tool), nil
+}
+
+// createTool stores a tool definition in the project unless it has one with the same hash, and links the
+// run to it, returning the definition's ID
+func (s *MemoryStore) createTool(projectId uuid.UUID, runId uuid.UUID, hash []byte, tool asteroid.Tool) uuid.UUID {
+	key := memoryToolKey{projectId: projectId, hash: string(hash)}
+	id, ok := s.toolsByHash[key]
+	if !ok {
+		id = uuid.New()
+		tool.Id = &id
+		tool.RunId = runId
+		tool.IgnoredAttributes = ignoredAttributesRef(tool.IgnoredAttributes)
+		s.tools[id] = memoryTool{tool: *copyTool(tool), projectId: projectId}
+		s.toolsByHash[key] = id
+		s.projectTools[projectId] = append(s.projectTools[projectId], id)
+	}
+
+	link := memoryRunToolKey{runId: runId, toolId: id}
+	if !s.runToolsByKey[link] {
+		s.runToolsByKey[link] = true
+		s.runTools[runId] = append(s.runTools[runId], id)
+
+		name := memoryRunToolName{runId: runId, name: tool.Name}
+		if existing, ok := s.runToolNames[name]; !ok || compareUUIDs(id, existing) < 0 {
+			s.runToolNames[name] = id
+		}
+	}
+
+	return id
+}
+
+func (s *MemoryStore) GetTool(ctx context.Context, id uuid.UUID) (*asteroid.Tool, error) {
+	s.mu.RLock()
+	defer s.mu.RUnlock()
+
+	stored, ok := s.tools[id]
+	if !ok {
+		return nil, nil
+	}
+
+	return copyTool(stored.tool), nil
+}
+
+func (s *MemoryStore) GetRunTools(ctx context.Context, runId uuid.UUID, page asteroid.Page, each func(asteroid.Tool) error) error {
+	s.mu.RLock()
+	tools := make([]asteroid.Tool, 0, len(s.runTools[runId]))
+	for _, id := range s.runTools[runId] {
+		tool := copyTool(s.tools[id].tool)
+		tool.RunId = runId
+		tools = append(tools, *tool)
+	}
+	s.mu.RUnlock()
+
+	return listTools(tools, page, each)
+}
+
+func (s *MemoryStore) GetProjectTools(ctx context.Context, projectId uuid.UUID, page asteroid.Page, each func(asteroid.Tool) error) error {
+	s.mu.RLock()
+	tools := make([]asteroid.Tool, 0, len(s.projectTools[projectId]))
+	for _, id := range s.projectTools[projectId] {
+		tools = append(tools, *copyTool(s.tools[id].tool))
+	}
+	s.mu.RUnlock()
+
+	return listTools(tools, page, each)
+}
+
+func (s *MemoryStore) GetToolFromNameAndRunId(ctx context.Context, name string, runId uuid.UUID) (*asteroid.Tool, error) {
+	s.mu.RLock()
+	defer s.mu.RUnlock()
+
+	id, ok := s.runToolNames[memoryRunToolName{runId: runId, name: name}]
+	if !ok {
+		return nil, nil
+	}
+
+	tool := copyTool(s.tools[id].tool)
+	tool.RunId = runId
+	return tool, nil
+}
+
+// copyTool copies a tool with its attributes and ignored attributes, so that callers can't change what
+// is stored. Attributes are always set, as they are when read from the database.
+func copyTool(tool asteroid.Tool) *asteroid.Tool {
+	if tool.Attributes == nil {
+		tool.Attributes = map[string]interface{}{}
+	} else {
+		tool.Attributes = maps.Clone(tool.Attributes)
+	}
+	tool.IgnoredAttributes = ignoredAttributesRef(tool.IgnoredAttributes)
+	if tool.Id != nil {
+		id := *tool.Id
+		tool.Id = &id
+	}
+	return &tool
+}
+
+func ignoredAttributesOf(ignored *[]string) []string {
+	if ignored == nil {
+		return []string{}
+	}
+	return *ignored
+}
+
+func ignoredAttributesRef(ignored *[]string) *[]string {
+	copied := slices.Clone(ignoredAttributesOf(ignored))
+	if copied == nil {
+		copied = []string{}
+	}
+	return &copied
+}
+
+// SupervisorStore implementation
+func (s *MemoryStore) CreateSupervisor(ctx context.Context, supervisor asteroid.Supervisor) (uuid.UUID, error) {
+	key, err := supervisorValuesKey(
+		supervisor.Code, supervisor.Name, supervisor.Description, supervisor.Type, supervisor.Attributes,
+		supervisor.DecisionCacheTtlSeconds,
+	)
+	if err != nil {
+		return uuid.UUID{}, err
+	}
+
+	s.mu.Lock()
+	defer s.mu.Unlock()
+
+	if existingId, ok := s.supervisorsByValues[key]; ok {
+		return existingId, nil
+	}
+
+	id := uuid.New()
+	supervisor.Id = &id
+	s.supervisors[id] = *copySupervisor(supervisor)
+	s.supervisorsByValues[key] = id
+
+	return id, nil
+}
+
+func (s *MemoryStore) GetSupervisor(ctx context.Context, id uuid.UUID) (*asteroid.Supervisor, error) {
+	s.mu.RLock()
+	defer s.mu.RUnlock()
+
+	supervisor, ok := s.supervisors[id]
+	if !ok {
+		return nil, nil
+	}
+
+	return copySupervisor(supervisor), nil
+}
+
+func (s *MemoryStore) GetSupervisorFromValues(
+	ctx context.Context,
+	code string,
+	name string,
+	desc string,
+	t asteroid.SupervisorType,
+	attributes map[string]interface{},
+	decisionCacheTtlSeconds *int,
+) (*asteroid.Supervisor, error) {
+	key, err := supervisorValuesKey(code, name, desc, t, attributes, decisionCacheTtlSeconds)
+	if err != nil {
+		return nil, err
+	}
+
+	s.mu.RLock()
+	id, ok := s.supervisorsByValues[key]
+	s.mu.RUnlock()
+	if !ok {
+		return nil, nil
+	}
+
+	return s.GetSupervisor(ctx, id)
+}
+
+// GetSupervisors returns the supervisors in the chains of the project's tools, once for every place
+// they have in a chain
+func (s *MemoryStore) GetSupervisors(ctx context.Context, projectId uuid.UUID) ([]asteroid.Supervisor, error) {
+	s.mu.RLock()
+	defer s.mu.RUnlock()
+
+	supervisors := make([]asteroid.Supervisor, 0)
+	for _, toolId := range s.projectTools[projectId] {
+		for _, chainId := range s.toolChains[toolId] {
+			for _, supervisorId := range s.chains[chainId] {
+				supervisors = append(supervisors, *copySupervisor(s.supervisors[supervisorId]))
+			}
+		}
+	}
+
+	return supervisors, nil
+}
+
+// CreateSupervisorChains adds chains of supervisors to a tool for a run, reusing the chains the tool
+// already has with the same supervisors in the same order. Without a run, the chains are added for the
+// runs using the tool that have no chains for it yet.
+func (s *MemoryStore) CreateSupervisorChains(
+	ctx context.Context,
+	toolId uuid.UUID,
+	runId uuid.UUID,
+	chains []asteroid.ChainRequest,
+) ([]uuid.UUID, error) {
+	for _, chain := range chains {
+		if chain.SupervisorIds == nil {
+			return nil, fmt.Errorf("supervisor IDs are required to make a chain of supervisors")
+		}
+	}
+
+	s.mu.Lock()
+	defer s.mu.Unlock()
+
+	if !s.runToolsByKey[memoryRunToolKey{runId: runId, toolId: toolId}] {
+		return nil, fmt.Errorf("%w: run %s, tool %s", asteroid.ErrRunToolNotFound, runId, toolId)
+	}
+	for _, chain := range chains {
+		if err := s.checkSupervisors(*chain.SupervisorIds); err != nil {
+			return nil, err
+		}
+	}
+
+	chainIds := make([]uuid.UUID, 0, len(chains))
+	for _, chain := range chains {
+		chainId := s.createChain(toolId, *chain.SupervisorIds)
+		s.linkChain(runId, toolId, chainId)
+		chainIds = append(chainIds, chainId)
+	}
+
+	return chainIds, nil
+}
+
+func (s *MemoryStore) checkSupervisors(ids []uuid.UUID) error {
+	for _, id := range ids {
+		if _, ok := s.supervisors[id]; !ok {
+			return fmt.Errorf("error adding supervisor to chain: supervisor not found: %s", id)
+		}
+	}
+	return nil
+}
+
+// createChain returns the tool's chain of the supervisors, creating it if the tool doesn't have it
+func (s *MemoryStore) createChain(toolId uuid.UUID, supervisorIds []uuid.UUID) uuid.UUID {
+	key := chainKey(toolId, supervisorIds)
+	if chainId, ok := s.chainsByKey[key]; ok {
+		return chainId
+	}
+
+	chainId := uuid.New()
+	s.chains[chainId] = slices.Clone(supervisorIds)
+	s.toolChains[toolId] = append(s.toolChains[toolId], chainId)
+	s.chainsByKey[key] = chainId
+
+	return chainId
+}
+
+// linkChain adds a chain of the tool to the run's chains on the tool
+func (s *MemoryStore) linkChain(runId uuid.UUID, toolId uuid.UUID, chainId uuid.UUID) {
+	key := memoryRunToolKey{runId: runId, toolId: toolId}
+	if !slices.Contains(s.runToolChains[key], chainId) {
+		s.runToolChains[key] = append(s.runToolChains[key], chainId)
+	}
+}
+
+// GetSupervisorChains returns the chains of a tool, only those of the run when one is given
+func (s *MemoryStore) GetSupervisorChains(ctx context.Context, toolId uuid.UUID, runId *uuid.UUID) ([]asteroid.SupervisorChain, error) {
+	s.mu.RLock()
+	defer s.mu.RUnlock()
+
+	chainIds := s.toolChains[toolId]
+	if runId != nil {
+		chainIds = s.runToolChains[memoryRunToolKey{runId: *runId, toolId: toolId}]
+	}
+
+	chains := make([]asteroid.SupervisorChain, 0, len(chainIds))
+	for _, chainId := range chainIds {
+		chains = append(chains, s.supervisorChain(chainId))
+	}
+
+	return chains, nil
+}
+
+// GetSupervisorChain returns the supervisors of a chain in order. A chain that doesn't exist has none.
+func (s *MemoryStore) GetSupervisorChain(ctx context.Context, id uuid.UUID) (*asteroid.SupervisorChain, error) {
+	s.mu.RLock()
+	defer s.mu.RUnlock()
+
+	chain := s.supervisorChain(id)
+	return &chain, nil
+}
+
+func (s *MemoryStore) supervisorChain(chainId uuid.UUID) asteroid.SupervisorChain {
+	supervisors := make([]asteroid.Supervisor, 0, len(s.chains[chainId]))
+	for _, supervisorId := range s.chains[chainId] {
+		supervisors = append(supervisors, *copySupervisor(s.supervisors[supervisorId]))
+	}
+
+	return asteroid.SupervisorChain{ChainId: chainId, Supervisors: supervisors}
+}
+
+// supervisorValuesKey identifies a supervisor by the values GetSupervisorFromValues matches on
+func supervisorValuesKey(
+	code string,
+	name string,
+	desc string,
+	t asteroid.SupervisorType,
+	attributes map[string]interface{},
+	decisionCacheTtlSeconds *int,
+) (string, error) {
+	key, err := json.Marshal(struct {
+		Code                    string                  `json:"code"`
+		Name                    string                  `json:"name"`
+		Description             string                  `json:"description"`
+		Type                    asteroid.SupervisorType `json:"type"`
+		Attributes              map[string]interface{}  `json:"attributes"`
+		DecisionCacheTtlSeconds *int                    `json:"decision_cache_ttl_seconds"`
+	}{code, name, desc, t, attributes, decisionCacheTtlSeconds})
+	if err != nil {
+		return "", fmt.Errorf("error marshalling attributes: %w", err)
+	}
+	return string(key), nil
+}
+
+func copySupervisor(supervisor asteroid.Supervisor) *asteroid.Supervisor {
+	supervisor.Attributes = maps.Clone(supervisor.Attributes)
+	if supervisor.Id != nil {
+		id := *supervisor.Id
+		supervisor.Id = &id
+	}
+	if supervisor.DecisionCacheTtlSeconds != nil {
+		ttl := *supervisor.DecisionCacheTtlSeconds
+		supervisor.DecisionCacheTtlSeconds = &ttl
+	}
+	return &supervisor
+}
+
+// ToolRequestStore implementation
+func (s *MemoryStore) GetToolCall(ctx context.Context, id uuid.UUID) (*asteroid.AsteroidToolCall, error) {
+	s.mu.RLock()
+	defer s.mu.RUnlock()
+
+	stored, ok := s.toolCalls[id]
+	if !ok {
+		return nil, nil
+	}
+
+	return stored.copy(), nil
+}
+
+func (s *MemoryStore) GetToolCallRunId(ctx context.Context, id uuid.UUID) (*uuid.UUID, error) {
+	s.mu.RLock()
+	defer s.mu.RUnlock()
+
+	stored, ok := s.toolCalls[id]
+	if !ok {
+		return nil, nil
+	}
+
+	runId := stored.runId
+	return &runId, nil
+}
+
+func (s *MemoryStore) GetToolCallFromCallId(ctx context.Context, id string) (*asteroid.AsteroidToolCall, error) {
+	s.mu.RLock()
+	defer s.mu.RUnlock()
+
+	toolCallId, ok := s.toolCallsByCallId[id]
+	if !ok {
+		return nil, nil
+	}
+
+	return s.toolCalls[toolCallId].copy(), nil
+}
+
+// copy returns the tool call as it reads back from the toolcall table
+func (c memoryToolCall) copy() *asteroid.AsteroidToolCall {
+	callId := ""
+	if c.toolCall.CallId != nil {
+		callId = *c.toolCall.CallId
+	}
+	createdAt := *c.toolCall.CreatedAt
+	arguments := c.data
+
+	return &asteroid.AsteroidToolCall{
+		Arguments: &arguments,
+		CallId:    &callId,
+		CreatedAt: &createdAt,
+		Id:        c.toolCall.Id,
+		ToolId:    c.toolCall.ToolId,
+	}
+}
+
+// SupervisionStore implementation
+func (s *MemoryStore) CreateSupervisionRequest(
+	ctx context.Context,
+	request asteroid.SupervisionRequest,
+	chainId uuid.UUID,
+	toolCallId uuid.UUID,
+) (*uuid.UUID, error) {
+	s.mu.Lock()
+	defer s.mu.Unlock()
+
+	// Sanity check that we're recording this against a valid chain execution group that already exists
+	if request.ChainexecutionId == nil && request.PositionInChain == 0 {
+		ceId, ok := s.executionsByChainAndToolCall[memoryChainToolCallKey{chainId: chainId, toolCallId: toolCallId}]
+		if !ok {
+			return nil, fmt.Errorf("chain execution not found for tool call %s and chain %s", toolCallId, chainId)
+		}
+		request.ChainexecutionId = &ceId
+	} else if request.ChainexecutionId == nil && request.PositionInChain > 0 {
+		return nil, fmt.Errorf("chain execution ID is required when creating a supervision request for a non-zero position in the chain")
+	}
+
+	if err := s.checkSupervisionRequest(request); err != nil {
+		return nil, err
+	}
+
+	id := s.createSupervisionRequest(request)
+	return &id, nil
+}
+
+// CreateSupervisionRequests stores supervision requests once all of them have been checked, so that
+// either all of them are created or none are. Each request must have its chain execution ID set.
+func (s *MemoryStore) CreateSupervisionRequests(ctx context.Context, requests []asteroid.SupervisionRequest) ([]uuid.UUID, error) {
+	s.mu.Lock()
+	defer s.mu.Unlock()
+
+	for i, request := range requests {
+		if request.ChainexecutionId == nil {
+			return nil, fmt.Errorf("chain execution ID is required for supervision request %d", i)
+		}
+		if err := s.checkSupervisionRequest(request); err != nil {
+			return nil, err
+		}
+	}
+
+	ids := make([]uuid.UUID, 0, len(requests))
+	for _, request := range requests {
+		ids = append(ids, s.createSupervisionRequest(request))
+	}
+
+	return ids, nil
+}
+
+// checkSupervisionRequest makes the checks the database's foreign keys make on a supervision request
+func (s *MemoryStore) checkSupervisionRequest(request asteroid.SupervisionRequest) error {
+	if _, ok := s.supervisors[request.SupervisorId]; !ok {
+		return fmt.Errorf("error creating supervision request: supervisor not found: %s", request.SupervisorId)
+	}
+	if _, ok := s.executions[*request.ChainexecutionId]; !ok {
+		return fmt.Errorf("error creating supervision request: chain execution not found: %s", *request.ChainexecutionId)
+	}
+	return nil
+}
+
+// createSupervisionRequest stores a supervision request as pending
+func (s *MemoryStore) createSupervisionRequest(request asteroid.SupervisionRequest) uuid.UUID {
+	id := uuid.New()
+	executionId := *request.ChainexecutionId
+	s.requests[id] = asteroid.SupervisionRequest{
+		ChainexecutionId: &executionId,
+		Id:               &id,
+		PositionInChain:  request.PositionInChain,
+		SupervisorId:     request.SupervisorId,
+	}
+	s.executionRequests[executionId] = append(s.executionRequests[executionId], id)
+
+	s.createSupervisionStatus(id, asteroid.SupervisionStatus{Status: asteroid.Pending, CreatedAt: time.Now()})
+
+	return id
+}
+
+func (s *MemoryStore) CreateSupervisionStatus(ctx context.Context, requestID uuid.UUID, status asteroid.SupervisionStatus) error {
+	s.mu.Lock()
+	defer s.mu.Unlock()
+
+	if _, ok := s.requests[requestID]; !ok {
+		return fmt.Errorf("error creating supervisor status: supervision request not found: %s", requestID)
+	}
+
+	s.createSupervisionStatus(requestID, status)
+	return nil
+}
+
+// createSupervisionStatus records a status of a supervision request, which becomes its current status.
+// Statuses are numbered in the order they are recorded, as the history table numbers them.
+func (s *MemoryStore) createSupervisionStatus(requestID uuid.UUID, status asteroid.SupervisionStatus) {
+	if current, ok := s.statuses[requestID]; ok {
+		// A completed request stays completed, as with PostgresqlStore
+		if current.Status == asteroid.Completed {
+			return
+		}
+		delete(s.requestsByStatus[current.Status], requestID)
+	}
+
+	s.lastStatusId++
+	id := requestID
+	s.statuses[requestID] = asteroid.SupervisionStatus{
+		CreatedAt:            status.CreatedAt,
+		Id:                   s.lastStatusId,
+		Status:               status.Status,
+		SupervisionRequestId: &id,
+	}
+
+	requests, ok := s.requestsByStatus[status.Status]
+	if !ok {
+		requests = make(map[uuid.UUID]bool)
+		s.requestsByStatus[status.Status] = requests
+	}
+	requests[requestID] = true
+}
+
+func (s *MemoryStore) GetSupervisionRequest(ctx context.Context, id uuid.UUID) (*asteroid.SupervisionRequest, error) {
+	s.mu.RLock()
+	defer s.mu.RUnlock()
+
+	if _, ok := s.requests[id]; !ok {
+		return nil, nil
+	}
+
+	return s.supervisionRequest(id), nil
+}
+
+// supervisionRequest returns a copy of a supervision request with its current status
+func (s *MemoryStore) supervisionRequest(id uuid.UUID) *asteroid.SupervisionRequest {
+	request := s.requests[id]
+
+	requestId := *request.Id
+	executionId := *request.ChainexecutionId
+	request.Id = &requestId
+	request.ChainexecutionId = &executionId
+
+	if status, ok := s.statuses[id]; ok {
+		request.Status = copyStatus(status)
+	}
+
+	return &request
+}
+
+// GetSupervisionRequestsForStatus returns the supervision requests with the status that the server
+// handles, oldest status first. Requests of client supervisors are left out.
+func (s *MemoryStore) GetSupervisionRequestsForStatus(ctx context.Context, status asteroid.Status) ([]asteroid.SupervisionRequest, error) {
+	s.mu.RLock()
+	defer s.mu.RUnlock()
+
+	var requests []asteroid.SupervisionRequest
+	for id := range s.requestsByStatus[status] {
+		if s.supervisors[s.requests[id].SupervisorId].Type == asteroid.ClientSupervisor {
+			continue
+		}
+		requests = append(requests, *s.supervisionRequest(id))
+	}
+	slices.SortFunc(requests, func(a, b asteroid.SupervisionRequest) int { return a.Status.Id - b.Status.Id })
+
+	return requests, nil
+}
+
+func (s *MemoryStore) CountSupervisionRequests(ctx context.Context, status asteroid.Status) (int, error) {
+	s.mu.RLock()
+	defer s.mu.RUnlock()
+
+	return len(s.requestsByStatus[status]), nil
+}
+
+func (s *MemoryStore) GetChainExecutionSupervisionRequests(ctx context.Context, chainExecutionId uuid.UUID) ([]asteroid.SupervisionRequest, error) {
+	s.mu.RLock()
+	defer s.mu.RUnlock()
+
+	requests := make([]asteroid.SupervisionRequest, 0, len(s.executionRequests[chainExecutionId]))
+	for _, id := range s.executionRequests[chainExecutionId] {
+		requests = append(requests, *s.supervisionRequest(id))
+	}
+	slices.SortFunc(requests, func(a, b asteroid.SupervisionRequest) int { return compareUUIDs(*a.Id, *b.Id) })
+
+	return requests, nil
+}
+
+// GetSupervisionRequestStatus gets the latest status for a supervision request
+func (s *MemoryStore) GetSupervisionRequestStatus(ctx context.Context, requestId uuid.UUID) (*asteroid.SupervisionStatus, error) {
+	s.mu.RLock()
+	defer s.mu.RUnlock()
+
+	status, ok := s.statuses[requestId]
+	if !ok {
+		return nil, nil
+	}
+
+	return copyStatus(status), nil
+}
+
+// GetSupervisionRequestStatuses returns the current status of each of the supervision requests that
+// exists
+func (s *MemoryStore) GetSupervisionRequestStatuses(ctx context.Context, requestIds []uuid.UUID) ([]asteroid.SupervisionStatus, error) {
+	s.mu.RLock()
+	defer s.mu.RUnlock()
+
+	statuses := make([]asteroid.SupervisionStatus, 0, len(requestIds))
+	seen := make(map[uuid.UUID]bool, len(requestIds))
+	for _, id := range requestIds {
+		status, ok := s.statuses[id]
+		if !ok || seen[id] {
+			continue
+		}
+		seen[id] = true
+		statuses = append(statuses, *copyStatus(status))
+	}
+
+	return statuses, nil
+}
+
+func copyStatus(status asteroid.SupervisionStatus) *asteroid.SupervisionStatus {
+	if status.SupervisionRequestId != nil {
+		id := *status.SupervisionRequestId
+		status.SupervisionRequestId = &id
+	}
+	return &status
+}
+
+func (s *MemoryStore) CreateSupervisionResult(ctx context.Context, result asteroid.SupervisionResult, requestId uuid.UUID) (*uuid.UUID, error) {
+	s.mu.Lock()
+	defer s.mu.Unlock()
+
+	if _, ok := s.requests[requestId]; !ok {
+		return nil, fmt.Errorf("error creating supervision result: supervision request not found: %s", requestId)
+	}
+
+	id := s.createSupervisionResult(result, requestId)
+	return &id, nil
+}
+
+// CreateSupervisionResults stores supervision results, each against the supervision request it names,
+// once all of the requests have been found
+func (s *MemoryStore) CreateSupervisionResults(ctx context.Context, results []asteroid.SupervisionResult) ([]uuid.UUID, error) {
+	s.mu.Lock()
+	defer s.mu.Unlock()
+
+	for _, result := range results {
+		if _, ok := s.requests[result.SupervisionRequestId]; !ok {
+			return nil, fmt.Errorf("error creating supervision result: supervision request not found: %s", result.SupervisionRequestId)
+		}
+	}
+
+	ids := make([]uuid.UUID, 0, len(results))
+	for _, result := range results {
+		ids = append(ids, s.createSupervisionResult(result, result.SupervisionRequestId))
+	}
+
+	return ids, nil
+}
+
+// createSupervisionResult stores a supervision result and marks its request completed. A request keeps
+// its latest result.
+func (s *MemoryStore) createSupervisionResult(result asteroid.SupervisionResult, requestId uuid.UUID) uuid.UUID {
+	id := uuid.New()
+	result.Id = &id
+	result.SupervisionRequestId = requestId
+	if result.ToolcallId != nil {
+		toolCallId := *result.ToolcallId
+		result.ToolcallId = &toolCallId
+	}
+
+	if existing, ok := s.results[requestId]; !ok || !result.CreatedAt.Before(existing.CreatedAt) {
+		s.results[requestId] = result
+	}
+
+	s.createSupervisionStatus(requestId, asteroid.SupervisionStatus{Status: asteroid.Completed, CreatedAt: result.CreatedAt})
+
+	return id
+}
+
+func (s *MemoryStore) GetSupervisionResultFromRequestID(ctx context.Context, requestId uuid.UUID) (*asteroid.SupervisionResult, error) {
+	s.mu.RLock()
+	defer s.mu.RUnlock()
+
+	result, ok := s.results[requestId]
+	if !ok {
+		return nil, nil
+	}
+
+	return copyResult(result), nil
+}
+
+func copyResult(result asteroid.SupervisionResult) *asteroid.SupervisionResult {
+	if result.Id != nil {
+		id := *result.Id
+		result.Id = &id
+	}
+	if result.ToolcallId != nil {
+		toolCallId := *result.ToolcallId
+		result.ToolcallId = &toolCallId
+	}
+	return &result
+}
+
+// GetExecutionFromChainId returns one of the executions of a chain
+func (s *MemoryStore) GetExecutionFromChainId(ctx context.Context, chainId uuid.UUID) (*uuid.UUID, error) {
+	s.mu.RLock()
+	defer s.mu.RUnlock()
+
+	executions := s.chainExecutions[chainId]
+	if len(executions) == 0 {
+		return nil, nil
+	}
+
+	id := executions[0]
+	return &id, nil
+}
+
+func (s *MemoryStore) GetChainExecution(ctx context.Context, executionId uuid.UUID) (*uuid.UUID, *uuid.UUID, error) {
+	s.mu.RLock()
+	defer s.mu.RUnlock()
+
+	execution, ok := s.executions[executionId]
+	if !ok {
+		return nil, nil, nil
+	}
+
+	return &execution.ChainId, &execution.ToolcallId, nil
+}
+
+func (s *MemoryStore) GetChainExecutionFromChainAndToolCall(ctx context.Context, chainId uuid.UUID, toolCallId uuid.UUID) (*uuid.UUID, error) {
+	s.mu.RLock()
+	defer s.mu.RUnlock()
+
+	id, ok := s.executionsByChainAndToolCall[memoryChainToolCallKey{chainId: chainId, toolCallId: toolCallId}]
+	if !ok {
+		return nil, nil
+	}
+
+	return &id, nil
+}
+
+func (s *MemoryStore) GetChainExecutionsFromToolCall(ctx context.Context, id uuid.UUID) ([]uuid.UUID, error) {
+	s.mu.RLock()
+	defer s.mu.RUnlock()
+
+	ids := slices.Clone(s.toolCallExecutions[id])
+	if ids == nil {
+		ids = make([]uuid.UUID, 0)
+	}
+
+	return ids, nil
+}
+
+// GetChainExecutionState returns the chain state for a given chain execution ID
+func (s *MemoryStore) GetChainExecutionState(ctx context.Context, executionId uuid.UUID) (*asteroid.ChainExecutionState, error) {
+	states, err := s.GetChainExecutionStates(ctx, []uuid.UUID{executionId})
+	if err != nil {
+		return nil, err
+	}
+	if len(states) == 0 {
+		return nil, nil
+	}
+
+	return &states[0], nil
+}
+
+// GetChainExecutionStates returns the chain states for the given chain execution IDs, oldest execution
+// first. Executions that don't exist are left out.
+func (s *MemoryStore) GetChainExecutionStates(ctx context.Context, executionIds []uuid.UUID) ([]asteroid.ChainExecutionState, error) {
+	s.mu.RLock()
+	defer s.mu.RUnlock()
+
+	return s.chainExecutionStates(executionIds), nil
+}
+
+// GetToolCallChainExecutionStates returns the states of all chain executions of a tool call
+func (s *MemoryStore) GetToolCallChainExecutionStates(ctx context.Context, toolCallId uuid.UUID) ([]asteroid.ChainExecutionState, error) {
+	s.mu.RLock()
+	defer s.mu.RUnlock()
+
+	return s.chainExecutionStates(s.toolCallExecutions[toolCallId]), nil
+}
+
+func (s *MemoryStore) chainExecutionStates(executionIds []uuid.UUID) []asteroid.ChainExecutionState {
+	executions := make([]asteroid.ChainExecution, 0, len(executionIds))
+	seen := make(map[uuid.UUID]bool, len(executionIds))
+	for _, id := range executionIds {
+		execution, ok := s.executions[id]
+		if !ok || seen[id] {
+			continue
+		}
+		seen[id] = true
+		executions = append(executions, execution)
+	}
+	slices.SortFunc(executions, func(a, b asteroid.ChainExecution) int {
+		if c := a.CreatedAt.Compare(b.CreatedAt); c != 0 {
+			return c
+		}
+		return compareUUIDs(a.Id, b.Id)
+	})
+
+	states := make([]asteroid.ChainExecutionState, 0, len(executions))
+	for _, execution := range executions {
+		requests := s.executionRequests[execution.Id]
+		state := asteroid.ChainExecutionState{
+			Chain:               s.supervisorChain(execution.ChainId),
+			ChainExecution:      execution,
+			SupervisionRequests: make([]asteroid.SupervisionRequestState, 0, len(requests)),
+		}
+
+		for _, id := range requests {
+			request := s.supervisionRequest(id)
+			requestState := asteroid.SupervisionRequestState{SupervisionRequest: *request}
+			if request.Status != nil {
+				requestState.Status = *copyStatus(*request.Status)
+			}
+			if result, ok := s.results[id]; ok {
+				requestState.Result = copyResult(result)
+			}
+			state.SupervisionRequests = append(state.SupervisionRequests, requestState)
+		}
+		slices.SortFunc(state.SupervisionRequests, func(a, b asteroid.SupervisionRequestState) int {
+			return compareUUIDs(*a.SupervisionRequest.Id, *b.SupervisionRequest.Id)
+		})
+
+		states = append(states, state)
+	}
+
+	return states
+}
+
+// ChatStore implementation
+
+// CreateChatRequest stores a chat with its choices, messages and tool calls, and initialises a chain
+// execution for every chain configured on each tool called. Everything is checked before anything is
+// stored, as the PostgreSQL store does it in one transaction.
+func (s *MemoryStore) CreateChatRequest(
+	ctx context.Context,
+	runId uuid.UUID,
+	request []byte,
+	response []byte,
+	choices []asteroid.AsteroidChoice,
+	format string,
+	requestMessages []asteroid.AsteroidMessage,
+) (*uuid.UUID, error) {
+	if len(request) == 0 {
+		return nil, fmt.Errorf("request is empty")
+	}
+	if !json.Valid(request) {
+		return nil, fmt.Errorf("error unmarshalling chat request: invalid JSON")
+	}
+
+	// Messages and tool calls are stored as JSON, as they are in the database
+	var messages []asteroid.AsteroidMessage
+	var toolCalls []memoryToolCall
+	for i, choice := range choices {
+		if _, err := uuid.Parse(choice.AsteroidId); err != nil {
+			return nil, fmt.Errorf("error creating chat choices: error parsing AsteroidId: %w", err)
+		}
+
+		// The request messages are shared by every choice of the chat, so they are stored once with the first
+		if i == 0 {
+			messages = append(messages, requestMessages...)
+		}
+		messages = append(messages, choice.Message)
+
+		if choice.Message.ToolCalls == nil {
+			continue
+		}
+		for _, toolCall := range *choice.Message.ToolCalls {
+			data, err := json.Marshal(toolCall)
+			if err != nil {
+				return nil, fmt.Errorf("error creating chat choices: error creating tool calls: error marshalling tool call data: %w", err)
+			}
+			toolCalls = append(toolCalls, memoryToolCall{toolCall: toolCall, data: string(data)})
+		}
+	}
+	for _, message := range messages {
+		if message.Id == nil {
+			return nil, fmt.Errorf("error creating chat choices: message ID is nil")
+		}
+	}
+
+	s.mu.Lock()
+	defer s.mu.Unlock()
+
+	if _, ok := s.runs[runId]; !ok {
+		return nil, fmt.Errorf("error creating chat entry: run not found: %s", runId)
+	}
+	for _, message := range messages {
+		if _, ok := s.messages[*message.Id]; ok {
+			return nil, fmt.Errorf("error creating chat choices: error creating chat messages: message %s already exists", *message.Id)
+		}
+	}
+	for _, toolCall := range toolCalls {
+		if _, ok := s.toolCalls[toolCall.toolCall.Id]; ok {
+			return nil, fmt.Errorf("error creating chat choices: error creating tool calls: tool call %s already exists", toolCall.toolCall.Id)
+		}
+		if _, ok := s.tools[toolCall.toolCall.ToolId]; !ok {
+			return nil, fmt.Errorf("error creating chat choices: error creating tool calls: tool not found: %s", toolCall.toolCall.ToolId)
+		}
+	}
+
+	id := uuid.New()
+	s.chats[runId] = append(s.chats[runId], memoryChat{
+		id:       id,
+		request:  slices.Clone(request),
+		response: slices.Clone(response),
+		format:   format,
+	})
+
+	for _, message := range messages {
+		s.messages[*message.Id] = copyMessage(message)
+	}
+
+	now := time.Now()
+	for _, toolCall := range toolCalls {
+		toolCall.toolCall.CreatedAt = &now
+		toolCall.runId = runId
+		s.toolCalls[toolCall.toolCall.Id] = toolCall
+		if toolCall.toolCall.CallId != nil {
+			if _, ok := s.toolCallsByCallId[*toolCall.toolCall.CallId]; !ok {
+				s.toolCallsByCallId[*toolCall.toolCall.CallId] = toolCall.toolCall.Id
+			}
+		}
+
+		for _, chainId := range s.runToolChains[memoryRunToolKey{runId: runId, toolId: toolCall.toolCall.ToolId}] {
+			execution := asteroid.ChainExecution{
+				ChainId:    chainId,
+				CreatedAt:  now,
+				Id:         uuid.New(),
+				ToolcallId: toolCall.toolCall.Id,
+			}
+			s.executions[execution.Id] = execution
+			s.chainExecutions[chainId] = append(s.chainExecutions[chainId], execution.Id)
+			s.toolCallExecutions[execution.ToolcallId] = append(s.toolCallExecutions[execution.ToolcallId], execution.Id)
+			s.executionsByChainAndToolCall[memoryChainToolCallKey{chainId: chainId, toolCallId: execution.ToolcallId}] = execution.Id
+		}
+	}
+
+	return &id, nil
+}
+
+// GetChat returns the request and response of a run's chat, counting back from the latest
+func (s *MemoryStore) GetChat(
+	ctx context.Context,
+	runId uuid.UUID,
+	index int,
+) ([]byte, []byte, error) {
+	s.mu.RLock()
+	defer s.mu.RUnlock()
+
+	chats := s.chats[runId]
+	position := len(chats) - 1 - index
+	if index < 0 || position < 0 {
+		return nil, nil, fmt.Errorf("error getting message: chat %d of run %s not found", index, runId)
+	}
+
+	chat := chats[position]
+	return slices.Clone(chat.request), slices.Clone(chat.response), nil
+}
+
+func (s *MemoryStore) GetMessage(ctx context.Context, id uuid.UUID) (*asteroid.AsteroidMessage, error) {
+	s.mu.RLock()
+	defer s.mu.RUnlock()
+
+	message, ok := s.messages[id]
+	if !ok {
+		return nil, fmt.Errorf("error getting message: message not found: %s", id)
+	}
+
+	message = copyMessage(message)
+	return &message, nil
+}
+
+func (s *MemoryStore) UpdateMessage(ctx context.Context, id uuid.UUID, message asteroid.AsteroidMessage) error {
+	s.mu.Lock()
+	defer s.mu.Unlock()
+
+	// As with an UPDATE, a message that doesn't exist is left alone
+	if _, ok := s.messages[id]; ok {
+		s.messages[id] = copyMessage(message)
+	}
+
+	return nil
+}
+
+func (s *MemoryStore) GetRunChatCount(ctx context.Context, runId uuid.UUID) (int, error) {
+	s.mu.RLock()
+	defer s.mu.RUnlock()
+
+	return len(s.chats[runId]), nil
+}
+
+// copyMessage copies a message and its tool calls, so that callers can't change what is stored
+func copyMessage(message asteroid.AsteroidMessage) asteroid.AsteroidMessage {
+	if message.ToolCalls != nil {
+		toolCalls := slices.Clone(*message.ToolCalls)
+		message.ToolCalls = &toolCalls
+	}
+	return message
+}
@@ -0,0 +1,151 @@
+package database
+
+import (
+	"context"
+	"database/sql"
+	"embed"
+	"fmt"
+	"log"
+	"path"
+	"sort"
+	"strconv"
+	"strings"
+)
+
+// Schema changes made after the baseline in db/init/schema.sql. Each file is named <version>_<name>.sql
+// and is applied once, in version order, in its own transaction.
+//
+//go:embed migrations/*.sql
+var migrationFiles embed.FS
+
+// An arbitrary key for the advisory lock held while migrating, so that replicas starting together
+// don't apply the same migration twice
+const migrationLockKey = 7305912864
+
+type migration struct {
+	version int
+	name    string
+	sql     string
+}
+
+func loadMigrations() ([]migration, error) {
+	entries, err := migrationFiles.ReadDir("migrations")
+	if err != nil {
+		return nil, fmt.Errorf("error reading migrations: %w", err)
+	}
+
+	migrations := make([]migration, 0, len(entries))
+	seen := make(map[int]string)
+	for _, entry := range entries {
+		name := entry.Name()
+		prefix, _, ok := strings.Cut(name, "_")
+		if !ok {
+			return nil, fmt.Errorf("migration %s is not named <version>_<name>.sql", name)
+		}
+		version, err := strconv.Atoi(prefix)
+		if err != nil {
+			return nil, fmt.Errorf("migration %s has an invalid version: %w", name, err)
+		}
+		if other, ok := seen[version]; ok {
+			return nil, fmt.Errorf("migrations %s and %s have the same version", other, name)
+		}
+		seen[version] = name
+
+		data, err := migrationFiles.ReadFile(path.Join("migrations", name))
+		if err != nil {
+			return nil, fmt.Errorf("error reading migration %s: %w", name, err)
+		}
+		migrations = append(migrations, migration{version: version, name: name, sql: string(data)})
+	}
+
+	sort.Slice(migrations, func(i, j int) bool { return migrations[i].version < migrations[j].version })
+	return migrations, nil
+}
+
+// migrate applies the migrations the database doesn't have yet
+func migrate(ctx context.Context, db *sql.DB) error {
+	migrations, err := loadMigrations()
+	if err != nil {
+		return err
+	}
+
+	// The advisory lock belongs to a session, so everything runs on one connection
+	conn, err := db.Conn(ctx)
+	if err != nil {
+		return fmt.Errorf("error getting connection: %w", err)
+	}
+	defer conn.Close()
+
+	if _, err := conn.ExecContext(ctx, `SELECT pg_advisory_lock($1)`, migrationLockKey); err != nil {
+		return fmt.Errorf("error taking migration lock: %w", err)
+	}
+	defer func() {
+		_, _ = conn.ExecContext(context.Background(), `SELECT pg_advisory_unlock($1)`, migrationLockKey)
+	}()
+
+	_, err = conn.ExecContext(ctx, `
+		CREATE TABLE IF NOT EXISTS schema_migrations (
+			version INTEGER PRIMARY KEY,
+			name TEXT NOT NULL,
+			applied_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP NOT NULL
+		)`)
+	if err != nil {
+		return fmt.Errorf("error creating schema_migrations: %w", err)
+	}
+
+	applied := make(map[int]bool)
+	rows, err := conn.QueryContext(ctx, `SELECT version FROM schema_migrations`)
+	if err != nil {
+		return fmt.Errorf("error getting applied migrations: %w", err)
+	}
+	for rows.Next() {
+		var version int
+		if err := rows.Scan(&version); err != nil {
+			rows.Close()
+			return fmt.Errorf("error scanning applied migration: %w", err)
+		}
+		applied[version] = true
+	}
+	rows.Close()
+	if err := rows.Err(); err != nil {
+		return fmt.Errorf("error getting applied migrations: %w", err)
+	}
+
+	for _, m := range migrations {
+		if applied[m.version] {
+			continue
+		}
+		if err := applyMigration(ctx, conn, m); err != nil {
+			return err
+		}
+		log.Printf("Applied migration %s", m.name)
+	}
+
+	return nil
+}
+
+func applyMigration(ctx context.Context, conn *sql.Conn, m migration) error {
+	tx, err := conn.BeginTx(ctx, nil)
+	if err != nil {
+		return fmt.Errorf("error starting transaction: %w", err)
+	}
+	defer func() {
+		_ = tx.Rollback()
+	}()
+
+	// Without arguments the whole file is sent as one simple query, so it can hold several statements
+	if _, err := tx.ExecContext(ctx, m.sql); err != nil {
+		return fmt.Errorf("error applying migration %s: %w", m.name, err)
+	}
+
+	_, err = tx.ExecContext(ctx, `INSERT INTO schema_migrations (version, name) VALUES ($1, $2)`, m.version, m.name)
+	if err != nil {
+		return fmt.Errorf("error recording migration %s: %w", m.name, err)
+	}
+
+	if err := tx.Commit(); err != nil {
+		return fmt.Errorf("error committing migration %s: %w", m.name, err)
+	}
+
+	return nil
+}
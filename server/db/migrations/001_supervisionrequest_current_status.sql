@@ -0,0 +1,19 @@
+-- The latest row of supervisionrequest_status for every supervision request, maintained in the same
+-- transaction as the history so current status lookups don't have to scan it
+CREATE TABLE IF NOT EXISTS supervisionrequest_current_status (
+    supervisionrequest_id UUID PRIMARY KEY REFERENCES supervisionrequest(id),
+    status_id INTEGER NOT NULL REFERENCES supervisionrequest_status(id),
+    created_at TIMESTAMP WITH TIME ZONE NOT NULL,
+    status TEXT NOT NULL CHECK (status IN ('timeout', 'pending', 'completed', 'failed', 'assigned'))
+);
+
+INSERT INTO supervisionrequest_current_status (supervisionrequest_id, status_id, created_at, status)
+SELECT DISTINCT ON (supervisionrequest_id)
+    supervisionrequest_id, id, COALESCE(created_at, now()), COALESCE(status, 'pending')
+FROM supervisionrequest_status
+WHERE supervisionrequest_id IS NOT NULL
+ORDER BY supervisionrequest_id, id DESC
+ON CONFLICT (supervisionrequest_id) DO NOTHING;
+
+CREATE INDEX IF NOT EXISTS supervisionrequest_current_status_status_idx
+    ON supervisionrequest_current_status (status, status_id);
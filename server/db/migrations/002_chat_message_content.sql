@@ -0,0 +1,9 @@
+-- Chat request messages, stored once however many requests of a conversation resend them
+CREATE TABLE IF NOT EXISTS chat_message_content (
+    hash BYTEA PRIMARY KEY,
+    data JSONB NOT NULL
+);
+
+-- The request without its messages is kept in request_data, with the messages listed in order by hash.
+-- Chats stored before this migration keep their messages in request_data and have no hashes.
+ALTER TABLE chat ADD COLUMN IF NOT EXISTS message_hashes BYTEA[] DEFAULT '{}' NOT NULL;
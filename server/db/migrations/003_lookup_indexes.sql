@@ -0,0 +1,18 @@
+-- Indexes for the lookups made on every tool call and supervision decision
+CREATE INDEX IF NOT EXISTS toolcall_call_id_idx ON toolcall (call_id);
+CREATE INDEX IF NOT EXISTS tool_run_id_name_idx ON tool (run_id, name);
+CREATE INDEX IF NOT EXISTS chain_supervisor_chain_id_idx ON chain_supervisor (chain_id, position_in_chain);
+CREATE INDEX IF NOT EXISTS chainexecution_chain_id_toolcall_id_idx ON chainexecution (chain_id, toolcall_id);
+CREATE INDEX IF NOT EXISTS chainexecution_toolcall_id_idx ON chainexecution (toolcall_id);
+CREATE INDEX IF NOT EXISTS supervisionrequest_chainexecution_id_idx ON supervisionrequest (chainexecution_id);
+CREATE INDEX IF NOT EXISTS supervisionrequest_status_supervisionrequest_id_idx
+    ON supervisionrequest_status (supervisionrequest_id, id);
+CREATE INDEX IF NOT EXISTS supervisionresult_supervisionrequest_id_idx
+    ON supervisionresult (supervisionrequest_id, created_at DESC);
+
+-- Indexes for paging through listings in the order they are returned
+CREATE INDEX IF NOT EXISTS project_created_at_idx ON project (created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS task_project_id_created_at_idx ON task (project_id, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS run_task_id_created_at_idx ON run (task_id, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS tool_run_id_idx ON tool (run_id, id);
+CREATE INDEX IF NOT EXISTS chat_run_id_created_at_idx ON chat (run_id, created_at DESC, id);
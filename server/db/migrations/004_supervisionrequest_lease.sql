@@ -0,0 +1,11 @@
+-- Which server is handling a human supervision request. A server leases the requests it hands to its
+-- reviewers and keeps renewing the lease while it holds them; once a lease expires, e.g. because the
+-- server went away, any server can claim the request again.
+CREATE TABLE IF NOT EXISTS supervisionrequest_lease (
+    supervisionrequest_id UUID PRIMARY KEY REFERENCES supervisionrequest(id),
+    holder TEXT NOT NULL,
+    expires_at TIMESTAMP WITH TIME ZONE NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS supervisionrequest_lease_holder_idx
+    ON supervisionrequest_lease (holder);
@@ -0,0 +1,3 @@
+-- How long the server reuses a supervisor's decision on an identical tool call. NULL leaves the
+-- decision cache off for the supervisor.
+ALTER TABLE supervisor ADD COLUMN IF NOT EXISTS decision_cache_ttl_seconds INTEGER;
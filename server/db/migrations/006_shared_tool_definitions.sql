@@ -0,0 +1,30 @@
+-- Tool definitions are shared by the runs of a project that register the same tool. definition_hash is
+-- a SHA-256 of the definition computed by the server, and run_tool links each run to the definitions it
+-- uses. tool.run_id is kept as the run that first registered the definition. Tools created before this
+-- migration have no hash and stay linked to their own run only.
+ALTER TABLE tool ADD COLUMN IF NOT EXISTS project_id UUID REFERENCES project(id);
+ALTER TABLE tool ADD COLUMN IF NOT EXISTS definition_hash BYTEA;
+
+UPDATE tool
+SET project_id = task.project_id
+FROM run
+JOIN task ON task.id = run.task_id
+WHERE run.id = tool.run_id AND tool.project_id IS NULL;
+
+CREATE UNIQUE INDEX IF NOT EXISTS tool_project_id_definition_hash_idx
+    ON tool (project_id, definition_hash) WHERE definition_hash IS NOT NULL;
+CREATE INDEX IF NOT EXISTS tool_project_id_idx ON tool (project_id, id);
+
+CREATE TABLE IF NOT EXISTS run_tool (
+    run_id UUID REFERENCES run(id),
+    tool_id UUID REFERENCES tool(id),
+    PRIMARY KEY (run_id, tool_id)
+);
+
+CREATE INDEX IF NOT EXISTS run_tool_tool_id_idx ON run_tool (tool_id);
+
+INSERT INTO run_tool (run_id, tool_id)
+SELECT run_id, id
+FROM tool
+WHERE run_id IS NOT NULL
+ON CONFLICT DO NOTHING;
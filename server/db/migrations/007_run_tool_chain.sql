@@ -0,0 +1,16 @@
+-- The supervisor chains of each run's tools. Tool definitions are shared by the runs of a project, and
+-- chain_tool keeps every chain any run registered on a definition so identical chains are reused, but a
+-- tool call only runs the chains its own run registered. Existing runs keep all the chains of their
+-- tools, as before this migration.
+CREATE TABLE IF NOT EXISTS run_tool_chain (
+    run_id UUID REFERENCES run(id),
+    tool_id UUID REFERENCES tool(id),
+    chain_id UUID REFERENCES chain(id),
+    PRIMARY KEY (run_id, tool_id, chain_id)
+);
+
+INSERT INTO run_tool_chain (run_id, tool_id, chain_id)
+SELECT rt.run_id, rt.tool_id, ct.chain_id
+FROM run_tool rt
+JOIN chain_tool ct ON ct.tool_id = rt.tool_id
+ON CONFLICT DO NOTHING;
@@ -2,6 +2,7 @@ package database
 
 import (
 	"context"
+	"crypto/sha256"
 	"database/sql"
 	"encoding/json"
 	"errors"
@@ -9,6 +10,9 @@ import (
 	"log"
 	"net"
 	"os"
+	"slices"
+	"strconv"
+	"strings"
 	"time"
 
 	"cloud.google.com/go/cloudsqlconn"
@@ -22,10 +26,22 @@ import (
 
 type PostgresqlStore struct {
 	db *sql.DB
+	// statements holds the prepared statements by query text
+	statements map[string]*preparedStatement
 }
 
 // Check if PostgresqlStore implements asteroid.Store
 var _ asteroid.Store = &PostgresqlStore{}
+var _ asteroid.StatsStore = &PostgresqlStore{}
+
+// Connection pool defaults, overridden by DB_MAX_OPEN_CONNS, DB_MAX_IDLE_CONNS, DB_CONN_MAX_LIFETIME
+// and DB_CONN_MAX_IDLE_TIME
+const (
+	DEFAULT_MAX_OPEN_CONNS     = 20
+	DEFAULT_MAX_IDLE_CONNS     = 10
+	DEFAULT_CONN_MAX_LIFETIME  = 30 * time.Minute
+	DEFAULT_CONN_MAX_IDLE_TIME = 5 * time.Minute
+)
 
 // NewPostgresqlStore creates a new PostgreSQL store
 func NewPostgresqlStore() (*PostgresqlStore, error) {
@@ -51,11 +67,66 @@ func NewPostgresqlStore() (*PostgresqlStore, error) {
 		}
 	}
 
+	configurePool(db)
+
+	return NewPostgresqlStoreWithDB(db)
+}
+
+// NewPostgresqlStoreWithDB creates a PostgreSQL store on an open database, bringing its schema up to
+// date and preparing the store's statements first
+func NewPostgresqlStoreWithDB(db *sql.DB) (*PostgresqlStore, error) {
+	ctx := context.Background()
+
 	if err := db.Ping(); err != nil {
 		return nil, fmt.Errorf("error connecting to the database: %w", err)
 	}
 
-	return &PostgresqlStore{db: db}, nil
+	if err := migrate(ctx, db); err != nil {
+		return nil, fmt.Errorf("error migrating the database: %w", err)
+	}
+
+	statements, err := prepareStatements(ctx, db)
+	if err != nil {
+		return nil, fmt.Errorf("error preparing statements: %w", err)
+	}
+
+	return &PostgresqlStore{db: db, statements: statements}, nil
+}
+
+// configurePool sizes the connection pool from the environment. Without limits database/sql opens a
+// connection for every concurrent query and keeps only two idle, so bursts of requests open and close
+// connections faster than Postgres can accept them.
+func configurePool(db *sql.DB) {
+	db.SetMaxOpenConns(envInt("DB_MAX_OPEN_CONNS", DEFAULT_MAX_OPEN_CONNS))
+	db.SetMaxIdleConns(envInt("DB_MAX_IDLE_CONNS", DEFAULT_MAX_IDLE_CONNS))
+	db.SetConnMaxLifetime(envDuration("DB_CONN_MAX_LIFETIME", DEFAULT_CONN_MAX_LIFETIME))
+	db.SetConnMaxIdleTime(envDuration("DB_CONN_MAX_IDLE_TIME", DEFAULT_CONN_MAX_IDLE_TIME))
+}
+
+func envInt(name string, fallback int) int {
+	value := os.Getenv(name)
+	if value == "" {
+		return fallback
+	}
+	parsed, err := strconv.Atoi(value)
+	if err != nil || parsed <= 0 {
+		log.Printf("Invalid %s %q, using %d", name, value, fallback)
+		return fallback
+	}
+	return parsed
+}
+
+func envDuration(name string, fallback time.Duration) time.Duration {
+	value := os.Getenv(name)
+	if value == "" {
+		return fallback
+	}
+	parsed, err := time.ParseDuration(value)
+	if err != nil || parsed <= 0 {
+		log.Printf("Invalid %s %q, using %s", name, value, fallback)
+		return fallback
+	}
+	return parsed
 }
 
 // connectWithCloudSQL handles Cloud SQL connection in production
@@ -105,8 +176,9 @@ func connectWithCloudSQL() (*sql.DB, error) {
 	return dbPool, nil
 }
 
-// Close closes the database connection
+// Close closes the prepared statements and the database connection
 func (s *PostgresqlStore) Close() error {
+	closeStatements(s.statements)
 	return s.db.Close()
 }
 
@@ -125,13 +197,8 @@ func (s *PostgresqlStore) CreateProject(ctx context.Context, project asteroid.Pr
 }
 
 func (s *PostgresqlStore) GetProject(ctx context.Context, id uuid.UUID) (*asteroid.Project, error) {
-	query := `
-		SELECT id, name, created_at, run_result_tags
-		FROM project
-		WHERE id = $1`
-
 	var project asteroid.Project
-	err := s.db.QueryRowContext(ctx, query, id).Scan(
+	err := s.queryRowContext(ctx, getProjectQuery, id).Scan(
 		&project.Id,
 		&project.Name,
 		&project.CreatedAt,
@@ -148,13 +215,8 @@ func (s *PostgresqlStore) GetProject(ctx context.Context, id uuid.UUID) (*astero
 }
 
 func (s *PostgresqlStore) GetProjectFromName(ctx context.Context, name string) (*asteroid.Project, error) {
-	query := `
-		SELECT id, name, created_at, run_result_tags
-		FROM project
-		WHERE name = $1`
-
 	var project asteroid.Project
-	err := s.db.QueryRowContext(ctx, query, name).Scan(
+	err := s.queryRowContext(ctx, getProjectFromNameQuery, name).Scan(
 		&project.Id,
 		&project.Name,
 		&project.CreatedAt,
@@ -171,16 +233,10 @@ func (s *PostgresqlStore) GetProjectFromName(ctx context.Context, name string) (
 }
 
 func (s *PostgresqlStore) GetToolFromNameAndRunId(ctx context.Context, name string, runId uuid.UUID) (*asteroid.Tool, error) {
-	query := `
-		SELECT id, name, description, attributes, ignored_attributes, code
-		FROM tool
-		WHERE name = $1
-		AND run_id = $2`
-
 	var tool asteroid.Tool
 	var attributesJSON []byte
 	var toolIgnoredAttributes []string
-	err := s.db.QueryRowContext(ctx, query, name, runId).Scan(
+	err := s.queryRowContext(ctx, getToolFromNameAndRunIdQuery, name, runId).Scan(
 		&tool.Id,
 		&tool.Name,
 		&tool.Description,
@@ -194,6 +250,7 @@ func (s *PostgresqlStore) GetToolFromNameAndRunId(ctx context.Context, name stri
 	if err != nil {
 		return nil, fmt.Errorf("error getting tool from name: %w", err)
 	}
+	tool.RunId = runId
 
 	// Parse the JSON attributes if they exist
 	if len(attributesJSON) > 0 {
@@ -261,15 +318,17 @@ func (s *PostgresqlStore) GetSupervisorFromValues(
 	desc string,
 	t asteroid.SupervisorType,
 	attributes map[string]interface{},
+	decisionCacheTtlSeconds *int,
 ) (*asteroid.Supervisor, error) {
 	query := `
-		SELECT id, code, name, description, type, created_at
+		SELECT id, code, name, description, type, created_at, decision_cache_ttl_seconds
 		FROM supervisor
 		WHERE code = $1
 		AND name = $2
 		AND description = $3
 		AND type = $4
-		AND attributes = $5`
+		AND attributes = $5
+		AND decision_cache_ttl_seconds IS NOT DISTINCT FROM $6`
 
 	attrJSON, err := json.Marshal(attributes)
 	if err != nil {
@@ -278,9 +337,10 @@ func (s *PostgresqlStore) GetSupervisorFromValues(
 
 	var supervisor asteroid.Supervisor
 	err = s.db.QueryRowContext(
-		ctx, query, code, name, desc, t, attrJSON,
+		ctx, query, code, name, desc, t, attrJSON, decisionCacheTtlSeconds,
 	).Scan(
 		&supervisor.Id, &supervisor.Code, &supervisor.Name, &supervisor.Description, &supervisor.Type, &supervisor.CreatedAt,
+		&supervisor.DecisionCacheTtlSeconds,
 	)
 	if errors.Is(err, sql.ErrNoRows) {
 		return nil, nil
@@ -295,19 +355,39 @@ func (s *PostgresqlStore) GetSupervisorFromValues(
 	return &supervisor, nil
 }
 
-func (s *PostgresqlStore) GetProjects(ctx context.Context) ([]asteroid.Project, error) {
+// pageArgs returns the query arguments of a page: the created_at and ID of the row the page starts
+// after, both NULL for the first page, and the row limit, NULL for no limit
+func pageArgs(page asteroid.Page) (*time.Time, *uuid.UUID, *int) {
+	var createdAt *time.Time
+	var id *uuid.UUID
+	if page.After != nil {
+		createdAt = page.After.CreatedAt
+		id = &page.After.Id
+	}
+
+	var limit *int
+	if page.Limit > 0 {
+		limit = &page.Limit
+	}
+
+	return createdAt, id, limit
+}
+
+func (s *PostgresqlStore) GetProjects(ctx context.Context, page asteroid.Page, each func(asteroid.Project) error) error {
 	query := `
 		SELECT id, name, created_at, run_result_tags
 		FROM project
-		ORDER BY created_at DESC`
+		WHERE $1::timestamptz IS NULL OR (created_at, id) < ($1, $2::uuid)
+		ORDER BY created_at DESC, id DESC
+		LIMIT $3`
 
-	rows, err := s.db.QueryContext(ctx, query)
-	if err != nil && err != sql.ErrNoRows {
-		return nil, fmt.Errorf("error listing projects: %w", err)
+	afterCreatedAt, afterId, limit := pageArgs(page)
+	rows, err := s.db.QueryContext(ctx, query, afterCreatedAt, afterId, limit)
+	if err != nil {
+		return fmt.Errorf("error listing projects: %w", err)
 	}
 	defer rows.Close()
 
-	projects := make([]asteroid.Project, 0)
 	for rows.Next() {
 		var project asteroid.Project
 		if err := rows.Scan(
@@ -316,12 +396,14 @@ func (s *PostgresqlStore) GetProjects(ctx context.Context) ([]asteroid.Project,
 			&project.CreatedAt,
 			pq.Array(&project.RunResultTags),
 		); err != nil {
-			return nil, fmt.Errorf("error scanning project: %w", err)
+			return fmt.Errorf("error scanning project: %w", err)
+		}
+		if err := each(project); err != nil {
+			return err
 		}
-		projects = append(projects, project)
 	}
 
-	return projects, nil
+	return rows.Err()
 }
 
 func (s *PostgresqlStore) GetRuns(ctx context.Context, taskId uuid.UUID) ([]asteroid.Run, error) {
@@ -349,38 +431,43 @@ func (s *PostgresqlStore) GetRuns(ctx context.Context, taskId uuid.UUID) ([]aste
 	return runs, nil
 }
 
-func (s *PostgresqlStore) GetTaskRuns(ctx context.Context, taskId uuid.UUID) ([]asteroid.Run, error) {
+func (s *PostgresqlStore) GetTaskRuns(ctx context.Context, taskId uuid.UUID, page asteroid.Page, each func(asteroid.Run) error) error {
 	query := `
 		SELECT id, task_id, created_at, status, result
 		FROM run
-		WHERE task_id = $1`
+		WHERE task_id = $1 AND ($2::timestamptz IS NULL OR (created_at, id) < ($2, $3::uuid))
+		ORDER BY created_at DESC, id DESC
+		LIMIT $4`
 
-	rows, err := s.db.QueryContext(ctx, query, taskId)
-	if err != nil && err != sql.ErrNoRows {
-		return nil, fmt.Errorf("error getting task runs: %w", err)
+	afterCreatedAt, afterId, limit := pageArgs(page)
+	rows, err := s.db.QueryContext(ctx, query, taskId, afterCreatedAt, afterId, limit)
+	if err != nil {
+		return fmt.Errorf("error getting task runs: %w", err)
 	}
 	defer rows.Close()
 
-	runs := make([]asteroid.Run, 0)
 	for rows.Next() {
 		var run asteroid.Run
 		if err := rows.Scan(&run.Id, &run.TaskId, &run.CreatedAt, &run.Status, &run.Result); err != nil {
-			return nil, fmt.Errorf("error scanning run: %w", err)
+			return fmt.Errorf("error scanning run: %w", err)
+		}
+		if err := each(run); err != nil {
+			return err
 		}
-		runs = append(runs, run)
 	}
 
-	// If no rows were found, runs will be empty slice
-	return runs, nil
+	return rows.Err()
 }
 
-func (s *PostgresqlStore) getChainsForTool(ctx context.Context, toolId uuid.UUID) ([]uuid.UUID, error) {
-	query := `
-		SELECT chain_id
-		FROM chain_tool ct
-		WHERE tool_id = $1`
-
-	rows, err := s.db.QueryContext(ctx, query, toolId)
+// getChainsForTool returns the chains of a tool, only those of the run when one is given
+func (s *PostgresqlStore) getChainsForTool(ctx context.Context, toolId uuid.UUID, runId *uuid.UUID) ([]uuid.UUID, error) {
+	var rows *sql.Rows
+	var err error
+	if runId != nil {
+		rows, err = s.queryContext(ctx, getRunChainsForToolQuery, *runId, toolId)
+	} else {
+		rows, err = s.queryContext(ctx, getChainsForToolQuery, toolId)
+	}
 	if err != nil {
 		return nil, fmt.Errorf("error getting chains: %w", err)
 	}
@@ -398,10 +485,21 @@ func (s *PostgresqlStore) getChainsForTool(ctx context.Context, toolId uuid.UUID
 	return chainIds, nil
 }
 
-func (s *PostgresqlStore) CreateSupervisorChain(ctx context.Context, toolId uuid.UUID, chain asteroid.ChainRequest) (*uuid.UUID, error) {
-	ids := *chain.SupervisorIds
-	if ids == nil {
-		return nil, fmt.Errorf("supervisor IDs are required to make a chain of supervisors")
+// CreateSupervisorChains adds chains of supervisors to a tool for a run, returning their IDs in order.
+// Every run sharing the tool's definition registers its chains again, so a chain the tool already has,
+// with the same supervisors in the same order, is reused instead of creating another. Without a run, the
+// chains are added for the runs using the tool that have no chains for it yet, which is the run that has
+// just registered the tool when runs register their tools and chains one after the other.
+func (s *PostgresqlStore) CreateSupervisorChains(
+	ctx context.Context,
+	toolId uuid.UUID,
+	runId uuid.UUID,
+	chains []asteroid.ChainRequest,
+) ([]uuid.UUID, error) {
+	for _, chain := range chains {
+		if chain.SupervisorIds == nil {
+			return nil, fmt.Errorf("supervisor IDs are required to make a chain of supervisors")
+		}
 	}
 
 	// Start transaction
@@ -411,15 +509,94 @@ func (s *PostgresqlStore) CreateSupervisorChain(ctx context.Context, toolId uuid
 	}
 	defer func() { _ = tx.Rollback() }()
 
+	// Lock the tool so that runs registering the same chain at the same time don't both create it
+	query := `SELECT id FROM tool WHERE id = $1 FOR UPDATE`
+
+	_, err = tx.ExecContext(ctx, query, toolId)
+	if err != nil {
+		return nil, fmt.Errorf("error locking tool: %w", err)
+	}
+
+	if err := checkRunTool(ctx, tx, toolId, runId); err != nil {
+		return nil, err
+	}
+
+	chainIds := make([]uuid.UUID, 0, len(chains))
+	for _, chain := range chains {
+		chainId, err := createChain(ctx, tx, toolId, *chain.SupervisorIds)
+		if err != nil {
+			return nil, err
+		}
+		chainIds = append(chainIds, chainId)
+	}
+
+	// Link the chains to the run, so that only the run's own tool calls go through them
+	query = `
+		INSERT INTO run_tool_chain (run_id, tool_id, chain_id)
+		SELECT $1, $2, unnest($3::uuid[])
+		ON CONFLICT DO NOTHING`
+
+	_, err = tx.ExecContext(ctx, query, runId, toolId, pq.Array(chainIds))
+	if err != nil {
+		return nil, fmt.Errorf("error linking run to chains: %w", err)
+	}
+
+	// Commit transaction
+	if err := tx.Commit(); err != nil {
+		return nil, fmt.Errorf("error committing transaction: %w", err)
+	}
+
+	return chainIds, nil
+}
+
+// checkRunTool checks that a run uses a tool
+func checkRunTool(ctx context.Context, tx *sql.Tx, toolId uuid.UUID, runId uuid.UUID) error {
+	query := `SELECT 1 FROM run_tool WHERE run_id = $1 AND tool_id = $2`
+
+	var found int
+	err := tx.QueryRowContext(ctx, query, runId, toolId).Scan(&found)
+	if errors.Is(err, sql.ErrNoRows) {
+		return fmt.Errorf("%w: run %s, tool %s", asteroid.ErrRunToolNotFound, runId, toolId)
+	}
+	if err != nil {
+		return fmt.Errorf("error checking run tool: %w", err)
+	}
+	return nil
+}
+
+// createChain returns the tool's chain of the supervisors, creating it if the tool doesn't have it. The
+// tool must be locked by the transaction.
+func createChain(ctx context.Context, tx *sql.Tx, toolId uuid.UUID, ids []uuid.UUID) (uuid.UUID, error) {
+	query := `
+		SELECT ct.chain_id
+		FROM chain_tool ct
+		WHERE ct.tool_id = $1
+		AND ARRAY(
+			SELECT cs.supervisor_id
+			FROM chain_supervisor cs
+			WHERE cs.chain_id = ct.chain_id
+			ORDER BY cs.position_in_chain
+		) = $2::uuid[]
+		LIMIT 1`
+
+	var existingId uuid.UUID
+	err := tx.QueryRowContext(ctx, query, toolId, pq.Array(ids)).Scan(&existingId)
+	if err == nil {
+		return existingId, nil
+	}
+	if !errors.Is(err, sql.ErrNoRows) {
+		return uuid.Nil, fmt.Errorf("error checking for existing chain: %w", err)
+	}
+
 	// Create new chain
 	chainId := uuid.New()
-	query := `
+	query = `
 		INSERT INTO chain (id)
 		VALUES ($1)`
 
 	_, err = tx.ExecContext(ctx, query, chainId)
 	if err != nil {
-		return nil, fmt.Errorf("error creating chain: %w", err)
+		return uuid.Nil, fmt.Errorf("error creating chain: %w", err)
 	}
 
 	// Link chain to tool
@@ -429,7 +606,7 @@ func (s *PostgresqlStore) CreateSupervisorChain(ctx context.Context, toolId uuid
 
 	_, err = tx.ExecContext(ctx, query, toolId, chainId)
 	if err != nil {
-		return nil, fmt.Errorf("error linking tool to chain: %w", err)
+		return uuid.Nil, fmt.Errorf("error linking tool to chain: %w", err)
 	}
 
 	// Add chain_supervisor entries for each supervisor
@@ -440,28 +617,15 @@ func (s *PostgresqlStore) CreateSupervisorChain(ctx context.Context, toolId uuid
 	for i, supervisorId := range ids {
 		_, err = tx.ExecContext(ctx, query, chainId, supervisorId, i)
 		if err != nil {
-			return nil, fmt.Errorf("error adding supervisor to chain: %w", err)
+			return uuid.Nil, fmt.Errorf("error adding supervisor to chain: %w", err)
 		}
 	}
 
-	// Commit transaction
-	if err := tx.Commit(); err != nil {
-		return nil, fmt.Errorf("error committing transaction: %w", err)
-	}
-
-	return &chainId, nil
+	return chainId, nil
 }
 
 func (s *PostgresqlStore) GetSupervisorChain(ctx context.Context, chainId uuid.UUID) (*asteroid.SupervisorChain, error) {
-	// Order by the position column in chain_supervisor table
-	query := `
-		SELECT s.id, s.name, s.description, s.type, s.attributes, s.created_at, s.code
-		FROM chain_supervisor cs
-		INNER JOIN supervisor s ON cs.supervisor_id = s.id
-		WHERE cs.chain_id = $1
-		ORDER BY cs.position_in_chain ASC`
-
-	rows, err := s.db.QueryContext(ctx, query, chainId)
+	rows, err := s.queryContext(ctx, getSupervisorChainQuery, chainId)
 	if err != nil {
 		return nil, fmt.Errorf("error getting tool supervisor chain: %w", err)
 	}
@@ -480,6 +644,7 @@ func (s *PostgresqlStore) GetSupervisorChain(ctx context.Context, chainId uuid.U
 			&attributesJSON,
 			&supervisor.CreatedAt,
 			&supervisor.Code,
+			&supervisor.DecisionCacheTtlSeconds,
 		); err != nil {
 			return nil, fmt.Errorf("error scanning supervisor: %w", err)
 		}
@@ -502,8 +667,9 @@ func (s *PostgresqlStore) GetSupervisorChain(ctx context.Context, chainId uuid.U
 	}, nil
 }
 
-func (s *PostgresqlStore) GetSupervisorChains(ctx context.Context, toolId uuid.UUID) ([]asteroid.SupervisorChain, error) {
-	chainIds, err := s.getChainsForTool(ctx, toolId)
+// GetSupervisorChains returns the chains of a tool, only those of the run when one is given
+func (s *PostgresqlStore) GetSupervisorChains(ctx context.Context, toolId uuid.UUID, runId *uuid.UUID) ([]asteroid.SupervisorChain, error) {
+	chainIds, err := s.getChainsForTool(ctx, toolId, runId)
 	if err != nil {
 		return nil, fmt.Errorf("error getting chains for tool: %w", err)
 	}
@@ -521,14 +687,9 @@ func (s *PostgresqlStore) GetSupervisorChains(ctx context.Context, toolId uuid.U
 }
 
 func (s *PostgresqlStore) GetToolCallFromCallId(ctx context.Context, id string) (*asteroid.AsteroidToolCall, error) {
-	query := `
-		SELECT id, call_id, created_at, tool_id, tool_call_data
-		FROM toolcall
-		WHERE call_id = $1`
-
 	var toolCall asteroid.AsteroidToolCall
 	var toolCallDataJSON []byte
-	err := s.db.QueryRowContext(ctx, query, id).Scan(
+	err := s.queryRowContext(ctx, getToolCallFromCallIdQuery, id).Scan(
 		&toolCall.Id,
 		&toolCall.CallId,
 		&toolCall.CreatedAt,
@@ -550,14 +711,9 @@ func (s *PostgresqlStore) GetToolCallFromCallId(ctx context.Context, id string)
 }
 
 func (s *PostgresqlStore) GetToolCall(ctx context.Context, id uuid.UUID) (*asteroid.AsteroidToolCall, error) {
-	query := `
-		SELECT id, call_id, created_at, tool_id, tool_call_data
-		FROM toolcall
-		WHERE id = $1`
-
 	var toolCall asteroid.AsteroidToolCall
 	var toolCallDataJSON []byte
-	err := s.db.QueryRowContext(ctx, query, id).Scan(
+	err := s.queryRowContext(ctx, getToolCallQuery, id).Scan(
 		&toolCall.Id,
 		&toolCall.CallId,
 		&toolCall.CreatedAt,
@@ -577,11 +733,21 @@ func (s *PostgresqlStore) GetToolCall(ctx context.Context, id uuid.UUID) (*aster
 	return &toolCall, nil
 }
 
-func (s *PostgresqlStore) GetChainExecutionsFromToolCall(ctx context.Context, id uuid.UUID) ([]uuid.UUID, error) {
-	query := `
-			SELECT id FROM chainexecution WHERE toolcall_id = $1`
+func (s *PostgresqlStore) GetToolCallRunId(ctx context.Context, id uuid.UUID) (*uuid.UUID, error) {
+	var runId uuid.UUID
+	err := s.queryRowContext(ctx, getToolCallRunIdQuery, id).Scan(&runId)
+	if errors.Is(err, sql.ErrNoRows) {
+		return nil, nil
+	}
+	if err != nil {
+		return nil, fmt.Errorf("error getting run of tool call: %w", err)
+	}
+
+	return &runId, nil
+}
 
-	rows, err := s.db.QueryContext(ctx, query, id)
+func (s *PostgresqlStore) GetChainExecutionsFromToolCall(ctx context.Context, id uuid.UUID) ([]uuid.UUID, error) {
+	rows, err := s.queryContext(ctx, getChainExecutionsFromToolCallQuery, id)
 	if err != nil {
 		return nil, fmt.Errorf("error getting chain executions from tool call ID: %w", err)
 	}
@@ -602,13 +768,8 @@ func (s *PostgresqlStore) GetChainExecutionsFromToolCall(ctx context.Context, id
 }
 
 func (s *PostgresqlStore) GetExecutionFromChainId(ctx context.Context, chainId uuid.UUID) (*uuid.UUID, error) {
-	query := `
-		SELECT id
-		FROM chainexecution
-		WHERE chain_id = $1`
-
 	var id uuid.UUID
-	err := s.db.QueryRowContext(ctx, query, chainId).Scan(&id)
+	err := s.queryRowContext(ctx, getExecutionFromChainIdQuery, chainId).Scan(&id)
 	if errors.Is(err, sql.ErrNoRows) {
 		return nil, nil
 	}
@@ -619,36 +780,6 @@ func (s *PostgresqlStore) GetExecutionFromChainId(ctx context.Context, chainId u
 	return &id, nil
 }
 
-func (s *PostgresqlStore) createChainExecutions(ctx context.Context, tx *sql.Tx, toolCallId uuid.UUID, chainIds []uuid.UUID) error {
-	for _, chainId := range chainIds {
-		_, err := s.createChainExecution(ctx, chainId, toolCallId, tx)
-		if err != nil {
-			return fmt.Errorf("error creating chain execution: %w", err)
-		}
-	}
-
-	return nil
-}
-
-func (s *PostgresqlStore) createChainExecution(
-	ctx context.Context,
-	chainId uuid.UUID,
-	toolCallId uuid.UUID,
-	tx *sql.Tx,
-) (*uuid.UUID, error) {
-	query := `
-		INSERT INTO chainexecution (id, chain_id, toolcall_id)
-		VALUES ($1, $2, $3)`
-
-	id := uuid.New()
-	_, err := tx.ExecContext(ctx, query, id, chainId, toolCallId)
-	if err != nil {
-		return nil, fmt.Errorf("error creating chain execution: %w", err)
-	}
-
-	return &id, nil
-}
-
 func (s *PostgresqlStore) CreateSupervisionRequest(
 	ctx context.Context,
 	request asteroid.SupervisionRequest,
@@ -678,16 +809,57 @@ func (s *PostgresqlStore) CreateSupervisionRequest(
 		return nil, fmt.Errorf("chain execution ID is required when creating a supervision request for a non-zero position in the chain")
 	}
 
-	query := `
-		INSERT INTO supervisionrequest (id, supervisor_id, position_in_chain, chainexecution_id)
-		VALUES ($1, $2, $3, $4)`
+	requestID, err := s.createSupervisionRequest(ctx, request, tx)
+	if err != nil {
+		return nil, err
+	}
+
+	err = tx.Commit()
+	if err != nil {
+		return nil, fmt.Errorf("error committing transaction: %w", err)
+	}
+
+	return &requestID, nil
+}
+
+// CreateSupervisionRequests stores supervision requests in one transaction, so that either all of them
+// are created or none are. Each request must have its chain execution ID set.
+func (s *PostgresqlStore) CreateSupervisionRequests(ctx context.Context, requests []asteroid.SupervisionRequest) ([]uuid.UUID, error) {
+	tx, err := s.db.BeginTx(ctx, nil)
+	if err != nil {
+		return nil, fmt.Errorf("error starting transaction: %w", err)
+	}
+	defer func() { _ = tx.Rollback() }()
+
+	ids := make([]uuid.UUID, 0, len(requests))
+	for i, request := range requests {
+		if request.ChainexecutionId == nil {
+			return nil, fmt.Errorf("chain execution ID is required for supervision request %d", i)
+		}
+
+		id, err := s.createSupervisionRequest(ctx, request, tx)
+		if err != nil {
+			return nil, err
+		}
+		ids = append(ids, id)
+	}
+
+	err = tx.Commit()
+	if err != nil {
+		return nil, fmt.Errorf("error committing transaction: %w", err)
+	}
 
+	return ids, nil
+}
+
+// createSupervisionRequest stores a supervision request as pending
+func (s *PostgresqlStore) createSupervisionRequest(ctx context.Context, request asteroid.SupervisionRequest, tx *sql.Tx) (uuid.UUID, error) {
 	requestID := uuid.New()
-	_, err = tx.ExecContext(
-		ctx, query, requestID, request.SupervisorId, request.PositionInChain, request.ChainexecutionId,
+	_, err := s.txExecContext(
+		ctx, tx, createSupervisionRequestQuery, requestID, request.SupervisorId, request.PositionInChain, request.ChainexecutionId,
 	)
 	if err != nil {
-		return nil, fmt.Errorf("error creating supervision request: %w", err)
+		return uuid.Nil, fmt.Errorf("error creating supervision request: %w", err)
 	}
 
 	status := asteroid.SupervisionStatus{
@@ -698,25 +870,15 @@ func (s *PostgresqlStore) CreateSupervisionRequest(
 	// Store a supervisor status pending
 	err = s.createSupervisionStatus(ctx, requestID, status, tx)
 	if err != nil {
-		return nil, fmt.Errorf("error creating supervisor status: %w", err)
+		return uuid.Nil, fmt.Errorf("error creating supervisor status: %w", err)
 	}
 
-	err = tx.Commit()
-	if err != nil {
-		return nil, fmt.Errorf("error committing transaction: %w", err)
-	}
-
-	return &requestID, nil
+	return requestID, nil
 }
 
 func (s *PostgresqlStore) getChainExecutionForToolCall(ctx context.Context, chainId uuid.UUID, toolCallId uuid.UUID, tx *sql.Tx) (*uuid.UUID, error) {
-	query := `
-		SELECT id 
-		FROM chainexecution 
-		WHERE chain_id = $1 AND toolcall_id = $2`
-
 	var id uuid.UUID
-	err := tx.QueryRowContext(ctx, query, chainId, toolCallId).Scan(&id)
+	err := s.txQueryRowContext(ctx, tx, getChainExecutionFromChainAndToolCallQuery, chainId, toolCallId).Scan(&id)
 	if err != nil {
 		return nil, fmt.Errorf("error getting chain execution for tool call: %w", err)
 	}
@@ -745,28 +907,28 @@ func (s *PostgresqlStore) CreateSupervisionStatus(ctx context.Context, requestID
 }
 
 func (s *PostgresqlStore) createSupervisionStatus(ctx context.Context, requestID uuid.UUID, status asteroid.SupervisionStatus, tx *sql.Tx) error {
-	query := `
-		INSERT INTO supervisionrequest_status (supervisionrequest_id, status, created_at)
-		VALUES ($1, $2, $3)`
-
-	_, err := tx.ExecContext(ctx, query, requestID, status.Status, status.CreatedAt)
+	var statusID int
+	err := s.txQueryRowContext(ctx, tx, createSupervisionStatusQuery, requestID, status.Status, status.CreatedAt).Scan(&statusID)
 	if err != nil {
 		return fmt.Errorf("error creating supervisor status: %w", err)
 	}
 
+	// Keep the current status in step with the history. A completed request stays completed, so a status
+	// written late, such as an assignment recorded after the reviewer already answered, can't make it
+	// claimable again.
+	_, err = s.txExecContext(ctx, tx, updateCurrentSupervisionStatusQuery, requestID, statusID, status.Status, status.CreatedAt, asteroid.Completed)
+	if err != nil {
+		return fmt.Errorf("error updating current supervisor status: %w", err)
+	}
+
 	return nil
 }
 
 func (s *PostgresqlStore) GetTool(ctx context.Context, id uuid.UUID) (*asteroid.Tool, error) {
-	query := `
-		SELECT id, run_id, name, description, attributes, ignored_attributes, code
-		FROM tool
-		WHERE id = $1`
-
 	var tool asteroid.Tool
 	var attributesJSON []byte
 	var ignoredAttributes []string
-	err := s.db.QueryRowContext(ctx, query, id).Scan(
+	err := s.queryRowContext(ctx, getToolQuery, id).Scan(
 		&tool.Id,
 		&tool.RunId,
 		&tool.Name,
@@ -795,82 +957,55 @@ func (s *PostgresqlStore) GetTool(ctx context.Context, id uuid.UUID) (*asteroid.
 	return &tool, nil
 }
 
-func (s *PostgresqlStore) GetProjectTools(ctx context.Context, projectId uuid.UUID) ([]asteroid.Tool, error) {
+func (s *PostgresqlStore) GetProjectTools(ctx context.Context, projectId uuid.UUID, page asteroid.Page, each func(asteroid.Tool) error) error {
 	query := `
-		SELECT DISTINCT r.id
-		FROM run r
-		INNER JOIN task t ON t.id = r.task_id
-		WHERE t.project_id = $1`
+		SELECT tool.id, tool.run_id, tool.name, tool.description, tool.attributes, COALESCE(tool.ignored_attributes, '{}') as ignored_attributes, tool.code
+		FROM tool
+		WHERE tool.project_id = $1 AND ($2::uuid IS NULL OR tool.id > $2)
+		ORDER BY tool.id ASC
+		LIMIT $3`
 
-	rows, err := s.db.QueryContext(ctx, query, projectId)
+	_, afterId, limit := pageArgs(page)
+	rows, err := s.db.QueryContext(ctx, query, projectId, afterId, limit)
 	if err != nil {
-		return nil, fmt.Errorf("error getting project tools: %w", err)
+		return fmt.Errorf("error getting project tools: %w", err)
 	}
 	defer rows.Close()
 
-	tools := make([]asteroid.Tool, 0)
-	for rows.Next() {
-		var id uuid.UUID
-		if err := rows.Scan(
-			&id,
-		); err != nil {
-			return nil, fmt.Errorf("error scanning tool: %w", err)
-		}
-
-		runTools, err := s.GetRunTools(ctx, id)
-		if err != nil {
-			return nil, fmt.Errorf("error getting run tools for project: %w", err)
-		}
-
-		tools = append(tools, runTools...)
-	}
-
-	return tools, nil
+	return scanTools(rows, each)
 }
 
-func (s *PostgresqlStore) GetProjectTasks(ctx context.Context, projectId uuid.UUID) ([]asteroid.Task, error) {
+func (s *PostgresqlStore) GetProjectTasks(ctx context.Context, projectId uuid.UUID, page asteroid.Page, each func(asteroid.Task) error) error {
 	query := `
 		SELECT id, project_id, name, description, created_at
 		FROM task
-		WHERE project_id = $1`
+		WHERE project_id = $1 AND ($2::timestamptz IS NULL OR (created_at, id) < ($2, $3::uuid))
+		ORDER BY created_at DESC, id DESC
+		LIMIT $4`
 
-	rows, err := s.db.QueryContext(ctx, query, projectId)
+	afterCreatedAt, afterId, limit := pageArgs(page)
+	rows, err := s.db.QueryContext(ctx, query, projectId, afterCreatedAt, afterId, limit)
 	if err != nil {
-		return nil, fmt.Errorf("error getting project tasks: %w", err)
+		return fmt.Errorf("error getting project tasks: %w", err)
 	}
 	defer rows.Close()
 
-	tasks := make([]asteroid.Task, 0)
 	for rows.Next() {
 		var task asteroid.Task
 		if err := rows.Scan(&task.Id, &task.ProjectId, &task.Name, &task.Description, &task.CreatedAt); err != nil {
-			return nil, fmt.Errorf("error scanning task: %w", err)
+			return fmt.Errorf("error scanning task: %w", err)
+		}
+		if err := each(task); err != nil {
+			return err
 		}
-
-		tasks = append(tasks, task)
 	}
 
-	return tasks, nil
+	return rows.Err()
 }
 
 func (s *PostgresqlStore) CountSupervisionRequests(ctx context.Context, status asteroid.Status) (int, error) {
-	query := `
-        SELECT COUNT(*)
-        FROM (
-            SELECT DISTINCT ON (sr.id) sr.id
-            FROM supervisionrequest sr
-            JOIN supervisionrequest_status ss ON sr.id = ss.supervisionrequest_id
-            WHERE NOT EXISTS (
-                SELECT 1 
-                FROM supervisionrequest_status newer
-                WHERE newer.supervisionrequest_id = sr.id 
-                AND newer.created_at > ss.created_at
-            )
-            AND ss.status = $1
-        ) as latest_requests`
-
 	var count int
-	err := s.db.QueryRowContext(ctx, query, status).Scan(&count)
+	err := s.queryRowContext(ctx, countSupervisionRequestsQuery, status).Scan(&count)
 	if err != nil {
 		return 0, fmt.Errorf("error counting supervision requests: %w", err)
 	}
@@ -885,32 +1020,9 @@ func (s *PostgresqlStore) CreateSupervisionResult(ctx context.Context, result as
 	}
 	defer func() { _ = tx.Rollback() }()
 
-	query := `
-		INSERT INTO supervisionresult (id, supervisionrequest_id, created_at, decision, reasoning, toolcall_id)
-		VALUES ($1, $2, $3, $4, $5, $6)`
-
-	id := uuid.New()
-	_, err = tx.ExecContext(
-		ctx,
-		query,
-		id,
-		requestId,
-		result.CreatedAt,
-		result.Decision,
-		result.Reasoning,
-		result.ToolcallId,
-	)
-	if err != nil {
-		return nil, fmt.Errorf("error creating supervision result: %w", err)
-	}
-
-	// Create a supervisionrequest_status
-	err = s.createSupervisionStatus(ctx, requestId, asteroid.SupervisionStatus{
-		Status:    asteroid.Completed,
-		CreatedAt: result.CreatedAt,
-	}, tx)
+	id, err := s.createSupervisionResult(ctx, result, requestId, tx)
 	if err != nil {
-		return nil, fmt.Errorf("error creating supervision status for result: %w", err)
+		return nil, err
 	}
 
 	err = tx.Commit()
@@ -921,67 +1033,103 @@ func (s *PostgresqlStore) CreateSupervisionResult(ctx context.Context, result as
 	return &id, nil
 }
 
-func (s *PostgresqlStore) GetSupervisionRequestsForStatus(ctx context.Context, status asteroid.Status) ([]asteroid.SupervisionRequest, error) {
-	// Get IDs of supervision requests with the given status (excluding client supervisors)
-	query := `
-		SELECT sr.id
-		FROM supervisionrequest sr
-		JOIN supervisor s ON s.id = sr.supervisor_id
-		JOIN (
-				SELECT supervisionrequest_id, MAX(id) as latest_status_id
-				FROM supervisionrequest_status
-				GROUP BY supervisionrequest_id
-		) latest ON sr.id = latest.supervisionrequest_id
-		JOIN supervisionrequest_status srs ON srs.id = latest.latest_status_id
-		WHERE s.type != $1 AND srs.status = $2
-	`
-	rows, err := s.db.QueryContext(ctx, query, asteroid.ClientSupervisor, status)
+// CreateSupervisionResults stores supervision results, each against the supervision request it names,
+// in one transaction
+func (s *PostgresqlStore) CreateSupervisionResults(ctx context.Context, results []asteroid.SupervisionResult) ([]uuid.UUID, error) {
+	tx, err := s.db.BeginTx(ctx, nil)
 	if err != nil {
-		return nil, fmt.Errorf("error getting supervision request IDs: %w", err)
+		return nil, fmt.Errorf("error starting transaction: %w", err)
 	}
-	defer rows.Close()
+	defer func() { _ = tx.Rollback() }()
 
-	var requestIds []uuid.UUID
-	for rows.Next() {
-		var id uuid.UUID
-		if err := rows.Scan(&id); err != nil {
-			return nil, fmt.Errorf("error scanning supervision request ID: %w", err)
+	ids := make([]uuid.UUID, 0, len(results))
+	for _, result := range results {
+		id, err := s.createSupervisionResult(ctx, result, result.SupervisionRequestId, tx)
+		if err != nil {
+			return nil, err
 		}
-		requestIds = append(requestIds, id)
+		ids = append(ids, id)
 	}
 
-	// If there are no requests, return an empty list
-	if len(requestIds) == 0 {
-		return nil, nil
+	err = tx.Commit()
+	if err != nil {
+		return nil, fmt.Errorf("error committing transaction: %w", err)
 	}
 
-	// Get full details for each supervision request
-	requests := make([]asteroid.SupervisionRequest, 0, len(requestIds))
-	for _, id := range requestIds {
-		request, err := s.GetSupervisionRequest(ctx, id)
-		if err != nil {
-			return nil, fmt.Errorf("error getting supervision request %s: %w", id, err)
-		}
-		if request != nil {
-			requests = append(requests, *request)
-		}
+	return ids, nil
+}
+
+// createSupervisionResult stores a supervision result and marks its request completed
+func (s *PostgresqlStore) createSupervisionResult(
+	ctx context.Context,
+	result asteroid.SupervisionResult,
+	requestId uuid.UUID,
+	tx *sql.Tx,
+) (uuid.UUID, error) {
+	id := uuid.New()
+	_, err := s.txExecContext(
+		ctx,
+		tx,
+		createSupervisionResultQuery,
+		id,
+		requestId,
+		result.CreatedAt,
+		result.Decision,
+		result.Reasoning,
+		result.ToolcallId,
+	)
+	if err != nil {
+		return uuid.Nil, fmt.Errorf("error creating supervision result: %w", err)
+	}
+
+	// Create a supervisionrequest_status
+	err = s.createSupervisionStatus(ctx, requestId, asteroid.SupervisionStatus{
+		Status:    asteroid.Completed,
+		CreatedAt: result.CreatedAt,
+	}, tx)
+	if err != nil {
+		return uuid.Nil, fmt.Errorf("error creating supervision status for result: %w", err)
+	}
+
+	return id, nil
+}
+
+func (s *PostgresqlStore) GetSupervisionRequestsForStatus(ctx context.Context, status asteroid.Status) ([]asteroid.SupervisionRequest, error) {
+	rows, err := s.queryContext(ctx, getSupervisionRequestsForStatusQuery, asteroid.ClientSupervisor, status)
+	if err != nil {
+		return nil, fmt.Errorf("error getting supervision requests: %w", err)
 	}
+	defer rows.Close()
 
-	if len(requests) != len(requestIds) {
-		return nil, fmt.Errorf("number of requests (%d) does not match number of request IDs (%d) for status %s", len(requests), len(requestIds), status)
+	var requests []asteroid.SupervisionRequest
+	for rows.Next() {
+		var request asteroid.SupervisionRequest
+		var requestStatus asteroid.SupervisionStatus
+		if err := rows.Scan(
+			&request.Id,
+			&request.SupervisorId,
+			&request.PositionInChain,
+			&request.ChainexecutionId,
+			&requestStatus.Id,
+			&requestStatus.SupervisionRequestId,
+			&requestStatus.Status,
+			&requestStatus.CreatedAt,
+		); err != nil {
+			return nil, fmt.Errorf("error scanning supervision request: %w", err)
+		}
+		request.Status = &requestStatus
+		requests = append(requests, request)
+	}
+	if err := rows.Err(); err != nil {
+		return nil, fmt.Errorf("error iterating supervision requests: %w", err)
 	}
 
 	return requests, nil
 }
 
 func (s *PostgresqlStore) GetSupervisionResultFromRequestID(ctx context.Context, requestId uuid.UUID) (*asteroid.SupervisionResult, error) {
-	query := `
-		SELECT id, supervisionrequest_id, created_at, decision, reasoning, toolcall_id
-		FROM supervisionresult
-		WHERE supervisionrequest_id = $1`
-
 	var result asteroid.SupervisionResult
-	err := s.db.QueryRowContext(ctx, query, requestId).Scan(
+	err := s.queryRowContext(ctx, getSupervisionResultFromRequestIdQuery, requestId).Scan(
 		&result.Id,
 		&result.SupervisionRequestId,
 		&result.CreatedAt,
@@ -999,19 +1147,41 @@ func (s *PostgresqlStore) GetSupervisionResultFromRequestID(ctx context.Context,
 	return &result, nil
 }
 
-func (s *PostgresqlStore) GetSupervisionRequest(ctx context.Context, id uuid.UUID) (*asteroid.SupervisionRequest, error) {
-	query := `
-		SELECT id, supervisor_id, position_in_chain, chainexecution_id
-		FROM supervisionrequest
-		WHERE id = $1`
+// currentStatusColumns scans the columns of a supervisionrequest_current_status row reached through a
+// LEFT JOIN, which are all NULL for a supervision request without a status
+type currentStatusColumns struct {
+	id                   *int
+	supervisionRequestId *uuid.UUID
+	status               *asteroid.Status
+	createdAt            *time.Time
+}
 
+// scanDest appends the status columns to the scan destinations of the columns selected before them
+func (c *currentStatusColumns) scanDest(dest ...interface{}) []interface{} {
+	return append(dest, &c.id, &c.supervisionRequestId, &c.status, &c.createdAt)
+}
+
+func (c *currentStatusColumns) toSupervisionStatus() *asteroid.SupervisionStatus {
+	if c.id == nil {
+		return nil
+	}
+	return &asteroid.SupervisionStatus{
+		Id:                   *c.id,
+		SupervisionRequestId: c.supervisionRequestId,
+		Status:               *c.status,
+		CreatedAt:            *c.createdAt,
+	}
+}
+
+func (s *PostgresqlStore) GetSupervisionRequest(ctx context.Context, id uuid.UUID) (*asteroid.SupervisionRequest, error) {
 	var request asteroid.SupervisionRequest
-	err := s.db.QueryRowContext(ctx, query, id).Scan(
+	var status currentStatusColumns
+	err := s.queryRowContext(ctx, getSupervisionRequestQuery, id).Scan(status.scanDest(
 		&request.Id,
 		&request.SupervisorId,
 		&request.PositionInChain,
 		&request.ChainexecutionId,
-	)
+	)...)
 	if errors.Is(err, sql.ErrNoRows) {
 		return nil, nil
 	}
@@ -1019,12 +1189,7 @@ func (s *PostgresqlStore) GetSupervisionRequest(ctx context.Context, id uuid.UUI
 		return nil, fmt.Errorf("error getting supervision request: %w", err)
 	}
 
-	// Get the latest status for the request
-	status, err := s.GetSupervisionRequestStatus(ctx, id)
-	if err != nil {
-		return nil, fmt.Errorf("error getting supervision request status: %w", err)
-	}
-	request.Status = status
+	request.Status = status.toSupervisionStatus()
 
 	return &request, nil
 }
@@ -1033,6 +1198,7 @@ func (s *PostgresqlStore) CreateSupervisor(ctx context.Context, supervisor aster
 	// Try to find an existing supervisor with the same values
 	if existingSupervisor, err := s.GetSupervisorFromValues(
 		ctx, supervisor.Code, supervisor.Name, supervisor.Description, supervisor.Type, supervisor.Attributes,
+		supervisor.DecisionCacheTtlSeconds,
 	); err != nil {
 		return uuid.UUID{}, fmt.Errorf("error getting existing supervisor during create supervisor: %w", err)
 	} else if existingSupervisor != nil {
@@ -1047,10 +1213,21 @@ func (s *PostgresqlStore) CreateSupervisor(ctx context.Context, supervisor aster
 	}
 
 	query := `
-		INSERT INTO supervisor (id, description, name, created_at, type, code, attributes)
-		VALUES ($1, $2, $3, $4, $5, $6, $7)`
+		INSERT INTO supervisor (id, description, name, created_at, type, code, attributes, decision_cache_ttl_seconds)
+		VALUES ($1, $2, $3, $4, $5, $6, $7, $8)`
 
-	_, err = s.db.ExecContext(ctx, query, id, supervisor.Description, supervisor.Name, supervisor.CreatedAt, supervisor.Type, supervisor.Code, attributes)
+	_, err = s.db.ExecContext(
+		ctx,
+		query,
+		id,
+		supervisor.Description,
+		supervisor.Name,
+		supervisor.CreatedAt,
+		supervisor.Type,
+		supervisor.Code,
+		attributes,
+		supervisor.DecisionCacheTtlSeconds,
+	)
 	if err != nil {
 		return uuid.UUID{}, fmt.Errorf("error creating supervisor: %w", err)
 	}
@@ -1092,13 +1269,8 @@ func (s *PostgresqlStore) CreateTask(ctx context.Context, task asteroid.Task) (*
 }
 
 func (s *PostgresqlStore) GetTask(ctx context.Context, id uuid.UUID) (*asteroid.Task, error) {
-	query := `
-		SELECT id, project_id, name, description, created_at
-		FROM task
-		WHERE id = $1`
-
 	var task asteroid.Task
-	err := s.db.QueryRowContext(ctx, query, id).Scan(&task.Id, &task.ProjectId, &task.Name, &task.Description, &task.CreatedAt)
+	err := s.queryRowContext(ctx, getTaskQuery, id).Scan(&task.Id, &task.ProjectId, &task.Name, &task.Description, &task.CreatedAt)
 	if errors.Is(err, sql.ErrNoRows) {
 		return nil, nil
 	}
@@ -1131,6 +1303,467 @@ func (s *PostgresqlStore) CreateRun(ctx context.Context, run asteroid.Run) (uuid
 	return id, nil
 }
 
+// CreateRuns creates runs of a task, with their tools and the tools' supervisor chains, in one
+// transaction. Each table is written with a single statement, however many runs are in the batch. As with
+// CreateTool, the runs share the definitions of the tools they have in common, and as with
+// CreateSupervisorChains, the chains a definition already has are reused while each run only gets the
+// chains asked for it.
+func (s *PostgresqlStore) CreateRuns(
+	ctx context.Context,
+	taskId uuid.UUID,
+	runs []asteroid.RunBatchItem,
+) ([]asteroid.RunBatchItemResult, error) {
+	rows := runBatchRows{definitions: make(map[string]int)}
+	toolRows := make([][]runBatchTool, 0, len(runs))
+	for _, run := range runs {
+		runId := uuid.New()
+		rows.runIds = append(rows.runIds, runId.String())
+
+		tools := make([]runBatchTool, 0, len(run.Tools))
+		for _, tool := range run.Tools {
+			added, err := rows.addTool(runId, tool)
+			if err != nil {
+				return nil, err
+			}
+			tools = append(tools, added)
+		}
+		toolRows = append(toolRows, tools)
+	}
+
+	if len(rows.runIds) == 0 {
+		return []asteroid.RunBatchItemResult{}, nil
+	}
+
+	tx, err := s.db.BeginTx(ctx, nil)
+	if err != nil {
+		return nil, fmt.Errorf("error starting transaction: %w", err)
+	}
+	defer func() { _ = tx.Rollback() }()
+
+	query := `
+		INSERT INTO run (id, task_id, created_at, status)
+		SELECT r.id, $2, $3, $4
+		FROM unnest($1::uuid[]) AS r(id)`
+
+	_, err = tx.ExecContext(ctx, query, pq.Array(rows.runIds), taskId, time.Now(), asteroid.Pending)
+	if err != nil {
+		return nil, fmt.Errorf("error creating runs: %w", err)
+	}
+
+	definitionIds, err := rows.createDefinitions(ctx, tx, taskId)
+	if err != nil {
+		return nil, err
+	}
+
+	chainIds, err := rows.createChains(ctx, tx, definitionIds)
+	if err != nil {
+		return nil, err
+	}
+
+	if err := rows.linkChains(ctx, tx, definitionIds, chainIds); err != nil {
+		return nil, err
+	}
+
+	if err := tx.Commit(); err != nil {
+		return nil, fmt.Errorf("error committing transaction: %w", err)
+	}
+
+	results := make([]asteroid.RunBatchItemResult, 0, len(runs))
+	for i, tools := range toolRows {
+		result := asteroid.RunBatchItemResult{
+			RunId: uuid.MustParse(rows.runIds[i]),
+			Tools: make([]asteroid.RunBatchToolResult, 0, len(tools)),
+		}
+		for _, tool := range tools {
+			toolResult := asteroid.RunBatchToolResult{
+				ToolId:   definitionIds[tool.definition],
+				Name:     tool.name,
+				ChainIds: make([]uuid.UUID, 0, len(tool.chains)),
+			}
+			for _, chain := range tool.chains {
+				toolResult.ChainIds = append(toolResult.ChainIds, chainIds[chainKey(definitionIds[tool.definition], chain)])
+			}
+			result.Tools = append(result.Tools, toolResult)
+		}
+		results = append(results, result)
+	}
+
+	return results, nil
+}
+
+// runBatchRows holds the rows CreateRuns inserts. Tool definitions are held once however many runs use
+// them, one slice per column.
+type runBatchRows struct {
+	runIds []string
+
+	// definitions maps the hash of each distinct tool definition to its position in the columns below
+	definitions            map[string]int
+	definitionRunIds       []string
+	definitionHashes       [][]byte
+	definitionNames        []string
+	definitionDescriptions []string
+	definitionAttributes   []string
+	definitionIgnored      []string
+	definitionCode         []string
+	definitionChains       [][][]uuid.UUID
+	linkRunIds             []string
+	linkDefinitions        []int
+	// The chains asked for each run's tools, one entry per chain
+	chainLinkRunIds      []string
+	chainLinkDefinitions []int
+	chainLinkSupervisors [][]uuid.UUID
+}
+
+// runBatchTool is a tool of a run in the batch, as the definition it uses and the chains asked for
+type runBatchTool struct {
+	name       string
+	definition int
+	chains     [][]uuid.UUID
+}
+
+func (r *runBatchRows) addTool(runId uuid.UUID, tool asteroid.RunBatchTool) (runBatchTool, error) {
+	ignoredAttributes := []string{}
+	if tool.IgnoredAttributes != nil {
+		ignoredAttributes = *tool.IgnoredAttributes
+	}
+
+	hash, err := toolDefinitionHash(tool.Name, tool.Description, tool.Attributes, ignoredAttributes, tool.Code)
+	if err != nil {
+		return runBatchTool{}, err
+	}
+
+	definition, ok := r.definitions[string(hash)]
+	if !ok {
+		attributes := tool.Attributes
+		if attributes == nil {
+			attributes = map[string]interface{}{}
+		}
+		attributesJSON, err := json.Marshal(attributes)
+		if err != nil {
+			return runBatchTool{}, fmt.Errorf("error marshaling tool attributes: %w", err)
+		}
+		ignoredJSON, err := json.Marshal(ignoredAttributes)
+		if err != nil {
+			return runBatchTool{}, fmt.Errorf("error marshaling tool ignored attributes: %w", err)
+		}
+
+		definition = len(r.definitionHashes)
+		r.definitions[string(hash)] = definition
+		r.definitionRunIds = append(r.definitionRunIds, runId.String())
+		r.definitionHashes = append(r.definitionHashes, hash)
+		r.definitionNames = append(r.definitionNames, tool.Name)
+		r.definitionDescriptions = append(r.definitionDescriptions, tool.Description)
+		r.definitionAttributes = append(r.definitionAttributes, string(attributesJSON))
+		r.definitionIgnored = append(r.definitionIgnored, string(ignoredJSON))
+		r.definitionCode = append(r.definitionCode, tool.Code)
+		r.definitionChains = append(r.definitionChains, nil)
+	}
+	r.linkRunIds = append(r.linkRunIds, runId.String())
+	r.linkDefinitions = append(r.linkDefinitions, definition)
+
+	added := runBatchTool{name: tool.Name, definition: definition}
+	if tool.Chains == nil {
+		return added, nil
+	}
+
+	for _, chain := range *tool.Chains {
+		if chain.SupervisorIds == nil {
+			return runBatchTool{}, fmt.Errorf("supervisor IDs are required to make a chain of supervisors")
+		}
+		added.chains = append(added.chains, *chain.SupervisorIds)
+		r.definitionChains[definition] = append(r.definitionChains[definition], *chain.SupervisorIds)
+		r.chainLinkRunIds = append(r.chainLinkRunIds, runId.String())
+		r.chainLinkDefinitions = append(r.chainLinkDefinitions, definition)
+		r.chainLinkSupervisors = append(r.chainLinkSupervisors, *chain.SupervisorIds)
+	}
+
+	return added, nil
+}
+
+// createDefinitions stores the tool definitions the project doesn't have yet and links the runs to them,
+// returning the ID of each definition
+func (r *runBatchRows) createDefinitions(ctx context.Context, tx *sql.Tx, taskId uuid.UUID) ([]uuid.UUID, error) {
+	ids := make([]uuid.UUID, len(r.definitionHashes))
+	if len(ids) == 0 {
+		return ids, nil
+	}
+
+	// Definitions the project already has are left alone and read back afterwards, so they aren't
+	// written again. Ignored attributes are passed as JSON arrays, as a text[][] can't hold lists of
+	// different lengths.
+	query := `
+		INSERT INTO tool (id, run_id, project_id, definition_hash, name, description, attributes, ignored_attributes, code)
+		SELECT gen_random_uuid(), t.run_id, (SELECT project_id FROM task WHERE id = $1), t.definition_hash,
+		       t.name, t.description, t.attributes, ARRAY(SELECT jsonb_array_elements_text(t.ignored_attributes)), t.code
+		FROM unnest($2::uuid[], $3::bytea[], $4::text[], $5::text[], $6::jsonb[], $7::jsonb[], $8::text[])
+		     AS t(run_id, definition_hash, name, description, attributes, ignored_attributes, code)
+		ON CONFLICT (project_id, definition_hash) WHERE definition_hash IS NOT NULL
+		DO NOTHING
+		RETURNING id, definition_hash`
+
+	rows, err := tx.QueryContext(
+		ctx,
+		query,
+		taskId,
+		pq.Array(r.definitionRunIds),
+		pq.Array(r.definitionHashes),
+		pq.Array(r.definitionNames),
+		pq.Array(r.definitionDescriptions),
+		pq.Array(r.definitionAttributes),
+		pq.Array(r.definitionIgnored),
+		pq.Array(r.definitionCode),
+	)
+	if err != nil {
+		return nil, fmt.Errorf("error creating tools: %w", err)
+	}
+	defer rows.Close()
+
+	for rows.Next() {
+		var id uuid.UUID
+		var hash []byte
+		if err := rows.Scan(&id, &hash); err != nil {
+			return nil, fmt.Errorf("error scanning tool: %w", err)
+		}
+		ids[r.definitions[string(hash)]] = id
+	}
+	if err := rows.Err(); err != nil {
+		return nil, fmt.Errorf("error creating tools: %w", err)
+	}
+
+	var existing [][]byte
+	for i, id := range ids {
+		if id == uuid.Nil {
+			existing = append(existing, r.definitionHashes[i])
+		}
+	}
+	if len(existing) > 0 {
+		query = `
+			SELECT id, definition_hash
+			FROM tool
+			WHERE project_id = (SELECT project_id FROM task WHERE id = $1) AND definition_hash = ANY($2::bytea[])`
+
+		rows, err := tx.QueryContext(ctx, query, taskId, pq.Array(existing))
+		if err != nil {
+			return nil, fmt.Errorf("error getting existing tools: %w", err)
+		}
+		defer rows.Close()
+
+		for rows.Next() {
+			var id uuid.UUID
+			var hash []byte
+			if err := rows.Scan(&id, &hash); err != nil {
+				return nil, fmt.Errorf("error scanning tool: %w", err)
+			}
+			ids[r.definitions[string(hash)]] = id
+		}
+		if err := rows.Err(); err != nil {
+			return nil, fmt.Errorf("error getting existing tools: %w", err)
+		}
+	}
+
+	toolIds := make([]string, len(r.linkDefinitions))
+	for i, definition := range r.linkDefinitions {
+		toolIds[i] = ids[definition].String()
+	}
+
+	query = `
+		INSERT INTO run_tool (run_id, tool_id)
+		SELECT l.run_id, l.tool_id
+		FROM unnest($1::uuid[], $2::uuid[]) AS l(run_id, tool_id)
+		ON CONFLICT DO NOTHING`
+
+	_, err = tx.ExecContext(ctx, query, pq.Array(r.linkRunIds), pq.Array(toolIds))
+	if err != nil {
+		return nil, fmt.Errorf("error linking runs to tools: %w", err)
+	}
+
+	return ids, nil
+}
+
+// createChains creates the chains asked for that the definitions don't have yet, returning the ID of
+// every chain asked for by chainKey
+func (r *runBatchRows) createChains(ctx context.Context, tx *sql.Tx, definitionIds []uuid.UUID) (map[string]uuid.UUID, error) {
+	chainIds := make(map[string]uuid.UUID)
+
+	toolIds := make([]string, 0, len(definitionIds))
+	for definition, chains := range r.definitionChains {
+		if len(chains) > 0 {
+			toolIds = append(toolIds, definitionIds[definition].String())
+		}
+	}
+	if len(toolIds) == 0 {
+		return chainIds, nil
+	}
+
+	// Lock the tools, in a fixed order, so that batches registering the same chains at the same time
+	// don't both create them
+	query := `
+		SELECT id
+		FROM tool
+		WHERE id = ANY($1::uuid[])
+		ORDER BY id
+		FOR UPDATE`
+
+	_, err := tx.ExecContext(ctx, query, pq.Array(toolIds))
+	if err != nil {
+		return nil, fmt.Errorf("error locking tools: %w", err)
+	}
+
+	query = `
+		SELECT ct.tool_id, ct.chain_id, ARRAY(
+			SELECT cs.supervisor_id
+			FROM chain_supervisor cs
+			WHERE cs.chain_id = ct.chain_id
+			ORDER BY cs.position_in_chain
+		)
+		FROM chain_tool ct
+		WHERE ct.tool_id = ANY($1::uuid[])`
+
+	rows, err := tx.QueryContext(ctx, query, pq.Array(toolIds))
+	if err != nil {
+		return nil, fmt.Errorf("error getting tool chains: %w", err)
+	}
+	defer rows.Close()
+
+	for rows.Next() {
+		var toolId, chainId uuid.UUID
+		var supervisorIds []string
+		if err := rows.Scan(&toolId, &chainId, pq.Array(&supervisorIds)); err != nil {
+			return nil, fmt.Errorf("error scanning tool chain: %w", err)
+		}
+		chainIds[toolId.String()+"/"+strings.Join(supervisorIds, ",")] = chainId
+	}
+	if err := rows.Err(); err != nil {
+		return nil, fmt.Errorf("error getting tool chains: %w", err)
+	}
+
+	var newChainIds, newChainToolIds, linkChainIds, linkSupervisorIds []string
+	var linkPositions []int64
+	for definition, chains := range r.definitionChains {
+		for _, supervisorIds := range chains {
+			key := chainKey(definitionIds[definition], supervisorIds)
+			if _, ok := chainIds[key]; ok {
+				continue
+			}
+
+			chainId := uuid.New()
+			chainIds[key] = chainId
+			newChainIds = append(newChainIds, chainId.String())
+			newChainToolIds = append(newChainToolIds, definitionIds[definition].String())
+			for i, supervisorId := range supervisorIds {
+				linkChainIds = append(linkChainIds, chainId.String())
+				linkSupervisorIds = append(linkSupervisorIds, supervisorId.String())
+				linkPositions = append(linkPositions, int64(i))
+			}
+		}
+	}
+
+	if len(newChainIds) == 0 {
+		return chainIds, nil
+	}
+
+	query = `
+		INSERT INTO chain (id)
+		SELECT c.id
+		FROM unnest($1::uuid[]) AS c(id)`
+
+	_, err = tx.ExecContext(ctx, query, pq.Array(newChainIds))
+	if err != nil {
+		return nil, fmt.Errorf("error creating chains: %w", err)
+	}
+
+	query = `
+		INSERT INTO chain_tool (tool_id, chain_id)
+		SELECT c.tool_id, c.chain_id
+		FROM unnest($1::uuid[], $2::uuid[]) AS c(tool_id, chain_id)`
+
+	_, err = tx.ExecContext(ctx, query, pq.Array(newChainToolIds), pq.Array(newChainIds))
+	if err != nil {
+		return nil, fmt.Errorf("error linking tools to chains: %w", err)
+	}
+
+	query = `
+		INSERT INTO chain_supervisor (chain_id, supervisor_id, position_in_chain)
+		SELECT c.chain_id, c.supervisor_id, c.position_in_chain
+		FROM unnest($1::uuid[], $2::uuid[], $3::integer[]) AS c(chain_id, supervisor_id, position_in_chain)`
+
+	_, err = tx.ExecContext(ctx, query, pq.Array(linkChainIds), pq.Array(linkSupervisorIds), pq.Array(linkPositions))
+	if err != nil {
+		return nil, fmt.Errorf("error adding supervisors to chains: %w", err)
+	}
+
+	return chainIds, nil
+}
+
+// linkChains links each run to the chains asked for its tools, so that only the run's own tool calls go
+// through them
+func (r *runBatchRows) linkChains(ctx context.Context, tx *sql.Tx, definitionIds []uuid.UUID, chainIds map[string]uuid.UUID) error {
+	if len(r.chainLinkRunIds) == 0 {
+		return nil
+	}
+
+	toolIds := make([]string, len(r.chainLinkRunIds))
+	linkChainIds := make([]string, len(r.chainLinkRunIds))
+	for i, definition := range r.chainLinkDefinitions {
+		toolIds[i] = definitionIds[definition].String()
+		linkChainIds[i] = chainIds[chainKey(definitionIds[definition], r.chainLinkSupervisors[i])].String()
+	}
+
+	query := `
+		INSERT INTO run_tool_chain (run_id, tool_id, chain_id)
+		SELECT l.run_id, l.tool_id, l.chain_id
+		FROM unnest($1::uuid[], $2::uuid[], $3::uuid[]) AS l(run_id, tool_id, chain_id)
+		ON CONFLICT DO NOTHING`
+
+	_, err := tx.ExecContext(ctx, query, pq.Array(r.chainLinkRunIds), pq.Array(toolIds), pq.Array(linkChainIds))
+	if err != nil {
+		return fmt.Errorf("error linking runs to chains: %w", err)
+	}
+
+	return nil
+}
+
+// chainKey identifies a chain by its tool and its supervisors in order
+func chainKey(toolId uuid.UUID, supervisorIds []uuid.UUID) string {
+	ids := make([]string, len(supervisorIds))
+	for i, id := range supervisorIds {
+		ids[i] = id.String()
+	}
+	return toolId.String() + "/" + strings.Join(ids, ",")
+}
+
+// toolDefinitionHash identifies a tool definition by its content. Attribute keys are marshalled in
+// sorted order and ignored attributes are sorted, so definitions that only differ in order match.
+func toolDefinitionHash(
+	name string,
+	description string,
+	attributes map[string]interface{},
+	ignoredAttributes []string,
+	code string,
+) ([]byte, error) {
+	if attributes == nil {
+		attributes = map[string]interface{}{}
+	}
+	ignored := slices.Clone(ignoredAttributes)
+	slices.Sort(ignored)
+
+	definition, err := json.Marshal(struct {
+		Name              string                 `json:"name"`
+		Description       string                 `json:"description"`
+		Attributes        map[string]interface{} `json:"attributes"`
+		IgnoredAttributes []string               `json:"ignored_attributes"`
+		Code              string                 `json:"code"`
+	}{name, description, attributes, ignored, code})
+	if err != nil {
+		return nil, fmt.Errorf("error marshaling tool definition: %w", err)
+	}
+
+	hash := sha256.Sum256(definition)
+	return hash[:], nil
+}
+
+// CreateTool links a run to a tool definition, creating the definition unless the run's project already
+// has an identical one. Each run registers its own chains on the definition with CreateSupervisorChains.
 func (s *PostgresqlStore) CreateTool(
 	ctx context.Context,
 	runId uuid.UUID,
@@ -1150,24 +1783,49 @@ func (s *PostgresqlStore) CreateTool(
 		ignoredAttributes = []string{}
 	}
 
-	id := uuid.New()
-	query := `
-		INSERT INTO tool (id, run_id, name, description, attributes, ignored_attributes, code)
-		VALUES ($1, $2, $3, $4, $5, $6, $7)`
+	hash, err := toolDefinitionHash(name, description, attributes, ignoredAttributes, code)
+	if err != nil {
+		return nil, err
+	}
 
-	_, err = s.db.ExecContext(ctx, query,
-		id,
+	tx, err := s.db.BeginTx(ctx, nil)
+	if err != nil {
+		return nil, fmt.Errorf("error starting transaction: %w", err)
+	}
+	defer func() { _ = tx.Rollback() }()
+
+	var id uuid.UUID
+	err = s.txQueryRowContext(ctx, tx, createToolQuery,
+		uuid.New(),
 		runId,
+		hash,
 		name,
 		description,
 		attributesJSON, // Use the JSON-encoded attributes
 		pq.Array(ignoredAttributes),
 		code,
-	)
+	).Scan(&id)
+	if errors.Is(err, sql.ErrNoRows) {
+		// The project already has the definition, or the run doesn't exist. Left out of the insert so
+		// that an existing definition isn't written again.
+		err = s.txQueryRowContext(ctx, tx, getRunToolByHashQuery, runId, hash).Scan(&id)
+		if errors.Is(err, sql.ErrNoRows) {
+			return nil, fmt.Errorf("run not found: %s", runId)
+		}
+	}
 	if err != nil {
 		return nil, fmt.Errorf("error creating tool: %w", err)
 	}
 
+	_, err = s.txExecContext(ctx, tx, createRunToolQuery, runId, id)
+	if err != nil {
+		return nil, fmt.Errorf("error linking run to tool: %w", err)
+	}
+
+	if err := tx.Commit(); err != nil {
+		return nil, fmt.Errorf("error committing transaction: %w", err)
+	}
+
 	tool := asteroid.Tool{
 		Id:                &id,
 		RunId:             runId,
@@ -1182,13 +1840,8 @@ func (s *PostgresqlStore) CreateTool(
 }
 
 func (s *PostgresqlStore) GetRun(ctx context.Context, id uuid.UUID) (*asteroid.Run, error) {
-	query := `
-		SELECT id, task_id, created_at, status, result
-		FROM run
-		WHERE id = $1`
-
 	var run asteroid.Run
-	err := s.db.QueryRowContext(ctx, query, id).Scan(
+	err := s.queryRowContext(ctx, getRunQuery, id).Scan(
 		&run.Id,
 		&run.TaskId,
 		&run.CreatedAt,
@@ -1205,19 +1858,27 @@ func (s *PostgresqlStore) GetRun(ctx context.Context, id uuid.UUID) (*asteroid.R
 	return &run, nil
 }
 
-func (s *PostgresqlStore) GetRunTools(ctx context.Context, runId uuid.UUID) ([]asteroid.Tool, error) {
+func (s *PostgresqlStore) GetRunTools(ctx context.Context, runId uuid.UUID, page asteroid.Page, each func(asteroid.Tool) error) error {
 	query := `
-		SELECT tool.id, tool.run_id, tool.name, tool.description, tool.attributes, COALESCE(tool.ignored_attributes, '{}') as ignored_attributes, tool.code
-		FROM tool 
-		WHERE run_id = $1`
+		SELECT tool.id, rt.run_id, tool.name, tool.description, tool.attributes, COALESCE(tool.ignored_attributes, '{}') as ignored_attributes, tool.code
+		FROM run_tool rt
+		INNER JOIN tool ON tool.id = rt.tool_id
+		WHERE rt.run_id = $1 AND ($2::uuid IS NULL OR tool.id > $2)
+		ORDER BY tool.id ASC
+		LIMIT $3`
 
-	rows, err := s.db.QueryContext(ctx, query, runId)
-	if err != nil && err != sql.ErrNoRows {
-		return nil, fmt.Errorf("error getting run tools: %w", err)
+	_, afterId, limit := pageArgs(page)
+	rows, err := s.db.QueryContext(ctx, query, runId, afterId, limit)
+	if err != nil {
+		return fmt.Errorf("error getting run tools: %w", err)
 	}
 	defer rows.Close()
 
-	tools := make([]asteroid.Tool, 0)
+	return scanTools(rows, each)
+}
+
+// scanTools hands each tool row to the callback as it is scanned
+func scanTools(rows *sql.Rows, each func(asteroid.Tool) error) error {
 	for rows.Next() {
 		var tool asteroid.Tool
 		var attributesJSON []byte
@@ -1232,7 +1893,7 @@ func (s *PostgresqlStore) GetRunTools(ctx context.Context, runId uuid.UUID) ([]a
 			pq.Array(&ignoredAttributes),
 			&tool.Code,
 		); err != nil {
-			return nil, fmt.Errorf("error scanning tool: %w", err)
+			return fmt.Errorf("error scanning tool: %w", err)
 		}
 
 		// Initialize the attributes map
@@ -1241,27 +1902,32 @@ func (s *PostgresqlStore) GetRunTools(ctx context.Context, runId uuid.UUID) ([]a
 		// Parse the JSON attributes if they exist
 		if len(attributesJSON) > 0 {
 			if err := json.Unmarshal(attributesJSON, &t); err != nil {
-				return nil, fmt.Errorf("error parsing tool attributes: %w", err)
+				return fmt.Errorf("error parsing tool attributes: %w", err)
 			}
 		}
 		tool.Attributes = t
 		tool.IgnoredAttributes = &ignoredAttributes
 
-		tools = append(tools, tool)
+		if err := each(tool); err != nil {
+			return err
+		}
 	}
 
-	return tools, nil
+	return rows.Err()
 }
 
-func (s *PostgresqlStore) GetSupervisor(ctx context.Context, id uuid.UUID) (*asteroid.Supervisor, error) {
-	query := `
-		SELECT id, description, name, created_at, type, attributes
-		FROM supervisor
-		WHERE id = $1`
-
+func (s *PostgresqlStore) GetSupervisor(ctx context.Context, id uuid.UUID) (*asteroid.Supervisor, error) {
 	var supervisor asteroid.Supervisor
 	var attributesJSON []byte
-	err := s.db.QueryRowContext(ctx, query, id).Scan(&supervisor.Id, &supervisor.Description, &supervisor.Name, &supervisor.CreatedAt, &supervisor.Type, &attributesJSON)
+	err := s.queryRowContext(ctx, getSupervisorQuery, id).Scan(
+		&supervisor.Id,
+		&supervisor.Description,
+		&supervisor.Name,
+		&supervisor.CreatedAt,
+		&supervisor.Type,
+		&attributesJSON,
+		&supervisor.DecisionCacheTtlSeconds,
+	)
 	if errors.Is(err, sql.ErrNoRows) {
 		return nil, nil
 	}
@@ -1281,18 +1947,13 @@ func (s *PostgresqlStore) GetSupervisor(ctx context.Context, id uuid.UUID) (*ast
 
 func (s *PostgresqlStore) GetSupervisors(ctx context.Context, projectId uuid.UUID) ([]asteroid.Supervisor, error) {
 	query := `
-		SELECT s.id, s.description, s.name, s.code, s.created_at, s.type, s.attributes
+		SELECT s.id, s.description, s.name, s.code, s.created_at, s.type, s.attributes, s.decision_cache_ttl_seconds
 		FROM supervisor s 
 		INNER JOIN chain_supervisor cs ON s.id = cs.supervisor_id
 		INNER JOIN chain c ON cs.chain_id = c.id
 		INNER JOIN chain_tool ct ON c.id = ct.chain_id
 		INNER JOIN tool t ON ct.tool_id = t.id
-		INNER JOIN run r ON t.run_id = r.id
-		WHERE r.task_id IN (
-			SELECT id 
-			FROM task 
-			WHERE project_id = $1
-		)`
+		WHERE t.project_id = $1`
 
 	rows, err := s.db.QueryContext(ctx, query, projectId)
 	if err != nil {
@@ -1312,6 +1973,7 @@ func (s *PostgresqlStore) GetSupervisors(ctx context.Context, projectId uuid.UUI
 			&supervisor.CreatedAt,
 			&supervisor.Type,
 			&attributesJSON,
+			&supervisor.DecisionCacheTtlSeconds,
 		); err != nil {
 			return nil, fmt.Errorf("error scanning supervisor: %w", err)
 		}
@@ -1421,14 +2083,7 @@ func (s *PostgresqlStore) GetSupervisionStatusesForChainExecution(ctx context.Co
 
 // GetChainExecutionSupervisionRequests gets all supervision requests for a specific chain execution
 func (s *PostgresqlStore) GetChainExecutionSupervisionRequests(ctx context.Context, chainExecutionId uuid.UUID) ([]asteroid.SupervisionRequest, error) {
-	query := `
-        SELECT sr.id, sr.supervisor_id, sr.chainexecution_id, position_in_chain
-        FROM supervisionrequest sr
-        JOIN chainexecution ce ON sr.chainexecution_id = ce.id
-        WHERE ce.id = $1
-        ORDER BY sr.id ASC`
-
-	rows, err := s.db.QueryContext(ctx, query, chainExecutionId)
+	rows, err := s.queryContext(ctx, getChainExecutionSupervisionRequestsQuery, chainExecutionId)
 	if err != nil {
 		return nil, fmt.Errorf("error getting chain execution supervision requests: %w", err)
 	}
@@ -1437,41 +2092,31 @@ func (s *PostgresqlStore) GetChainExecutionSupervisionRequests(ctx context.Conte
 	requests := make([]asteroid.SupervisionRequest, 0)
 	for rows.Next() {
 		var request asteroid.SupervisionRequest
-		if err := rows.Scan(
+		var status currentStatusColumns
+		if err := rows.Scan(status.scanDest(
 			&request.Id,
 			&request.SupervisorId,
 			&request.ChainexecutionId,
 			&request.PositionInChain,
-		); err != nil {
+		)...); err != nil {
 			return nil, fmt.Errorf("error scanning supervision request: %w", err)
 		}
 
-		status, err := s.GetSupervisionRequestStatus(ctx, *request.Id)
-		if err != nil {
-			return nil, fmt.Errorf("error trying to get request status during chain execution query: %w", err)
-		}
-
-		if status != nil {
-			request.Status = status
-		}
+		request.Status = status.toSupervisionStatus()
 
 		requests = append(requests, request)
 	}
+	if err := rows.Err(); err != nil {
+		return nil, fmt.Errorf("error iterating chain execution supervision requests: %w", err)
+	}
 
 	return requests, nil
 }
 
 // GetSupervisionRequestStatus gets the latest status for a supervision request
 func (s *PostgresqlStore) GetSupervisionRequestStatus(ctx context.Context, requestId uuid.UUID) (*asteroid.SupervisionStatus, error) {
-	query := `
-        SELECT ss.id, ss.supervisionrequest_id, ss.status, ss.created_at
-        FROM supervisionrequest_status ss
-        WHERE ss.supervisionrequest_id = $1
-        ORDER BY ss.created_at DESC
-        LIMIT 1`
-
 	var status asteroid.SupervisionStatus
-	err := s.db.QueryRowContext(ctx, query, requestId).Scan(
+	err := s.queryRowContext(ctx, getSupervisionRequestStatusQuery, requestId).Scan(
 		&status.Id,
 		&status.SupervisionRequestId,
 		&status.Status,
@@ -1487,11 +2132,42 @@ func (s *PostgresqlStore) GetSupervisionRequestStatus(ctx context.Context, reque
 	return &status, nil
 }
 
-func (s *PostgresqlStore) GetChainExecution(ctx context.Context, executionId uuid.UUID) (*uuid.UUID, *uuid.UUID, error) {
-	query := `SELECT chain_id, toolcall_id FROM chainexecution WHERE id = $1`
+// GetSupervisionRequestStatuses returns the current status of each of the supervision requests that
+// exists, in no particular order
+func (s *PostgresqlStore) GetSupervisionRequestStatuses(ctx context.Context, requestIds []uuid.UUID) ([]asteroid.SupervisionStatus, error) {
+	if len(requestIds) == 0 {
+		return []asteroid.SupervisionStatus{}, nil
+	}
+
+	rows, err := s.queryContext(ctx, getSupervisionRequestStatusesQuery, pq.Array(requestIds))
+	if err != nil {
+		return nil, fmt.Errorf("error getting supervision request statuses: %w", err)
+	}
+	defer rows.Close()
+
+	statuses := make([]asteroid.SupervisionStatus, 0, len(requestIds))
+	for rows.Next() {
+		var status asteroid.SupervisionStatus
+		if err := rows.Scan(
+			&status.Id,
+			&status.SupervisionRequestId,
+			&status.Status,
+			&status.CreatedAt,
+		); err != nil {
+			return nil, fmt.Errorf("error scanning supervision request status: %w", err)
+		}
+		statuses = append(statuses, status)
+	}
+	if err := rows.Err(); err != nil {
+		return nil, fmt.Errorf("error iterating supervision request statuses: %w", err)
+	}
+
+	return statuses, nil
+}
 
+func (s *PostgresqlStore) GetChainExecution(ctx context.Context, executionId uuid.UUID) (*uuid.UUID, *uuid.UUID, error) {
 	var chainId, toolCallId uuid.UUID
-	err := s.db.QueryRowContext(ctx, query, executionId).Scan(&chainId, &toolCallId)
+	err := s.queryRowContext(ctx, getChainExecutionQuery, executionId).Scan(&chainId, &toolCallId)
 	if errors.Is(err, sql.ErrNoRows) {
 		return nil, nil, nil
 	}
@@ -1504,105 +2180,196 @@ func (s *PostgresqlStore) GetChainExecution(ctx context.Context, executionId uui
 
 // GetChainExecutionState returns the chain state for a given chain execution ID
 func (s *PostgresqlStore) GetChainExecutionState(ctx context.Context, executionId uuid.UUID) (*asteroid.ChainExecutionState, error) {
-	// First, get the chain execution record
-	var chainExecution asteroid.ChainExecution
-	err := s.db.QueryRowContext(ctx, `
-        SELECT id, toolcall_id, chain_id, created_at
-        FROM chainexecution
-        WHERE id = $1
-				ORDER BY id ASC
-    `, executionId).Scan(
-		&chainExecution.Id,
-		&chainExecution.ToolcallId,
-		&chainExecution.ChainId,
-		&chainExecution.CreatedAt,
-	)
-	if errors.Is(err, sql.ErrNoRows) {
+	states, err := s.GetChainExecutionStates(ctx, []uuid.UUID{executionId})
+	if err != nil {
+		return nil, err
+	}
+	if len(states) == 0 {
 		return nil, nil
 	}
-	if err != nil {
-		return nil, fmt.Errorf("failed to get chain execution: %w", err)
+
+	return &states[0], nil
+}
+
+// GetChainExecutionStates returns the chain states for the given chain execution IDs. Executions
+// that don't exist are left out.
+func (s *PostgresqlStore) GetChainExecutionStates(ctx context.Context, executionIds []uuid.UUID) ([]asteroid.ChainExecutionState, error) {
+	ids := make([]string, len(executionIds))
+	for i, id := range executionIds {
+		ids[i] = id.String()
 	}
 
-	// Get the supervisor chain
-	supervisorChain, err := s.GetSupervisorChain(ctx, chainExecution.ChainId)
+	return s.getChainExecutionStates(ctx, chainExecutionIdsFilter, pq.Array(ids))
+}
+
+// GetToolCallChainExecutionStates returns the states of all chain executions of a tool call
+func (s *PostgresqlStore) GetToolCallChainExecutionStates(ctx context.Context, toolCallId uuid.UUID) ([]asteroid.ChainExecutionState, error) {
+	return s.getChainExecutionStates(ctx, chainExecutionToolCallFilter, toolCallId)
+}
+
+// getChainExecutionStates loads the state of every chain execution matching the filter in two
+// queries, whatever the number of executions and supervision requests: one for the executions
+// and the supervisors of their chains, and one for the supervision requests with their latest
+// status and result. The filter is a condition on the chainexecution table aliased as ce.
+func (s *PostgresqlStore) getChainExecutionStates(ctx context.Context, filter string, arg interface{}) ([]asteroid.ChainExecutionState, error) {
+	rows, err := s.queryContext(ctx, chainExecutionsQuery(filter), arg)
 	if err != nil {
-		return nil, fmt.Errorf("failed to get supervisor chain: %w", err)
+		return nil, fmt.Errorf("failed to get chain executions: %w", err)
+	}
+	defer rows.Close()
+
+	states := make([]asteroid.ChainExecutionState, 0)
+	stateIndex := make(map[uuid.UUID]int)
+	for rows.Next() {
+		var chainExecution asteroid.ChainExecution
+		var supervisorId *uuid.UUID
+		var name, description, code *string
+		var supervisorType *asteroid.SupervisorType
+		var attributesJSON []byte
+		var createdAt *time.Time
+		var decisionCacheTtlSeconds *int
+		if err := rows.Scan(
+			&chainExecution.Id,
+			&chainExecution.ToolcallId,
+			&chainExecution.ChainId,
+			&chainExecution.CreatedAt,
+			&supervisorId,
+			&name,
+			&description,
+			&supervisorType,
+			&attributesJSON,
+			&createdAt,
+			&code,
+			&decisionCacheTtlSeconds,
+		); err != nil {
+			return nil, fmt.Errorf("error scanning chain execution: %w", err)
+		}
+
+		i, ok := stateIndex[chainExecution.Id]
+		if !ok {
+			i = len(states)
+			stateIndex[chainExecution.Id] = i
+			states = append(states, asteroid.ChainExecutionState{
+				Chain: asteroid.SupervisorChain{
+					ChainId:     chainExecution.ChainId,
+					Supervisors: make([]asteroid.Supervisor, 0),
+				},
+				ChainExecution:      chainExecution,
+				SupervisionRequests: make([]asteroid.SupervisionRequestState, 0),
+			})
+		}
+
+		// Chains without supervisors come back as a single row of NULLs
+		if supervisorId == nil {
+			continue
+		}
+
+		supervisor := asteroid.Supervisor{Id: supervisorId, DecisionCacheTtlSeconds: decisionCacheTtlSeconds}
+		if name != nil {
+			supervisor.Name = *name
+		}
+		if description != nil {
+			supervisor.Description = *description
+		}
+		if supervisorType != nil {
+			supervisor.Type = *supervisorType
+		}
+		if createdAt != nil {
+			supervisor.CreatedAt = *createdAt
+		}
+		if code != nil {
+			supervisor.Code = *code
+		}
+
+		// Parse the JSON attributes if they exist
+		if len(attributesJSON) > 0 {
+			if err := json.Unmarshal(attributesJSON, &supervisor.Attributes); err != nil {
+				return nil, fmt.Errorf("error parsing supervisor attributes: %w", err)
+			}
+		}
+
+		states[i].Chain.Supervisors = append(states[i].Chain.Supervisors, supervisor)
+	}
+	if err := rows.Err(); err != nil {
+		return nil, fmt.Errorf("error iterating chain executions: %w", err)
+	}
+
+	if len(states) == 0 {
+		return states, nil
 	}
 
-	// Get all supervision requests for this chain execution
-	supervisionRequests, err := s.GetChainExecutionSupervisionRequests(ctx, chainExecution.Id)
+	// Latest status and result of every supervision request of the matching executions
+	rows, err = s.queryContext(ctx, chainExecutionRequestsQuery(filter), arg)
 	if err != nil {
 		return nil, fmt.Errorf("failed to get supervision requests: %w", err)
 	}
+	defer rows.Close()
 
-	// For each supervision request, get the latest status and result
-	var supervisionRequestStates []asteroid.SupervisionRequestState
-	for _, request := range supervisionRequests {
-		// Get the latest status
+	for rows.Next() {
+		var request asteroid.SupervisionRequest
 		var status asteroid.SupervisionStatus
-		err := s.db.QueryRowContext(ctx, `
-            SELECT id, supervisionrequest_id, created_at, status FROM supervisionrequest_status WHERE supervisionrequest_id = $1 ORDER BY created_at DESC LIMIT 1
-        `, request.Id).Scan(
+		var resultId, resultRequestId, resultToolCallId *uuid.UUID
+		var resultCreatedAt *time.Time
+		var resultDecision *asteroid.Decision
+		var resultReasoning *string
+		if err := rows.Scan(
+			&request.Id,
+			&request.SupervisorId,
+			&request.ChainexecutionId,
+			&request.PositionInChain,
 			&status.Id,
 			&status.SupervisionRequestId,
-			&status.CreatedAt,
 			&status.Status,
-		)
-		if err != nil {
-			return nil, fmt.Errorf("failed to get supervision request status: %w", err)
+			&status.CreatedAt,
+			&resultId,
+			&resultRequestId,
+			&resultCreatedAt,
+			&resultDecision,
+			&resultReasoning,
+			&resultToolCallId,
+		); err != nil {
+			return nil, fmt.Errorf("error scanning supervision request state: %w", err)
 		}
 
-		// Get the result, if any
-		result := &asteroid.SupervisionResult{}
-		err = s.db.QueryRowContext(ctx, `
-            SELECT id, supervisionrequest_id, created_at, decision, reasoning, toolcall_id
-            FROM supervisionresult
-            WHERE supervisionrequest_id = $1
-        `, request.Id).Scan(
-			&result.Id,
-			&result.SupervisionRequestId,
-			&result.CreatedAt,
-			&result.Decision,
-			&result.Reasoning,
-			&result.ToolcallId,
-		)
-		if err != nil {
-			if err == sql.ErrNoRows {
-				result = nil // No result yet
-			} else {
-				return nil, fmt.Errorf("failed to get supervision result: %w", err)
+		requestStatus := status
+		request.Status = &requestStatus
+
+		var result *asteroid.SupervisionResult // No result yet
+		if resultId != nil {
+			result = &asteroid.SupervisionResult{
+				Id:                   resultId,
+				SupervisionRequestId: *resultRequestId,
+				ToolcallId:           resultToolCallId,
+			}
+			if resultCreatedAt != nil {
+				result.CreatedAt = *resultCreatedAt
+			}
+			if resultDecision != nil {
+				result.Decision = *resultDecision
+			}
+			if resultReasoning != nil {
+				result.Reasoning = *resultReasoning
 			}
 		}
 
-		supervisionRequestState := asteroid.SupervisionRequestState{
+		i := stateIndex[*request.ChainexecutionId]
+		states[i].SupervisionRequests = append(states[i].SupervisionRequests, asteroid.SupervisionRequestState{
 			SupervisionRequest: request,
 			Status:             status,
 			Result:             result,
-		}
-		supervisionRequestStates = append(supervisionRequestStates, supervisionRequestState)
+		})
 	}
-
-	// Build and return the ChainExecutionState
-	state := asteroid.ChainExecutionState{
-		Chain:               *supervisorChain,
-		ChainExecution:      chainExecution,
-		SupervisionRequests: supervisionRequestStates,
+	if err := rows.Err(); err != nil {
+		return nil, fmt.Errorf("error iterating supervision requests: %w", err)
 	}
 
-	return &state, nil
+	return states, nil
 }
 
 // GetChainExecutionFromChainAndToolCall gets the chain execution ID for a given chain ID and tool call ID
 func (s *PostgresqlStore) GetChainExecutionFromChainAndToolCall(ctx context.Context, chainId uuid.UUID, toolCallId uuid.UUID) (*uuid.UUID, error) {
-	query := `
-        SELECT id FROM chainexecution
-        WHERE chain_id = $1 
-				AND toolcall_id = $2
-    `
-
 	var executionId uuid.UUID
-	err := s.db.QueryRowContext(ctx, query, chainId, toolCallId).Scan(&executionId)
+	err := s.queryRowContext(ctx, getChainExecutionFromChainAndToolCallQuery, chainId, toolCallId).Scan(&executionId)
 	if errors.Is(err, sql.ErrNoRows) {
 		return nil, nil
 	}
@@ -1614,8 +2381,7 @@ func (s *PostgresqlStore) GetChainExecutionFromChainAndToolCall(ctx context.Cont
 }
 
 func (s *PostgresqlStore) UpdateRunStatus(ctx context.Context, runId uuid.UUID, status asteroid.Status) error {
-	query := `UPDATE run SET status = $1 WHERE id = $2`
-	_, err := s.db.ExecContext(ctx, query, status, runId)
+	_, err := s.execContext(ctx, updateRunStatusQuery, status, runId)
 	if err != nil {
 		return fmt.Errorf("error updating run status: %w", err)
 	}
@@ -1654,18 +2420,30 @@ func (s *PostgresqlStore) CreateChatRequest(
 	}
 	defer func() { _ = tx.Rollback() }()
 
+	// Every request resends the whole conversation, so the messages are stored once by content hash and
+	// the chat only keeps the rest of the request and the list of hashes
+	request, hashes, contents, err := splitChatRequest(request)
+	if err != nil {
+		return nil, err
+	}
+
+	err = s.createChatMessageContents(ctx, tx, hashes, contents)
+	if err != nil {
+		return nil, fmt.Errorf("error storing chat messages: %w", err)
+	}
+
 	query := `
-		INSERT INTO chat (request_data, response_data, run_id, format)
-		VALUES ($1, $2, $3, $4) RETURNING id
+		INSERT INTO chat (request_data, message_hashes, response_data, run_id, format)
+		VALUES ($1, $2, $3, $4, $5) RETURNING id
 	`
 	var id uuid.UUID
-	err = tx.QueryRowContext(ctx, query, request, response, runId, format).Scan(&id)
+	err = tx.QueryRowContext(ctx, query, request, pq.Array(hashes), response, runId, format).Scan(&id)
 	if err != nil {
 		return nil, fmt.Errorf("error creating chat entry: %w", err)
 	}
 
 	// Store the choices
-	err = s.createChatChoices(ctx, tx, id, choices, requestMessages)
+	err = s.createChatChoices(ctx, tx, runId, id, choices, requestMessages)
 	if err != nil {
 		return nil, fmt.Errorf("error creating chat choices: %w", err)
 	}
@@ -1677,37 +2455,121 @@ func (s *PostgresqlStore) CreateChatRequest(
 	return &id, nil
 }
 
-func (s *PostgresqlStore) createChatRequestMessages(
-	ctx context.Context,
-	tx *sql.Tx,
-	choiceId uuid.UUID,
-	requestMessages []asteroid.AsteroidMessage,
-) error {
-	// For each message, store it in the DB
-	for _, message := range requestMessages {
-		query := `
-			INSERT INTO msg (id, choice_id, msg_data)
-			VALUES ($1, $2, $3)
-		`
-		msgData, err := json.Marshal(message)
-		if err != nil {
-			return fmt.Errorf("error marshalling message data: %w", err)
+// splitChatRequest takes the messages out of a chat request, returning the rest of the request and the
+// SHA-256 hash and content of each message in order. A request without messages is returned as is.
+func splitChatRequest(request []byte) ([]byte, [][]byte, []string, error) {
+	var fields map[string]json.RawMessage
+	if err := json.Unmarshal(request, &fields); err != nil {
+		return nil, nil, nil, fmt.Errorf("error unmarshalling chat request: %w", err)
+	}
+
+	var messages []json.RawMessage
+	if raw, ok := fields["messages"]; ok {
+		if err := json.Unmarshal(raw, &messages); err != nil {
+			return nil, nil, nil, fmt.Errorf("error unmarshalling chat request messages: %w", err)
 		}
-		_, err = tx.ExecContext(ctx, query, message.Id, choiceId, msgData)
-		if err != nil {
-			return fmt.Errorf("error creating chat message: %w", err)
+	}
+	if len(messages) == 0 {
+		return request, [][]byte{}, nil, nil
+	}
+
+	delete(fields, "messages")
+	rest, err := json.Marshal(fields)
+	if err != nil {
+		return nil, nil, nil, fmt.Errorf("error marshalling chat request: %w", err)
+	}
+
+	hashes := make([][]byte, len(messages))
+	contents := make([]string, len(messages))
+	for i, message := range messages {
+		sum := sha256.Sum256(message)
+		hashes[i] = sum[:]
+		contents[i] = string(message)
+	}
+
+	return rest, hashes, contents, nil
+}
+
+// joinChatRequest puts the messages of a chat request back in place. Chats stored before messages were
+// split out have no message list and are returned as is.
+func joinChatRequest(request []byte, messages []byte) ([]byte, error) {
+	if messages == nil {
+		return request, nil
+	}
+
+	var fields map[string]json.RawMessage
+	if err := json.Unmarshal(request, &fields); err != nil {
+		return nil, fmt.Errorf("error unmarshalling chat request: %w", err)
+	}
+	fields["messages"] = messages
+
+	return json.Marshal(fields)
+}
+
+// createChatMessageContents stores the messages of a chat request that haven't been stored before. Only
+// the hashes are sent to check what is already there, so the earlier turns of a conversation aren't
+// written again.
+func (s *PostgresqlStore) createChatMessageContents(ctx context.Context, tx *sql.Tx, hashes [][]byte, contents []string) error {
+	if len(hashes) == 0 {
+		return nil
+	}
+
+	query := `
+		SELECT hash
+		FROM chat_message_content
+		WHERE hash = ANY($1::bytea[])`
+
+	rows, err := tx.QueryContext(ctx, query, pq.Array(hashes))
+	if err != nil {
+		return fmt.Errorf("error getting stored chat messages: %w", err)
+	}
+	defer rows.Close()
+
+	stored := make(map[string]bool, len(hashes))
+	for rows.Next() {
+		var hash []byte
+		if err := rows.Scan(&hash); err != nil {
+			return fmt.Errorf("error scanning chat message hash: %w", err)
+		}
+		stored[string(hash)] = true
+	}
+	if err := rows.Err(); err != nil {
+		return fmt.Errorf("error iterating stored chat messages: %w", err)
+	}
+
+	var newHashes [][]byte
+	var newContents []string
+	for i, hash := range hashes {
+		if stored[string(hash)] {
+			continue
 		}
+		// A message repeated within the request is only sent once
+		stored[string(hash)] = true
+		newHashes = append(newHashes, hash)
+		newContents = append(newContents, contents[i])
+	}
+	if len(newHashes) == 0 {
+		return nil
+	}
+
+	// Another request of the same conversation may store the same message concurrently
+	query = `
+		INSERT INTO chat_message_content (hash, data)
+		SELECT m.hash, m.data
+		FROM unnest($1::bytea[], $2::jsonb[]) AS m(hash, data)
+		ON CONFLICT (hash) DO NOTHING`
+
+	_, err = tx.ExecContext(ctx, query, pq.Array(newHashes), pq.Array(newContents))
+	if err != nil {
+		return fmt.Errorf("error creating chat messages: %w", err)
 	}
 
 	return nil
 }
 
 func (s *PostgresqlStore) GetMessage(ctx context.Context, id uuid.UUID) (*asteroid.AsteroidMessage, error) {
-	query := `
-		SELECT msg_data FROM msg WHERE id = $1
-	`
 	var msgData []byte
-	err := s.db.QueryRowContext(ctx, query, id).Scan(&msgData)
+	err := s.queryRowContext(ctx, getMessageQuery, id).Scan(&msgData)
 	if err != nil {
 		return nil, fmt.Errorf("error getting message: %w", err)
 	}
@@ -1722,14 +2584,11 @@ func (s *PostgresqlStore) GetMessage(ctx context.Context, id uuid.UUID) (*astero
 }
 
 func (s *PostgresqlStore) UpdateMessage(ctx context.Context, id uuid.UUID, message asteroid.AsteroidMessage) error {
-	query := `
-		UPDATE msg SET msg_data = $1 WHERE id = $2	
-	`
 	msgData, err := json.Marshal(message)
 	if err != nil {
 		return fmt.Errorf("error marshalling message data: %w", err)
 	}
-	_, err = s.db.ExecContext(ctx, query, msgData, id)
+	_, err = s.execContext(ctx, updateMessageQuery, msgData, id)
 	if err != nil {
 		return fmt.Errorf("error updating message: %w", err)
 	}
@@ -1741,32 +2600,23 @@ func (s *PostgresqlStore) GetChat(
 	runId uuid.UUID,
 	index int,
 ) ([]byte, []byte, error) {
-	query := `
-		SELECT request_data, response_data
-		FROM chat
-		WHERE run_id = $1
-		ORDER BY created_at DESC
-		LIMIT 1 OFFSET $2
-	`
-
-	var requestData, responseData []byte
-	err := s.db.QueryRowContext(ctx, query, runId, index).Scan(&requestData, &responseData)
+	var requestData, responseData, messages []byte
+	err := s.queryRowContext(ctx, getChatQuery, runId, index).Scan(&requestData, &responseData, &messages)
 	if err != nil {
 		return nil, nil, fmt.Errorf("error getting message: %w", err)
 	}
 
+	requestData, err = joinChatRequest(requestData, messages)
+	if err != nil {
+		return nil, nil, fmt.Errorf("error rebuilding chat request: %w", err)
+	}
+
 	return requestData, responseData, nil
 }
 
 func (s *PostgresqlStore) GetRunChatCount(ctx context.Context, runId uuid.UUID) (int, error) {
-	query := `
-		SELECT COUNT(*) 
-		FROM chat 
-		WHERE run_id = $1
-	`
-
 	var count int
-	err := s.db.QueryRowContext(ctx, query, runId).Scan(&count)
+	err := s.queryRowContext(ctx, getRunChatCountQuery, runId).Scan(&count)
 	if err != nil {
 		return 0, fmt.Errorf("error getting chat count: %w", err)
 	}
@@ -1774,107 +2624,166 @@ func (s *PostgresqlStore) GetRunChatCount(ctx context.Context, runId uuid.UUID)
 	return count, nil
 }
 
+// chatRows holds the rows a chat turn adds to each table, as columns ready to be passed as arrays
+type chatRows struct {
+	choiceIds       []string
+	choiceData      []string
+	msgIds          []string
+	msgChoiceIds    []string
+	msgData         []string
+	toolCallIds     []string
+	toolCallCallIds []string
+	toolCallMsgIds  []string
+	toolCallData    []string
+	toolCallToolIds []string
+}
+
+func (c *chatRows) addMessage(choiceId string, message asteroid.AsteroidMessage) error {
+	if message.Id == nil {
+		return fmt.Errorf("message ID is nil")
+	}
+
+	msgData, err := json.Marshal(message)
+	if err != nil {
+		return fmt.Errorf("error marshalling message data: %w", err)
+	}
+
+	c.msgIds = append(c.msgIds, message.Id.String())
+	c.msgChoiceIds = append(c.msgChoiceIds, choiceId)
+	c.msgData = append(c.msgData, string(msgData))
+
+	return nil
+}
+
+func (c *chatRows) addToolCall(msgId uuid.UUID, toolCall asteroid.AsteroidToolCall) error {
+	toolCallData, err := json.Marshal(toolCall)
+	if err != nil {
+		return fmt.Errorf("error marshalling tool call data: %w", err)
+	}
+
+	callId := ""
+	if toolCall.CallId != nil {
+		callId = *toolCall.CallId
+	}
+
+	c.toolCallIds = append(c.toolCallIds, toolCall.Id.String())
+	c.toolCallCallIds = append(c.toolCallCallIds, callId)
+	c.toolCallMsgIds = append(c.toolCallMsgIds, msgId.String())
+	c.toolCallData = append(c.toolCallData, string(toolCallData))
+	c.toolCallToolIds = append(c.toolCallToolIds, toolCall.ToolId.String())
+
+	return nil
+}
+
+// createChatChoices stores the choices of a chat together with their messages and tool calls, and
+// initialises a chain execution for every chain the run configured on each tool called. Each table takes a
+// single multi-row insert, so a chat turn costs the same number of round trips however many choices,
+// messages and tool calls it has.
 func (s *PostgresqlStore) createChatChoices(
 	ctx context.Context,
 	tx *sql.Tx,
+	runId uuid.UUID,
 	chatId uuid.UUID,
 	choices []asteroid.AsteroidChoice,
 	requestMessages []asteroid.AsteroidMessage,
 ) error {
-	// Store the choices in the DB
+	var rows chatRows
 	for _, choice := range choices {
-		query := `
-			INSERT INTO choice (id, chat_id, choice_data)
-			VALUES ($1, $2, $3)
-		`
+		// Convert the AsteroidId to a uuid
+		if _, err := uuid.Parse(choice.AsteroidId); err != nil {
+			return fmt.Errorf("error parsing AsteroidId: %w", err)
+		}
 
 		choiceData, err := json.Marshal(choice)
 		if err != nil {
 			return fmt.Errorf("error marshalling choice data: %w", err)
 		}
+		rows.choiceIds = append(rows.choiceIds, choice.AsteroidId)
+		rows.choiceData = append(rows.choiceData, string(choiceData))
 
-		_, err = tx.ExecContext(ctx, query, choice.AsteroidId, chatId, choiceData)
-		if err != nil {
-			return fmt.Errorf("error creating chat choice: %w", err)
+		// The request messages are shared by every choice of the chat, so they are stored once with the first
+		for _, message := range requestMessages {
+			if len(rows.choiceIds) > 1 {
+				break
+			}
+			if err := rows.addMessage(choice.AsteroidId, message); err != nil {
+				return fmt.Errorf("error creating chat request messages: %w", err)
+			}
 		}
 
-		// Convert the AsteroidId to a uuid
-		choiceId, err := uuid.Parse(choice.AsteroidId)
-		if err != nil {
-			return fmt.Errorf("error parsing AsteroidId: %w", err)
+		// Store the message
+		if err := rows.addMessage(choice.AsteroidId, choice.Message); err != nil {
+			return err
 		}
 
-		// Store the request messages which are unique to the request that generated this choice
-		err = s.createChatRequestMessages(ctx, tx, choiceId, requestMessages)
-		if err != nil {
-			return fmt.Errorf("error creating chat request messages: %w", err)
+		if choice.Message.ToolCalls != nil {
+			for _, toolCall := range *choice.Message.ToolCalls {
+				if err := rows.addToolCall(*choice.Message.Id, toolCall); err != nil {
+					return fmt.Errorf("error creating tool calls: %w", err)
+				}
+			}
 		}
+	}
 
-		fmt.Printf("Choice message: %+v\n", choice.Message)
-		// Store the message
-		query = `
-			INSERT INTO msg (id, choice_id, msg_data)
-			VALUES ($1, $2, $3)
-		`
-		messageData, err := json.Marshal(choice.Message)
-		if err != nil {
-			return fmt.Errorf("error marshalling message data: %w", err)
-		}
+	if len(rows.choiceIds) == 0 {
+		return nil
+	}
 
-		msgId := choice.Message.Id
-		if msgId == nil {
-			return fmt.Errorf("message ID is nil")
-		}
+	query := `
+		INSERT INTO choice (id, chat_id, choice_data)
+		SELECT c.id, $1, c.choice_data
+		FROM unnest($2::uuid[], $3::jsonb[]) AS c(id, choice_data)`
 
-		_, err = tx.ExecContext(ctx, query, *msgId, choice.AsteroidId, messageData)
-		if err != nil {
-			return fmt.Errorf("error creating chat message: %w", err)
-		}
+	_, err := tx.ExecContext(ctx, query, chatId, pq.Array(rows.choiceIds), pq.Array(rows.choiceData))
+	if err != nil {
+		return fmt.Errorf("error creating chat choices: %w", err)
+	}
 
-		if choice.Message.ToolCalls != nil {
-			// Store the tool calls
-			err = s.createToolCalls(ctx, tx, *msgId, *choice.Message.ToolCalls)
-			if err != nil {
-				return fmt.Errorf("error creating tool calls: %w", err)
-			}
-		}
+	query = `
+		INSERT INTO msg (id, choice_id, msg_data)
+		SELECT m.id, m.choice_id, m.msg_data
+		FROM unnest($1::uuid[], $2::uuid[], $3::jsonb[]) AS m(id, choice_id, msg_data)`
+
+	_, err = tx.ExecContext(ctx, query, pq.Array(rows.msgIds), pq.Array(rows.msgChoiceIds), pq.Array(rows.msgData))
+	if err != nil {
+		return fmt.Errorf("error creating chat messages: %w", err)
 	}
 
-	return nil
-}
+	if len(rows.toolCallIds) == 0 {
+		return nil
+	}
 
-func (s *PostgresqlStore) createToolCalls(
-	ctx context.Context,
-	tx *sql.Tx,
-	msgId uuid.UUID,
-	toolCalls []asteroid.AsteroidToolCall,
-) error {
-	// Store the tool calls in the DB
-	for _, toolCall := range toolCalls {
-		query := `
-			INSERT INTO toolcall (id, call_id, msg_id, tool_call_data, tool_id)
-			VALUES ($1, $2, $3, $4, $5)
-		`
-		toolCallData, err := json.Marshal(toolCall)
-		if err != nil {
-			return fmt.Errorf("error marshalling tool call data: %w", err)
-		}
-		_, err = tx.ExecContext(ctx, query, toolCall.Id, toolCall.CallId, msgId, toolCallData, toolCall.ToolId)
-		if err != nil {
-			return fmt.Errorf("error creating tool call: %w", err)
-		}
+	query = `
+		INSERT INTO toolcall (id, call_id, msg_id, tool_call_data, tool_id)
+		SELECT t.id, t.call_id, t.msg_id, t.tool_call_data, t.tool_id
+		FROM unnest($1::uuid[], $2::text[], $3::uuid[], $4::jsonb[], $5::uuid[])
+		     AS t(id, call_id, msg_id, tool_call_data, tool_id)`
 
-		// Get the chains configured for this tool
-		chains, err := s.getChainsForTool(ctx, toolCall.ToolId)
-		if err != nil {
-			return fmt.Errorf("error getting chains configured for tool call: %w", err)
-		}
+	_, err = tx.ExecContext(
+		ctx,
+		query,
+		pq.Array(rows.toolCallIds),
+		pq.Array(rows.toolCallCallIds),
+		pq.Array(rows.toolCallMsgIds),
+		pq.Array(rows.toolCallData),
+		pq.Array(rows.toolCallToolIds),
+	)
+	if err != nil {
+		return fmt.Errorf("error creating tool calls: %w", err)
+	}
 
-		// Init the chain executions
-		err = s.createChainExecutions(ctx, tx, toolCall.Id, chains)
-		if err != nil {
-			return fmt.Errorf("error creating chain executions: %w", err)
-		}
+	// Init the chain executions for the chains the run configured on each tool, read in the same
+	// statement so they come from the transaction's snapshot. Other runs sharing the tool's definition
+	// may have configured other chains on it.
+	query = `
+		INSERT INTO chainexecution (id, chain_id, toolcall_id)
+		SELECT gen_random_uuid(), rtc.chain_id, t.id
+		FROM unnest($1::uuid[], $2::uuid[]) AS t(id, tool_id)
+		JOIN run_tool_chain rtc ON rtc.run_id = $3 AND rtc.tool_id = t.tool_id`
+
+	_, err = tx.ExecContext(ctx, query, pq.Array(rows.toolCallIds), pq.Array(rows.toolCallToolIds), runId)
+	if err != nil {
+		return fmt.Errorf("error creating chain executions: %w", err)
 	}
 
 	return nil
@@ -0,0 +1,509 @@
+package database
+
+import (
+	"context"
+	"database/sql"
+	"fmt"
+	"sort"
+	"sync/atomic"
+	"time"
+
+	asteroid "github.com/asteroidai/asteroid/server"
+)
+
+// The queries made on every tool call and supervision decision. They are prepared once when the store
+// connects and run as prepared statements from then on, so Postgres doesn't parse and plan them again
+// on every call.
+const (
+	// Projects, tasks and runs
+	getProjectQuery = `
+		SELECT id, name, created_at, run_result_tags
+		FROM project
+		WHERE id = $1`
+
+	getProjectFromNameQuery = `
+		SELECT id, name, created_at, run_result_tags
+		FROM project
+		WHERE name = $1`
+
+	getTaskQuery = `
+		SELECT id, project_id, name, description, created_at
+		FROM task
+		WHERE id = $1`
+
+	getRunQuery = `
+		SELECT id, task_id, created_at, status, result
+		FROM run
+		WHERE id = $1`
+
+	updateRunStatusQuery = `UPDATE run SET status = $1 WHERE id = $2`
+
+	// Tools and supervisor chains
+	getToolQuery = `
+		SELECT id, run_id, name, description, attributes, ignored_attributes, code
+		FROM tool
+		WHERE id = $1`
+
+	getToolFromNameAndRunIdQuery = `
+		SELECT t.id, t.name, t.description, t.attributes, t.ignored_attributes, t.code
+		FROM run_tool rt
+		JOIN tool t ON t.id = rt.tool_id
+		WHERE t.name = $1
+		AND rt.run_id = $2
+		ORDER BY t.id
+		LIMIT 1`
+
+	// Creates a tool definition in the run's project, or returns the identical one the project has
+	createToolQuery = `
+		INSERT INTO tool (id, run_id, project_id, definition_hash, name, description, attributes, ignored_attributes, code)
+		SELECT $1, r.id, t.project_id, $3, $4, $5, $6, $7, $8
+		FROM run r
+		JOIN task t ON t.id = r.task_id
+		WHERE r.id = $2
+		ON CONFLICT (project_id, definition_hash) WHERE definition_hash IS NOT NULL
+		DO NOTHING
+		RETURNING id`
+
+	getRunToolByHashQuery = `
+		SELECT tl.id
+		FROM run r
+		JOIN task t ON t.id = r.task_id
+		JOIN tool tl ON tl.project_id = t.project_id
+		WHERE r.id = $1 AND tl.definition_hash = $2`
+
+	createRunToolQuery = `
+		INSERT INTO run_tool (run_id, tool_id)
+		VALUES ($1, $2)
+		ON CONFLICT DO NOTHING`
+
+	getSupervisorQuery = `
+		SELECT id, description, name, created_at, type, attributes, decision_cache_ttl_seconds
+		FROM supervisor
+		WHERE id = $1`
+
+	getChainsForToolQuery = `
+		SELECT chain_id
+		FROM chain_tool ct
+		WHERE tool_id = $1`
+
+	getRunChainsForToolQuery = `
+		SELECT chain_id
+		FROM run_tool_chain
+		WHERE run_id = $1 AND tool_id = $2`
+
+	getSupervisorChainQuery = `
+		SELECT s.id, s.name, s.description, s.type, s.attributes, s.created_at, s.code, s.decision_cache_ttl_seconds
+		FROM chain_supervisor cs
+		INNER JOIN supervisor s ON cs.supervisor_id = s.id
+		WHERE cs.chain_id = $1
+		ORDER BY cs.position_in_chain ASC`
+
+	// Tool calls and chain executions
+	getToolCallQuery = `
+		SELECT id, call_id, created_at, tool_id, tool_call_data
+		FROM toolcall
+		WHERE id = $1`
+
+	getToolCallRunIdQuery = `
+		SELECT c.run_id
+		FROM toolcall tc
+		JOIN msg m ON m.id = tc.msg_id
+		JOIN choice ch ON ch.id = m.choice_id
+		JOIN chat c ON c.id = ch.chat_id
+		WHERE tc.id = $1`
+
+	getToolCallFromCallIdQuery = `
+		SELECT id, call_id, created_at, tool_id, tool_call_data
+		FROM toolcall
+		WHERE call_id = $1`
+
+	getChainExecutionQuery = `SELECT chain_id, toolcall_id FROM chainexecution WHERE id = $1`
+
+	getChainExecutionsFromToolCallQuery = `SELECT id FROM chainexecution WHERE toolcall_id = $1`
+
+	getExecutionFromChainIdQuery = `
+		SELECT id
+		FROM chainexecution
+		WHERE chain_id = $1`
+
+	getChainExecutionFromChainAndToolCallQuery = `
+		SELECT id
+		FROM chainexecution
+		WHERE chain_id = $1 AND toolcall_id = $2`
+
+	// Supervision requests, statuses and results
+	createSupervisionRequestQuery = `
+		INSERT INTO supervisionrequest (id, supervisor_id, position_in_chain, chainexecution_id)
+		VALUES ($1, $2, $3, $4)`
+
+	getSupervisionRequestQuery = `
+		SELECT sr.id, sr.supervisor_id, sr.position_in_chain, sr.chainexecution_id,
+			   cs.status_id, cs.supervisionrequest_id, cs.status, cs.created_at
+		FROM supervisionrequest sr
+		LEFT JOIN supervisionrequest_current_status cs ON cs.supervisionrequest_id = sr.id
+		WHERE sr.id = $1`
+
+	getChainExecutionSupervisionRequestsQuery = `
+		SELECT sr.id, sr.supervisor_id, sr.chainexecution_id, sr.position_in_chain,
+			   cs.status_id, cs.supervisionrequest_id, cs.status, cs.created_at
+		FROM supervisionrequest sr
+		LEFT JOIN supervisionrequest_current_status cs ON cs.supervisionrequest_id = sr.id
+		WHERE sr.chainexecution_id = $1
+		ORDER BY sr.id ASC`
+
+	getSupervisionRequestsForStatusQuery = `
+		SELECT sr.id, sr.supervisor_id, sr.position_in_chain, sr.chainexecution_id,
+			   cs.status_id, cs.supervisionrequest_id, cs.status, cs.created_at
+		FROM supervisionrequest_current_status cs
+		JOIN supervisionrequest sr ON sr.id = cs.supervisionrequest_id
+		JOIN supervisor s ON s.id = sr.supervisor_id
+		WHERE s.type != $1 AND cs.status = $2
+		ORDER BY cs.status_id ASC`
+
+	countSupervisionRequestsQuery = `
+		SELECT COUNT(*)
+		FROM supervisionrequest_current_status
+		WHERE status = $1`
+
+	createSupervisionStatusQuery = `
+		INSERT INTO supervisionrequest_status (supervisionrequest_id, status, created_at)
+		VALUES ($1, $2, $3)
+		RETURNING id`
+
+	updateCurrentSupervisionStatusQuery = `
+		INSERT INTO supervisionrequest_current_status (supervisionrequest_id, status_id, status, created_at)
+		VALUES ($1, $2, $3, $4)
+		ON CONFLICT (supervisionrequest_id) DO UPDATE
+		SET status_id = EXCLUDED.status_id, status = EXCLUDED.status, created_at = EXCLUDED.created_at
+		WHERE supervisionrequest_current_status.status_id < EXCLUDED.status_id
+			AND supervisionrequest_current_status.status <> $5`
+
+	getSupervisionRequestStatusQuery = `
+		SELECT status_id, supervisionrequest_id, status, created_at
+		FROM supervisionrequest_current_status
+		WHERE supervisionrequest_id = $1`
+
+	getSupervisionRequestStatusesQuery = `
+		SELECT status_id, supervisionrequest_id, status, created_at
+		FROM supervisionrequest_current_status
+		WHERE supervisionrequest_id = ANY($1::uuid[])`
+
+	createSupervisionResultQuery = `
+		INSERT INTO supervisionresult (id, supervisionrequest_id, created_at, decision, reasoning, toolcall_id)
+		VALUES ($1, $2, $3, $4, $5, $6)`
+
+	getSupervisionResultFromRequestIdQuery = `
+		SELECT id, supervisionrequest_id, created_at, decision, reasoning, toolcall_id
+		FROM supervisionresult
+		WHERE supervisionrequest_id = $1`
+
+	// Leases on human supervision requests. A request can be claimed while it is pending, or assigned
+	// under a lease that has expired, which means the server that assigned it went away.
+	claimSupervisionRequestsQuery = `
+		WITH claimable AS (
+			SELECT cs.supervisionrequest_id
+			FROM supervisionrequest_current_status cs
+			JOIN supervisionrequest sr ON sr.id = cs.supervisionrequest_id
+			JOIN supervisor s ON s.id = sr.supervisor_id
+			LEFT JOIN supervisionrequest_lease l ON l.supervisionrequest_id = cs.supervisionrequest_id
+			WHERE cs.status IN ($4, $5) AND s.type = $6
+			AND (l.expires_at IS NULL OR l.expires_at < now())
+			ORDER BY cs.status_id ASC
+			LIMIT $3
+			FOR UPDATE OF cs SKIP LOCKED
+		), claimed AS (
+			INSERT INTO supervisionrequest_lease (supervisionrequest_id, holder, expires_at)
+			SELECT supervisionrequest_id, $1, now() + $2 * interval '1 millisecond'
+			FROM claimable
+			ON CONFLICT (supervisionrequest_id) DO UPDATE
+			SET holder = EXCLUDED.holder, expires_at = EXCLUDED.expires_at
+			WHERE supervisionrequest_lease.expires_at < now()
+			RETURNING supervisionrequest_id
+		)
+		SELECT sr.id, sr.supervisor_id, sr.position_in_chain, sr.chainexecution_id,
+			   cs.status_id, cs.supervisionrequest_id, cs.status, cs.created_at
+		FROM claimed c
+		JOIN supervisionrequest sr ON sr.id = c.supervisionrequest_id
+		JOIN supervisionrequest_current_status cs ON cs.supervisionrequest_id = sr.id
+		ORDER BY cs.status_id ASC`
+
+	// Claims a single request under the same rules, also letting the holder of a live lease renew it
+	claimSupervisionRequestQuery = `
+		INSERT INTO supervisionrequest_lease (supervisionrequest_id, holder, expires_at)
+		SELECT cs.supervisionrequest_id, $2, now() + $3 * interval '1 millisecond'
+		FROM supervisionrequest_current_status cs
+		WHERE cs.supervisionrequest_id = $1 AND cs.status IN ($4, $5)
+		FOR UPDATE OF cs
+		ON CONFLICT (supervisionrequest_id) DO UPDATE
+		SET holder = EXCLUDED.holder, expires_at = EXCLUDED.expires_at
+		WHERE supervisionrequest_lease.expires_at < now() OR supervisionrequest_lease.holder = EXCLUDED.holder
+		RETURNING supervisionrequest_id`
+
+	renewSupervisionRequestLeasesQuery = `
+		UPDATE supervisionrequest_lease
+		SET expires_at = now() + $3 * interval '1 millisecond'
+		WHERE holder = $1 AND supervisionrequest_id = ANY($2::uuid[])`
+
+	releaseSupervisionRequestLeasesQuery = `
+		DELETE FROM supervisionrequest_lease
+		WHERE holder = $1 AND supervisionrequest_id = ANY($2::uuid[])`
+
+	// Chats
+	getChatQuery = `
+		SELECT c.request_data, c.response_data, (
+			SELECT jsonb_agg(m.data ORDER BY h.position)
+			FROM unnest(c.message_hashes) WITH ORDINALITY AS h(hash, position)
+			JOIN chat_message_content m ON m.hash = h.hash
+		)
+		FROM chat c
+		WHERE c.id = (
+			SELECT id
+			FROM chat
+			WHERE run_id = $1
+			ORDER BY created_at DESC
+			LIMIT 1 OFFSET $2
+		)`
+
+	getRunChatCountQuery = `
+		SELECT COUNT(*)
+		FROM chat
+		WHERE run_id = $1`
+
+	getMessageQuery = `SELECT msg_data FROM msg WHERE id = $1`
+
+	updateMessageQuery = `UPDATE msg SET msg_data = $1 WHERE id = $2`
+)
+
+// Filters for getChainExecutionStates, on the chainexecution table aliased as ce
+const (
+	chainExecutionIdsFilter      = "ce.id = ANY($1::uuid[])"
+	chainExecutionToolCallFilter = "ce.toolcall_id = $1"
+)
+
+func chainExecutionsQuery(filter string) string {
+	return `
+		SELECT ce.id, ce.toolcall_id, ce.chain_id, ce.created_at,
+			s.id, s.name, s.description, s.type, s.attributes, s.created_at, s.code, s.decision_cache_ttl_seconds
+		FROM chainexecution ce
+		LEFT JOIN chain_supervisor cs ON cs.chain_id = ce.chain_id
+		LEFT JOIN supervisor s ON s.id = cs.supervisor_id
+		WHERE ` + filter + `
+		ORDER BY ce.created_at ASC, ce.id ASC, cs.position_in_chain ASC`
+}
+
+func chainExecutionRequestsQuery(filter string) string {
+	return `
+		SELECT sr.id, sr.supervisor_id, sr.chainexecution_id, sr.position_in_chain,
+			st.status_id, st.supervisionrequest_id, st.status, st.created_at,
+			res.id, res.supervisionrequest_id, res.created_at, res.decision, res.reasoning, res.toolcall_id
+		FROM chainexecution ce
+		INNER JOIN supervisionrequest sr ON sr.chainexecution_id = ce.id
+		INNER JOIN supervisionrequest_current_status st ON st.supervisionrequest_id = sr.id
+		LEFT JOIN LATERAL (
+			SELECT r.id, r.supervisionrequest_id, r.created_at, r.decision, r.reasoning, r.toolcall_id
+			FROM supervisionresult r
+			WHERE r.supervisionrequest_id = sr.id
+			ORDER BY r.created_at DESC
+			LIMIT 1
+		) res ON true
+		WHERE ` + filter + `
+		ORDER BY sr.chainexecution_id ASC, sr.id ASC`
+}
+
+var preparedQueries = []struct {
+	name  string
+	query string
+}{
+	{"getProject", getProjectQuery},
+	{"getProjectFromName", getProjectFromNameQuery},
+	{"getTask", getTaskQuery},
+	{"getRun", getRunQuery},
+	{"updateRunStatus", updateRunStatusQuery},
+	{"getTool", getToolQuery},
+	{"getToolFromNameAndRunId", getToolFromNameAndRunIdQuery},
+	{"createTool", createToolQuery},
+	{"getRunToolByHash", getRunToolByHashQuery},
+	{"createRunTool", createRunToolQuery},
+	{"getSupervisor", getSupervisorQuery},
+	{"getChainsForTool", getChainsForToolQuery},
+	{"getRunChainsForTool", getRunChainsForToolQuery},
+	{"getSupervisorChain", getSupervisorChainQuery},
+	{"getToolCall", getToolCallQuery},
+	{"getToolCallFromCallId", getToolCallFromCallIdQuery},
+	{"getToolCallRunId", getToolCallRunIdQuery},
+	{"getChainExecution", getChainExecutionQuery},
+	{"getChainExecutionsFromToolCall", getChainExecutionsFromToolCallQuery},
+	{"getExecutionFromChainId", getExecutionFromChainIdQuery},
+	{"getChainExecutionFromChainAndToolCall", getChainExecutionFromChainAndToolCallQuery},
+	{"createSupervisionRequest", createSupervisionRequestQuery},
+	{"getSupervisionRequest", getSupervisionRequestQuery},
+	{"getChainExecutionSupervisionRequests", getChainExecutionSupervisionRequestsQuery},
+	{"getSupervisionRequestsForStatus", getSupervisionRequestsForStatusQuery},
+	{"countSupervisionRequests", countSupervisionRequestsQuery},
+	{"createSupervisionStatus", createSupervisionStatusQuery},
+	{"updateCurrentSupervisionStatus", updateCurrentSupervisionStatusQuery},
+	{"getSupervisionRequestStatus", getSupervisionRequestStatusQuery},
+	{"getSupervisionRequestStatuses", getSupervisionRequestStatusesQuery},
+	{"createSupervisionResult", createSupervisionResultQuery},
+	{"getSupervisionResultFromRequestId", getSupervisionResultFromRequestIdQuery},
+	{"claimSupervisionRequests", claimSupervisionRequestsQuery},
+	{"claimSupervisionRequest", claimSupervisionRequestQuery},
+	{"renewSupervisionRequestLeases", renewSupervisionRequestLeasesQuery},
+	{"releaseSupervisionRequestLeases", releaseSupervisionRequestLeasesQuery},
+	{"getChat", getChatQuery},
+	{"getRunChatCount", getRunChatCountQuery},
+	{"getMessage", getMessageQuery},
+	{"updateMessage", updateMessageQuery},
+	{"chainExecutionsById", chainExecutionsQuery(chainExecutionIdsFilter)},
+	{"chainExecutionsByToolCall", chainExecutionsQuery(chainExecutionToolCallFilter)},
+	{"chainExecutionRequestsById", chainExecutionRequestsQuery(chainExecutionIdsFilter)},
+	{"chainExecutionRequestsByToolCall", chainExecutionRequestsQuery(chainExecutionToolCallFilter)},
+}
+
+// preparedStatement is a prepared query with counters of its use
+type preparedStatement struct {
+	name     string
+	stmt     *sql.Stmt
+	calls    atomic.Int64
+	errors   atomic.Int64
+	duration atomic.Int64
+}
+
+func (p *preparedStatement) record(start time.Time, err error) {
+	p.calls.Add(1)
+	p.duration.Add(int64(time.Since(start)))
+	if err != nil {
+		p.errors.Add(1)
+	}
+}
+
+// prepareStatements prepares every query in preparedQueries. database/sql prepares a statement again
+// on each connection of the pool the first time it is used there.
+func prepareStatements(ctx context.Context, db *sql.DB) (map[string]*preparedStatement, error) {
+	statements := make(map[string]*preparedStatement, len(preparedQueries))
+	for _, q := range preparedQueries {
+		stmt, err := db.PrepareContext(ctx, q.query)
+		if err != nil {
+			closeStatements(statements)
+			return nil, fmt.Errorf("error preparing %s: %w", q.name, err)
+		}
+		statements[q.query] = &preparedStatement{name: q.name, stmt: stmt}
+	}
+	return statements, nil
+}
+
+func closeStatements(statements map[string]*preparedStatement) {
+	for _, p := range statements {
+		_ = p.stmt.Close()
+	}
+}
+
+// queryRowContext runs a query as its prepared statement when it has one
+func (s *PostgresqlStore) queryRowContext(ctx context.Context, query string, args ...interface{}) *sql.Row {
+	p, ok := s.statements[query]
+	if !ok {
+		return s.db.QueryRowContext(ctx, query, args...)
+	}
+
+	start := time.Now()
+	row := p.stmt.QueryRowContext(ctx, args...)
+	p.record(start, row.Err())
+	return row
+}
+
+// queryContext runs a query as its prepared statement when it has one
+func (s *PostgresqlStore) queryContext(ctx context.Context, query string, args ...interface{}) (*sql.Rows, error) {
+	p, ok := s.statements[query]
+	if !ok {
+		return s.db.QueryContext(ctx, query, args...)
+	}
+
+	start := time.Now()
+	rows, err := p.stmt.QueryContext(ctx, args...)
+	p.record(start, err)
+	return rows, err
+}
+
+// execContext runs a statement as its prepared statement when it has one
+func (s *PostgresqlStore) execContext(ctx context.Context, query string, args ...interface{}) (sql.Result, error) {
+	p, ok := s.statements[query]
+	if !ok {
+		return s.db.ExecContext(ctx, query, args...)
+	}
+
+	start := time.Now()
+	result, err := p.stmt.ExecContext(ctx, args...)
+	p.record(start, err)
+	return result, err
+}
+
+// txQueryRowContext runs a query in a transaction as its prepared statement when it has one
+func (s *PostgresqlStore) txQueryRowContext(ctx context.Context, tx *sql.Tx, query string, args ...interface{}) *sql.Row {
+	p, ok := s.statements[query]
+	if !ok {
+		return tx.QueryRowContext(ctx, query, args...)
+	}
+
+	start := time.Now()
+	row := tx.StmtContext(ctx, p.stmt).QueryRowContext(ctx, args...)
+	p.record(start, row.Err())
+	return row
+}
+
+// txExecContext runs a statement in a transaction as its prepared statement when it has one
+func (s *PostgresqlStore) txExecContext(ctx context.Context, tx *sql.Tx, query string, args ...interface{}) (sql.Result, error) {
+	p, ok := s.statements[query]
+	if !ok {
+		return tx.ExecContext(ctx, query, args...)
+	}
+
+	start := time.Now()
+	result, err := tx.StmtContext(ctx, p.stmt).ExecContext(ctx, args...)
+	p.record(start, err)
+	return result, err
+}
+
+// Stats reports on the connection pool and on the use of each prepared statement since the store
+// connected
+func (s *PostgresqlStore) Stats() asteroid.StoreStats {
+	pool := s.db.Stats()
+	statements := make([]asteroid.StatementStats, 0, len(s.statements))
+	stats := asteroid.StoreStats{
+		Pool: &asteroid.PoolStats{
+			MaxOpenConnections: pool.MaxOpenConnections,
+			OpenConnections:    pool.OpenConnections,
+			InUse:              pool.InUse,
+			Idle:               pool.Idle,
+			WaitCount:          pool.WaitCount,
+			WaitDurationMs:     pool.WaitDuration.Milliseconds(),
+			MaxIdleClosed:      pool.MaxIdleClosed,
+			MaxIdleTimeClosed:  pool.MaxIdleTimeClosed,
+			MaxLifetimeClosed:  pool.MaxLifetimeClosed,
+		},
+	}
+
+	for _, p := range s.statements {
+		calls := p.calls.Load()
+		duration := time.Duration(p.duration.Load())
+		statement := asteroid.StatementStats{
+			Name:            p.name,
+			Calls:           calls,
+			Errors:          p.errors.Load(),
+			TotalDurationMs: float64(duration) / float64(time.Millisecond),
+		}
+		if calls > 0 {
+			statement.MeanDurationMs = statement.TotalDurationMs / float64(calls)
+		}
+		statements = append(statements, statement)
+	}
+	// Busiest statements first
+	sort.Slice(statements, func(i, j int) bool {
+		if statements[i].TotalDurationMs != statements[j].TotalDurationMs {
+			return statements[i].TotalDurationMs > statements[j].TotalDurationMs
+		}
+		return statements[i].Name < statements[j].Name
+	})
+	stats.Statements = &statements
+
+	return stats
+}
@@ -0,0 +1,930 @@
+package database
+
+import (
+	"context"
+	"encoding/json"
+	"errors"
+	"math/rand"
+	"os"
+	"reflect"
+	"slices"
+	"strconv"
+	"testing"
+	"time"
+
+	asteroid "github.com/asteroidai/asteroid/server"
+	"github.com/google/uuid"
+)
+
+// TestStoreConformance runs the same checks on every store, so that the in-memory store keeps behaving
+// like the database. The PostgreSQL store is only checked when DATABASE_URL is set, as it is in CI. Each
+// check creates its own project, so the database needn't be empty, but the checks of the supervision
+// request counts expect nothing else to create supervision requests while they run.
+func TestStoreConformance(t *testing.T) {
+	stores := map[string]func(t *testing.T) asteroid.Store{
+		"memory": func(t *testing.T) asteroid.Store {
+			return NewMemoryStore()
+		},
+		"postgres": func(t *testing.T) asteroid.Store {
+			if os.Getenv("DATABASE_URL") == "" {
+				t.Skip("DATABASE_URL is not set")
+			}
+			store, err := NewPostgresqlStore()
+			if err != nil {
+				t.Fatalf("error opening store: %v", err)
+			}
+			t.Cleanup(func() { _ = store.Close() })
+			return store
+		},
+	}
+
+	checks := map[string]func(t *testing.T, store asteroid.Store){
+		"SharedToolDefinitions": testSharedToolDefinitions,
+		"RunSupervisorChains":   testRunSupervisorChains,
+		"ToolCallRunId":         testToolCallRunId,
+		"SupervisionStatus":     testSupervisionStatus,
+		"CreateRuns":            testCreateRuns,
+		"ListingOrder":          testListingOrder,
+		"Chats":                 testChats,
+		"SupervisionBatches":    testSupervisionBatches,
+		"ChainExecutionStates":  testChainExecutionStates,
+	}
+
+	for name, open := range stores {
+		t.Run(name, func(t *testing.T) {
+			store := open(t)
+			for check, run := range checks {
+				t.Run(check, func(t *testing.T) { run(t, store) })
+			}
+		})
+	}
+}
+
+// createTestTask creates a project and a task of it to run checks in
+func createTestTask(t *testing.T, store asteroid.Store) uuid.UUID {
+	t.Helper()
+	ctx := context.Background()
+
+	projectId := uuid.New()
+	project := asteroid.Project{Id: projectId, Name: "test-" + projectId.String(), CreatedAt: time.Now(), RunResultTags: []string{}}
+	if err := store.CreateProject(ctx, project); err != nil {
+		t.Fatalf("error creating project: %v", err)
+	}
+
+	taskId, err := store.CreateTask(ctx, asteroid.Task{ProjectId: projectId, Name: "test", CreatedAt: time.Now()})
+	if err != nil {
+		t.Fatalf("error creating task: %v", err)
+	}
+	return *taskId
+}
+
+func createTestRun(t *testing.T, store asteroid.Store, taskId uuid.UUID) uuid.UUID {
+	t.Helper()
+
+	runId, err := store.CreateRun(context.Background(), asteroid.Run{TaskId: taskId, CreatedAt: time.Now()})
+	if err != nil {
+		t.Fatalf("error creating run: %v", err)
+	}
+	return runId
+}
+
+func createTestTool(t *testing.T, store asteroid.Store, runId uuid.UUID) uuid.UUID {
+	t.Helper()
+
+	attributes := map[string]interface{}{"location": "string"}
+	tool, err := store.CreateTool(context.Background(), runId, attributes, "weather", "Get the weather", []string{}, "")
+	if err != nil {
+		t.Fatalf("error creating tool: %v", err)
+	}
+	return *tool.Id
+}
+
+func createTestSupervisor(t *testing.T, store asteroid.Store, supervisorType asteroid.SupervisorType) uuid.UUID {
+	t.Helper()
+
+	// Supervisors with the same values are the same supervisor, so each gets its own name
+	supervisor := asteroid.Supervisor{
+		Name:       "test-" + uuid.NewString(),
+		Type:       supervisorType,
+		Attributes: map[string]interface{}{},
+		CreatedAt:  time.Now(),
+	}
+	id, err := store.CreateSupervisor(context.Background(), supervisor)
+	if err != nil {
+		t.Fatalf("error creating supervisor: %v", err)
+	}
+	return id
+}
+
+func createTestChains(t *testing.T, store asteroid.Store, toolId uuid.UUID, runId uuid.UUID, supervisorIds ...uuid.UUID) []uuid.UUID {
+	t.Helper()
+
+	chains := make([]asteroid.ChainRequest, 0, len(supervisorIds))
+	for _, supervisorId := range supervisorIds {
+		chains = append(chains, asteroid.ChainRequest{SupervisorIds: &[]uuid.UUID{supervisorId}})
+	}
+	ids, err := store.CreateSupervisorChains(context.Background(), toolId, runId, chains)
+	if err != nil {
+		t.Fatalf("error creating supervisor chains: %v", err)
+	}
+	return ids
+}
+
+// createTestToolCall sends a chat turn for the run that calls the tool, returning the tool call's ID
+func createTestToolCall(t *testing.T, store asteroid.Store, runId uuid.UUID, toolId uuid.UUID) uuid.UUID {
+	t.Helper()
+
+	toolCallId := uuid.New()
+	callId := "call_" + toolCallId.String()
+	name := "weather"
+	arguments := `{"location": "London"}`
+	calls := []asteroid.AsteroidToolCall{{Id: toolCallId, CallId: &callId, ToolId: toolId, Name: &name, Arguments: &arguments}}
+
+	messageId := uuid.New()
+	choices := []asteroid.AsteroidChoice{{
+		AsteroidId:   uuid.NewString(),
+		FinishReason: asteroid.ToolCalls,
+		Message:      asteroid.AsteroidMessage{Id: &messageId, Role: asteroid.AsteroidMessageRoleAssistant, ToolCalls: &calls},
+	}}
+
+	_, err := store.CreateChatRequest(context.Background(), runId, []byte(`{}`), []byte(`{}`), choices, "openai", nil)
+	if err != nil {
+		t.Fatalf("error creating chat: %v", err)
+	}
+	return toolCallId
+}
+
+// chainsOfExecutions returns the chains of a tool call's chain executions
+func chainsOfExecutions(t *testing.T, store asteroid.Store, toolCallId uuid.UUID) []uuid.UUID {
+	t.Helper()
+	ctx := context.Background()
+
+	executionIds, err := store.GetChainExecutionsFromToolCall(ctx, toolCallId)
+	if err != nil {
+		t.Fatalf("error getting chain executions: %v", err)
+	}
+
+	chainIds := make([]uuid.UUID, 0, len(executionIds))
+	for _, executionId := range executionIds {
+		chainId, _, err := store.GetChainExecution(ctx, executionId)
+		if err != nil || chainId == nil {
+			t.Fatalf("error getting chain execution %s: %v", executionId, err)
+		}
+		chainIds = append(chainIds, *chainId)
+	}
+	return chainIds
+}
+
+func sameIds(a []uuid.UUID, b []uuid.UUID) bool {
+	a, b = slices.Clone(a), slices.Clone(b)
+	compare := func(x, y uuid.UUID) int { return slices.Compare(x[:], y[:]) }
+	slices.SortFunc(a, compare)
+	slices.SortFunc(b, compare)
+	return slices.Equal(a, b)
+}
+
+func testSharedToolDefinitions(t *testing.T, store asteroid.Store) {
+	ctx := context.Background()
+	taskId := createTestTask(t, store)
+	firstRun := createTestRun(t, store, taskId)
+	secondRun := createTestRun(t, store, taskId)
+
+	firstTool := createTestTool(t, store, firstRun)
+	secondTool := createTestTool(t, store, secondRun)
+	if firstTool != secondTool {
+		t.Fatalf("runs of a project got different tools for the same definition: %s and %s", firstTool, secondTool)
+	}
+
+	for _, runId := range []uuid.UUID{firstRun, secondRun} {
+		var tools []asteroid.Tool
+		err := store.GetRunTools(ctx, runId, asteroid.Page{}, func(tool asteroid.Tool) error {
+			tools = append(tools, tool)
+			return nil
+		})
+		if err != nil {
+			t.Fatalf("error getting run tools: %v", err)
+		}
+		if len(tools) != 1 || *tools[0].Id != firstTool || tools[0].RunId != runId {
+			t.Errorf("run %s has tools %+v, want tool %s listed for the run", runId, tools, firstTool)
+		}
+	}
+}
+
+func testRunSupervisorChains(t *testing.T, store asteroid.Store) {
+	ctx := context.Background()
+	taskId := createTestTask(t, store)
+	firstRun := createTestRun(t, store, taskId)
+	secondRun := createTestRun(t, store, taskId)
+	toolId := createTestTool(t, store, firstRun)
+	createTestTool(t, store, secondRun)
+
+	firstSupervisor := createTestSupervisor(t, store, asteroid.ClientSupervisor)
+	secondSupervisor := createTestSupervisor(t, store, asteroid.ClientSupervisor)
+
+	firstChains := createTestChains(t, store, toolId, firstRun, firstSupervisor)
+	secondChains := createTestChains(t, store, toolId, secondRun, secondSupervisor)
+
+	// A chain of the same supervisors is shared, but only linked to the runs that asked for it
+	again := createTestChains(t, store, toolId, secondRun, firstSupervisor)
+	if again[0] != firstChains[0] {
+		t.Errorf("chain of the same supervisors was created again: %s, want %s", again[0], firstChains[0])
+	}
+	secondChains = append(secondChains, again...)
+
+	for runId, want := range map[uuid.UUID][]uuid.UUID{firstRun: firstChains, secondRun: secondChains} {
+		chains, err := store.GetSupervisorChains(ctx, toolId, &runId)
+		if err != nil {
+			t.Fatalf("error getting supervisor chains: %v", err)
+		}
+		got := make([]uuid.UUID, 0, len(chains))
+		for _, chain := range chains {
+			got = append(got, chain.ChainId)
+		}
+		if !sameIds(got, want) {
+			t.Errorf("run %s has chains %v, want %v", runId, got, want)
+		}
+
+		toolCallId := createTestToolCall(t, store, runId, toolId)
+		if got := chainsOfExecutions(t, store, toolCallId); !sameIds(got, want) {
+			t.Errorf("tool call of run %s has executions of chains %v, want %v", runId, got, want)
+		}
+	}
+
+	// A run that doesn't use the tool can't have chains on it
+	otherRun := createTestRun(t, store, taskId)
+	chainRequests := []asteroid.ChainRequest{{SupervisorIds: &[]uuid.UUID{firstSupervisor}}}
+	if _, err := store.CreateSupervisorChains(ctx, toolId, otherRun, chainRequests); !errors.Is(err, asteroid.ErrRunToolNotFound) {
+		t.Errorf("creating chains for run %s, which doesn't use tool %s, got error %v, want ErrRunToolNotFound", otherRun, toolId, err)
+	}
+}
+
+func testToolCallRunId(t *testing.T, store asteroid.Store) {
+	ctx := context.Background()
+	taskId := createTestTask(t, store)
+	firstRun := createTestRun(t, store, taskId)
+	secondRun := createTestRun(t, store, taskId)
+	toolId := createTestTool(t, store, firstRun)
+	createTestTool(t, store, secondRun)
+
+	// The tool was registered by the first run, but the second run makes the call
+	toolCallId := createTestToolCall(t, store, secondRun, toolId)
+	runId, err := store.GetToolCallRunId(ctx, toolCallId)
+	if err != nil {
+		t.Fatalf("error getting tool call run: %v", err)
+	}
+	if runId == nil || *runId != secondRun {
+		t.Errorf("tool call run is %v, want %s", runId, secondRun)
+	}
+
+	runId, err = store.GetToolCallRunId(ctx, uuid.New())
+	if err != nil || runId != nil {
+		t.Errorf("unknown tool call has run %v, error %v, want neither", runId, err)
+	}
+}
+
+func testSupervisionStatus(t *testing.T, store asteroid.Store) {
+	ctx := context.Background()
+	taskId := createTestTask(t, store)
+	runId := createTestRun(t, store, taskId)
+	toolId := createTestTool(t, store, runId)
+	supervisorId := createTestSupervisor(t, store, asteroid.ClientSupervisor)
+	chainId := createTestChains(t, store, toolId, runId, supervisorId)[0]
+	toolCallId := createTestToolCall(t, store, runId, toolId)
+
+	request := asteroid.SupervisionRequest{SupervisorId: supervisorId, PositionInChain: 0}
+	requestId, err := store.CreateSupervisionRequest(ctx, request, chainId, toolCallId)
+	if err != nil {
+		t.Fatalf("error creating supervision request: %v", err)
+	}
+
+	expectStatus := func(want asteroid.Status) {
+		t.Helper()
+		status, err := store.GetSupervisionRequestStatus(ctx, *requestId)
+		if err != nil {
+			t.Fatalf("error getting supervision request status: %v", err)
+		}
+		if status == nil || status.Status != want {
+			t.Errorf("supervision request status is %+v, want %s", status, want)
+		}
+	}
+	expectStatus(asteroid.Pending)
+
+	result := asteroid.SupervisionResult{
+		CreatedAt:            time.Now(),
+		Decision:             asteroid.Reject,
+		Reasoning:            "test",
+		SupervisionRequestId: *requestId,
+	}
+	if _, err := store.CreateSupervisionResult(ctx, result, *requestId); err != nil {
+		t.Fatalf("error creating supervision result: %v", err)
+	}
+	expectStatus(asteroid.Completed)
+
+	// An assignment that arrives after the result mustn't reopen the request
+	late := asteroid.SupervisionStatus{Status: asteroid.Assigned, CreatedAt: time.Now()}
+	if err := store.CreateSupervisionStatus(ctx, *requestId, late); err != nil {
+		t.Fatalf("error creating supervision status: %v", err)
+	}
+	expectStatus(asteroid.Completed)
+}
+
+func testCreateRuns(t *testing.T, store asteroid.Store) {
+	ctx := context.Background()
+	taskId := createTestTask(t, store)
+	firstSupervisor := createTestSupervisor(t, store, asteroid.ClientSupervisor)
+	secondSupervisor := createTestSupervisor(t, store, asteroid.ClientSupervisor)
+
+	tool := func(supervisorId uuid.UUID) asteroid.RunBatchTool {
+		return asteroid.RunBatchTool{
+			Name:        "weather",
+			Description: "Get the weather",
+			Attributes:  map[string]interface{}{"location": "string"},
+			Chains:      &[]asteroid.ChainRequest{{SupervisorIds: &[]uuid.UUID{supervisorId}}},
+		}
+	}
+	results, err := store.CreateRuns(ctx, taskId, []asteroid.RunBatchItem{
+		{Tools: []asteroid.RunBatchTool{tool(firstSupervisor)}},
+		{Tools: []asteroid.RunBatchTool{tool(secondSupervisor)}},
+	})
+	if err != nil {
+		t.Fatalf("error creating runs: %v", err)
+	}
+	if len(results) != 2 {
+		t.Fatalf("created %d runs, want 2", len(results))
+	}
+
+	toolId := results[0].Tools[0].ToolId
+	if results[1].Tools[0].ToolId != toolId {
+		t.Errorf("runs of a batch got different tools for the same definition")
+	}
+
+	for _, result := range results {
+		runId := result.RunId
+		chains, err := store.GetSupervisorChains(ctx, toolId, &runId)
+		if err != nil {
+			t.Fatalf("error getting supervisor chains: %v", err)
+		}
+		got := make([]uuid.UUID, 0, len(chains))
+		for _, chain := range chains {
+			got = append(got, chain.ChainId)
+		}
+		if !sameIds(got, result.Tools[0].ChainIds) {
+			t.Errorf("run %s has chains %v, want %v", runId, got, result.Tools[0].ChainIds)
+		}
+	}
+}
+
+// listPages reads a listing a page of limit rows at a time, starting after the cursor, until it has
+// read want rows or the listing ends
+func listPages[T any](
+	t *testing.T,
+	list func(page asteroid.Page, each func(T) error) error,
+	cursor func(T) asteroid.Cursor,
+	after *asteroid.Cursor,
+	limit int,
+	want int,
+) []T {
+	t.Helper()
+
+	var rows []T
+	for len(rows) < want {
+		var page []T
+		err := list(asteroid.Page{After: after, Limit: limit}, func(row T) error {
+			page = append(page, row)
+			return nil
+		})
+		if err != nil {
+			t.Fatalf("error listing: %v", err)
+		}
+		if len(page) > limit {
+			t.Fatalf("page of %d rows has %d", limit, len(page))
+		}
+		rows = append(rows, page...)
+		if len(page) < limit {
+			break
+		}
+		c := cursor(page[len(page)-1])
+		after = &c
+	}
+	if len(rows) > want {
+		rows = rows[:want]
+	}
+	return rows
+}
+
+// newestFirst returns the IDs of rows in listing order, newest first and by ID between rows created at
+// the same time
+func newestFirst(createdAt map[uuid.UUID]time.Time) []uuid.UUID {
+	ids := make([]uuid.UUID, 0, len(createdAt))
+	for id := range createdAt {
+		ids = append(ids, id)
+	}
+	slices.SortFunc(ids, func(a, b uuid.UUID) int {
+		if c := createdAt[b].Compare(createdAt[a]); c != 0 {
+			return c
+		}
+		return slices.Compare(b[:], a[:])
+	})
+	return ids
+}
+
+// listingTimes returns creation times for n rows, two of them the same so that the order between rows
+// created at the same time is checked too. They are in the past and apart from other checks' rows, and
+// whole microseconds as PostgreSQL keeps them.
+func listingTimes(n int) []time.Time {
+	base := time.Date(2000, 1, 1, 0, 0, 0, 0, time.UTC).Add(time.Duration(rand.Int63n(int64(20*365*24*time.Hour/time.Microsecond))) * time.Microsecond)
+	times := make([]time.Time, n)
+	for i := range times {
+		times[i] = base.Add(time.Duration(i) * time.Second)
+	}
+	times[n-1] = times[n-2]
+	return times
+}
+
+func testListingOrder(t *testing.T, store asteroid.Store) {
+	ctx := context.Background()
+	const rows = 5
+	const limit = 2
+
+	check := func(name string, got []uuid.UUID, want []uuid.UUID) {
+		t.Helper()
+		if !slices.Equal(got, want) {
+			t.Errorf("%s listed as %v, want %v", name, got, want)
+		}
+	}
+
+	// Projects are listed across the store, so the listing starts right after the newest project here
+	projects := make(map[uuid.UUID]time.Time, rows)
+	var newest time.Time
+	for _, createdAt := range listingTimes(rows) {
+		id := uuid.New()
+		project := asteroid.Project{Id: id, Name: "test-" + id.String(), CreatedAt: createdAt, RunResultTags: []string{}}
+		if err := store.CreateProject(ctx, project); err != nil {
+			t.Fatalf("error creating project: %v", err)
+		}
+		projects[id] = createdAt
+		newest = createdAt
+	}
+	start := newest.Add(time.Microsecond)
+	listed := listPages(t, func(page asteroid.Page, each func(asteroid.Project) error) error {
+		return store.GetProjects(ctx, page, each)
+	}, func(p asteroid.Project) asteroid.Cursor {
+		return asteroid.Cursor{CreatedAt: &p.CreatedAt, Id: p.Id}
+	}, &asteroid.Cursor{CreatedAt: &start, Id: uuid.Nil}, limit, rows)
+	ids := make([]uuid.UUID, 0, len(listed))
+	for _, project := range listed {
+		ids = append(ids, project.Id)
+	}
+	check("projects", ids, newestFirst(projects))
+
+	var projectId uuid.UUID
+	for id := range projects {
+		projectId = id
+	}
+	tasks := make(map[uuid.UUID]time.Time, rows)
+	for i, createdAt := range listingTimes(rows) {
+		taskId, err := store.CreateTask(ctx, asteroid.Task{ProjectId: projectId, Name: "test-" + strconv.Itoa(i), CreatedAt: createdAt})
+		if err != nil {
+			t.Fatalf("error creating task: %v", err)
+		}
+		tasks[*taskId] = createdAt
+	}
+	listTasks := func(page asteroid.Page, each func(asteroid.Task) error) error {
+		return store.GetProjectTasks(ctx, projectId, page, each)
+	}
+	taskCursor := func(task asteroid.Task) asteroid.Cursor {
+		return asteroid.Cursor{CreatedAt: &task.CreatedAt, Id: task.Id}
+	}
+	for _, pageLimit := range []int{limit, rows + 1} {
+		ids = ids[:0]
+		for _, task := range listPages(t, listTasks, taskCursor, nil, pageLimit, rows+1) {
+			ids = append(ids, task.Id)
+		}
+		check("tasks", ids, newestFirst(tasks))
+	}
+
+	var taskId uuid.UUID
+	for id := range tasks {
+		taskId = id
+	}
+	runs := make(map[uuid.UUID]time.Time, rows)
+	for _, createdAt := range listingTimes(rows) {
+		runId, err := store.CreateRun(ctx, asteroid.Run{TaskId: taskId, CreatedAt: createdAt})
+		if err != nil {
+			t.Fatalf("error creating run: %v", err)
+		}
+		runs[runId] = createdAt
+	}
+	listRuns := func(page asteroid.Page, each func(asteroid.Run) error) error {
+		return store.GetTaskRuns(ctx, taskId, page, each)
+	}
+	runCursor := func(run asteroid.Run) asteroid.Cursor {
+		return asteroid.Cursor{CreatedAt: &run.CreatedAt, Id: run.Id}
+	}
+	for _, pageLimit := range []int{limit, rows + 1} {
+		ids = ids[:0]
+		for _, run := range listPages(t, listRuns, runCursor, nil, pageLimit, rows+1) {
+			ids = append(ids, run.Id)
+		}
+		check("runs", ids, newestFirst(runs))
+	}
+
+	// GetRuns isn't paged and has no order, but returns the same runs
+	all, err := store.GetRuns(ctx, taskId)
+	if err != nil {
+		t.Fatalf("error getting runs: %v", err)
+	}
+	ids = ids[:0]
+	for _, run := range all {
+		ids = append(ids, run.Id)
+	}
+	if want := newestFirst(runs); !sameIds(ids, want) {
+		t.Errorf("GetRuns returned %v, want %v", ids, want)
+	}
+}
+
+// jsonEqual reports whether two JSON documents hold the same value. Stores may change the spacing and
+// key order of the JSON they keep.
+func jsonEqual(a []byte, b []byte) bool {
+	var aValue, bValue interface{}
+	if json.Unmarshal(a, &aValue) != nil || json.Unmarshal(b, &bValue) != nil {
+		return false
+	}
+	return reflect.DeepEqual(aValue, bValue)
+}
+
+func testChats(t *testing.T, store asteroid.Store) {
+	ctx := context.Background()
+	taskId := createTestTask(t, store)
+	runId := createTestRun(t, store, taskId)
+
+	type chat struct {
+		request  []byte
+		response []byte
+	}
+	chats := []chat{
+		{
+			request:  []byte(`{"model": "gpt-4o", "messages": [{"role": "user", "content": "Hello"}]}`),
+			response: []byte(`{"id": "first", "choices": []}`),
+		},
+		{
+			// The second turn repeats the first turn's message, which is only stored once
+			request:  []byte(`{"model": "gpt-4o", "messages": [{"role": "user", "content": "Hello"}, {"role": "user", "content": "Again"}]}`),
+			response: []byte(`{"id": "second", "choices": []}`),
+		},
+		{
+			request:  []byte(`{"model": "gpt-4o"}`),
+			response: []byte(`{"id": "third", "choices": []}`),
+		},
+	}
+
+	for _, c := range chats {
+		messageId := uuid.New()
+		choices := []asteroid.AsteroidChoice{{
+			AsteroidId:   uuid.NewString(),
+			FinishReason: asteroid.Stop,
+			Message:      asteroid.AsteroidMessage{Id: &messageId, Role: asteroid.AsteroidMessageRoleAssistant, Content: "Hi"},
+		}}
+		if _, err := store.CreateChatRequest(ctx, runId, c.request, c.response, choices, "openai", nil); err != nil {
+			t.Fatalf("error creating chat: %v", err)
+		}
+	}
+
+	count, err := store.GetRunChatCount(ctx, runId)
+	if err != nil {
+		t.Fatalf("error getting chat count: %v", err)
+	}
+	if count != len(chats) {
+		t.Errorf("run has %d chats, want %d", count, len(chats))
+	}
+
+	// Chats are indexed from the latest
+	for index := range chats {
+		want := chats[len(chats)-1-index]
+		request, response, err := store.GetChat(ctx, runId, index)
+		if err != nil {
+			t.Fatalf("error getting chat %d: %v", index, err)
+		}
+		if !jsonEqual(request, want.request) || !jsonEqual(response, want.response) {
+			t.Errorf("chat %d is %s, %s, want %s, %s", index, request, response, want.request, want.response)
+		}
+	}
+
+	if _, _, err := store.GetChat(ctx, runId, len(chats)); err == nil {
+		t.Errorf("got chat %d of a run with %d chats", len(chats), len(chats))
+	}
+
+	// A chat of a run that doesn't exist is refused
+	messageId := uuid.New()
+	choices := []asteroid.AsteroidChoice{{
+		AsteroidId:   uuid.NewString(),
+		FinishReason: asteroid.Stop,
+		Message:      asteroid.AsteroidMessage{Id: &messageId, Role: asteroid.AsteroidMessageRoleAssistant},
+	}}
+	if _, err := store.CreateChatRequest(ctx, uuid.New(), chats[0].request, chats[0].response, choices, "openai", nil); err == nil {
+		t.Errorf("created a chat for a run that doesn't exist")
+	}
+}
+
+func countRequests(t *testing.T, store asteroid.Store, status asteroid.Status) int {
+	t.Helper()
+
+	count, err := store.CountSupervisionRequests(context.Background(), status)
+	if err != nil {
+		t.Fatalf("error counting %s supervision requests: %v", status, err)
+	}
+	return count
+}
+
+// requestsForStatus returns the IDs of the requests GetSupervisionRequestsForStatus lists, checking
+// that they are in the order of their statuses
+func requestsForStatus(t *testing.T, store asteroid.Store, status asteroid.Status) []uuid.UUID {
+	t.Helper()
+
+	requests, err := store.GetSupervisionRequestsForStatus(context.Background(), status)
+	if err != nil {
+		t.Fatalf("error getting %s supervision requests: %v", status, err)
+	}
+
+	ids := make([]uuid.UUID, 0, len(requests))
+	for i, request := range requests {
+		if request.Status == nil || request.Status.Status != status {
+			t.Errorf("%s supervision request %s has status %+v", status, *request.Id, request.Status)
+		} else if i > 0 && requests[i-1].Status != nil && requests[i-1].Status.Id > request.Status.Id {
+			t.Errorf("%s supervision requests aren't in the order of their statuses", status)
+		}
+		ids = append(ids, *request.Id)
+	}
+	return ids
+}
+
+func testSupervisionBatches(t *testing.T, store asteroid.Store) {
+	ctx := context.Background()
+	taskId := createTestTask(t, store)
+	runId := createTestRun(t, store, taskId)
+	toolId := createTestTool(t, store, runId)
+	humanSupervisor := createTestSupervisor(t, store, asteroid.HumanSupervisor)
+	clientSupervisor := createTestSupervisor(t, store, asteroid.ClientSupervisor)
+	chainIds := createTestChains(t, store, toolId, runId, humanSupervisor, clientSupervisor)
+	supervisorIds := []uuid.UUID{humanSupervisor, clientSupervisor}
+
+	var requests []asteroid.SupervisionRequest
+	for toolCall := 0; toolCall < 2; toolCall++ {
+		toolCallId := createTestToolCall(t, store, runId, toolId)
+		for i, chainId := range chainIds {
+			executionId, err := store.GetChainExecutionFromChainAndToolCall(ctx, chainId, toolCallId)
+			if err != nil || executionId == nil {
+				t.Fatalf("error getting chain execution: %v", err)
+			}
+			requests = append(requests, asteroid.SupervisionRequest{
+				SupervisorId:     supervisorIds[i],
+				PositionInChain:  0,
+				ChainexecutionId: executionId,
+			})
+		}
+	}
+
+	pending := countRequests(t, store, asteroid.Pending)
+	completed := countRequests(t, store, asteroid.Completed)
+
+	// A batch with a request missing its chain execution is refused as a whole
+	invalid := append(slices.Clone(requests[:1]), asteroid.SupervisionRequest{SupervisorId: humanSupervisor})
+	if _, err := store.CreateSupervisionRequests(ctx, invalid); err == nil {
+		t.Errorf("created a supervision request without a chain execution")
+	}
+	if got := countRequests(t, store, asteroid.Pending); got != pending {
+		t.Errorf("%d pending supervision requests after a refused batch, want %d", got, pending)
+	}
+
+	ids, err := store.CreateSupervisionRequests(ctx, requests)
+	if err != nil {
+		t.Fatalf("error creating supervision requests: %v", err)
+	}
+	if len(ids) != len(requests) {
+		t.Fatalf("created %d supervision requests, want %d", len(ids), len(requests))
+	}
+	for i, id := range ids {
+		request, err := store.GetSupervisionRequest(ctx, id)
+		if err != nil || request == nil {
+			t.Fatalf("error getting supervision request %s: %v", id, err)
+		}
+		if request.SupervisorId != requests[i].SupervisorId || *request.ChainexecutionId != *requests[i].ChainexecutionId {
+			t.Errorf("supervision request %d is %+v, want %+v", i, request, requests[i])
+		}
+		if request.Status == nil || request.Status.Status != asteroid.Pending {
+			t.Errorf("new supervision request %s has status %+v, want pending", id, request.Status)
+		}
+
+		executionRequests, err := store.GetChainExecutionSupervisionRequests(ctx, *requests[i].ChainexecutionId)
+		if err != nil {
+			t.Fatalf("error getting chain execution supervision requests: %v", err)
+		}
+		if len(executionRequests) != 1 || *executionRequests[0].Id != id {
+			t.Errorf("chain execution of supervision request %s has requests %+v", id, executionRequests)
+		}
+	}
+	if got := countRequests(t, store, asteroid.Pending); got != pending+len(ids) {
+		t.Errorf("%d pending supervision requests, want %d", got, pending+len(ids))
+	}
+
+	// Requests of client supervisors are counted but not listed, as the server doesn't handle them
+	humanIds := []uuid.UUID{ids[0], ids[2]}
+	clientIds := []uuid.UUID{ids[1], ids[3]}
+	listed := requestsForStatus(t, store, asteroid.Pending)
+	for _, id := range humanIds {
+		if !slices.Contains(listed, id) {
+			t.Errorf("pending supervision request %s of a human supervisor isn't listed", id)
+		}
+	}
+	for _, id := range clientIds {
+		if slices.Contains(listed, id) {
+			t.Errorf("pending supervision request %s of a client supervisor is listed", id)
+		}
+	}
+
+	// Statuses are returned once for each request that exists
+	statuses, err := store.GetSupervisionRequestStatuses(ctx, append(slices.Clone(ids), ids[0], uuid.New()))
+	if err != nil {
+		t.Fatalf("error getting supervision request statuses: %v", err)
+	}
+	statusIds := make([]uuid.UUID, 0, len(statuses))
+	for _, status := range statuses {
+		if status.Status != asteroid.Pending {
+			t.Errorf("supervision request %s has status %s, want pending", *status.SupervisionRequestId, status.Status)
+		}
+		statusIds = append(statusIds, *status.SupervisionRequestId)
+	}
+	if !sameIds(statusIds, ids) {
+		t.Errorf("got statuses of requests %v, want %v", statusIds, ids)
+	}
+
+	// A batch of results naming a request that doesn't exist is refused as a whole
+	results := []asteroid.SupervisionResult{
+		{CreatedAt: time.Now(), Decision: asteroid.Reject, Reasoning: "first", SupervisionRequestId: humanIds[0]},
+		{CreatedAt: time.Now(), Decision: asteroid.Escalate, Reasoning: "second", SupervisionRequestId: humanIds[1]},
+	}
+	invalidResults := append(slices.Clone(results[:1]), asteroid.SupervisionResult{
+		CreatedAt: time.Now(), Decision: asteroid.Reject, Reasoning: "unknown", SupervisionRequestId: uuid.New(),
+	})
+	if _, err := store.CreateSupervisionResults(ctx, invalidResults); err == nil {
+		t.Errorf("created a supervision result for a request that doesn't exist")
+	}
+	if result, err := store.GetSupervisionResultFromRequestID(ctx, humanIds[0]); err != nil || result != nil {
+		t.Errorf("supervision request %s has result %+v, error %v, after a refused batch", humanIds[0], result, err)
+	}
+
+	resultIds, err := store.CreateSupervisionResults(ctx, results)
+	if err != nil {
+		t.Fatalf("error creating supervision results: %v", err)
+	}
+	if len(resultIds) != len(results) {
+		t.Fatalf("created %d supervision results, want %d", len(resultIds), len(results))
+	}
+	for i, want := range results {
+		result, err := store.GetSupervisionResultFromRequestID(ctx, want.SupervisionRequestId)
+		if err != nil || result == nil {
+			t.Fatalf("error getting supervision result of %s: %v", want.SupervisionRequestId, err)
+		}
+		if *result.Id != resultIds[i] || result.Decision != want.Decision || result.Reasoning != want.Reasoning {
+			t.Errorf("supervision request %s has result %+v, want %+v", want.SupervisionRequestId, result, want)
+		}
+	}
+
+	if got := countRequests(t, store, asteroid.Pending); got != pending+len(clientIds) {
+		t.Errorf("%d pending supervision requests, want %d", got, pending+len(clientIds))
+	}
+	if got := countRequests(t, store, asteroid.Completed); got != completed+len(humanIds) {
+		t.Errorf("%d completed supervision requests, want %d", got, completed+len(humanIds))
+	}
+	listed = requestsForStatus(t, store, asteroid.Pending)
+	completedListed := requestsForStatus(t, store, asteroid.Completed)
+	for _, id := range humanIds {
+		if slices.Contains(listed, id) || !slices.Contains(completedListed, id) {
+			t.Errorf("supervision request %s isn't listed as completed only", id)
+		}
+	}
+}
+
+func testChainExecutionStates(t *testing.T, store asteroid.Store) {
+	ctx := context.Background()
+	taskId := createTestTask(t, store)
+	runId := createTestRun(t, store, taskId)
+	toolId := createTestTool(t, store, runId)
+	first := createTestSupervisor(t, store, asteroid.ClientSupervisor)
+	second := createTestSupervisor(t, store, asteroid.ClientSupervisor)
+
+	chainIds, err := store.CreateSupervisorChains(ctx, toolId, runId, []asteroid.ChainRequest{
+		{SupervisorIds: &[]uuid.UUID{first, second}},
+		{SupervisorIds: &[]uuid.UUID{second}},
+	})
+	if err != nil {
+		t.Fatalf("error creating supervisor chains: %v", err)
+	}
+	toolCallId := createTestToolCall(t, store, runId, toolId)
+
+	getStates := func() map[uuid.UUID]asteroid.ChainExecutionState {
+		t.Helper()
+		states, err := store.GetToolCallChainExecutionStates(ctx, toolCallId)
+		if err != nil {
+			t.Fatalf("error getting chain execution states: %v", err)
+		}
+		byChain := make(map[uuid.UUID]asteroid.ChainExecutionState, len(states))
+		for i, state := range states {
+			if state.ChainExecution.ToolcallId != toolCallId || state.ChainExecution.ChainId != state.Chain.ChainId {
+				t.Errorf("chain execution state %+v isn't of tool call %s", state.ChainExecution, toolCallId)
+			}
+			if i > 0 {
+				previous := states[i-1].ChainExecution
+				c := previous.CreatedAt.Compare(state.ChainExecution.CreatedAt)
+				if c > 0 || (c == 0 && slices.Compare(previous.Id[:], state.ChainExecution.Id[:]) > 0) {
+					t.Errorf("chain execution states aren't oldest first")
+				}
+			}
+			byChain[state.Chain.ChainId] = state
+		}
+		if len(byChain) != len(chainIds) {
+			t.Fatalf("tool call has states of %d chains, want %d", len(byChain), len(chainIds))
+		}
+		return byChain
+	}
+
+	states := getStates()
+	for i, want := range [][]uuid.UUID{{first, second}, {second}} {
+		state := states[chainIds[i]]
+		got := make([]uuid.UUID, 0, len(state.Chain.Supervisors))
+		for _, supervisor := range state.Chain.Supervisors {
+			got = append(got, *supervisor.Id)
+		}
+		if !slices.Equal(got, want) {
+			t.Errorf("chain %s has supervisors %v, want %v", chainIds[i], got, want)
+		}
+		if len(state.SupervisionRequests) != 0 {
+			t.Errorf("chain %s has supervision requests before any were made", chainIds[i])
+		}
+	}
+
+	// The first supervisor approves and the second is asked next
+	firstRequest, err := store.CreateSupervisionRequest(ctx, asteroid.SupervisionRequest{SupervisorId: first}, chainIds[0], toolCallId)
+	if err != nil {
+		t.Fatalf("error creating supervision request: %v", err)
+	}
+	result := asteroid.SupervisionResult{
+		CreatedAt:            time.Now(),
+		Decision:             asteroid.Approve,
+		Reasoning:            "fine",
+		SupervisionRequestId: *firstRequest,
+		ToolcallId:           &toolCallId,
+	}
+	if _, err := store.CreateSupervisionResult(ctx, result, *firstRequest); err != nil {
+		t.Fatalf("error creating supervision result: %v", err)
+	}
+	executionId := states[chainIds[0]].ChainExecution.Id
+	secondRequests, err := store.CreateSupervisionRequests(ctx, []asteroid.SupervisionRequest{
+		{SupervisorId: second, PositionInChain: 1, ChainexecutionId: &executionId},
+	})
+	if err != nil {
+		t.Fatalf("error creating supervision requests: %v", err)
+	}
+
+	states = getStates()
+	requests := states[chainIds[0]].SupervisionRequests
+	if len(requests) != 2 {
+		t.Fatalf("chain %s has %d supervision requests, want 2", chainIds[0], len(requests))
+	}
+	if slices.Compare(requests[0].SupervisionRequest.Id[:], requests[1].SupervisionRequest.Id[:]) > 0 {
+		t.Errorf("supervision requests of a chain execution aren't in the order of their IDs")
+	}
+	for _, request := range requests {
+		switch *request.SupervisionRequest.Id {
+		case *firstRequest:
+			if request.Status.Status != asteroid.Completed || request.Result == nil || request.Result.Decision != asteroid.Approve {
+				t.Errorf("decided supervision request has status %s and result %+v", request.Status.Status, request.Result)
+			}
+			if request.Result != nil && (request.Result.ToolcallId == nil || *request.Result.ToolcallId != toolCallId) {
+				t.Errorf("approval doesn't name tool call %s", toolCallId)
+			}
+		case secondRequests[0]:
+			if request.Status.Status != asteroid.Pending || request.Result != nil || request.SupervisionRequest.PositionInChain != 1 {
+				t.Errorf("undecided supervision request has status %s, result %+v", request.Status.Status, request.Result)
+			}
+		default:
+			t.Errorf("unexpected supervision request %s", *request.SupervisionRequest.Id)
+		}
+	}
+	if len(states[chainIds[1]].SupervisionRequests) != 0 {
+		t.Errorf("chain %s has supervision requests made on another chain", chainIds[1])
+	}
+
+	// States by execution are returned once for each execution that exists
+	byId, err := store.GetChainExecutionStates(ctx, []uuid.UUID{executionId, executionId, uuid.New()})
+	if err != nil {
+		t.Fatalf("error getting chain execution states: %v", err)
+	}
+	if len(byId) != 1 || byId[0].ChainExecution.Id != executionId || len(byId[0].SupervisionRequests) != 2 {
+		t.Errorf("got states %+v of chain execution %s", byId, executionId)
+	}
+	state, err := store.GetChainExecutionState(ctx, uuid.New())
+	if err != nil || state != nil {
+		t.Errorf("chain execution that doesn't exist has state %+v, error %v", state, err)
+	}
+}
@@ -0,0 +1,233 @@
+package asteroid
+
+import (
+	"bytes"
+	"context"
+	"crypto/sha256"
+	"encoding/json"
+	"fmt"
+	"log"
+	"os"
+	"strconv"
+	"time"
+
+	"github.com/google/uuid"
+)
+
+// Default number of decisions kept by the decision cache, across all supervisors
+const DEFAULT_DECISION_CACHE_SIZE = 10000
+
+// DecisionCache remembers the decisions of the supervisors that opt in with decision_cache_ttl_seconds.
+// A later call of the same tool with the same arguments is then decided straight away with the stored
+// decision, instead of going through the supervisor again. Only approvals and rejections are reused, as
+// a modification or an escalation is about the call it was made on. Client supervisors are left out:
+// the client posts its own result for every request, which would give a resolved request a second one.
+type DecisionCache struct {
+	store         Store
+	subscriptions *ToolCallSubscriptions
+	decisions     *lruCache[decisionKey, cachedDecision]
+}
+
+// decisionKey identifies a supervisor's decision on a tool call by the tool and a hash of its
+// normalized arguments
+type decisionKey struct {
+	supervisorId uuid.UUID
+	toolId       uuid.UUID
+	arguments    [sha256.Size]byte
+}
+
+type cachedDecision struct {
+	decision             Decision
+	reasoning            string
+	supervisionRequestId uuid.UUID
+	expires              time.Time
+}
+
+// NewDecisionCache creates a decision cache of DECISION_CACHE_SIZE entries
+func NewDecisionCache(store Store, subscriptions *ToolCallSubscriptions) *DecisionCache {
+	size := DEFAULT_DECISION_CACHE_SIZE
+	if value := os.Getenv("DECISION_CACHE_SIZE"); value != "" {
+		parsed, err := strconv.Atoi(value)
+		if err != nil || parsed <= 0 {
+			log.Printf("Invalid DECISION_CACHE_SIZE %q, using %d", value, DEFAULT_DECISION_CACHE_SIZE)
+		} else {
+			size = parsed
+		}
+	}
+
+	return &DecisionCache{
+		store:         store,
+		subscriptions: subscriptions,
+		decisions:     newLRUCache[decisionKey, cachedDecision]("decisions", size),
+	}
+}
+
+// Resolve completes a new supervision request with the supervisor's stored decision on an identical
+// tool call, if it has one. It reports whether the request was completed.
+func (c *DecisionCache) Resolve(
+	ctx context.Context,
+	supervisor Supervisor,
+	toolCall AsteroidToolCall,
+	supervisionRequestId uuid.UUID,
+) (bool, error) {
+	if c == nil || !usesDecisionCache(supervisor) {
+		return false, nil
+	}
+
+	key, err := c.key(ctx, *supervisor.Id, toolCall)
+	if err != nil {
+		return false, err
+	}
+
+	now := time.Now()
+	cached, ok := c.decisions.getValid(key, func(d cachedDecision) bool { return now.Before(d.expires) })
+	if !ok {
+		return false, nil
+	}
+
+	result := SupervisionResult{
+		CreatedAt:            now,
+		Decision:             cached.decision,
+		Reasoning:            fmt.Sprintf("Reused the decision on supervision request %s: %s", cached.supervisionRequestId, cached.reasoning),
+		SupervisionRequestId: supervisionRequestId,
+	}
+	if cached.decision == Approve {
+		result.ToolcallId = &toolCall.Id
+	}
+
+	if _, err := c.store.CreateSupervisionResult(ctx, result, supervisionRequestId); err != nil {
+		return false, fmt.Errorf("error creating supervision result: %w", err)
+	}
+
+	// Push the decision to any client waiting on this tool call
+	go c.subscriptions.NotifySupervisionResult(context.Background(), supervisionRequestId)
+
+	return true, nil
+}
+
+// usesDecisionCache reports whether the supervisor's decisions are reused
+func usesDecisionCache(supervisor Supervisor) bool {
+	return supervisor.Id != nil &&
+		supervisor.Type != ClientSupervisor &&
+		supervisor.DecisionCacheTtlSeconds != nil &&
+		*supervisor.DecisionCacheTtlSeconds > 0
+}
+
+// Record stores the decision made on a supervision request, if its supervisor uses the decision cache
+func (c *DecisionCache) Record(ctx context.Context, supervisionRequestId uuid.UUID, result SupervisionResult) {
+	if c == nil || (result.Decision != Approve && result.Decision != Reject) {
+		return
+	}
+
+	if err := c.record(ctx, supervisionRequestId, result); err != nil {
+		log.Printf("Error caching the decision on supervision request %s: %v", supervisionRequestId, err)
+	}
+}
+
+func (c *DecisionCache) record(ctx context.Context, supervisionRequestId uuid.UUID, result SupervisionResult) error {
+	request, err := c.store.GetSupervisionRequest(ctx, supervisionRequestId)
+	if err != nil {
+		return fmt.Errorf("error getting supervision request: %w", err)
+	}
+	if request == nil || request.ChainexecutionId == nil {
+		return nil
+	}
+
+	supervisor, err := c.store.GetSupervisor(ctx, request.SupervisorId)
+	if err != nil {
+		return fmt.Errorf("error getting supervisor: %w", err)
+	}
+	if supervisor == nil || !usesDecisionCache(*supervisor) {
+		return nil
+	}
+
+	_, toolCallId, err := c.store.GetChainExecution(ctx, *request.ChainexecutionId)
+	if err != nil {
+		return fmt.Errorf("error getting chain execution: %w", err)
+	}
+	if toolCallId == nil {
+		return nil
+	}
+
+	toolCall, err := c.store.GetToolCall(ctx, *toolCallId)
+	if err != nil {
+		return fmt.Errorf("error getting tool call: %w", err)
+	}
+	if toolCall == nil {
+		return nil
+	}
+
+	key, err := c.key(ctx, request.SupervisorId, *toolCall)
+	if err != nil {
+		return err
+	}
+
+	ttl := time.Duration(*supervisor.DecisionCacheTtlSeconds) * time.Second
+	c.decisions.add(key, cachedDecision{
+		decision:             result.Decision,
+		reasoning:            result.Reasoning,
+		supervisionRequestId: supervisionRequestId,
+		expires:              time.Now().Add(ttl),
+	})
+
+	return nil
+}
+
+// Stats reports the use of the cache
+func (c *DecisionCache) Stats() *CacheStats {
+	if c == nil {
+		return nil
+	}
+
+	stats := c.decisions.stats()
+	return &stats
+}
+
+func (c *DecisionCache) key(ctx context.Context, supervisorId uuid.UUID, toolCall AsteroidToolCall) (decisionKey, error) {
+	tool, err := c.store.GetTool(ctx, toolCall.ToolId)
+	if err != nil {
+		return decisionKey{}, fmt.Errorf("error getting tool: %w", err)
+	}
+
+	var ignored []string
+	if tool != nil && tool.IgnoredAttributes != nil {
+		ignored = *tool.IgnoredAttributes
+	}
+
+	var arguments string
+	if toolCall.Arguments != nil {
+		arguments = *toolCall.Arguments
+	}
+
+	return decisionKey{
+		supervisorId: supervisorId,
+		toolId:       toolCall.ToolId,
+		arguments:    sha256.Sum256(normalizedArguments(arguments, ignored)),
+	}, nil
+}
+
+// normalizedArguments returns tool call arguments as compact JSON with sorted keys and without the
+// tool's ignored attributes, so that calls differing only in those or in formatting match. Numbers are
+// kept as written, so that two different numbers never match.
+func normalizedArguments(arguments string, ignored []string) []byte {
+	decoder := json.NewDecoder(bytes.NewReader([]byte(arguments)))
+	decoder.UseNumber()
+
+	var parsed interface{}
+	if err := decoder.Decode(&parsed); err != nil || decoder.More() {
+		// Not JSON, so only the same string matches
+		return []byte(arguments)
+	}
+
+	if object, ok := parsed.(map[string]interface{}); ok {
+		for _, name := range ignored {
+			delete(object, name)
+		}
+	}
+
+	normalized, err := json.Marshal(parsed)
+	if err != nil {
+		return []byte(arguments)
+	}
+	return normalized
+}
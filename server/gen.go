@@ -114,6 +114,12 @@ type AsteroidMessage struct {
 // AsteroidMessageRole defines model for AsteroidMessage.Role.
 type AsteroidMessageRole string
 
+// AsteroidRawChat The JSON of the request and response data sent/received from the LLM.
+type AsteroidRawChat struct {
+	Request  map[string]interface{} `json:"request"`
+	Response map[string]interface{} `json:"response"`
+}
+
 // AsteroidToolCall defines model for AsteroidToolCall.
 type AsteroidToolCall struct {
 	// Arguments Arguments in JSON format
@@ -125,6 +131,43 @@ type AsteroidToolCall struct {
 	ToolId    openapi_types.UUID `json:"tool_id"`
 }
 
+// BatchItemResult The outcome of one item of a batch
+type BatchItemResult struct {
+	Details *string `json:"details,omitempty"`
+	Error   *string `json:"error,omitempty"`
+
+	// Id ID of what the item created
+	Id *openapi_types.UUID `json:"id,omitempty"`
+
+	// Index Position of the item in the batch
+	Index int `json:"index"`
+
+	// Status HTTP status the item would have had as a single request
+	Status            int                `json:"status"`
+	SupervisionStatus *SupervisionStatus `json:"supervision_status,omitempty"`
+}
+
+// BatchResult defines model for BatchResult.
+type BatchResult struct {
+	Results []BatchItemResult `json:"results"`
+}
+
+// CacheStats Usage of one of the server's in-memory caches
+type CacheStats struct {
+	// Capacity Most entries held before the least recently used is evicted
+	Capacity  int   `json:"capacity"`
+	Evictions int64 `json:"evictions"`
+
+	// HitRate Fraction of lookups answered from the cache
+	HitRate float64 `json:"hit_rate"`
+	Hits    int64   `json:"hits"`
+	Misses  int64   `json:"misses"`
+	Name    string  `json:"name"`
+
+	// Size Number of entries held
+	Size int `json:"size"`
+}
+
 // ChainExecution defines model for ChainExecution.
 type ChainExecution struct {
 	ChainId    openapi_types.UUID `json:"chain_id"`
@@ -175,9 +218,15 @@ type HubStats struct {
 	BusyClients           int            `json:"busy_clients"`
 	CompletedReviewsCount int            `json:"completed_reviews_count"`
 	ConnectedClients      int            `json:"connected_clients"`
-	FreeClients           int            `json:"free_clients"`
-	PendingReviewsCount   int            `json:"pending_reviews_count"`
-	ReviewDistribution    map[string]int `json:"review_distribution"`
+
+	// DecisionCache Usage of one of the server's in-memory caches
+	DecisionCache       *CacheStats    `json:"decision_cache,omitempty"`
+	FreeClients         int            `json:"free_clients"`
+	PendingReviewsCount int            `json:"pending_reviews_count"`
+	ReviewDistribution  map[string]int `json:"review_distribution"`
+
+	// WaitingReviewsCount Reviews held by the hub until a client has capacity for them
+	WaitingReviewsCount int `json:"waiting_reviews_count"`
 }
 
 // MessageRole defines model for MessageRole.
@@ -186,6 +235,53 @@ type MessageRole string
 // MessageType defines model for MessageType.
 type MessageType string
 
+// PoolStats Database connection pool usage, as reported by database/sql
+type PoolStats struct {
+	Idle               int   `json:"idle"`
+	InUse              int   `json:"in_use"`
+	MaxIdleClosed      int64 `json:"max_idle_closed"`
+	MaxIdleTimeClosed  int64 `json:"max_idle_time_closed"`
+	MaxLifetimeClosed  int64 `json:"max_lifetime_closed"`
+	MaxOpenConnections int   `json:"max_open_connections"`
+	OpenConnections    int   `json:"open_connections"`
+
+	// WaitCount Number of times a query waited for a free connection
+	WaitCount int64 `json:"wait_count"`
+
+	// WaitDurationMs Total time spent waiting for a free connection
+	WaitDurationMs int64 `json:"wait_duration_ms"`
+}
+
+// ProcessorQueueStats defines model for ProcessorQueueStats.
+type ProcessorQueueStats struct {
+	// Busy Workers processing a supervision request
+	Busy int `json:"busy"`
+
+	// Capacity Most supervision requests the queue holds before callers wait for room
+	Capacity int `json:"capacity"`
+
+	// Depth Supervision requests waiting in the queue
+	Depth    int   `json:"depth"`
+	Enqueued int64 `json:"enqueued"`
+	Failed   int64 `json:"failed"`
+
+	// MaxWaitMs Longest time a processed supervision request waited in the queue
+	MaxWaitMs float64 `json:"max_wait_ms"`
+
+	// MeanWaitMs Mean time processed supervision requests waited in the queue
+	MeanWaitMs float64 `json:"mean_wait_ms"`
+	Processed  int64   `json:"processed"`
+
+	// SupervisorType The type of supervisor. ClientSupervisor means that the supervision is done client side and the server is merely informed. Other supervisor types are handled serverside, e.g. HumanSupervisor means that a human will review the request via the Asteroid UI.
+	SupervisorType SupervisorType `json:"supervisor_type"`
+	Workers        int            `json:"workers"`
+}
+
+// ProcessorStats Queues of the processor that dispatches supervision requests, one per supervisor type
+type ProcessorStats struct {
+	Queues []ProcessorQueueStats `json:"queues"`
+}
+
 // Project defines model for Project.
 type Project struct {
 	CreatedAt     time.Time          `json:"created_at"`
@@ -216,6 +312,45 @@ type Run struct {
 	TaskId    openapi_types.UUID `json:"task_id"`
 }
 
+// RunBatch defines model for RunBatch.
+type RunBatch struct {
+	Runs []RunBatchItem `json:"runs"`
+}
+
+// RunBatchItem A run to create, with the tools it can call
+type RunBatchItem struct {
+	Tools []RunBatchTool `json:"tools"`
+}
+
+// RunBatchItemResult defines model for RunBatchItemResult.
+type RunBatchItemResult struct {
+	RunId openapi_types.UUID   `json:"run_id"`
+	Tools []RunBatchToolResult `json:"tools"`
+}
+
+// RunBatchResult defines model for RunBatchResult.
+type RunBatchResult struct {
+	Runs []RunBatchItemResult `json:"runs"`
+}
+
+// RunBatchTool A tool to create for a run, with the supervisor chains to create for it
+type RunBatchTool struct {
+	Attributes        map[string]interface{} `json:"attributes"`
+	Chains            *[]ChainRequest        `json:"chains,omitempty"`
+	Code              string                 `json:"code"`
+	Description       string                 `json:"description"`
+	IgnoredAttributes *[]string              `json:"ignored_attributes,omitempty"`
+	Name              string                 `json:"name"`
+}
+
+// RunBatchToolResult defines model for RunBatchToolResult.
+type RunBatchToolResult struct {
+	// ChainIds IDs of the tool's supervisor chains, in the order they were given
+	ChainIds []openapi_types.UUID `json:"chain_ids"`
+	Name     string               `json:"name"`
+	ToolId   openapi_types.UUID   `json:"tool_id"`
+}
+
 // RunExecution defines model for RunExecution.
 type RunExecution struct {
 	Chains   []ChainExecutionState `json:"chains"`
@@ -226,9 +361,25 @@ type RunExecution struct {
 // RunState defines model for RunState.
 type RunState = []RunExecution
 
+// StatementStats defines model for StatementStats.
+type StatementStats struct {
+	Calls           int64   `json:"calls"`
+	Errors          int64   `json:"errors"`
+	MeanDurationMs  float64 `json:"mean_duration_ms"`
+	Name            string  `json:"name"`
+	TotalDurationMs float64 `json:"total_duration_ms"`
+}
+
 // Status defines model for Status.
 type Status string
 
+// StoreStats defines model for StoreStats.
+type StoreStats struct {
+	Caches     *[]CacheStats     `json:"caches,omitempty"`
+	Pool       *PoolStats        `json:"pool,omitempty"`
+	Statements *[]StatementStats `json:"statements,omitempty"`
+}
+
 // SupervisionRequest defines model for SupervisionRequest.
 type SupervisionRequest struct {
 	ChainexecutionId *openapi_types.UUID `json:"chainexecution_id,omitempty"`
@@ -238,6 +389,25 @@ type SupervisionRequest struct {
 	SupervisorId     openapi_types.UUID  `json:"supervisor_id"`
 }
 
+// SupervisionRequestBatch defines model for SupervisionRequestBatch.
+type SupervisionRequestBatch struct {
+	Requests []SupervisionRequestBatchItem `json:"requests"`
+}
+
+// SupervisionRequestBatchItem A supervision request for a supervisor in a chain on a tool call
+type SupervisionRequestBatchItem struct {
+	ChainId          openapi_types.UUID  `json:"chain_id"`
+	ChainexecutionId *openapi_types.UUID `json:"chainexecution_id,omitempty"`
+	PositionInChain  int                 `json:"position_in_chain"`
+	SupervisorId     openapi_types.UUID  `json:"supervisor_id"`
+	ToolCallId       openapi_types.UUID  `json:"tool_call_id"`
+}
+
+// SupervisionRequestIds defines model for SupervisionRequestIds.
+type SupervisionRequestIds struct {
+	SupervisionRequestIds []openapi_types.UUID `json:"supervision_request_ids"`
+}
+
 // SupervisionRequestState defines model for SupervisionRequestState.
 type SupervisionRequestState struct {
 	Result             *SupervisionResult `json:"result,omitempty"`
@@ -255,6 +425,11 @@ type SupervisionResult struct {
 	ToolcallId           *openapi_types.UUID `json:"toolcall_id,omitempty"`
 }
 
+// SupervisionResultBatch defines model for SupervisionResultBatch.
+type SupervisionResultBatch struct {
+	Results []SupervisionResult `json:"results"`
+}
+
 // SupervisionStatus defines model for SupervisionStatus.
 type SupervisionStatus struct {
 	CreatedAt            time.Time           `json:"created_at"`
@@ -265,12 +440,15 @@ type SupervisionStatus struct {
 
 // Supervisor defines model for Supervisor.
 type Supervisor struct {
-	Attributes  map[string]interface{} `json:"attributes"`
-	Code        string                 `json:"code"`
-	CreatedAt   time.Time              `json:"created_at"`
-	Description string                 `json:"description"`
-	Id          *openapi_types.UUID    `json:"id,omitempty"`
-	Name        string                 `json:"name"`
+	Attributes map[string]interface{} `json:"attributes"`
+	Code       string                 `json:"code"`
+	CreatedAt  time.Time              `json:"created_at"`
+
+	// DecisionCacheTtlSeconds Reuse the supervisor's approve or reject decision on a tool call for this many seconds, for later calls of the same tool with the same arguments, not counting the tool's ignored attributes. Unset leaves the decision cache off. Ignored for client supervisors, which post their own result for every request.
+	DecisionCacheTtlSeconds *int                `json:"decision_cache_ttl_seconds,omitempty"`
+	Description             string              `json:"description"`
+	Id                      *openapi_types.UUID `json:"id,omitempty"`
+	Name                    string              `json:"name"`
 
 	// Type The type of supervisor. ClientSupervisor means that the supervision is done client side and the server is merely informed. Other supervisor types are handled serverside, e.g. HumanSupervisor means that a human will review the request via the Asteroid UI.
 	Type SupervisorType `json:"type"`
@@ -302,7 +480,9 @@ type Tool struct {
 	Id                *openapi_types.UUID    `json:"id,omitempty"`
 	IgnoredAttributes *[]string              `json:"ignored_attributes,omitempty"`
 	Name              string                 `json:"name"`
-	RunId             openapi_types.UUID     `json:"run_id"`
+
+	// RunId The run the tool was registered or listed for. Tool definitions are shared by the runs of a project, so a tool got by its ID or listed for a project has the run that first registered the definition, which needn't be the run of any given tool call.
+	RunId openapi_types.UUID `json:"run_id"`
 }
 
 // ToolCallIds defines model for ToolCallIds.
@@ -311,23 +491,59 @@ type ToolCallIds struct {
 	ToolId     *string `json:"tool_id,omitempty"`
 }
 
+// GetProjectsParams defines parameters for GetProjects.
+type GetProjectsParams struct {
+	// Cursor Return the projects after this cursor, taken from the X-Next-Cursor header of the previous page
+	Cursor *string `form:"cursor,omitempty" json:"cursor,omitempty"`
+
+	// Limit Maximum number of projects to return. All of them are returned when it is omitted.
+	Limit *int `form:"limit,omitempty" json:"limit,omitempty"`
+}
+
 // CreateProjectJSONBody defines parameters for CreateProject.
 type CreateProjectJSONBody struct {
 	Name          string   `json:"name"`
 	RunResultTags []string `json:"run_result_tags"`
 }
 
+// GetProjectTasksParams defines parameters for GetProjectTasks.
+type GetProjectTasksParams struct {
+	// Cursor Return the tasks after this cursor, taken from the X-Next-Cursor header of the previous page
+	Cursor *string `form:"cursor,omitempty" json:"cursor,omitempty"`
+
+	// Limit Maximum number of tasks to return. All of them are returned when it is omitted.
+	Limit *int `form:"limit,omitempty" json:"limit,omitempty"`
+}
+
 // CreateTaskJSONBody defines parameters for CreateTask.
 type CreateTaskJSONBody struct {
 	Description *string `json:"description,omitempty"`
 	Name        string  `json:"name"`
 }
 
+// GetProjectToolsParams defines parameters for GetProjectTools.
+type GetProjectToolsParams struct {
+	// Cursor Return the tools after this cursor, taken from the X-Next-Cursor header of the previous page
+	Cursor *string `form:"cursor,omitempty" json:"cursor,omitempty"`
+
+	// Limit Maximum number of tools to return. All of them are returned when it is omitted.
+	Limit *int `form:"limit,omitempty" json:"limit,omitempty"`
+}
+
 // UpdateRunResultJSONBody defines parameters for UpdateRunResult.
 type UpdateRunResultJSONBody struct {
 	Result *string `json:"result,omitempty"`
 }
 
+// GetRunToolsParams defines parameters for GetRunTools.
+type GetRunToolsParams struct {
+	// Cursor Return the tools after this cursor, taken from the X-Next-Cursor header of the previous page
+	Cursor *string `form:"cursor,omitempty" json:"cursor,omitempty"`
+
+	// Limit Maximum number of tools to return. All of them are returned when it is omitted.
+	Limit *int `form:"limit,omitempty" json:"limit,omitempty"`
+}
+
 // CreateRunToolJSONBody defines parameters for CreateRunTool.
 type CreateRunToolJSONBody struct {
 	Attributes        map[string]interface{} `json:"attributes"`
@@ -337,9 +553,30 @@ type CreateRunToolJSONBody struct {
 	Name              string                 `json:"name"`
 }
 
+// GetTaskRunsParams defines parameters for GetTaskRuns.
+type GetTaskRunsParams struct {
+	// Cursor Return the runs after this cursor, taken from the X-Next-Cursor header of the previous page
+	Cursor *string `form:"cursor,omitempty" json:"cursor,omitempty"`
+
+	// Limit Maximum number of runs to return. All of them are returned when it is omitted.
+	Limit *int `form:"limit,omitempty" json:"limit,omitempty"`
+}
+
+// GetToolSupervisorChainsParams defines parameters for GetToolSupervisorChains.
+type GetToolSupervisorChainsParams struct {
+	// RunId Only return the chains of this run. Tools are shared by the runs of a project, and each run has its own chains on them.
+	RunId *openapi_types.UUID `form:"run_id,omitempty" json:"run_id,omitempty"`
+}
+
 // CreateToolSupervisorChainsJSONBody defines parameters for CreateToolSupervisorChains.
 type CreateToolSupervisorChainsJSONBody = []ChainRequest
 
+// CreateToolSupervisorChainsParams defines parameters for CreateToolSupervisorChains.
+type CreateToolSupervisorChainsParams struct {
+	// RunId Run the chains are for. Tools are shared by the runs of a project, and each run's tool calls only go through the chains of that run.
+	RunId openapi_types.UUID `form:"run_id" json:"run_id"`
+}
+
 // CreateProjectJSONRequestBody defines body for CreateProject for application/json ContentType.
 type CreateProjectJSONRequestBody CreateProjectJSONBody
 
@@ -361,9 +598,24 @@ type CreateRunToolJSONRequestBody CreateRunToolJSONBody
 // CreateNewChatJSONRequestBody defines body for CreateNewChat for application/json ContentType.
 type CreateNewChatJSONRequestBody = AsteroidChat
 
+// CreateNewChatApplicationVndAsteroidChatPlusJSONRequestBody defines body for CreateNewChat for application/vnd.asteroid.chat+json ContentType.
+type CreateNewChatApplicationVndAsteroidChatPlusJSONRequestBody = AsteroidRawChat
+
 // CreateSupervisionResultJSONRequestBody defines body for CreateSupervisionResult for application/json ContentType.
 type CreateSupervisionResultJSONRequestBody = SupervisionResult
 
+// CreateSupervisionRequestsJSONRequestBody defines body for CreateSupervisionRequests for application/json ContentType.
+type CreateSupervisionRequestsJSONRequestBody = SupervisionRequestBatch
+
+// GetSupervisionRequestStatusesJSONRequestBody defines body for GetSupervisionRequestStatuses for application/json ContentType.
+type GetSupervisionRequestStatusesJSONRequestBody = SupervisionRequestIds
+
+// CreateSupervisionResultsJSONRequestBody defines body for CreateSupervisionResults for application/json ContentType.
+type CreateSupervisionResultsJSONRequestBody = SupervisionResultBatch
+
+// CreateTaskRunsJSONRequestBody defines body for CreateTaskRuns for application/json ContentType.
+type CreateTaskRunsJSONRequestBody = RunBatch
+
 // CreateToolSupervisorChainsJSONRequestBody defines body for CreateToolSupervisorChains for application/json ContentType.
 type CreateToolSupervisorChainsJSONRequestBody = CreateToolSupervisorChainsJSONBody
 
@@ -377,7 +629,7 @@ type ServerInterface interface {
 	GetOpenAPI(w http.ResponseWriter, r *http.Request)
 	// Get all projects
 	// (GET /project)
-	GetProjects(w http.ResponseWriter, r *http.Request)
+	GetProjects(w http.ResponseWriter, r *http.Request, params GetProjectsParams)
 	// Create a new project
 	// (POST /project)
 	CreateProject(w http.ResponseWriter, r *http.Request)
@@ -392,13 +644,13 @@ type ServerInterface interface {
 	CreateSupervisor(w http.ResponseWriter, r *http.Request, projectId openapi_types.UUID)
 	// Get all tasks for a project
 	// (GET /project/{projectId}/tasks)
-	GetProjectTasks(w http.ResponseWriter, r *http.Request, projectId openapi_types.UUID)
+	GetProjectTasks(w http.ResponseWriter, r *http.Request, projectId openapi_types.UUID, params GetProjectTasksParams)
 	// Create a new task
 	// (POST /project/{projectId}/tasks)
 	CreateTask(w http.ResponseWriter, r *http.Request, projectId openapi_types.UUID)
 	// Get all tools for a project
 	// (GET /project/{projectId}/tools)
-	GetProjectTools(w http.ResponseWriter, r *http.Request, projectId openapi_types.UUID)
+	GetProjectTools(w http.ResponseWriter, r *http.Request, projectId openapi_types.UUID, params GetProjectToolsParams)
 	// Get a run
 	// (GET /run/{runId})
 	GetRun(w http.ResponseWriter, r *http.Request, runId openapi_types.UUID)
@@ -413,7 +665,7 @@ type ServerInterface interface {
 	UpdateRunStatus(w http.ResponseWriter, r *http.Request, runId openapi_types.UUID)
 	// Get all tools for a run
 	// (GET /run/{runId}/tool)
-	GetRunTools(w http.ResponseWriter, r *http.Request, runId openapi_types.UUID)
+	GetRunTools(w http.ResponseWriter, r *http.Request, runId openapi_types.UUID, params GetRunToolsParams)
 	// Create a new tool for a run
 	// (POST /run/{runId}/tool)
 	CreateRunTool(w http.ResponseWriter, r *http.Request, runId openapi_types.UUID)
@@ -429,6 +681,12 @@ type ServerInterface interface {
 	// Get hub stats
 	// (GET /stats)
 	GetHubStats(w http.ResponseWriter, r *http.Request)
+	// Get processor stats
+	// (GET /stats/processor)
+	GetProcessorStats(w http.ResponseWriter, r *http.Request)
+	// Get store stats
+	// (GET /stats/store)
+	GetStoreStats(w http.ResponseWriter, r *http.Request)
 	// Get a supervision result
 	// (GET /supervision_request/{supervisionRequestId}/result)
 	GetSupervisionResult(w http.ResponseWriter, r *http.Request, supervisionRequestId openapi_types.UUID)
@@ -441,6 +699,15 @@ type ServerInterface interface {
 	// Get a supervision request status
 	// (GET /supervision_request/{supervisionRequestId}/status)
 	GetSupervisionRequestStatus(w http.ResponseWriter, r *http.Request, supervisionRequestId openapi_types.UUID)
+	// Create supervision requests in one transaction
+	// (POST /supervision_requests)
+	CreateSupervisionRequests(w http.ResponseWriter, r *http.Request)
+	// Get the statuses of supervision requests
+	// (POST /supervision_requests/status)
+	GetSupervisionRequestStatuses(w http.ResponseWriter, r *http.Request)
+	// Create supervision results in one transaction
+	// (POST /supervision_results)
+	CreateSupervisionResults(w http.ResponseWriter, r *http.Request)
 	// Get a supervisor
 	// (GET /supervisor/{supervisorId})
 	GetSupervisor(w http.ResponseWriter, r *http.Request, supervisorId openapi_types.UUID)
@@ -452,19 +719,22 @@ type ServerInterface interface {
 	GetTask(w http.ResponseWriter, r *http.Request, taskId openapi_types.UUID)
 	// Get all runs for a task
 	// (GET /task/{taskId}/run)
-	GetTaskRuns(w http.ResponseWriter, r *http.Request, taskId openapi_types.UUID)
+	GetTaskRuns(w http.ResponseWriter, r *http.Request, taskId openapi_types.UUID, params GetTaskRunsParams)
 	// Create a new run for a task
 	// (POST /task/{taskId}/run)
 	CreateRun(w http.ResponseWriter, r *http.Request, taskId openapi_types.UUID)
+	// Create many runs for a task, with their tools and supervisor chains, in one transaction
+	// (POST /task/{taskId}/runs)
+	CreateTaskRuns(w http.ResponseWriter, r *http.Request, taskId openapi_types.UUID)
 	// Get a tool
 	// (GET /tool/{toolId})
 	GetTool(w http.ResponseWriter, r *http.Request, toolId openapi_types.UUID)
 	// Get all supervisors for a tool, in chain format
 	// (GET /tool/{toolId}/supervisors)
-	GetToolSupervisorChains(w http.ResponseWriter, r *http.Request, toolId openapi_types.UUID)
+	GetToolSupervisorChains(w http.ResponseWriter, r *http.Request, toolId openapi_types.UUID, params GetToolSupervisorChainsParams)
 	// Create new chains with supervisors for a tool
 	// (POST /tool/{toolId}/supervisors)
-	CreateToolSupervisorChains(w http.ResponseWriter, r *http.Request, toolId openapi_types.UUID)
+	CreateToolSupervisorChains(w http.ResponseWriter, r *http.Request, toolId openapi_types.UUID, params CreateToolSupervisorChainsParams)
 	// Get a tool call
 	// (GET /tool_call/{toolCallId})
 	GetToolCall(w http.ResponseWriter, r *http.Request, toolCallId openapi_types.UUID)
@@ -474,6 +744,9 @@ type ServerInterface interface {
 	// Get the state of a tool call
 	// (GET /tool_call/{toolCallId}/state)
 	GetToolCallState(w http.ResponseWriter, r *http.Request, toolCallId string)
+	// Stream the state of a tool call until its supervision completes
+	// (GET /tool_call/{toolCallId}/state/stream)
+	StreamToolCallState(w http.ResponseWriter, r *http.Request, toolCallId string)
 	// Get a tool call status
 	// (GET /tool_call/{toolCallId}/status)
 	GetToolCallStatus(w http.ResponseWriter, r *http.Request, toolCallId openapi_types.UUID)
@@ -505,8 +778,29 @@ func (siw *ServerInterfaceWrapper) GetOpenAPI(w http.ResponseWriter, r *http.Req
 // GetProjects operation middleware
 func (siw *ServerInterfaceWrapper) GetProjects(w http.ResponseWriter, r *http.Request) {
 
+	var err error
+
+	// Parameter object where we will unmarshal all parameters from the context
+	var params GetProjectsParams
+
+	// ------------- Optional query parameter "cursor" -------------
+
+	err = runtime.BindQueryParameter("form", true, false, "cursor", r.URL.Query(), &params.Cursor)
+	if err != nil {
+		siw.ErrorHandlerFunc(w, r, &InvalidParamFormatError{ParamName: "cursor", Err: err})
+		return
+	}
+
+	// ------------- Optional query parameter "limit" -------------
+
+	err = runtime.BindQueryParameter("form", true, false, "limit", r.URL.Query(), &params.Limit)
+	if err != nil {
+		siw.ErrorHandlerFunc(w, r, &InvalidParamFormatError{ParamName: "limit", Err: err})
+		return
+	}
+
 	handler := http.Handler(http.HandlerFunc(func(w http.ResponseWriter, r *http.Request) {
-		siw.Handler.GetProjects(w, r)
+		siw.Handler.GetProjects(w, r, params)
 	}))
 
 	for _, middleware := range siw.HandlerMiddlewares {
@@ -619,8 +913,27 @@ func (siw *ServerInterfaceWrapper) GetProjectTasks(w http.ResponseWriter, r *htt
 		return
 	}
 
+	// Parameter object where we will unmarshal all parameters from the context
+	var params GetProjectTasksParams
+
+	// ------------- Optional query parameter "cursor" -------------
+
+	err = runtime.BindQueryParameter("form", true, false, "cursor", r.URL.Query(), &params.Cursor)
+	if err != nil {
+		siw.ErrorHandlerFunc(w, r, &InvalidParamFormatError{ParamName: "cursor", Err: err})
+		return
+	}
+
+	// ------------- Optional query parameter "limit" -------------
+
+	err = runtime.BindQueryParameter("form", true, false, "limit", r.URL.Query(), &params.Limit)
+	if err != nil {
+		siw.ErrorHandlerFunc(w, r, &InvalidParamFormatError{ParamName: "limit", Err: err})
+		return
+	}
+
 	handler := http.Handler(http.HandlerFunc(func(w http.ResponseWriter, r *http.Request) {
-		siw.Handler.GetProjectTasks(w, r, projectId)
+		siw.Handler.GetProjectTasks(w, r, projectId, params)
 	}))
 
 	for _, middleware := range siw.HandlerMiddlewares {
@@ -669,8 +982,27 @@ func (siw *ServerInterfaceWrapper) GetProjectTools(w http.ResponseWriter, r *htt
 		return
 	}
 
+	// Parameter object where we will unmarshal all parameters from the context
+	var params GetProjectToolsParams
+
+	// ------------- Optional query parameter "cursor" -------------
+
+	err = runtime.BindQueryParameter("form", true, false, "cursor", r.URL.Query(), &params.Cursor)
+	if err != nil {
+		siw.ErrorHandlerFunc(w, r, &InvalidParamFormatError{ParamName: "cursor", Err: err})
+		return
+	}
+
+	// ------------- Optional query parameter "limit" -------------
+
+	err = runtime.BindQueryParameter("form", true, false, "limit", r.URL.Query(), &params.Limit)
+	if err != nil {
+		siw.ErrorHandlerFunc(w, r, &InvalidParamFormatError{ParamName: "limit", Err: err})
+		return
+	}
+
 	handler := http.Handler(http.HandlerFunc(func(w http.ResponseWriter, r *http.Request) {
-		siw.Handler.GetProjectTools(w, r, projectId)
+		siw.Handler.GetProjectTools(w, r, projectId, params)
 	}))
 
 	for _, middleware := range siw.HandlerMiddlewares {
@@ -794,8 +1126,27 @@ func (siw *ServerInterfaceWrapper) GetRunTools(w http.ResponseWriter, r *http.Re
 		return
 	}
 
+	// Parameter object where we will unmarshal all parameters from the context
+	var params GetRunToolsParams
+
+	// ------------- Optional query parameter "cursor" -------------
+
+	err = runtime.BindQueryParameter("form", true, false, "cursor", r.URL.Query(), &params.Cursor)
+	if err != nil {
+		siw.ErrorHandlerFunc(w, r, &InvalidParamFormatError{ParamName: "cursor", Err: err})
+		return
+	}
+
+	// ------------- Optional query parameter "limit" -------------
+
+	err = runtime.BindQueryParameter("form", true, false, "limit", r.URL.Query(), &params.Limit)
+	if err != nil {
+		siw.ErrorHandlerFunc(w, r, &InvalidParamFormatError{ParamName: "limit", Err: err})
+		return
+	}
+
 	handler := http.Handler(http.HandlerFunc(func(w http.ResponseWriter, r *http.Request) {
-		siw.Handler.GetRunTools(w, r, runId)
+		siw.Handler.GetRunTools(w, r, runId, params)
 	}))
 
 	for _, middleware := range siw.HandlerMiddlewares {
@@ -928,6 +1279,34 @@ func (siw *ServerInterfaceWrapper) GetHubStats(w http.ResponseWriter, r *http.Re
 	handler.ServeHTTP(w, r)
 }
 
+// GetProcessorStats operation middleware
+func (siw *ServerInterfaceWrapper) GetProcessorStats(w http.ResponseWriter, r *http.Request) {
+
+	handler := http.Handler(http.HandlerFunc(func(w http.ResponseWriter, r *http.Request) {
+		siw.Handler.GetProcessorStats(w, r)
+	}))
+
+	for _, middleware := range siw.HandlerMiddlewares {
+		handler = middleware(handler)
+	}
+
+	handler.ServeHTTP(w, r)
+}
+
+// GetStoreStats operation middleware
+func (siw *ServerInterfaceWrapper) GetStoreStats(w http.ResponseWriter, r *http.Request) {
+
+	handler := http.Handler(http.HandlerFunc(func(w http.ResponseWriter, r *http.Request) {
+		siw.Handler.GetStoreStats(w, r)
+	}))
+
+	for _, middleware := range siw.HandlerMiddlewares {
+		handler = middleware(handler)
+	}
+
+	handler.ServeHTTP(w, r)
+}
+
 // GetSupervisionResult operation middleware
 func (siw *ServerInterfaceWrapper) GetSupervisionResult(w http.ResponseWriter, r *http.Request) {
 
@@ -1028,6 +1407,48 @@ func (siw *ServerInterfaceWrapper) GetSupervisionRequestStatus(w http.ResponseWr
 	handler.ServeHTTP(w, r)
 }
 
+// CreateSupervisionRequests operation middleware
+func (siw *ServerInterfaceWrapper) CreateSupervisionRequests(w http.ResponseWriter, r *http.Request) {
+
+	handler := http.Handler(http.HandlerFunc(func(w http.ResponseWriter, r *http.Request) {
+		siw.Handler.CreateSupervisionRequests(w, r)
+	}))
+
+	for _, middleware := range siw.HandlerMiddlewares {
+		handler = middleware(handler)
+	}
+
+	handler.ServeHTTP(w, r)
+}
+
+// GetSupervisionRequestStatuses operation middleware
+func (siw *ServerInterfaceWrapper) GetSupervisionRequestStatuses(w http.ResponseWriter, r *http.Request) {
+
+	handler := http.Handler(http.HandlerFunc(func(w http.ResponseWriter, r *http.Request) {
+		siw.Handler.GetSupervisionRequestStatuses(w, r)
+	}))
+
+	for _, middleware := range siw.HandlerMiddlewares {
+		handler = middleware(handler)
+	}
+
+	handler.ServeHTTP(w, r)
+}
+
+// CreateSupervisionResults operation middleware
+func (siw *ServerInterfaceWrapper) CreateSupervisionResults(w http.ResponseWriter, r *http.Request) {
+
+	handler := http.Handler(http.HandlerFunc(func(w http.ResponseWriter, r *http.Request) {
+		siw.Handler.CreateSupervisionResults(w, r)
+	}))
+
+	for _, middleware := range siw.HandlerMiddlewares {
+		handler = middleware(handler)
+	}
+
+	handler.ServeHTTP(w, r)
+}
+
 // GetSupervisor operation middleware
 func (siw *ServerInterfaceWrapper) GetSupervisor(w http.ResponseWriter, r *http.Request) {
 
@@ -1106,8 +1527,27 @@ func (siw *ServerInterfaceWrapper) GetTaskRuns(w http.ResponseWriter, r *http.Re
 		return
 	}
 
+	// Parameter object where we will unmarshal all parameters from the context
+	var params GetTaskRunsParams
+
+	// ------------- Optional query parameter "cursor" -------------
+
+	err = runtime.BindQueryParameter("form", true, false, "cursor", r.URL.Query(), &params.Cursor)
+	if err != nil {
+		siw.ErrorHandlerFunc(w, r, &InvalidParamFormatError{ParamName: "cursor", Err: err})
+		return
+	}
+
+	// ------------- Optional query parameter "limit" -------------
+
+	err = runtime.BindQueryParameter("form", true, false, "limit", r.URL.Query(), &params.Limit)
+	if err != nil {
+		siw.ErrorHandlerFunc(w, r, &InvalidParamFormatError{ParamName: "limit", Err: err})
+		return
+	}
+
 	handler := http.Handler(http.HandlerFunc(func(w http.ResponseWriter, r *http.Request) {
-		siw.Handler.GetTaskRuns(w, r, taskId)
+		siw.Handler.GetTaskRuns(w, r, taskId, params)
 	}))
 
 	for _, middleware := range siw.HandlerMiddlewares {
@@ -1142,6 +1582,31 @@ func (siw *ServerInterfaceWrapper) CreateRun(w http.ResponseWriter, r *http.Requ
 	handler.ServeHTTP(w, r)
 }
 
+// CreateTaskRuns operation middleware
+func (siw *ServerInterfaceWrapper) CreateTaskRuns(w http.ResponseWriter, r *http.Request) {
+
+	var err error
+
+	// ------------- Path parameter "taskId" -------------
+	var taskId openapi_types.UUID
+
+	err = runtime.BindStyledParameterWithOptions("simple", "taskId", r.PathValue("taskId"), &taskId, runtime.BindStyledParameterOptions{ParamLocation: runtime.ParamLocationPath, Explode: false, Required: true})
+	if err != nil {
+		siw.ErrorHandlerFunc(w, r, &InvalidParamFormatError{ParamName: "taskId", Err: err})
+		return
+	}
+
+	handler := http.Handler(http.HandlerFunc(func(w http.ResponseWriter, r *http.Request) {
+		siw.Handler.CreateTaskRuns(w, r, taskId)
+	}))
+
+	for _, middleware := range siw.HandlerMiddlewares {
+		handler = middleware(handler)
+	}
+
+	handler.ServeHTTP(w, r)
+}
+
 // GetTool operation middleware
 func (siw *ServerInterfaceWrapper) GetTool(w http.ResponseWriter, r *http.Request) {
 
@@ -1181,8 +1646,19 @@ func (siw *ServerInterfaceWrapper) GetToolSupervisorChains(w http.ResponseWriter
 		return
 	}
 
+	// Parameter object where we will unmarshal all parameters from the context
+	var params GetToolSupervisorChainsParams
+
+	// ------------- Optional query parameter "run_id" -------------
+
+	err = runtime.BindQueryParameter("form", true, false, "run_id", r.URL.Query(), &params.RunId)
+	if err != nil {
+		siw.ErrorHandlerFunc(w, r, &InvalidParamFormatError{ParamName: "run_id", Err: err})
+		return
+	}
+
 	handler := http.Handler(http.HandlerFunc(func(w http.ResponseWriter, r *http.Request) {
-		siw.Handler.GetToolSupervisorChains(w, r, toolId)
+		siw.Handler.GetToolSupervisorChains(w, r, toolId, params)
 	}))
 
 	for _, middleware := range siw.HandlerMiddlewares {
@@ -1206,8 +1682,26 @@ func (siw *ServerInterfaceWrapper) CreateToolSupervisorChains(w http.ResponseWri
 		return
 	}
 
+	// Parameter object where we will unmarshal all parameters from the context
+	var params CreateToolSupervisorChainsParams
+
+	// ------------- Required query parameter "run_id" -------------
+
+	if paramValue := r.URL.Query().Get("run_id"); paramValue != "" {
+
+	} else {
+		siw.ErrorHandlerFunc(w, r, &RequiredParamError{ParamName: "run_id"})
+		return
+	}
+
+	err = runtime.BindQueryParameter("form", true, true, "run_id", r.URL.Query(), &params.RunId)
+	if err != nil {
+		siw.ErrorHandlerFunc(w, r, &InvalidParamFormatError{ParamName: "run_id", Err: err})
+		return
+	}
+
 	handler := http.Handler(http.HandlerFunc(func(w http.ResponseWriter, r *http.Request) {
-		siw.Handler.CreateToolSupervisorChains(w, r, toolId)
+		siw.Handler.CreateToolSupervisorChains(w, r, toolId, params)
 	}))
 
 	for _, middleware := range siw.HandlerMiddlewares {
@@ -1310,6 +1804,31 @@ func (siw *ServerInterfaceWrapper) GetToolCallState(w http.ResponseWriter, r *ht
 	handler.ServeHTTP(w, r)
 }
 
+// StreamToolCallState operation middleware
+func (siw *ServerInterfaceWrapper) StreamToolCallState(w http.ResponseWriter, r *http.Request) {
+
+	var err error
+
+	// ------------- Path parameter "toolCallId" -------------
+	var toolCallId string
+
+	err = runtime.BindStyledParameterWithOptions("simple", "toolCallId", r.PathValue("toolCallId"), &toolCallId, runtime.BindStyledParameterOptions{ParamLocation: runtime.ParamLocationPath, Explode: false, Required: true})
+	if err != nil {
+		siw.ErrorHandlerFunc(w, r, &InvalidParamFormatError{ParamName: "toolCallId", Err: err})
+		return
+	}
+
+	handler := http.Handler(http.HandlerFunc(func(w http.ResponseWriter, r *http.Request) {
+		siw.Handler.StreamToolCallState(w, r, toolCallId)
+	}))
+
+	for _, middleware := range siw.HandlerMiddlewares {
+		handler = middleware(handler)
+	}
+
+	handler.ServeHTTP(w, r)
+}
+
 // GetToolCallStatus operation middleware
 func (siw *ServerInterfaceWrapper) GetToolCallStatus(w http.ResponseWriter, r *http.Request) {
 
@@ -1474,21 +1993,28 @@ func HandlerWithOptions(si ServerInterface, options StdHTTPServerOptions) http.H
 	m.HandleFunc("GET "+options.BaseURL+"/run/{run_id}/chat_count", wrapper.GetRunChatCount)
 	m.HandleFunc("GET "+options.BaseURL+"/run/{run_id}/messages/{index}", wrapper.GetRunMessages)
 	m.HandleFunc("GET "+options.BaseURL+"/stats", wrapper.GetHubStats)
+	m.HandleFunc("GET "+options.BaseURL+"/stats/processor", wrapper.GetProcessorStats)
+	m.HandleFunc("GET "+options.BaseURL+"/stats/store", wrapper.GetStoreStats)
 	m.HandleFunc("GET "+options.BaseURL+"/supervision_request/{supervisionRequestId}/result", wrapper.GetSupervisionResult)
 	m.HandleFunc("POST "+options.BaseURL+"/supervision_request/{supervisionRequestId}/result", wrapper.CreateSupervisionResult)
 	m.HandleFunc("GET "+options.BaseURL+"/supervision_request/{supervisionRequestId}/review_payload", wrapper.GetSupervisionReviewPayload)
 	m.HandleFunc("GET "+options.BaseURL+"/supervision_request/{supervisionRequestId}/status", wrapper.GetSupervisionRequestStatus)
+	m.HandleFunc("POST "+options.BaseURL+"/supervision_requests", wrapper.CreateSupervisionRequests)
+	m.HandleFunc("POST "+options.BaseURL+"/supervision_requests/status", wrapper.GetSupervisionRequestStatuses)
+	m.HandleFunc("POST "+options.BaseURL+"/supervision_results", wrapper.CreateSupervisionResults)
 	m.HandleFunc("GET "+options.BaseURL+"/supervisor/{supervisorId}", wrapper.GetSupervisor)
 	m.HandleFunc("GET "+options.BaseURL+"/swagger-ui", wrapper.GetSwaggerDocs)
 	m.HandleFunc("GET "+options.BaseURL+"/task/{taskId}", wrapper.GetTask)
 	m.HandleFunc("GET "+options.BaseURL+"/task/{taskId}/run", wrapper.GetTaskRuns)
 	m.HandleFunc("POST "+options.BaseURL+"/task/{taskId}/run", wrapper.CreateRun)
+	m.HandleFunc("POST "+options.BaseURL+"/task/{taskId}/runs", wrapper.CreateTaskRuns)
 	m.HandleFunc("GET "+options.BaseURL+"/tool/{toolId}", wrapper.GetTool)
 	m.HandleFunc("GET "+options.BaseURL+"/tool/{toolId}/supervisors", wrapper.GetToolSupervisorChains)
 	m.HandleFunc("POST "+options.BaseURL+"/tool/{toolId}/supervisors", wrapper.CreateToolSupervisorChains)
 	m.HandleFunc("GET "+options.BaseURL+"/tool_call/{toolCallId}", wrapper.GetToolCall)
 	m.HandleFunc("POST "+options.BaseURL+"/tool_call/{toolCallId}/chain/{chainId}/supervisor/{supervisorId}/supervision_request", wrapper.CreateSupervisionRequest)
 	m.HandleFunc("GET "+options.BaseURL+"/tool_call/{toolCallId}/state", wrapper.GetToolCallState)
+	m.HandleFunc("GET "+options.BaseURL+"/tool_call/{toolCallId}/state/stream", wrapper.StreamToolCallState)
 	m.HandleFunc("GET "+options.BaseURL+"/tool_call/{toolCallId}/status", wrapper.GetToolCallStatus)
 
 	return m
@@ -1497,60 +2023,107 @@ func HandlerWithOptions(si ServerInterface, options StdHTTPServerOptions) http.H
 // Base64 encoded, gzipped, json marshaled Swagger object
 var swaggerSpec = []string{
 
-	"H4sIAAAAAAAC/+RcW2/cNvb/KgT//0fVk3SDPvitdYqtF00a2Om+FMGAHh2P2WhIhaTsGAN/9wVvEiVR",
-	"EjWekb3Yl8S2eDnnd+6HlPZ4w3clZ8CUxOd7LDd3sCPmx5+lAsFpfnFHlP49B7kRtFSUM3yOP98BEuQB",
-	"3fz0DgHb8Bxy9K/rPz4ifouUfgbfKpAKEZYjAbLkTALKiSJIAlMrARug95CjW8F3ZsLvv384wxkuBS9B",
-	"KAqGBrfKWk/Uv99ysdPU4Bsi4ad3OMPqsQR8jqUSlG3xU4b9ZulzzKRvFRWQ4/O/2nt21/tSz+Y3f8NG",
-	"6R0boDjdgN6yzQRxz9c017/2KL6ljMq7tQAiNbR7DKzaaUqk4iXOcAFsq+5whm8rttHwrzekKDQfnBfm",
-	"Z4kzvOFMAVPrW1ooEDhjVVF8ieBDWQ7fAzooU7AFoR/tQEqyNRz8v4BbfI7/b9Wox8rpxsrz+8EN7wIY",
-	"8uv3axbv8juG6IeGoDakjtkonBsBREG+tlpbSz8nCn5QdAcxpfG6Mk/HHUvIEi4RZYgqibigW8pIgfTe",
-	"mt9ppbWaUQ+sKgNdX7d5AS0FeZQK9BaV1CLHREoqFWEqUBanJ+apRRXH1CLQpfM9pgp2MlUPPnNeXGiN",
-	"fKrXJUKQx+b38XWclD/roT1j1BzXyj2qLDUZfQMU22rnPVxbxD/7R1p4RrZOCBGINDpDNnyI0iUKnZEd",
-	"RPc0IktapAOqHeJmu8GBwsRAvrgjlP36HTaVBa5nkPr5OpGjE4KluQrkdCAufoWs4atF9TRC14ooGIBp",
-	"yh6uqxLEPZVcmDUNYoYMCPEfW6EjracMS7emjh4uwKUb+nUz+crOtez17L2Dp+V2YPM+U4Oouk37cMoa",
-	"qTXNo9YtyKP21s1AdPleIsWRlSYyNEj0QE2ArdGY1rMu3zHK1aUlqqcDKtlSTErhmUsSls1C9M4J4lFe",
-	"y+tt4kLwS0aYcTOjHsoFyKHHdcyZxaD382ksevJaxHS3jjH9HjZGY8N4S8pS8HswWaEZl2EFYkeZtoYM",
-	"73hObx9xhkFuSKH/Fou0vwrBxZXLKvuI5qAItVG4NxX01MiTDtd2WIyp36obbboylqRKumWQrwXcU3iw",
-	"f8tzqi2JFJ9aY/uZY2+j7nLrDa9a+Vow+aaSj+tNQX2E7o/QWlCASltuwxmDjR48uuatABgfUQLLKdum",
-	"7GmHrHOqJXJT++iDAeyqcY+lDH+roArElelqQbT+0OKwA3NfQjjOxTD4QwANCj+mkC73u0pObGMWFSaQ",
-	"wSIKvhtqqpxy7dx3tvww/68rUUTX+iS4oa3v6V4gwxOVDpiyKtRakW3bRU6HpFCDzBatHCaz6U53i5iQ",
-	"rowYP5HHgpO8H2UvOFMmipKiMHURZZZlyhliALpsuuUCEXRX7QhDVitA6DC8I18BERRkCCj3jjeL5pjS",
-	"Z1bpCVCdrbgQIOOlnn+qSwHTwqhYmBPMKon7lZAGmubxnS/f122TSu9NpQMJUamhC4vIISWKJFnz87ow",
-	"hZ5f/nV0LkZR1pJisFkNUCClqC5WbFHbtLYRNTjNQzWdPNtRGlgivz6jLnGzJwuRq2qyUJuTTUYNqavc",
-	"s6E4lo4F+uM4q4kZwKauzJL4b4EZYfy6ZtxHHRcUw8CpzZfQwvzgY6OWKN0Br+IhLWKacVHW5VNqSZE4",
-	"rOSS2mXZuq5a+3lLouAbbhodaBVv842iPT1GcEwBhkrZHriN3Sd7UDPhOJg804knOeIRM+mzdRSXmwcl",
-	"1RhLdek1x00TyZn+Jeqp+wCsl2goDezbycOChKdhY0Isjd85ViQ82LbHlPfwcOc2n4x2TbMsUtMqW8e0",
-	"iq5m6obncLwThDCp25+g2ZvQSG+wiPbSXQ0QUtrRRNcJNsBkIXzjyF/4+PCMnnDjzuf3JblIa0Va2wt3",
-	"GufLF5T9hF1PavcVz9CFKa2b2WgHhEmk7ogyqX1Y41CJcs4A2XIcSZqDOSk140Dcg9BDdiCgeHTlFORn",
-	"6A91ByJsZmo6JCIC0B1heQG5m60XzBCcbc/Qb7rmilPlC7IHWhS+4AjPbu8pMb/7LAz9eXmGszrTscSv",
-	"G3Jwhs2C7T8xHv4eS3Y+E/n1WBHmtFZY2u7A4W4tWCCLFOUxfdS57/F825EQoltmuk1tMlKbExMtj0PQ",
-	"ravHqJcLyHTYDCHtO8s9wMOO8dRxXJ/Ubn/PHMTf8r53+bc2Xs7QW98RqI3v50+XpmhQhV6p8+d7Ow2f",
-	"4/u3Z2/O3miCeAmMlBSf43+cvTl7q7WPqDvDzMo9O3skO6NcWzBWphk2fZvLHJ/jf4L6owRmd/D3IMz8",
-	"H9+86ZPuxiLrng3bstrtiHi0axl2OoN0XbuVWoB6ly96zqpsWnBDZLkunRygK7geQMqyoBszefW3u1/h",
-	"9k4NM74l2I8xXXvCv1OptOBKT18fBFIUzeOGfb/JF1t7Rdi+MG7Cj8v8PZVfeP44i+e2Wi/Xe5zuNLYn",
-	"KlHB0zPlO+VDegJ08KJbXrFcc/bjm7fL7OiigN7z3Uwux5S3fdoU2f8XkvuA39FWq3CIIAYPXmWjGhsY",
-	"7WrvfrjMnxIM+Ln2m2S2g5hbrN8th7WXNeO1hvX9wyjU2ocLsgMFOk/+a4914m38ug9957iWAO6aUzZD",
-	"Ub8MSHUlWxXXkICvgyx7CSc9WgsM+umwFoi7atniwwsk2G1RmYzHhusw7T40PKSCnOKsT+w6g6rmlXvP",
-	"VkEUVaIha1NEfpUJnvSzGbeEpZlqbYaNWQ5epastCkudO57sO17D6yuycEPPsVK/qVJwIDWMZXeH5XIn",
-	"dg8arMYxDBunsqB2ZD5okJwXSQZpxi1ikJwXswzSUDZgDvrZsDnonRZPQkTFVntRsYmU8qpip0wn9fIR",
-	"UM2fF/ZtVxWbSCHt1QUvNk1jmtQMykeV2Ko5SFtk+wyXVUQ//ixzouCq8udZx/Khg9cDng73iH1h211e",
-	"YZJjYbUKZy7R6h89wm316+pFc7o0YtDX/hToZGbtj6/iVibrw61XZeDmmMCQpv35i5r7lL0FEjxBPRII",
-	"b8q03sVNy8FYGXrzuHqnwN1Vb+W69iPK/d+fIbSBmJEdHEfxRhJlB+/R/PzJjltOc46ScvKbciZy/I7s",
-	"tJpGEnnOi8M7sgfvmFI6WMoGbSH0CmuaP6027mXaJBOxB1ons5GP8GDe7T2Nb269PrywIvl3byKS/QgP",
-	"SAsBudt5lLPXkVe9ohSjpeJdsPzlAPPiNmEIvlOpKNtORsVa/5sXKUaCoxbhhXuf4Fl60r3XFFGJancD",
-	"Qsc9wyswJSjYEOevgXfw0XSZZ2x46rOysmdbfg94f6l6tTcvZE9V0h/8Hewl0pPJ2/Nx9a3vib/G9Lx+",
-	"meDFdSGLLuxfyx9et2c4Rqmkf31sSHnqV8xO6N/rPSLC+a26QZbIpd35JbsnBR0qlbVi3NW0BacA5nfr",
-	"KiM3KFd72bvg226rTJ3ANZd4T1lG9y9C9wGqS9fgJpxrbVgraT8YQpFEFogcq5hXipOMLIbwEud0bcmc",
-	"7riuI5RXcmoXSH8i056lL0OKMNu+zLuQZfPSW5KdhS/KnbIZ3dooFqLsbU5Hfp3LRA1s4eh53adhMpqK",
-	"PjvzpP8ybmCmzk23ROOvr5y4Q9p/USXVtVvh+ibqpCNvDX+9kuSiESAXE6dSnTsZJ5YRF+P3JEaFMHw5",
-	"YQ7mGpEjYP1AtlsQP1R0FFw76j3fyKQbqm48+vNywM8EA2I3UxWRX1d7/e+E1Otz+lN1yswdjPiRd1TG",
-	"8TPuFLlabp8v0RZ2ujadwu+qYsuUn+4IN7U5LjRd8d64fuSCUwfw9IrvGHhP9sbx0kmfLpkT+qmiYmP4",
-	"GT3ivFjt9b9TNuj7/y/QrV48qTIN6/E7Ae4rcAec1liwj+ACQtGtOm98jYmx86rZ0jdK689wpbqI4KtS",
-	"OqxQMe+iqTcBzosMUWaXCz5Md2iIPoYcJ+6nDQnrsOI2/RMF4fcrekI6bsF78EfCeupi8Rn3i64FX6tT",
-	"XE3GbpXWLy5Z07MvOE16zgv3UY5Tec/Ilx0GTuHclyWXd6d65wSfivzXWAPHajhKN0ork+M42L6oV0Z/",
-	"VnvzX9vzdgqZ1cD3BxbjIt6rdoSfYOXjFS0zOn6+U3Hylp9voL62np+t8/8XT10/Tp24xhoi7W4XFzol",
-	"IC4p4GzAC/WbnwPOof6e1lQ0uHafbDrlDdvgWztjTtnSPHwvDuw9reW88xxvPN3lCxF/qduPQewdi3v9",
-	"bt1LhT9Npf32gdlq3lvVlSjwOV6Rkq7u3+KnL0//CQAA//+5tfBfGF8AAA==",
+	"H4sIAAAAAAAC/+1dWZPbOJL+KwjtRvhhZcme8cxDv3WXvdu10e72Vtm7G9F2qFEiSuKYh5ogq1zj8H/f",
+	"zMRBkAR46HI51i92SQJxZH55IDMBfp6t83SXZyIr5eyHzzO53oqU058/ylIUeRxdbHmJnyMh10W8K+M8",
+	"m/0we7sVrOD37ObvL5jI1nkkIvaf17/9yvJbVuJv4s9KyJLxLIK/JQwhBYt4yZmEsZaFWIv4Dp65LfKU",
+	"Hvjll9eL2Xy2K/KdKMpY0Bx0Lyt8ED/f5kWKs5ndcCn+/gLalw87AZ9lWcTZZvZlPjODjX+GHvqzigsR",
+	"zX74vTlmu78P9un85h9iXeKINaHyeC1wyOYiuP59FUf4sTPj2ziL5XZVCC6RtJ9nIqtSnIks8x3MIBHZ",
+	"ptzCH7dVtkbyr9Y8SXAdeZ7Q3xI+rPOsBMqubuMEhpvNsypJPnjoE2eR+OTMI4bHNvAA/JQKKfmGVvCv",
+	"hbiFH/9lWcNjqbGxNOt9rZu3Ceiu14xXd95ebx9FX9cTapJUL9ZLzjV0XIpopVBruQ/sE0/LOBU+0Bis",
+	"TMO4XhJTE5cszlgM/+VFvIkznjAcG9c7DFqFDNuwqoh0XWzniWgA5AEIhUNUElkOlJexLDkQpgaLxgn9",
+	"qqg688HCwRIMEEO3ciwO3sKjF4jIL7ZfXhT8of7c34/m8lts2hFGXLEFdy9Yrvh9WFWdTDU5EKynZHr1",
+	"/OhXNo6e6V2jJXVXyRSbKjVavLn+H81PCFAihAaaBwaIgJCe2kewRgI746nwjkmwHNVJi7CqiX5aN3aE",
+	"wkfkn3i53l4C8q+ErJIAkPKqBAgLxBLAmKGg4N+c3eDTHZREouSxkqnO2kRR5IX3F7Xg5uCXL3Gce0A4",
+	"YZIG1hxxdUyIwlbtN3t9k8sY/zSyQd0CTPBvs6KuoQAdU1YepP389u0bpn6se7vPqyRiW34n4J+IcQnE",
+	"kjCrxEqif4wKyHgXS7R39Xh9euS6fuJaPdABhbZFur8gCGoAtGUevx+vIduI6ijIjjZQ/fsmdsGhU1yX",
+	"h+7vlBlSkNScBItwJ4onKPRPU5HmxQNbYxeyg9E13/F1XD50+32dg5qEFRXQkm0FsPFGANIEDZCA/S4Z",
+	"asusTB4YmKCIxZKJu3itMNnlKf0GXcuGPEMD1yo67bdxuSoA4d2Z/XvB1wa3SZ5/rHYAq0zei8JV3LRg",
+	"VzqivLpJHEUFdvTGDjV2VmkspRjbOKjZZPxPz7p+pQnhqlyye3puIYeG0Z3Oa47qddk5uyxwyOvF25bH",
+	"2atPYl2pqXVcMPx9NVK/n9B0oI53rNaeVsL0MK/X1Zj1MIVQNEWATGM1V15Qn0QxmoZw6d/XQ4tbLf2p",
+	"9ex4xeWo0iv1rFrekAJTqw0M3l1UkKpXtXPVJKe0lAIWeX0dmBaKT92QXb4Ea5RrY8loDpLdx7SlstQY",
+	"xll73b6Zl5dqUh0MlKMlhTaRZnGjmKX2nTjyCPaUBuV2GD8TTJeexegnvVpNb4lCP9tdxqQFGq933BLN",
+	"9BqTaQ/tW/RLsSbEujssvoPV3wnyz6kdPCeKFLZ3JX6Z5lF8i2oWQMiTpiqtV/0KHb0rZ09wuI/YWrVq",
+	"5lvUz9WNdRraYQkZbzJQbwXYBHGvvosicgd58qbRtmvXOgO1u1ut86qxQ3cevqnkw2qdxGa/0m2BKEhE",
+	"Oa472B1mAp2O/j4jzd+VcguGpKr2tzBGUwjR3/tOZBGwZsx8VZNVFCM3b6x+P4D49xye9A3e1I5X6mft",
+	"yj2Qj7Stbhg0jhNwy9UCwU2XzLgQuFfEdumwD9Jlw3wGarxyIIauN/iP7hcNyrag0UXVzE+9MGBCjAkC",
+	"NkRMn3DpyMXV6LCMTzu44Q+nk1J8ollWUZyjoUpV8Iz+X1VF4u3rDSi5wB7hJS85BqCYZhM6zztoDo47",
+	"9DjHfVkhdnkBJERoRLr5Uv6ZdHYMcZQIPzLBvFcy8FvKP63wSWBvLkU01ts2T6GfOP3RJL4V+z0JCwZV",
+	"YYkVEMVxrRBSIaGsXX6cJ+6OQWhgt4bP4GYG5I8zlBKHc+6eJrwKGjWqwMVHrZd6QPE2L3lC4zK5Q9HX",
+	"2N9/1JZO8BLSQzWLnLkCV4NknpV00RRAih8FPmEGpbsGUcyL/0KdFTCaqJ66ZPyfvPgoCsl2qgskIGeO",
+	"D9wb6BjYfnu6UcEVUq1smyeRNNtydG9wHkguYmGR56l30EjswP/tjHjtG8xgQoeFaFz/9j5T6n6kkN2C",
+	"1zNJIgkFPhj/kmcbjOgSkLlhAwiPh3hGrlqrGREiSAXPwnN4Db+qCfQOL/cf3/Y7kmTOXmlMGL7ehKpI",
+	"PEidgrVPpbXEvD1U/ayy6DODuEZswuLFXZvFRYvgTQj0CnDAApJcSxMf25nW8ImXDNyJHUbroIGPa3MK",
+	"rcH37sZSL7WpIWhJ4/c2Pq0ztMfRQwRoQH92t21fIXhfVLj7x5DmquSbJk2G99ee8JaziLmK3bSH8NFE",
+	"eb1v+EOSc09g/SLPSgoJgPJUUetMLRn5nwkRWSO8rVKOkMDuAAllzlL+UbRUvdlldMOsFPyQJkw0Pppj",
+	"Qy96Pyv9mQnzq9EsQBo3wDEpo9tN5CGhfWkJHFmlJvSY8H8sNZEwHgykG5Of8ESMpgep3Hjg9OxlQKe5",
+	"M5o3uOgMZgnkcMmLxSo7q2wWNpPRpfi4pIrOpEDfXH48IMiqnx6MqgKFKG3iyb5U2Xi9arrB7Iv2Hy7V",
+	"c8+fPXuGAfHMfB5KyuCwfTOlIbqRSCUMJu44p4gjCQmCBqS0BHctYxo9zZVSi8lLRSQPalLV9dByggmw",
+	"anTIf/81jE2WGYEbXlLPcvZD1Pgp9k+MWOaBDi7JiVkr8wO9OShy/BAd0m62j8sOrHipIiaNsFI9KdXN",
+	"hLCzE6j3WAysl/EqnsZifdnvTUYxouZ0x3oOQX/E71K4k5m7FNILGOJeCFomjSR9mXzrhCKfn8guL+fG",
+	"iOdFJCj+9sAwt8k28Z3IDshbnKLUoq6yMG6aXXuAekNpxYkg7HpK7UVPtnXHciIcB0GvrLf6AGhj84hj",
+	"lVIj69deOPWGxT+BeIat+Bqxn6Qkw+gkOe7dWrGnEXvcHnSWPJncYWAboUsm9YJ8nXsW4OPXtcWVCdvq",
+	"aLMbkXa3tCbojIOCZ5dX/pjwNUbJgyyjKo7REtLIY7TxsdMGqHeLaoPKWpKELTQbl0xuYnBULtXj2/tV",
+	"hU0mj/VLRjbb6cKoFWgym8Pvq4SaWJk0b6ayp2vd5uO+CX8YRdeQs314ycCx/G8zkwnrCbnkvnigcq4c",
+	"Ewymlys7zHL8k5wxr58+rQZmL7iOxeFEMDXz4XvafG/RzLFw6S0+8OzJO5UEgyvfH4qh4cetKFAhVG/R",
+	"R4uX2XwcQfscGG8ZFTPpcXi6yzpKdCRySjn6lmRLPqZEVPDYAn7wBlW8CDl9IVtg3FbI1IlN1ssYxZag",
+	"lZhWEOtF8SGmIVwv20X9EeNuezsCffK3f3BNDz4YW6tTPJ5yoIHgQGg3f4h4qkqcVVkmKynWeebbLV+J",
+	"SopWxAO2zLowi2GSkyqzbOC9ZbR1AUssWcqzB6bHmdPXWLFVUCu7I5ewRVAP15EW/Mqer5izLC8ZJaYx",
+	"Kers4nXcgtWUXLB3mRQllkrfCZW1tbOkpcOotwt2qR/EKekSnHqtMOD9Nl5v2Q6zwdBFXLD8Ht0XxD49",
+	"I+6wXkCjaEHVvlmc4n7kuT/3OxB/OfTMxh7JxjHBmYYq07k3gmUjbtOP+wvjQh3gyDm8maz48mJcDW3b",
+	"lxpal6ke6iZn8KFmQeyCXRDI6qcZbnalSoS6koY4BcGJMPdpgBlHgk5O1WcMsEkqCpE86NSZiBbsN/i9",
+	"kywFsS3wFEgWJZgdp6exwzkTi82C/Yz5Nf+sTPLtPgaJ1skl9yzXXczpswnIsHeXC8owq125mvyqng5W",
+	"v2OHza+y3P3s25i/5fLjsVyU00rhTmWC9zcqTgdzTwLWh0cTzj6OZTkShU4UTu5PiapEqLEkVFu3iRGb",
+	"gHs0PPg3KfwFQ6KBWcBTsVQLRTIit7wQtkYT8wjqlJlmypzJ3Bi5DZgjaIcnTzER63ZeP0A1nXWGFiTq",
+	"Ni7o+I6dlrJOZhrG6mACPHsCIwj7OE4ELCmFoms7uxjO8oYSOAeE4t3S8A7w2lvcvpB3d6rtg5tU3Xib",
+	"d/n936jEQFM+Nz6EVUI/vrmkQF+J5ZKz1td36jH44e754tnimakm5LsYvvsrfPUcpZCXW1rMUv+2eOAp",
+	"CdlGkLbBBVOM8hLWMfsPUf4G7dQI5kgpPf+XZ8+6U9dtmTJTtGxZpSkvHlRftJxWI8zlYjHH7zMc5QM+",
+	"s9zVZSehaenKFDp+xgvgeEmlRb93/b2yKjJToqMOVvPbUmgnbl0VoJvnrOQfAX32pNf/Pv1VfCqfXtCv",
+	"bCt4pEsqqRuwF3kl2U6X0OIwVGNpsPfDTHU7cwF6yxMp5vpGBC9EOiVg/BO6XSyzFZ12BWUOooYLW7Af",
+	"wYKpmaUk6up7EMD7rcAD5GhO8zQuQYYXgdkmcRqX/ZNN1VycPVXQI/zywQ8V55A9eNtJvCZ+Lv+hbymo",
+	"xxpb6GSEtuP+uN1/eppF3SFG9fylbTRmv4Byc/mAZp+wQdNtgMZTGKTApFGUQVNCEJaCJbiRKBXHOCN2",
+	"kJZXOhHdoxTrMS37C5hoDLy/RheKTsCWBaYECrXL8K0feR/G3peuqOJex1mnEVJDnQ8qmOgRzgsy6qbd",
+	"3ARcf8qjh0kwaCrf81WFDdeANR8si0p8ORDyQ5aug0RNXrDKVRbhyv7y7Pl5RjSHxKHBi4mr7JO65qEm",
+	"z/g/8cjWPTfRqgAHQpCBF7+zuOsi1jEty8/6j8voywgzMzuQv3vqG0fJvXj24ny0NrzG0IRGWFc/9JK6",
+	"Y5XJ7qD3UZsdy4FZW5zmE4D6IcDVpWxEp0IMvnb2xOewW70796DBcXfuflUtG+swDHFGOytP+m3DtbtJ",
+	"3tc8jCXyGGV9YtXpxCAeufZshC+8IApJGxZkyhGa9C21G++0U7/frseupv/dXadA1/F9ddVtWG+WGm3n",
+	"9NIVy0/goj9GJwDPONB6G+EhR3kQhx6R7aH5HGtTMhRSnFA6ut8u48SGC4lVm6yw2SgVUVs8D5oKU8o9",
+	"ZCqo3QRTQYXw366poOl/NxXBcwcHmgrqtsdUaLSd1VQQy88VzVGjBRU10ufsG7eiypaf4Z+BbfhVlZ1y",
+	"C47de6BBX5/Z6sKYA9tudRDPsA3nOI5rROWjcmxZ15qdZXhYZeXBx7sdZkaBELoG6FjWPXjY7cv+trrL",
+	"bF148fg2hoqsCnBaE+nJduDXxkVdvdQj0NemyuhkYm2vbfRKmbTFU49KwKkQQt15SSnaryjuQ/LmcPAE",
+	"MRyHeUOi9cIvWpqMFc038sN7DLnb8C51XUIPuL/7rt991+++62l816aITvBbj6MSe4ILWvCP5oGcrNTp",
+	"cR+JPX5+dR/hokKqvfOre484JtyiZhaUBdderWIwWGt9kf0oEVFFVEeRkW4hG86ELiq4EXQ9PlMvMbDv",
+	"Q+CStek6xyI0LHnj9+q6eS7fZ26juyxamJcRLHCAf1OPqYqzmJTSNi4iJlO60Ip0GCyH79StK0AVKRbs",
+	"VUw1pmpy7zPkW6HuXSJVdqE4//QVzhRLtTf/jHeL95m6fqyjCn4V6vUBp3GOGi9TadsXPz2md27egHBm",
+	"eTT33noEBIiqEaQOw1Lh+2PYOH3dPQSM/vyv5xv9guq685wlvFC3+7x4/rfzDf8uk9VO3yzZFso+rdkG",
+	"jj2wib41CL34BN4UCvbQFsCq1PoKxp6dAFLrQt87eJDMdDzarnhYf5zWaq5811eu0rpa9MF5KQ8w/OhB",
+	"W9CDjUmH8OY+pOVnev3CUNjwtbk+6Rzu/+DFV35Rtlc8PcZYhL0H7KtjYe7t2LyEI9xvdyuIoJLmOoQQ",
+	"eOxV1ye0dXYMD3PgNybNFQdnNW2X2R1P4lBcEIGxtXNzykTos1KV9NvS3onokLl1izDe4ti5QvGJ1LeR",
+	"4nsrOPhwrXM/5MBt83uW5KCug7diqhdodfwzlWB0r3Y8bXGfO5I/za4vjtTM7hB712rRR3K6DztI7gv/",
+	"Xc3q3SZ4apFOYtXX9wIBif7gCO/oAIm9rmNuD21tgdD41g975BF+xYu+1b0i2AUY2Kw0v5qLoH1sca4p",
+	"OWlU2I7iq9XCX2u5+9sRt32DcveWYpE4fpQD6VAzqzu0g9CQzmwDsOgeDF5+lp7rEdxszlCxZH3e+pR8",
+	"6h7u7pLMRswbSsAeZfVfm+zLqnU78FTA0UtGRpk7H4XPUVLZ5MzpKitbTHkkBZYO9wfCKJPwEgLCZPmi",
+	"Nw3s6ptjR8mZe9vsKXPgjYF8zqI6Jqunb3cVXgE7sx/ruWd80K8tusuZxv2vowYmYm44E+u/WObEiVnP",
+	"q/VGqnbFXFm/kK9fkTeafxOcVAdPvQFUpb3MzRM+txe27nm2Ngfg68scHAcafWr6zl5JBUR+n9mDtzoP",
+	"qtJ4r9D7M1SMJaN9AepVfI5eTnuvUkKALmm/UAq1vlz0faYzrJhJGnx944KhH6R2IIAbfYCZ3vPCaMIC",
+	"c0yZVG/sC0dgu8CW5zCKzi1oZw6cunfTBrxLbera+yoHQ62rQjFG//gOK3ix38XGVMMtHXXpd7Z69KU4",
+	"H7psdPxRYauuohiJLS4/qnsFHhHAmhU4alPrQ9sEaNkrrfxK/Yp2eFqpm+t82ppcaez6SqLb+u1armrP",
+	"Gor7fabFfW/FzXr09vvsLIpbUe9Mm5lvUm0rln1zWpsYu6/Szova4c2LgeLh1nHDE/u0edF/BLDXaQ2f",
+	"u5vioyJFjuCb3vPNRhRPq7iXuKrVy3wtR10Rotuzd5cBzes08F0NgkdNlp/x3wGu24M+pyobCRw90993",
+	"eew/JDOGr2q1h3O0QTvMqg3R76rKphQx0r1C32wNI83+ewmjPvRw5ArGwAkLU8BYKKCds36R2H2u8kUa",
+	"TIWYWmpgfAb1GFpgsHxxdu7QLaagR5S84RmEHvp5tZscV/J2ero6qvQUbqx9xdEJQvFjxg37rrhow92B",
+	"d5DU3qo/F32jVmgDy56DqnnjgshQ/FfDirZbLbGsNz5xYSrysyjwOpWw2+pAEvoASMK/Q86KqRr+CjWu",
+	"Z4/WU5lr/xm3UtFjjxpvRewj+Eou65atO1r72Ni6HHbQf/oNDVZRO1H67Utk2fDNd1Wm7nQceZEjApY2",
+	"iagx8ZZGs7c3/dIoachj8ZTpdFyWEdrwnPfoqDt4J1ymoynhyPqk63WMwgCekCJQcXRNlAN2b8dA7oAd",
+	"2gOeV1UDlohBe83oHpB8IpmbaUDsb3J4sMirzbaDf14S/sdjdQ+C7WuRj/BSs+Ob633f4+Ut8o1r4332",
+	"YNLrWL33WvGY0WtUWkVp57Za+rpaW5pj7pEvlW31+Bi66tgqG78S6btpyV45q0yRupp20JO40K8QPZU3",
+	"4XlNWeAsC/34NdwLuqp/2Mcw7+FxHQ1a0XiVrXhyHIejy+ol4Wf5mf5reiKtCOgy8AqWs63CX56rJ36C",
+	"no8X7ZxQWmVKQs6T6HuExVWqFOD/46GbX/s3lPzwt4GF8x4B5WDf/j1kDa71C6ZPeYOK8+LIPqWs5hzO",
+	"ugpdf3I27TxFG9ME4V9geRqssr6mF1E8peON4g7JxNQTzhtZVIU6ejiEAt8b31U6dV0VBbRXJTQCY87U",
+	"r8Q45WYLduyeP1AFd6YjZX9Qwz/UyNh+V8kt+OcqhUzF3Y3x3CyxTtaa0r76Mn5VCKS6XIPPiGeDOHOZ",
+	"jtFTPJ2pZq3W+x4wEtUZAaFfEqC6ud/msk4wS/aHfcHlHwt2kadYZc6S2OaRiQgw6ziPYpzTA8bqPwqx",
+	"U7uGurIdL7b3JZevaU4TJaIUn8olTfhpzfWe8G+3nJwYD5Bu8EXO1Y4IafmAKGgS8xH6THohISll+P6i",
+	"hIINLpYNT+Wjk+JKjtWbX+uOGseD7vNeu8WNX8uJxVmqd/B44ghDb7WoigRaLfkuXt49n0Fv/wcH7e3G",
+	"S6IAAA==",
 }
 
 // GetSwagger returns the content of the embedded swagger specification file
@@ -1,11 +1,17 @@
 package asteroid
 
 import (
+	"compress/gzip"
 	"context"
 	"encoding/json"
+	"errors"
 	"fmt"
+	"io"
+	"log"
+	"mime"
 	"net/http"
 	"slices"
+	"strings"
 	"time"
 
 	"github.com/google/uuid"
@@ -112,16 +118,18 @@ func apiGetTaskHandler(w http.ResponseWriter, r *http.Request, taskId uuid.UUID,
 	respondJSON(w, task, http.StatusOK)
 }
 
-func apiGetProjectTasksHandler(w http.ResponseWriter, r *http.Request, projectId uuid.UUID, store Store) {
+func apiGetProjectTasksHandler(w http.ResponseWriter, r *http.Request, projectId uuid.UUID, params GetProjectTasksParams, store Store) {
 	ctx := r.Context()
 
-	tasks, err := store.GetProjectTasks(ctx, projectId)
+	page, err := pageFromParams(params.Cursor, params.Limit)
 	if err != nil {
-		sendErrorResponse(w, http.StatusInternalServerError, "Error getting project tasks", err.Error())
+		sendErrorResponse(w, http.StatusBadRequest, "Invalid page", err.Error())
 		return
 	}
 
-	respondJSON(w, tasks, http.StatusOK)
+	respondList(w, r, page, "Error getting project tasks", taskCursor, func(page Page, each func(Task) error) error {
+		return store.GetProjectTasks(ctx, projectId, page, each)
+	})
 }
 
 func apiCreateRunHandler(w http.ResponseWriter, r *http.Request, taskId uuid.UUID, store Store) {
@@ -142,6 +150,79 @@ func apiCreateRunHandler(w http.ResponseWriter, r *http.Request, taskId uuid.UUI
 	respondJSON(w, runID, http.StatusCreated)
 }
 
+// Largest number of runs accepted by CreateTaskRuns
+const MAX_RUN_BATCH_SIZE = 1000
+
+// apiCreateTaskRunsHandler creates the runs of an evaluation at once, with their tools and supervisor
+// chains, instead of a round trip per run, tool and chain. The task and the supervisors are checked once
+// for the whole batch.
+func apiCreateTaskRunsHandler(w http.ResponseWriter, r *http.Request, taskId uuid.UUID, store Store) {
+	ctx := r.Context()
+
+	var batch RunBatch
+	err := json.NewDecoder(r.Body).Decode(&batch)
+	if err != nil {
+		sendErrorResponse(w, http.StatusBadRequest, "Invalid JSON format", err.Error())
+		return
+	}
+
+	if len(batch.Runs) == 0 || len(batch.Runs) > MAX_RUN_BATCH_SIZE {
+		sendErrorResponse(w, http.StatusBadRequest, fmt.Sprintf("A batch must have between 1 and %d runs", MAX_RUN_BATCH_SIZE), "")
+		return
+	}
+
+	task, err := store.GetTask(ctx, taskId)
+	if err != nil {
+		sendErrorResponse(w, http.StatusInternalServerError, "Error getting task", err.Error())
+		return
+	}
+
+	if task == nil {
+		sendErrorResponse(w, http.StatusNotFound, "Task not found", "")
+		return
+	}
+
+	// Every run of a sweep usually has the same chains, so each supervisor is only looked up once
+	supervisors := make(map[uuid.UUID]bool)
+	for _, run := range batch.Runs {
+		for _, tool := range run.Tools {
+			if tool.Chains == nil {
+				continue
+			}
+			for _, chain := range *tool.Chains {
+				if chain.SupervisorIds == nil || len(*chain.SupervisorIds) == 0 {
+					sendErrorResponse(w, http.StatusBadRequest, fmt.Sprintf("Chain of tool %s has no supervisors", tool.Name), "")
+					return
+				}
+				for _, supervisorId := range *chain.SupervisorIds {
+					supervisors[supervisorId] = true
+				}
+			}
+		}
+	}
+
+	for supervisorId := range supervisors {
+		supervisor, err := store.GetSupervisor(ctx, supervisorId)
+		if err != nil {
+			sendErrorResponse(w, http.StatusInternalServerError, "error getting supervisor", err.Error())
+			return
+		}
+
+		if supervisor == nil {
+			sendErrorResponse(w, http.StatusNotFound, fmt.Sprintf("Supervisor %s not found", supervisorId), "")
+			return
+		}
+	}
+
+	runs, err := store.CreateRuns(ctx, taskId, batch.Runs)
+	if err != nil {
+		sendErrorResponse(w, http.StatusInternalServerError, "Error creating runs", err.Error())
+		return
+	}
+
+	respondJSON(w, RunBatchResult{Runs: runs}, http.StatusCreated)
+}
+
 func apiGetRunHandler(w http.ResponseWriter, r *http.Request, runId uuid.UUID, store Store) {
 	ctx := r.Context()
 
@@ -159,16 +240,18 @@ func apiGetRunHandler(w http.ResponseWriter, r *http.Request, runId uuid.UUID, s
 	respondJSON(w, run, http.StatusOK)
 }
 
-func apiGetTaskRunsHandler(w http.ResponseWriter, r *http.Request, taskId uuid.UUID, store Store) {
+func apiGetTaskRunsHandler(w http.ResponseWriter, r *http.Request, taskId uuid.UUID, params GetTaskRunsParams, store Store) {
 	ctx := r.Context()
 
-	runs, err := store.GetTaskRuns(ctx, taskId)
+	page, err := pageFromParams(params.Cursor, params.Limit)
 	if err != nil {
-		sendErrorResponse(w, http.StatusInternalServerError, "Error getting task runs", err.Error())
+		sendErrorResponse(w, http.StatusBadRequest, "Invalid page", err.Error())
 		return
 	}
 
-	respondJSON(w, runs, http.StatusOK)
+	respondList(w, r, page, "Error getting task runs", runCursor, func(page Page, each func(Run) error) error {
+		return store.GetTaskRuns(ctx, taskId, page, each)
+	})
 }
 
 func apiCreateRunToolHandler(w http.ResponseWriter, r *http.Request, runId uuid.UUID, store Store) {
@@ -199,26 +282,7 @@ func apiCreateRunToolHandler(w http.ResponseWriter, r *http.Request, runId uuid.
 		return
 	}
 
-	// TODO revive this logic so that we can share tools across runs, requires schema changes
-	// var existingTool *Tool
-	// if t.Attributes != nil && t.Name != "" && t.Description != "" && t.IgnoredAttributes != nil {
-	// 	found, err := store.GetToolFromValues(ctx, t.Attributes, t.Name, t.Description, t.IgnoredAttributes)
-	// 	if err != nil {
-	// 		sendErrorResponse(w, http.StatusInternalServerError, "error trying to locate an existing tool", err.Error())
-	// 		return
-	// 	}
-	// 	if found != nil {
-	// 		existingTool = found
-	// 	}
-	// }
-
-	// if existingTool != nil {
-	// 	w.WriteHeader(http.StatusOK)
-	// 	id := existingTool.Id.String()
-	// 	respondJSON(w, id)
-	// 	return
-	// }
-
+	// Runs of the same project share the definition of an identical tool
 	tool, err := store.CreateTool(ctx, runId, t.Attributes, t.Name, t.Description, t.IgnoredAttributes, t.Code)
 	if err != nil {
 		sendErrorResponse(w, http.StatusInternalServerError, "error creating tool", err.Error())
@@ -245,7 +309,7 @@ func apiGetSupervisorHandler(w http.ResponseWriter, r *http.Request, id uuid.UUI
 	respondJSON(w, supervisor, http.StatusOK)
 }
 
-func apiCreateToolSupervisorChainsHandler(w http.ResponseWriter, r *http.Request, toolId uuid.UUID, store SupervisorStore) {
+func apiCreateToolSupervisorChainsHandler(w http.ResponseWriter, r *http.Request, toolId uuid.UUID, params CreateToolSupervisorChainsParams, store SupervisorStore) {
 	ctx := r.Context()
 
 	var request []ChainRequest
@@ -256,14 +320,14 @@ func apiCreateToolSupervisorChainsHandler(w http.ResponseWriter, r *http.Request
 	}
 
 	// TODO do we want to return the chains here?
-	chainIds := make([]uuid.UUID, 0)
-	for _, chain := range request {
-		chainId, err := store.CreateSupervisorChain(ctx, toolId, chain)
-		if err != nil {
-			sendErrorResponse(w, http.StatusInternalServerError, "error creating supervisor chain", err.Error())
-			return
-		}
-		chainIds = append(chainIds, *chainId)
+	chainIds, err := store.CreateSupervisorChains(ctx, toolId, params.RunId, request)
+	if errors.Is(err, ErrRunToolNotFound) {
+		sendErrorResponse(w, http.StatusNotFound, "Run does not use tool", err.Error())
+		return
+	}
+	if err != nil {
+		sendErrorResponse(w, http.StatusInternalServerError, "error creating supervisor chain", err.Error())
+		return
 	}
 
 	respondJSON(w, chainIds, http.StatusCreated)
@@ -278,6 +342,11 @@ func apiCreateSupervisorHandler(w http.ResponseWriter, r *http.Request, _ uuid.U
 		return
 	}
 
+	if request.DecisionCacheTtlSeconds != nil && *request.DecisionCacheTtlSeconds < 1 {
+		sendErrorResponse(w, http.StatusBadRequest, "decision_cache_ttl_seconds must be at least 1", "")
+		return
+	}
+
 	// Create new supervisor
 	supervisorId, err := store.CreateSupervisor(ctx, request)
 	if err != nil {
@@ -288,7 +357,7 @@ func apiCreateSupervisorHandler(w http.ResponseWriter, r *http.Request, _ uuid.U
 	respondJSON(w, supervisorId, http.StatusCreated)
 }
 
-func apiGetToolSupervisorChainsHandler(w http.ResponseWriter, r *http.Request, toolId uuid.UUID, store Store) {
+func apiGetToolSupervisorChainsHandler(w http.ResponseWriter, r *http.Request, toolId uuid.UUID, params GetToolSupervisorChainsParams, store Store) {
 	ctx := r.Context()
 
 	// First check if tool exists
@@ -303,7 +372,7 @@ func apiGetToolSupervisorChainsHandler(w http.ResponseWriter, r *http.Request, t
 		return
 	}
 
-	chains, err := store.GetSupervisorChains(ctx, toolId)
+	chains, err := store.GetSupervisorChains(ctx, toolId, params.RunId)
 	if err != nil {
 		sendErrorResponse(w, http.StatusInternalServerError, "error getting tool supervisor chains", err.Error())
 		return
@@ -312,9 +381,15 @@ func apiGetToolSupervisorChainsHandler(w http.ResponseWriter, r *http.Request, t
 	respondJSON(w, chains, http.StatusOK)
 }
 
-func apiGetRunToolsHandler(w http.ResponseWriter, r *http.Request, id uuid.UUID, store Store) {
+func apiGetRunToolsHandler(w http.ResponseWriter, r *http.Request, id uuid.UUID, params GetRunToolsParams, store Store) {
 	ctx := r.Context()
 
+	page, err := pageFromParams(params.Cursor, params.Limit)
+	if err != nil {
+		sendErrorResponse(w, http.StatusBadRequest, "Invalid page", err.Error())
+		return
+	}
+
 	// First check if run exists
 	run, err := store.GetRun(ctx, id)
 	if err != nil {
@@ -327,13 +402,9 @@ func apiGetRunToolsHandler(w http.ResponseWriter, r *http.Request, id uuid.UUID,
 		return
 	}
 
-	tools, err := store.GetRunTools(ctx, id)
-	if err != nil {
-		sendErrorResponse(w, http.StatusInternalServerError, "error getting run tools", err.Error())
-		return
-	}
-
-	respondJSON(w, tools, http.StatusOK)
+	respondList(w, r, page, "error getting run tools", toolCursor, func(page Page, each func(Tool) error) error {
+		return store.GetRunTools(ctx, id, page, each)
+	})
 }
 
 // func apiCreateToolRequestGroupHandler(w http.ResponseWriter, r *http.Request, toolId uuid.UUID, store ToolRequestStore) {
@@ -475,16 +546,18 @@ func apiGetSupervisorsHandler(w http.ResponseWriter, r *http.Request, projectId
 	respondJSON(w, supervisors, http.StatusOK)
 }
 
-func apiGetProjectToolsHandler(w http.ResponseWriter, r *http.Request, id uuid.UUID, store ToolStore) {
+func apiGetProjectToolsHandler(w http.ResponseWriter, r *http.Request, id uuid.UUID, params GetProjectToolsParams, store ToolStore) {
 	ctx := r.Context()
 
-	tools, err := store.GetProjectTools(ctx, id)
+	page, err := pageFromParams(params.Cursor, params.Limit)
 	if err != nil {
-		sendErrorResponse(w, http.StatusInternalServerError, "error getting project tools", err.Error())
+		sendErrorResponse(w, http.StatusBadRequest, "Invalid page", err.Error())
 		return
 	}
 
-	respondJSON(w, tools, http.StatusOK)
+	respondList(w, r, page, "error getting project tools", toolCursor, func(page Page, each func(Tool) error) error {
+		return store.GetProjectTools(ctx, id, page, each)
+	})
 }
 
 func apiGetToolHandler(w http.ResponseWriter, r *http.Request, id uuid.UUID, store ToolStore) {
@@ -527,6 +600,8 @@ func apiCreateSupervisionRequestHandler(
 	chainId uuid.UUID,
 	supervisorId uuid.UUID,
 	store Store,
+	processor *Processor,
+	decisions *DecisionCache,
 ) {
 	ctx := r.Context()
 
@@ -538,38 +613,84 @@ func apiCreateSupervisionRequestHandler(
 		return
 	}
 
+	supervisor, toolCall, requestErr := prepareSupervisionRequest(ctx, store, &request, toolCallId, chainId, supervisorId)
+	if requestErr != nil {
+		requestErr.send(w)
+		return
+	}
+
+	// Store the supervision in the database
+	reviewID, err := store.CreateSupervisionRequest(ctx, request, chainId, toolCallId)
+	if err != nil {
+		sendErrorResponse(w, http.StatusInternalServerError, "error creating supervision request", err.Error())
+		return
+	}
+
+	request.Id = reviewID
+	dispatchSupervisionRequest(ctx, request, *supervisor, *toolCall, processor, decisions)
+
+	respondJSON(w, reviewID, http.StatusCreated)
+}
+
+// Largest number of items accepted by the batch supervision endpoints
+const MAX_SUPERVISION_BATCH_SIZE = 1000
+
+// supervisionError is why a supervision request or result can't be created, as the status and message it
+// is answered with, either as a whole response or as one item of a batch
+type supervisionError struct {
+	status  int
+	message string
+	details string
+}
+
+func (e *supervisionError) send(w http.ResponseWriter) {
+	sendErrorResponse(w, e.status, e.message, e.details)
+}
+
+func (e *supervisionError) itemResult(index int) BatchItemResult {
+	result := BatchItemResult{Index: index, Status: e.status, Error: &e.message}
+	if e.details != "" {
+		result.Details = &e.details
+	}
+	return result
+}
+
+// prepareSupervisionRequest checks that the tool call, chain and supervisor of a supervision request
+// exist and belong together, and fills in the request's chain execution
+func prepareSupervisionRequest(
+	ctx context.Context,
+	store Store,
+	request *SupervisionRequest,
+	toolCallId uuid.UUID,
+	chainId uuid.UUID,
+	supervisorId uuid.UUID,
+) (*Supervisor, *AsteroidToolCall, *supervisionError) {
 	// Check that the request, chain and supervisor exist
 	toolCall, err := store.GetToolCall(ctx, toolCallId)
 	if err != nil {
-		sendErrorResponse(w, http.StatusInternalServerError, "error getting tool call", err.Error())
-		return
+		return nil, nil, &supervisionError{http.StatusInternalServerError, "error getting tool call", err.Error()}
 	}
 
 	if toolCall == nil {
-		sendErrorResponse(w, http.StatusNotFound, "Request group not found", "")
-		return
+		return nil, nil, &supervisionError{http.StatusNotFound, "Request group not found", ""}
 	}
 
 	chain, err := store.GetSupervisorChain(ctx, chainId)
 	if err != nil {
-		sendErrorResponse(w, http.StatusInternalServerError, "error getting supervisor chain", err.Error())
-		return
+		return nil, nil, &supervisionError{http.StatusInternalServerError, "error getting supervisor chain", err.Error()}
 	}
 
 	if chain == nil {
-		sendErrorResponse(w, http.StatusNotFound, "Supervisor chain not found", "")
-		return
+		return nil, nil, &supervisionError{http.StatusNotFound, "Supervisor chain not found", ""}
 	}
 
 	supervisor, err := store.GetSupervisor(ctx, supervisorId)
 	if err != nil {
-		sendErrorResponse(w, http.StatusInternalServerError, "error getting supervisor", err.Error())
-		return
+		return nil, nil, &supervisionError{http.StatusInternalServerError, "error getting supervisor", err.Error()}
 	}
 
 	if supervisor == nil {
-		sendErrorResponse(w, http.StatusNotFound, "Supervisor not found", "")
-		return
+		return nil, nil, &supervisionError{http.StatusNotFound, "Supervisor not found", ""}
 	}
 
 	// Check that the supervisor is associated with the tool/request/chain
@@ -584,51 +705,178 @@ func apiCreateSupervisionRequestHandler(
 	}
 
 	if !found {
-		sendErrorResponse(w, http.StatusBadRequest, fmt.Sprintf("Supervisor %s not associated with chain %s", supervisorId, chainId), "")
-		return
+		return nil, nil, &supervisionError{http.StatusBadRequest, fmt.Sprintf("Supervisor %s not associated with chain %s", supervisorId, chainId), ""}
 	}
 
 	if pos != request.PositionInChain {
-		sendErrorResponse(w, http.StatusBadRequest, fmt.Sprintf("Supervisor %s is not in the correct position in chain %s", supervisorId, chainId), "")
-		return
+		return nil, nil, &supervisionError{http.StatusBadRequest, fmt.Sprintf("Supervisor %s is not in the correct position in chain %s", supervisorId, chainId), ""}
 	}
 
 	// Check that the chainexecution entry exists
 	foundExecutionId, err := store.GetChainExecutionFromChainAndToolCall(ctx, chainId, toolCallId)
 	if err != nil {
-		sendErrorResponse(w, http.StatusInternalServerError, "error getting execution from chain ID", err.Error())
-		return
+		return nil, nil, &supervisionError{http.StatusInternalServerError, "error getting execution from chain ID", err.Error()}
 	}
 
 	if foundExecutionId == nil {
-		sendErrorResponse(w, http.StatusNotFound, fmt.Sprintf("chain execution not found for chain %s, tool call %s, and supervisor %s", chainId, toolCallId, supervisorId), "")
+		return nil, nil, &supervisionError{
+			http.StatusNotFound,
+			fmt.Sprintf("chain execution not found for chain %s, tool call %s, and supervisor %s", chainId, toolCallId, supervisorId),
+			"",
+		}
+	}
+
+	if request.ChainexecutionId != nil && *request.ChainexecutionId != *foundExecutionId {
+		return nil, nil, &supervisionError{
+			http.StatusInternalServerError,
+			fmt.Sprintf("chain execution ID mismatch for chain %s, tool call %s, and supervisor %s", chainId, toolCallId, supervisorId),
+			"",
+		}
+	}
+
+	request.ChainexecutionId = foundExecutionId
+
+	return supervisor, toolCall, nil
+}
+
+// dispatchSupervisionRequest answers a stored supervision request from the decision cache if it can, or
+// else hands it to the processor
+func dispatchSupervisionRequest(
+	ctx context.Context,
+	request SupervisionRequest,
+	supervisor Supervisor,
+	toolCall AsteroidToolCall,
+	processor *Processor,
+	decisions *DecisionCache,
+) {
+	// The supervisor may already have decided an identical tool call
+	resolved, err := decisions.Resolve(ctx, supervisor, toolCall, *request.Id)
+	if err != nil {
+		log.Printf("Error resolving supervision request %s from the decision cache: %v", *request.Id, err)
+	}
+
+	// Dispatch the request straight away, client supervisors are handled by the client itself. When the
+	// processor is behind this waits for room in its queue, so the caller feels the backpressure.
+	if !resolved && supervisor.Type != ClientSupervisor {
+		processor.Enqueue(ctx, request, supervisor.Type)
+	}
+}
+
+// apiCreateSupervisionRequestsHandler creates the supervision requests of a whole turn at once. Each item
+// is checked as the single endpoint would; the valid ones are stored in one transaction and dispatched,
+// and the invalid ones are reported in their place in the response.
+func apiCreateSupervisionRequestsHandler(
+	w http.ResponseWriter,
+	r *http.Request,
+	store Store,
+	processor *Processor,
+	decisions *DecisionCache,
+) {
+	ctx := r.Context()
+
+	var batch SupervisionRequestBatch
+	err := json.NewDecoder(r.Body).Decode(&batch)
+	if err != nil {
+		sendErrorResponse(w, http.StatusBadRequest, "Invalid JSON format", err.Error())
 		return
 	}
 
-	if request.ChainexecutionId != nil && foundExecutionId != nil {
-		if *request.ChainexecutionId != *foundExecutionId {
-			sendErrorResponse(
-				w,
-				http.StatusInternalServerError,
-				fmt.Sprintf("chain execution ID mismatch for chain %s, tool call %s, and supervisor %s", chainId, toolCallId, supervisorId),
-				"",
-			)
+	if len(batch.Requests) == 0 || len(batch.Requests) > MAX_SUPERVISION_BATCH_SIZE {
+		sendErrorResponse(w, http.StatusBadRequest, fmt.Sprintf("A batch must have between 1 and %d requests", MAX_SUPERVISION_BATCH_SIZE), "")
+		return
+	}
+
+	type preparedRequest struct {
+		index      int
+		request    SupervisionRequest
+		supervisor *Supervisor
+		toolCall   *AsteroidToolCall
+	}
+
+	results := make([]BatchItemResult, len(batch.Requests))
+	prepared := make([]preparedRequest, 0, len(batch.Requests))
+	for i, item := range batch.Requests {
+		request := SupervisionRequest{
+			ChainexecutionId: item.ChainexecutionId,
+			PositionInChain:  item.PositionInChain,
+			SupervisorId:     item.SupervisorId,
+		}
+
+		supervisor, toolCall, requestErr := prepareSupervisionRequest(ctx, store, &request, item.ToolCallId, item.ChainId, item.SupervisorId)
+		if requestErr != nil {
+			results[i] = requestErr.itemResult(i)
+			continue
+		}
+		prepared = append(prepared, preparedRequest{index: i, request: request, supervisor: supervisor, toolCall: toolCall})
+	}
+
+	if len(prepared) > 0 {
+		requests := make([]SupervisionRequest, len(prepared))
+		for i, p := range prepared {
+			requests[i] = p.request
+		}
+
+		ids, err := store.CreateSupervisionRequests(ctx, requests)
+		if err != nil {
+			sendErrorResponse(w, http.StatusInternalServerError, "error creating supervision requests", err.Error())
 			return
 		}
+
+		for i, p := range prepared {
+			id := ids[i]
+			p.request.Id = &id
+			results[p.index] = BatchItemResult{Index: p.index, Status: http.StatusCreated, Id: &id}
+		}
+
+		for _, p := range prepared {
+			dispatchSupervisionRequest(ctx, p.request, *p.supervisor, *p.toolCall, processor, decisions)
+		}
+	}
+
+	respondJSON(w, BatchResult{Results: results}, http.StatusOK)
+}
+
+func apiGetSupervisionRequestStatusesHandler(w http.ResponseWriter, r *http.Request, store Store) {
+	ctx := r.Context()
+
+	var batch SupervisionRequestIds
+	err := json.NewDecoder(r.Body).Decode(&batch)
+	if err != nil {
+		sendErrorResponse(w, http.StatusBadRequest, "Invalid JSON format", err.Error())
+		return
 	}
 
-	if foundExecutionId != nil && request.ChainexecutionId == nil {
-		request.ChainexecutionId = foundExecutionId
+	ids := batch.SupervisionRequestIds
+	if len(ids) == 0 || len(ids) > MAX_SUPERVISION_BATCH_SIZE {
+		sendErrorResponse(w, http.StatusBadRequest, fmt.Sprintf("A batch must have between 1 and %d supervision request IDs", MAX_SUPERVISION_BATCH_SIZE), "")
+		return
 	}
 
-	// Store the supervision in the database
-	reviewID, err := store.CreateSupervisionRequest(ctx, request, chainId, toolCallId)
+	statuses, err := store.GetSupervisionRequestStatuses(ctx, ids)
 	if err != nil {
-		sendErrorResponse(w, http.StatusInternalServerError, "error creating supervision request", err.Error())
+		sendErrorResponse(w, http.StatusInternalServerError, "error getting supervision request statuses", err.Error())
 		return
 	}
 
-	respondJSON(w, reviewID, http.StatusCreated)
+	byRequest := make(map[uuid.UUID]SupervisionStatus, len(statuses))
+	for _, status := range statuses {
+		if status.SupervisionRequestId != nil {
+			byRequest[*status.SupervisionRequestId] = status
+		}
+	}
+
+	results := make([]BatchItemResult, len(ids))
+	for i, id := range ids {
+		status, ok := byRequest[id]
+		if !ok {
+			notFound := fmt.Sprintf("Supervision request %s not found", id)
+			results[i] = BatchItemResult{Index: i, Status: http.StatusNotFound, Id: &ids[i], Error: &notFound}
+			continue
+		}
+		results[i] = BatchItemResult{Index: i, Status: http.StatusOK, Id: &ids[i], SupervisionStatus: &status}
+	}
+
+	respondJSON(w, BatchResult{Results: results}, http.StatusOK)
 }
 
 func apiCreateSupervisionResultHandler(
@@ -636,6 +884,8 @@ func apiCreateSupervisionResultHandler(
 	r *http.Request,
 	supervisionRequestId uuid.UUID,
 	store Store,
+	subscriptions *ToolCallSubscriptions,
+	decisions *DecisionCache,
 ) {
 	ctx := r.Context()
 
@@ -646,22 +896,9 @@ func apiCreateSupervisionResultHandler(
 		return
 	}
 
-	if result.Decision == Modify || result.Decision == Approve {
-		if result.ToolcallId == nil {
-			sendErrorResponse(w, http.StatusBadRequest, "Chosen tool call ID is required if you wish to modify or approve a given tool call", "")
-			return
-		}
-
-		toolCall, err := store.GetToolCall(ctx, *result.ToolcallId)
-		if err != nil {
-			sendErrorResponse(w, http.StatusInternalServerError, "error getting tool call", err.Error())
-			return
-		}
-
-		if toolCall == nil {
-			sendErrorResponse(w, http.StatusNotFound, fmt.Sprintf("Tool call %s not found", *result.ToolcallId), "")
-			return
-		}
+	if resultErr := checkSupervisionResult(ctx, store, result); resultErr != nil {
+		resultErr.send(w)
+		return
 	}
 
 	// Check that the group, chain and supervisor, and request exist
@@ -670,10 +907,120 @@ func apiCreateSupervisionResultHandler(
 		sendErrorResponse(w, http.StatusInternalServerError, "error creating supervision result", err.Error())
 		return
 	}
+	decisions.Record(ctx, supervisionRequestId, result)
+
+	// Push the new state to any client waiting on this tool call
+	go subscriptions.NotifySupervisionResult(context.Background(), supervisionRequestId)
 
 	respondJSON(w, id, http.StatusCreated)
 }
 
+// checkSupervisionResult checks that a result that approves or modifies a tool call names one that exists
+func checkSupervisionResult(ctx context.Context, store Store, result SupervisionResult) *supervisionError {
+	if result.Decision != Modify && result.Decision != Approve {
+		return nil
+	}
+
+	if result.ToolcallId == nil {
+		return &supervisionError{http.StatusBadRequest, "Chosen tool call ID is required if you wish to modify or approve a given tool call", ""}
+	}
+
+	toolCall, err := store.GetToolCall(ctx, *result.ToolcallId)
+	if err != nil {
+		return &supervisionError{http.StatusInternalServerError, "error getting tool call", err.Error()}
+	}
+
+	if toolCall == nil {
+		return &supervisionError{http.StatusNotFound, fmt.Sprintf("Tool call %s not found", *result.ToolcallId), ""}
+	}
+
+	return nil
+}
+
+// apiCreateSupervisionResultsHandler records the decisions on many supervision requests at once, each
+// against the request its supervision_request_id names. Each item is checked as the single endpoint
+// would; the valid ones are stored in one transaction, and the invalid ones are reported in their place
+// in the response.
+func apiCreateSupervisionResultsHandler(
+	w http.ResponseWriter,
+	r *http.Request,
+	store Store,
+	subscriptions *ToolCallSubscriptions,
+	decisions *DecisionCache,
+) {
+	ctx := r.Context()
+
+	var batch SupervisionResultBatch
+	err := json.NewDecoder(r.Body).Decode(&batch)
+	if err != nil {
+		sendErrorResponse(w, http.StatusBadRequest, "Invalid JSON format", err.Error())
+		return
+	}
+
+	if len(batch.Results) == 0 || len(batch.Results) > MAX_SUPERVISION_BATCH_SIZE {
+		sendErrorResponse(w, http.StatusBadRequest, fmt.Sprintf("A batch must have between 1 and %d results", MAX_SUPERVISION_BATCH_SIZE), "")
+		return
+	}
+
+	// Look up all the requests at once to check they exist
+	requestIds := make([]uuid.UUID, len(batch.Results))
+	for i, result := range batch.Results {
+		requestIds[i] = result.SupervisionRequestId
+	}
+
+	statuses, err := store.GetSupervisionRequestStatuses(ctx, requestIds)
+	if err != nil {
+		sendErrorResponse(w, http.StatusInternalServerError, "error getting supervision request statuses", err.Error())
+		return
+	}
+
+	existing := make(map[uuid.UUID]bool, len(statuses))
+	for _, status := range statuses {
+		if status.SupervisionRequestId != nil {
+			existing[*status.SupervisionRequestId] = true
+		}
+	}
+
+	results := make([]BatchItemResult, len(batch.Results))
+	indexes := make([]int, 0, len(batch.Results))
+	valid := make([]SupervisionResult, 0, len(batch.Results))
+	for i, result := range batch.Results {
+		if !existing[result.SupervisionRequestId] {
+			notFound := fmt.Sprintf("Supervision request %s not found", result.SupervisionRequestId)
+			results[i] = BatchItemResult{Index: i, Status: http.StatusNotFound, Error: &notFound}
+			continue
+		}
+
+		if resultErr := checkSupervisionResult(ctx, store, result); resultErr != nil {
+			results[i] = resultErr.itemResult(i)
+			continue
+		}
+
+		indexes = append(indexes, i)
+		valid = append(valid, result)
+	}
+
+	if len(valid) > 0 {
+		ids, err := store.CreateSupervisionResults(ctx, valid)
+		if err != nil {
+			sendErrorResponse(w, http.StatusInternalServerError, "error creating supervision results", err.Error())
+			return
+		}
+
+		for i, result := range valid {
+			id := ids[i]
+			results[indexes[i]] = BatchItemResult{Index: indexes[i], Status: http.StatusCreated, Id: &id}
+
+			decisions.Record(ctx, result.SupervisionRequestId, result)
+
+			// Push the new state to any client waiting on this tool call
+			go subscriptions.NotifySupervisionResult(context.Background(), result.SupervisionRequestId)
+		}
+	}
+
+	respondJSON(w, BatchResult{Results: results}, http.StatusOK)
+}
+
 func apiGetHubStatsHandler(w http.ResponseWriter, _ *http.Request, hub *Hub) {
 	stats, err := hub.getStats()
 	if err != nil {
@@ -684,17 +1031,33 @@ func apiGetHubStatsHandler(w http.ResponseWriter, _ *http.Request, hub *Hub) {
 	respondJSON(w, stats, http.StatusOK)
 }
 
-// apiGetProjectsHandler returns all projects
-func apiGetProjectsHandler(w http.ResponseWriter, r *http.Request, store ProjectStore) {
+func apiGetProcessorStatsHandler(w http.ResponseWriter, _ *http.Request, processor *Processor) {
+	respondJSON(w, processor.Stats(), http.StatusOK)
+}
+
+func apiGetStoreStatsHandler(w http.ResponseWriter, _ *http.Request, store Store) {
+	statsStore, ok := store.(StatsStore)
+	if !ok {
+		sendErrorResponse(w, http.StatusNotImplemented, "store does not report stats", "")
+		return
+	}
+
+	respondJSON(w, statsStore.Stats(), http.StatusOK)
+}
+
+// apiGetProjectsHandler returns all projects, or a page of them
+func apiGetProjectsHandler(w http.ResponseWriter, r *http.Request, params GetProjectsParams, store ProjectStore) {
 	ctx := r.Context()
 
-	projects, err := store.GetProjects(ctx)
+	page, err := pageFromParams(params.Cursor, params.Limit)
 	if err != nil {
-		sendErrorResponse(w, http.StatusInternalServerError, "error getting projects", err.Error())
+		sendErrorResponse(w, http.StatusBadRequest, "Invalid page", err.Error())
 		return
 	}
 
-	respondJSON(w, projects, http.StatusOK)
+	respondList(w, r, page, "error getting projects", projectCursor, func(page Page, each func(Project) error) error {
+		return store.GetProjects(ctx, page, each)
+	})
 }
 
 func apiGetProjectHandler(w http.ResponseWriter, r *http.Request, id uuid.UUID, store ProjectStore) {
@@ -759,20 +1122,20 @@ func apiGetSupervisionReviewPayloadHandler(w http.ResponseWriter, r *http.Reques
 		return
 	}
 
-	// Get the tool to find the run ID
-	tool, err := store.GetTool(ctx, toolCall.ToolId)
+	// The run is found from the chat that made the tool call, as the tool may be shared by several runs
+	runId, err := store.GetToolCallRunId(ctx, *toolCallId)
 	if err != nil {
-		sendErrorResponse(w, http.StatusInternalServerError, "error getting tool", err.Error())
+		sendErrorResponse(w, http.StatusInternalServerError, "error getting run of tool call", err.Error())
 		return
 	}
 
-	if tool == nil {
-		sendErrorResponse(w, http.StatusInternalServerError, "can't find run ID from tool", "")
+	if runId == nil {
+		sendErrorResponse(w, http.StatusInternalServerError, "can't find run ID from tool call", "")
 		return
 	}
 
 	// Get the latest chat
-	requestData, responseData, err := store.GetChat(ctx, tool.RunId, 0)
+	requestData, responseData, err := store.GetChat(ctx, *runId, 0)
 	if err != nil {
 		sendErrorResponse(w, http.StatusInternalServerError, "error getting messages for run", err.Error())
 		return
@@ -780,7 +1143,7 @@ func apiGetSupervisionReviewPayloadHandler(w http.ResponseWriter, r *http.Reques
 
 	converter := OpenAIConverter{store}
 
-	asteroidMsgs, err := converter.ToAsteroidMessages(ctx, requestData, responseData, tool.RunId)
+	asteroidMsgs, err := converter.ToAsteroidMessages(ctx, requestData, responseData, *runId)
 	if err != nil {
 		sendErrorResponse(w, http.StatusInternalServerError, "error converting messages", err.Error())
 		return
@@ -791,7 +1154,7 @@ func apiGetSupervisionReviewPayloadHandler(w http.ResponseWriter, r *http.Reques
 		SupervisionRequest: *supervisionRequest,
 		ChainState:         *chainState,
 		Toolcall:           *toolCall,
-		RunId:              tool.RunId,
+		RunId:              *runId,
 		Messages:           asteroidMsgs,
 	}
 
@@ -841,31 +1204,30 @@ func determineChainStatus(requests []SupervisionRequestState, totalSupervisors i
 }
 
 func getToolCallStatus(ctx context.Context, toolCallId uuid.UUID, store Store) (Status, error) {
-	chainExecutions, err := store.GetChainExecutionsFromToolCall(ctx, toolCallId)
+	states, err := store.GetToolCallChainExecutionStates(ctx, toolCallId)
 	if err != nil {
-		return Pending, fmt.Errorf("error getting chain executions: %w", err)
+		return Pending, fmt.Errorf("error getting chain states: %w", err)
 	}
 
-	// Track status for each chain execution
-	executionStatuses := make([]Status, 0, len(chainExecutions))
+	return toolCallStatusFromStates(states), nil
+}
 
-	for _, execution := range chainExecutions {
-		state, err := store.GetChainExecutionState(ctx, execution)
-		if err != nil {
-			return Pending, fmt.Errorf("error getting chain state: %w", err)
-		}
+// toolCallStatusFromStates computes the status of a tool call from the states of its chain executions
+func toolCallStatusFromStates(states []ChainExecutionState) Status {
+	// Track status for each chain execution
+	executionStatuses := make([]Status, 0, len(states))
 
+	for _, state := range states {
 		status := determineChainStatus(state.SupervisionRequests, len(state.Chain.Supervisors))
 		executionStatuses = append(executionStatuses, status)
 	}
 
 	// Request group is complete only if all chains are complete
-	status := Pending
 	if allChainsComplete(executionStatuses) {
-		status = Completed
+		return Completed
 	}
 
-	return status, nil
+	return Pending
 }
 
 func apiGetToolCallStatusHandler(w http.ResponseWriter, r *http.Request, toolCallId uuid.UUID, store Store) {
@@ -1005,31 +1367,73 @@ func apiGetToolCallHandler(w http.ResponseWriter, r *http.Request, id uuid.UUID,
 	respondJSON(w, toolCall, http.StatusOK)
 }
 
+// Media type of a chat sent as raw JSON rather than base64 encoded
+const RAW_CHAT_CONTENT_TYPE = "application/vnd.asteroid.chat+json"
+
+// Largest chat, once decompressed, that CreateNewChat accepts
+const MAX_CHAT_SIZE = 64 << 20
+
 func apiCreateNewChatHandler(w http.ResponseWriter, r *http.Request, runId uuid.UUID, store Store) {
 	ctx := r.Context()
 
-	var payload AsteroidChat
-	if err := json.NewDecoder(r.Body).Decode(&payload); err != nil {
-		sendErrorResponse(w, http.StatusBadRequest, "Invalid JSON format", err.Error())
+	body, err := decodedBody(w, r, MAX_CHAT_SIZE)
+	if errors.Is(err, errUnsupportedEncoding) {
+		sendErrorResponse(w, http.StatusUnsupportedMediaType, "Unsupported Content-Encoding", err.Error())
+		return
+	}
+	if err != nil {
+		sendErrorResponse(w, http.StatusBadRequest, "Invalid request body", err.Error())
 		return
 	}
+	defer body.Close()
 
 	converter := OpenAIConverter{store}
 
-	jsonRequest, err := converter.ValidateB64EncodedRequest(payload.RequestData)
+	// The chat is parsed once here, then stored and converted from the parsed form
+	var chat *OpenAIChat
+	if mediaType, _, _ := mime.ParseMediaType(r.Header.Get("Content-Type")); mediaType == RAW_CHAT_CONTENT_TYPE {
+		chat, err = converter.DecodeRawChat(body)
+		if err != nil {
+			sendChatBodyError(w, err)
+			return
+		}
+	} else {
+		var payload AsteroidChat
+		if err := json.NewDecoder(body).Decode(&payload); err != nil {
+			sendChatBodyError(w, err)
+			return
+		}
+
+		chatRequest, err := converter.DecodeB64EncodedRequest(payload.RequestData)
+		if err != nil {
+			sendErrorResponse(w, http.StatusBadRequest, fmt.Sprintf("Request: %s", err.Error()), "")
+			return
+		}
+
+		chatResponse, err := converter.DecodeB64EncodedResponse(payload.ResponseData)
+		if err != nil {
+			sendErrorResponse(w, http.StatusBadRequest, fmt.Sprintf("Response: %s", err.Error()), "")
+			return
+		}
+
+		chat = &OpenAIChat{Request: *chatRequest, Response: *chatResponse}
+	}
+
+	// Store the chat as parsed, so that it is stored the same way whichever format it was sent in
+	jsonRequest, err := json.Marshal(chat.Request)
 	if err != nil {
-		sendErrorResponse(w, http.StatusBadRequest, fmt.Sprintf("Request: %s", err.Error()), "")
+		sendErrorResponse(w, http.StatusInternalServerError, "error marshalling request", err.Error())
 		return
 	}
 
-	jsonResponse, err := converter.ValidateB64EncodedResponse(payload.ResponseData)
+	jsonResponse, err := json.Marshal(chat.Response)
 	if err != nil {
-		sendErrorResponse(w, http.StatusBadRequest, fmt.Sprintf("Response: %s", err.Error()), "")
+		sendErrorResponse(w, http.StatusInternalServerError, "error marshalling response", err.Error())
 		return
 	}
 
 	// Parse out the choices into AsteroidChoice objects
-	asteroidChoices, err := converter.ToAsteroidChoices(ctx, jsonResponse, runId)
+	asteroidChoices, err := converter.ConvertChoices(ctx, chat.Response.Choices, runId)
 	if err != nil {
 		sendErrorResponse(w, http.StatusBadRequest, fmt.Sprintf("Error converting choices: %s", err.Error()), "")
 		return
@@ -1055,6 +1459,36 @@ func apiCreateNewChatHandler(w http.ResponseWriter, r *http.Request, runId uuid.
 	respondJSON(w, chatIds, http.StatusOK)
 }
 
+// errUnsupportedEncoding is returned by decodedBody for a Content-Encoding it can't decompress
+var errUnsupportedEncoding = errors.New("unsupported Content-Encoding")
+
+// decodedBody returns the request body decompressed according to its Content-Encoding, limited to
+// limit bytes once decompressed
+func decodedBody(w http.ResponseWriter, r *http.Request, limit int64) (io.ReadCloser, error) {
+	switch encoding := strings.ToLower(strings.TrimSpace(r.Header.Get("Content-Encoding"))); encoding {
+	case "", "identity":
+		return http.MaxBytesReader(w, r.Body, limit), nil
+	case "gzip":
+		reader, err := gzip.NewReader(r.Body)
+		if err != nil {
+			return nil, fmt.Errorf("invalid gzip stream: %w", err)
+		}
+		return http.MaxBytesReader(w, reader, limit), nil
+	default:
+		return nil, fmt.Errorf("%w %q, use gzip or none", errUnsupportedEncoding, encoding)
+	}
+}
+
+// sendChatBodyError reports a chat body that couldn't be read or parsed
+func sendChatBodyError(w http.ResponseWriter, err error) {
+	var tooLarge *http.MaxBytesError
+	if errors.As(err, &tooLarge) {
+		sendErrorResponse(w, http.StatusRequestEntityTooLarge, "Chat too large", err.Error())
+		return
+	}
+	sendErrorResponse(w, http.StatusBadRequest, "Invalid JSON format", err.Error())
+}
+
 func extractChatIds(chatId uuid.UUID, choices []AsteroidChoice) ChatIds {
 	result := ChatIds{
 		ChatId:    chatId,
@@ -1138,47 +1572,26 @@ func apiGetToolCallStateHandler(w http.ResponseWriter, r *http.Request, toolCall
 		return
 	}
 
-	execution := RunExecution{
-		Chains:   make([]ChainExecutionState, 0),
-		Toolcall: *toolCall,
-	}
-
-	// Get all chains for this tool
-	chains, err := store.GetSupervisorChains(ctx, toolCall.ToolId)
+	execution, err := getRunExecution(ctx, *toolCall, store)
 	if err != nil {
-		sendErrorResponse(w, http.StatusInternalServerError, "error getting chains", err.Error())
+		sendErrorResponse(w, http.StatusInternalServerError, "error getting tool call state", err.Error())
 		return
 	}
 
-	for _, chain := range chains {
-		// Get the chain execution from the chain ID + tool call ID
-		chainExecutionId, err := store.GetChainExecutionFromChainAndToolCall(ctx, chain.ChainId, toolCall.Id)
-		if err != nil {
-			sendErrorResponse(w, http.StatusInternalServerError, "error getting chain execution", err.Error())
-			return
-		}
-
-		if chainExecutionId == nil {
-			sendErrorResponse(w, http.StatusNotFound, fmt.Sprintf("Chain execution not found for tool call %s and chain %s", toolCall.Id, chain.ChainId), "")
-			return
-		}
-
-		ceState, err := store.GetChainExecutionState(ctx, *chainExecutionId)
-		if err != nil {
-			sendErrorResponse(w, http.StatusInternalServerError, "error getting chain execution state", err.Error())
-			return
-		}
-
-		execution.Chains = append(execution.Chains, *ceState)
-	}
+	respondJSON(w, execution, http.StatusOK)
+}
 
-	status, err := getToolCallStatus(ctx, toolCall.Id, store)
+// getRunExecution builds the state of a tool call and all of its chain executions
+func getRunExecution(ctx context.Context, toolCall AsteroidToolCall, store Store) (*RunExecution, error) {
+	// Load the state of every chain execution of the tool call at once
+	states, err := store.GetToolCallChainExecutionStates(ctx, toolCall.Id)
 	if err != nil {
-		sendErrorResponse(w, http.StatusInternalServerError, "error getting tool call status", err.Error())
-		return
+		return nil, fmt.Errorf("error getting chain execution states: %w", err)
 	}
 
-	execution.Status = status
-
-	respondJSON(w, execution, http.StatusOK)
+	return &RunExecution{
+		Chains:   states,
+		Toolcall: toolCall,
+		Status:   toolCallStatusFromStates(states),
+	}, nil
 }
@@ -2,10 +2,15 @@ package asteroid
 
 import (
 	"context"
+	"errors"
+	"time"
 
 	"github.com/google/uuid"
 )
 
+// ErrRunToolNotFound is returned by stores for a run that doesn't use the tool it was given with
+var ErrRunToolNotFound = errors.New("run does not use tool")
+
 // Store defines the interface for all storage operations
 type Store interface {
 	ProjectStore
@@ -18,15 +23,61 @@ type Store interface {
 	ChatStore
 }
 
+// StatsStore is implemented by stores that can report on their use of the database
+type StatsStore interface {
+	Stats() StoreStats
+}
+
+// LeaseStore is implemented by stores that can lease human supervision requests to one of several
+// servers, so that the servers can share one review queue without assigning a review twice. A lease
+// that isn't renewed expires, and the request can then be claimed by another server.
+type LeaseStore interface {
+	// ClaimSupervisionRequests leases up to limit human supervision requests to holder, oldest first.
+	// Requests that are pending, or assigned under an expired lease, can be claimed.
+	ClaimSupervisionRequests(ctx context.Context, holder string, limit int, ttl time.Duration) ([]SupervisionRequest, error)
+	// ClaimSupervisionRequest leases one supervision request to holder while it is pending or assigned,
+	// unless another holder has a live lease on it
+	ClaimSupervisionRequest(ctx context.Context, holder string, id uuid.UUID, ttl time.Duration) (bool, error)
+	// RenewSupervisionRequestLeases extends the leases holder still has on the requests, returning how
+	// many it had
+	RenewSupervisionRequestLeases(ctx context.Context, holder string, ids []uuid.UUID, ttl time.Duration) (int, error)
+	ReleaseSupervisionRequestLeases(ctx context.Context, holder string, ids []uuid.UUID) error
+}
+
+// wrappingStore is implemented by stores that add behaviour in front of another store
+type wrappingStore interface {
+	Unwrap() Store
+}
+
+// leaseStoreOf returns the store, or the first store it wraps, that can lease supervision requests
+func leaseStoreOf(store Store) LeaseStore {
+	for store != nil {
+		if leases, ok := store.(LeaseStore); ok {
+			return leases
+		}
+		wrapping, ok := store.(wrappingStore)
+		if !ok {
+			return nil
+		}
+		store = wrapping.Unwrap()
+	}
+	return nil
+}
+
 type SupervisionStore interface {
 	// Requests
 	CreateSupervisionRequest(ctx context.Context, request SupervisionRequest, chainId uuid.UUID, toolCallId uuid.UUID) (*uuid.UUID, error)
+	// CreateSupervisionRequests creates requests that already have their chain execution ID, all in one
+	// transaction
+	CreateSupervisionRequests(ctx context.Context, requests []SupervisionRequest) ([]uuid.UUID, error)
 	GetSupervisionRequest(ctx context.Context, id uuid.UUID) (*SupervisionRequest, error)
 	GetSupervisionRequestsForStatus(ctx context.Context, status Status) ([]SupervisionRequest, error)
 
 	// Results
 	GetSupervisionResultFromRequestID(ctx context.Context, requestId uuid.UUID) (*SupervisionResult, error)
 	CreateSupervisionResult(ctx context.Context, result SupervisionResult, requestId uuid.UUID) (*uuid.UUID, error)
+	// CreateSupervisionResults creates results for the requests they name, all in one transaction
+	CreateSupervisionResults(ctx context.Context, results []SupervisionResult) ([]uuid.UUID, error)
 
 	// Statuses
 	CreateSupervisionStatus(ctx context.Context, requestID uuid.UUID, status SupervisionStatus) error
@@ -39,25 +90,28 @@ type SupervisionStore interface {
 
 	GetChainExecutionSupervisionRequests(ctx context.Context, chainExecutionId uuid.UUID) ([]SupervisionRequest, error)
 	GetSupervisionRequestStatus(ctx context.Context, requestId uuid.UUID) (*SupervisionStatus, error)
+	GetSupervisionRequestStatuses(ctx context.Context, requestIds []uuid.UUID) ([]SupervisionStatus, error)
 
 	GetExecutionFromChainId(ctx context.Context, chainId uuid.UUID) (*uuid.UUID, error)
 	GetChainExecution(ctx context.Context, executionId uuid.UUID) (*uuid.UUID, *uuid.UUID, error)
 	GetChainExecutionFromChainAndToolCall(ctx context.Context, chainId uuid.UUID, toolCallId uuid.UUID) (*uuid.UUID, error)
 	GetChainExecutionsFromToolCall(ctx context.Context, id uuid.UUID) ([]uuid.UUID, error)
 	GetChainExecutionState(ctx context.Context, executionId uuid.UUID) (*ChainExecutionState, error)
+	GetChainExecutionStates(ctx context.Context, executionIds []uuid.UUID) ([]ChainExecutionState, error)
+	GetToolCallChainExecutionStates(ctx context.Context, toolCallId uuid.UUID) ([]ChainExecutionState, error)
 }
 
 type TaskStore interface {
 	CreateTask(ctx context.Context, task Task) (*uuid.UUID, error)
 	GetTask(ctx context.Context, id uuid.UUID) (*Task, error)
-	GetProjectTasks(ctx context.Context, projectId uuid.UUID) ([]Task, error)
+	GetProjectTasks(ctx context.Context, projectId uuid.UUID, page Page, each func(Task) error) error
 }
 
 type ProjectStore interface {
 	CreateProject(ctx context.Context, project Project) error
 	GetProject(ctx context.Context, id uuid.UUID) (*Project, error)
 	GetProjectFromName(ctx context.Context, name string) (*Project, error)
-	GetProjects(ctx context.Context) ([]Project, error)
+	GetProjects(ctx context.Context, page Page, each func(Project) error) error
 }
 
 type ToolRequestStore interface {
@@ -67,32 +121,50 @@ type ToolRequestStore interface {
 	// CreateToolCall(ctx context.Context, toolCallId uuid.UUID, request ToolRequest) (*uuid.UUID, error)
 	GetToolCall(ctx context.Context, id uuid.UUID) (*AsteroidToolCall, error)
 	GetToolCallFromCallId(ctx context.Context, id string) (*AsteroidToolCall, error)
+	// GetToolCallRunId returns the run whose chat made a tool call. A tool's run_id doesn't say, as the
+	// runs of a project share their tool definitions.
+	GetToolCallRunId(ctx context.Context, id uuid.UUID) (*uuid.UUID, error)
 }
 
 type ToolStore interface {
 	CreateTool(ctx context.Context, runId uuid.UUID, attributes map[string]interface{}, name string, description string, ignoredAttributes []string, code string) (*Tool, error)
 	GetTool(ctx context.Context, id uuid.UUID) (*Tool, error)
 	// GetToolFromValues(ctx context.Context, attributes map[string]interface{}, name string, description string, ignoredAttributes []string) (*Tool, error)
-	GetRunTools(ctx context.Context, id uuid.UUID) ([]Tool, error)
-	GetProjectTools(ctx context.Context, id uuid.UUID) ([]Tool, error)
+	GetRunTools(ctx context.Context, id uuid.UUID, page Page, each func(Tool) error) error
+	GetProjectTools(ctx context.Context, id uuid.UUID, page Page, each func(Tool) error) error
 	GetToolFromNameAndRunId(ctx context.Context, name string, runId uuid.UUID) (*Tool, error)
 }
 
 type SupervisorStore interface {
 	CreateSupervisor(ctx context.Context, supervisor Supervisor) (uuid.UUID, error)
 	GetSupervisor(ctx context.Context, id uuid.UUID) (*Supervisor, error)
-	GetSupervisorFromValues(ctx context.Context, code string, name string, desc string, t SupervisorType, attributes map[string]interface{}) (*Supervisor, error)
+	GetSupervisorFromValues(
+		ctx context.Context,
+		code string,
+		name string,
+		desc string,
+		t SupervisorType,
+		attributes map[string]interface{},
+		decisionCacheTtlSeconds *int,
+	) (*Supervisor, error)
 	GetSupervisors(ctx context.Context, projectId uuid.UUID) ([]Supervisor, error)
-	CreateSupervisorChain(ctx context.Context, toolId uuid.UUID, chain ChainRequest) (*uuid.UUID, error)
-	GetSupervisorChains(ctx context.Context, toolId uuid.UUID) ([]SupervisorChain, error)
+	// CreateSupervisorChains adds chains to a tool for a run. Tool definitions are shared by the runs of
+	// a project, so each run has its own chains on them. It fails with ErrRunToolNotFound when the run
+	// doesn't use the tool.
+	CreateSupervisorChains(ctx context.Context, toolId uuid.UUID, runId uuid.UUID, chains []ChainRequest) ([]uuid.UUID, error)
+	// GetSupervisorChains returns the chains of a tool, only those of the run when one is given
+	GetSupervisorChains(ctx context.Context, toolId uuid.UUID, runId *uuid.UUID) ([]SupervisorChain, error)
 	GetSupervisorChain(ctx context.Context, id uuid.UUID) (*SupervisorChain, error)
 }
 
 type RunStore interface {
 	CreateRun(ctx context.Context, run Run) (uuid.UUID, error)
+	// CreateRuns creates runs of a task with their tools and the tools' supervisor chains, all in one
+	// transaction. The results are in the order of the runs, tools and chains given.
+	CreateRuns(ctx context.Context, taskId uuid.UUID, runs []RunBatchItem) ([]RunBatchItemResult, error)
 	GetRun(ctx context.Context, id uuid.UUID) (*Run, error)
 	GetRuns(ctx context.Context, taskId uuid.UUID) ([]Run, error)
-	GetTaskRuns(ctx context.Context, taskId uuid.UUID) ([]Run, error)
+	GetTaskRuns(ctx context.Context, taskId uuid.UUID, page Page, each func(Run) error) error
 	UpdateRunStatus(ctx context.Context, runId uuid.UUID, status Status) error
 	UpdateRunResult(ctx context.Context, runId uuid.UUID, result string) error
 }
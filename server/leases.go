@@ -0,0 +1,141 @@
+package asteroid
+
+import (
+	"context"
+	"fmt"
+	"log"
+	"os"
+	"time"
+
+	"github.com/google/uuid"
+)
+
+// Default time a server's lease on a human supervision request lasts without being renewed. A server
+// that goes away loses its reviews to the other servers after this long.
+const DEFAULT_REVIEW_LEASE_TTL = 30 * time.Second
+
+// Default interval at which a server with free reviewers claims pending reviews from the shared queue
+const DEFAULT_REVIEW_CLAIM_INTERVAL = 2 * time.Second
+
+// leaseHolder names this server in the leases it takes, from REPLICA_ID or else the host name and a
+// random suffix, so that a restarted server doesn't mistake the leases of its previous run for its own
+func leaseHolder() string {
+	if id := os.Getenv("REPLICA_ID"); id != "" {
+		return id
+	}
+
+	host, err := os.Hostname()
+	if err != nil {
+		host = "asteroid"
+	}
+	return fmt.Sprintf("%s-%s", host, uuid.NewString()[:8])
+}
+
+func durationFromEnv(name string, fallback time.Duration) time.Duration {
+	value := os.Getenv(name)
+	if value == "" {
+		return fallback
+	}
+
+	parsed, err := time.ParseDuration(value)
+	if err != nil || parsed <= 0 {
+		log.Printf("Invalid %s %q, using %s", name, value, fallback)
+		return fallback
+	}
+	return parsed
+}
+
+// claimReview leases a review this server has been handed before giving it to a reviewer. Reviews are
+// only claimed while the reviewers have room for them, so that a server without free reviewers leaves
+// them to one that has.
+func (h *Hub) claimReview(supervisionRequest SupervisionRequest) bool {
+	if h.Scheduler.Free() == 0 {
+		return false
+	}
+
+	claimed, err := h.Leases.ClaimSupervisionRequest(context.Background(), h.LeaseHolder, *supervisionRequest.Id, h.leaseTTL)
+	if err != nil {
+		log.Printf("Error claiming supervision request %s: %v", supervisionRequest.Id, err)
+		return false
+	}
+	return claimed
+}
+
+// claimReviews fills the reviewers' free capacity from the shared queue
+func (h *Hub) claimReviews(ctx context.Context) {
+	free := h.Scheduler.Free()
+	if free == 0 {
+		return
+	}
+
+	requests, err := h.Leases.ClaimSupervisionRequests(ctx, h.LeaseHolder, free, h.leaseTTL)
+	if err != nil {
+		log.Printf("Error claiming supervision requests: %v", err)
+		return
+	}
+
+	for _, request := range requests {
+		h.Scheduler.Submit(request)
+	}
+	if len(requests) > 0 {
+		log.Printf("Claimed %d supervision requests", len(requests))
+	}
+}
+
+// renewLeases extends the leases on every review this server holds
+func (h *Hub) renewLeases(ctx context.Context) {
+	held := h.Scheduler.Held()
+	renewed, err := h.Leases.RenewSupervisionRequestLeases(ctx, h.LeaseHolder, held, h.leaseTTL)
+	if err != nil {
+		log.Printf("Error renewing supervision request leases: %v", err)
+		return
+	}
+
+	// A lease is only lost if it expired before it was renewed, e.g. after losing the database for
+	// longer than the lease lasts, in which case another server may have the review too
+	if renewed < len(held) {
+		log.Printf("Lost the leases on %d supervision requests", len(held)-renewed)
+	}
+}
+
+// releaseReviews gives up the leases on reviews so that any server can claim them straight away
+func (h *Hub) releaseReviews(ids []uuid.UUID) {
+	if h.Leases == nil || len(ids) == 0 {
+		return
+	}
+
+	if err := h.Leases.ReleaseSupervisionRequestLeases(context.Background(), h.LeaseHolder, ids); err != nil {
+		log.Printf("Error releasing supervision request leases: %v", err)
+	}
+	h.nudgeClaims()
+}
+
+// nudgeClaims triggers a claim without waiting for the next interval
+func (h *Hub) nudgeClaims() {
+	select {
+	case h.claimNow <- struct{}{}:
+	default:
+		// A claim is already scheduled
+	}
+}
+
+// maintainLeases claims reviews while the reviewers have room and keeps the leases on held reviews alive
+func (h *Hub) maintainLeases(ctx context.Context) {
+	claimTicker := time.NewTicker(h.claimInterval)
+	defer claimTicker.Stop()
+	renewTicker := time.NewTicker(h.leaseTTL / 3)
+	defer renewTicker.Stop()
+
+	for {
+		select {
+		case <-ctx.Done():
+			return
+		case <-h.claimNow:
+			h.claimReviews(ctx)
+		case <-claimTicker.C:
+			h.claimReviews(ctx)
+		case <-renewTicker.C:
+			h.renewLeases(ctx)
+		}
+	}
+}
@@ -0,0 +1,222 @@
+package asteroid
+
+import (
+	"encoding/base64"
+	"encoding/json"
+	"errors"
+	"fmt"
+	"log"
+	"net/http"
+	"strings"
+	"time"
+
+	"github.com/google/uuid"
+)
+
+// The most rows a single page of a list endpoint can ask for
+const MAX_PAGE_LIMIT = 1000
+
+// The rows read from the store at a time when a listing is streamed as NDJSON
+const STREAM_BATCH_SIZE = 100
+
+// Page selects part of a listing. Listings are returned in a fixed order and a page starts right after
+// the row its cursor was taken from, so fetching a later page costs the same as fetching the first.
+type Page struct {
+	// After is the position of the last row of the previous page, nil to start at the beginning
+	After *Cursor
+	// Limit is the maximum number of rows, 0 for all of them
+	Limit int
+}
+
+// Cursor is the position of a row in a listing, made of the columns the listing is ordered by
+type Cursor struct {
+	CreatedAt *time.Time `json:"created_at,omitempty"`
+	Id        uuid.UUID  `json:"id"`
+}
+
+// errStopListing is returned from a row callback to end a listing early without an error
+var errStopListing = errors.New("stop listing")
+
+// Encode returns the cursor in the opaque form handed to clients
+func (c Cursor) Encode() string {
+	data, _ := json.Marshal(c)
+	return base64.RawURLEncoding.EncodeToString(data)
+}
+
+func decodeCursor(encoded string) (*Cursor, error) {
+	data, err := base64.RawURLEncoding.DecodeString(encoded)
+	if err != nil {
+		return nil, fmt.Errorf("invalid cursor: %w", err)
+	}
+
+	var cursor Cursor
+	if err := json.Unmarshal(data, &cursor); err != nil {
+		return nil, fmt.Errorf("invalid cursor: %w", err)
+	}
+
+	return &cursor, nil
+}
+
+func pageFromParams(cursor *string, limit *int) (Page, error) {
+	var page Page
+
+	if cursor != nil && *cursor != "" {
+		after, err := decodeCursor(*cursor)
+		if err != nil {
+			return page, err
+		}
+		page.After = after
+	}
+
+	if limit != nil {
+		if *limit < 1 || *limit > MAX_PAGE_LIMIT {
+			return page, fmt.Errorf("limit must be between 1 and %d", MAX_PAGE_LIMIT)
+		}
+		page.Limit = *limit
+	}
+
+	return page, nil
+}
+
+func projectCursor(project Project) Cursor {
+	return Cursor{CreatedAt: &project.CreatedAt, Id: project.Id}
+}
+
+func taskCursor(task Task) Cursor {
+	return Cursor{CreatedAt: &task.CreatedAt, Id: task.Id}
+}
+
+func runCursor(run Run) Cursor {
+	return Cursor{CreatedAt: &run.CreatedAt, Id: run.Id}
+}
+
+func toolCursor(tool Tool) Cursor {
+	return Cursor{Id: *tool.Id}
+}
+
+// wantsNDJSON reports whether the client asked for a listing as newline-delimited JSON
+func wantsNDJSON(r *http.Request) bool {
+	return strings.Contains(r.Header.Get("Accept"), "application/x-ndjson")
+}
+
+// respondList writes a page of a listing. By default the rows are returned as a JSON array. When the
+// client accepts application/x-ndjson they are written one per line, a batch at a time, without holding
+// the listing in memory. Either way, when a limit was given and more rows remain, the cursor of the
+// next page is sent in the X-Next-Cursor header (a trailer for NDJSON).
+func respondList[T any](
+	w http.ResponseWriter,
+	r *http.Request,
+	page Page,
+	errorMessage string,
+	cursor func(T) Cursor,
+	list func(page Page, each func(T) error) error,
+) {
+	if wantsNDJSON(r) {
+		streamList(w, page, errorMessage, cursor, list)
+		return
+	}
+
+	rows, more, err := listBatch(page, page.Limit, list)
+	if err != nil {
+		sendErrorResponse(w, http.StatusInternalServerError, errorMessage, err.Error())
+		return
+	}
+
+	if more {
+		w.Header().Set("X-Next-Cursor", cursor(rows[len(rows)-1]).Encode())
+	}
+	respondJSON(w, rows, http.StatusOK)
+}
+
+// listBatch reads up to limit rows of a listing into memory, all of them when limit is 0, and reports
+// whether more rows remain. The store's cursor is closed by the time it returns.
+func listBatch[T any](page Page, limit int, list func(page Page, each func(T) error) error) ([]T, bool, error) {
+	// Ask for one row more than the limit to know whether there is a next page
+	if limit > 0 {
+		page.Limit = limit + 1
+	}
+
+	rows := make([]T, 0)
+	more := false
+	err := list(page, func(row T) error {
+		if limit > 0 && len(rows) == limit {
+			more = true
+			return errStopListing
+		}
+		rows = append(rows, row)
+		return nil
+	})
+	if err != nil && !errors.Is(err, errStopListing) {
+		return nil, false, err
+	}
+
+	return rows, more, nil
+}
+
+// streamList writes a listing as NDJSON. Rows are read from the store STREAM_BATCH_SIZE at a time and
+// each batch is only written once it has been read, so a slow client never holds a database connection
+// while the response is sent.
+func streamList[T any](
+	w http.ResponseWriter,
+	page Page,
+	errorMessage string,
+	cursor func(T) Cursor,
+	list func(page Page, each func(T) error) error,
+) {
+	flusher, _ := w.(http.Flusher)
+	encoder := json.NewEncoder(w)
+
+	limit := page.Limit
+	count := 0
+	var next *Cursor
+	for {
+		batch := STREAM_BATCH_SIZE
+		if limit > 0 && limit-count < batch {
+			batch = limit - count
+		}
+
+		rows, more, err := listBatch(page, batch, list)
+		if err != nil {
+			if count == 0 {
+				sendErrorResponse(w, http.StatusInternalServerError, errorMessage, err.Error())
+				return
+			}
+			// Part of the listing has been sent, so abort the response to keep the client from taking it
+			// as complete
+			log.Printf("%s after streaming %d rows: %v", errorMessage, count, err)
+			panic(http.ErrAbortHandler)
+		}
+
+		// Headers are only written with the first batch, so a failure before then still gets an error
+		// response
+		if count == 0 {
+			w.Header().Set("Content-Type", "application/x-ndjson")
+			w.Header().Set("Trailer", "X-Next-Cursor")
+			w.WriteHeader(http.StatusOK)
+		}
+		for _, row := range rows {
+			if err := encoder.Encode(row); err != nil {
+				log.Printf("%s after streaming %d rows: %v", errorMessage, count, err)
+				panic(http.ErrAbortHandler)
+			}
+			count++
+		}
+		if flusher != nil {
+			flusher.Flush()
+		}
+
+		if !more {
+			break
+		}
+		c := cursor(rows[len(rows)-1])
+		if limit > 0 && count == limit {
+			next = &c
+			break
+		}
+		page.After = &c
+	}
+
+	if next != nil {
+		w.Header().Set("X-Next-Cursor", next.Encode())
+	}
+}
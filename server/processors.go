@@ -4,33 +4,128 @@ import (
 	"context"
 	"fmt"
 	"log"
+	"os"
+	"strconv"
+	"sync"
+	"sync/atomic"
 	"time"
 
 	"github.com/google/uuid"
 )
 
+// Default interval of the recovery sweep. New supervision requests are delivered through Enqueue as soon
+// as they are created; the sweep only picks up requests that were missed, e.g. after a restart or a
+// reviewer disconnecting with reviews still assigned.
+const DEFAULT_SWEEP_INTERVAL = 30 * time.Second
+
+// Number of supervision requests that can wait in each of the processor's queues
+const PROCESSOR_QUEUE_SIZE = 1000
+
+// Default number of workers taking supervision requests from each of the processor's queues
+const DEFAULT_PROCESSOR_WORKERS = 4
+
+// The supervisor types the processor has a queue for. Each has its own workers, so a backlog of one type
+// doesn't hold up the others.
+var processorQueueTypes = []SupervisorType{HumanSupervisor, ClientSupervisor, NoSupervisor}
+
 type Processor struct {
 	store           Store
 	humanReviewChan chan SupervisionRequest
 	interval        time.Duration
+	workers         int
+	// queues holds the supervision requests waiting for a worker, by supervisor type
+	queues map[SupervisorType]*processorQueue
+	// wake triggers an immediate sweep
+	wake chan struct{}
+
+	// queued holds the requests that are in a queue or being processed, so that a sweep doesn't queue
+	// a request a second time
+	queuedMutex sync.Mutex
+	queued      map[uuid.UUID]bool
+}
+
+// processorQueue is the queue of one supervisor type, with counters of its use
+type processorQueue struct {
+	supervisorType SupervisorType
+	requests       chan queuedRequest
+
+	busy      atomic.Int64
+	enqueued  atomic.Int64
+	processed atomic.Int64
+	failed    atomic.Int64
+	// Nanoseconds the processed requests spent in the queue, in total and at most
+	waitTotal atomic.Int64
+	waitMax   atomic.Int64
+}
+
+type queuedRequest struct {
+	request    SupervisionRequest
+	enqueuedAt time.Time
 }
 
 func NewProcessor(store Store, humanReviewChan chan SupervisionRequest) *Processor {
+	interval := DEFAULT_SWEEP_INTERVAL
+	if value := os.Getenv("SUPERVISION_SWEEP_INTERVAL"); value != "" {
+		parsed, err := time.ParseDuration(value)
+		if err != nil || parsed <= 0 {
+			log.Printf("Invalid SUPERVISION_SWEEP_INTERVAL %q, using %s", value, DEFAULT_SWEEP_INTERVAL)
+		} else {
+			interval = parsed
+		}
+	}
+
+	workers := DEFAULT_PROCESSOR_WORKERS
+	if value := os.Getenv("PROCESSOR_WORKERS"); value != "" {
+		parsed, err := strconv.Atoi(value)
+		if err != nil || parsed <= 0 {
+			log.Printf("Invalid PROCESSOR_WORKERS %q, using %d", value, DEFAULT_PROCESSOR_WORKERS)
+		} else {
+			workers = parsed
+		}
+	}
+
+	queues := make(map[SupervisorType]*processorQueue, len(processorQueueTypes))
+	for _, supervisorType := range processorQueueTypes {
+		queues[supervisorType] = &processorQueue{
+			supervisorType: supervisorType,
+			requests:       make(chan queuedRequest, PROCESSOR_QUEUE_SIZE),
+		}
+	}
+
 	return &Processor{
 		store:           store,
 		humanReviewChan: humanReviewChan,
-		interval:        2 * time.Second, // Configurable interval
+		interval:        interval,
+		workers:         workers,
+		queues:          queues,
+		wake:            make(chan struct{}, 1),
+		queued:          make(map[uuid.UUID]bool),
 	}
 }
 
 func (p *Processor) Start(ctx context.Context) {
+	for _, supervisorType := range processorQueueTypes {
+		for i := 0; i < p.workers; i++ {
+			go p.work(ctx, p.queues[supervisorType])
+		}
+	}
+
 	ticker := time.NewTicker(p.interval)
 	defer ticker.Stop()
 
+	// Pick up anything left pending before the processor started
+	if err := p.processPendingSupervisionRequests(ctx); err != nil {
+		log.Printf("Error processing pending reviews: %v", err)
+	}
+
 	for {
 		select {
 		case <-ctx.Done():
 			return
+		case <-p.wake:
+			if err := p.processPendingSupervisionRequests(ctx); err != nil {
+				log.Printf("Error processing pending reviews: %v", err)
+			}
 		case <-ticker.C:
 			if err := p.processPendingSupervisionRequests(ctx); err != nil {
 				log.Printf("Error processing pending reviews: %v", err)
@@ -39,6 +134,112 @@ func (p *Processor) Start(ctx context.Context) {
 	}
 }
 
+// Enqueue hands a newly created supervision request to the queue of its supervisor type. When the queue
+// is full it waits for room, so that a burst of requests slows down the callers creating them rather
+// than being dropped. It reports false if ctx ends first, leaving the request for the next sweep.
+func (p *Processor) Enqueue(ctx context.Context, supervisionRequest SupervisionRequest, supervisorType SupervisorType) bool {
+	if supervisionRequest.Id == nil {
+		return false
+	}
+
+	queue, ok := p.queues[supervisorType]
+	if !ok {
+		log.Printf("No processor queue for supervisor type %s, supervision request %s", supervisorType, *supervisionRequest.Id)
+		return false
+	}
+
+	p.queuedMutex.Lock()
+	if p.queued[*supervisionRequest.Id] {
+		p.queuedMutex.Unlock()
+		return true
+	}
+	p.queued[*supervisionRequest.Id] = true
+	p.queuedMutex.Unlock()
+
+	select {
+	case queue.requests <- queuedRequest{request: supervisionRequest, enqueuedAt: time.Now()}:
+		queue.enqueued.Add(1)
+		return true
+	case <-ctx.Done():
+		p.done(*supervisionRequest.Id)
+		log.Printf("Gave up queueing supervision request %s, it will be picked up by the next sweep", *supervisionRequest.Id)
+		return false
+	}
+}
+
+// Wake triggers a sweep of all pending supervision requests without waiting for the next interval
+func (p *Processor) Wake() {
+	select {
+	case p.wake <- struct{}{}:
+	default:
+		// A sweep is already scheduled
+	}
+}
+
+// Stats reports the depth of each queue and how long requests wait in it
+func (p *Processor) Stats() ProcessorStats {
+	stats := ProcessorStats{Queues: make([]ProcessorQueueStats, 0, len(processorQueueTypes))}
+	for _, supervisorType := range processorQueueTypes {
+		queue := p.queues[supervisorType]
+		processed := queue.processed.Load()
+		queueStats := ProcessorQueueStats{
+			SupervisorType: supervisorType,
+			Workers:        p.workers,
+			Busy:           int(queue.busy.Load()),
+			Depth:          len(queue.requests),
+			Capacity:       cap(queue.requests),
+			Enqueued:       queue.enqueued.Load(),
+			Processed:      processed,
+			Failed:         queue.failed.Load(),
+			MaxWaitMs:      float64(queue.waitMax.Load()) / float64(time.Millisecond),
+		}
+		if processed > 0 {
+			queueStats.MeanWaitMs = float64(queue.waitTotal.Load()) / float64(processed) / float64(time.Millisecond)
+		}
+		stats.Queues = append(stats.Queues, queueStats)
+	}
+	return stats
+}
+
+func (p *Processor) done(id uuid.UUID) {
+	p.queuedMutex.Lock()
+	delete(p.queued, id)
+	p.queuedMutex.Unlock()
+}
+
+// work processes the requests of one queue until ctx ends
+func (p *Processor) work(ctx context.Context, queue *processorQueue) {
+	for {
+		select {
+		case <-ctx.Done():
+			return
+		case queued := <-queue.requests:
+			queue.busy.Add(1)
+
+			wait := int64(time.Since(queued.enqueuedAt))
+			queue.waitTotal.Add(wait)
+			for {
+				longest := queue.waitMax.Load()
+				if wait <= longest || queue.waitMax.CompareAndSwap(longest, wait) {
+					break
+				}
+			}
+
+			err := p.processReview(ctx, queue.supervisorType, queued.request)
+			if err != nil {
+				queue.failed.Add(1)
+				log.Printf("Error processing supervisor %s: %v", *queued.request.Id, err)
+			}
+			queue.processed.Add(1)
+			p.done(*queued.request.Id)
+
+			queue.busy.Add(-1)
+		}
+	}
+}
+
+// processPendingSupervisionRequests queues every pending supervision request that isn't queued already.
+// It waits for room in the queues as it goes, so a large backlog is worked through at the workers' pace.
 func (p *Processor) processPendingSupervisionRequests(ctx context.Context) error {
 	supervisorRequests, err := p.store.GetSupervisionRequestsForStatus(ctx, Pending)
 	if err != nil {
@@ -46,28 +247,26 @@ func (p *Processor) processPendingSupervisionRequests(ctx context.Context) error
 	}
 
 	for _, supervisorRequest := range supervisorRequests {
-		if err := p.processReview(ctx, supervisorRequest); err != nil {
-			log.Printf("Error processing supervisor %s: %v", *supervisorRequest.Id, err)
+		supervisor, err := p.store.GetSupervisor(ctx, supervisorRequest.SupervisorId)
+		if err != nil {
+			log.Printf("Error getting supervisor %s: %v", supervisorRequest.SupervisorId, err)
+			continue
+		}
+		if supervisor == nil {
+			log.Printf("Supervisor %s of supervision request %s not found", supervisorRequest.SupervisorId, *supervisorRequest.Id)
 			continue
 		}
+
+		if !p.Enqueue(ctx, supervisorRequest, supervisor.Type) && ctx.Err() != nil {
+			return ctx.Err()
+		}
 	}
 
 	return nil
 }
 
-func (p *Processor) processReview(ctx context.Context, supervisionRequest SupervisionRequest) error {
-	supervisorId := supervisionRequest.SupervisorId
-
-	if supervisorId == uuid.Nil {
-		return fmt.Errorf("supervisor ID is required but was not provided to processReview")
-	}
-
-	supervisor, err := p.store.GetSupervisor(ctx, supervisorId)
-	if err != nil {
-		return fmt.Errorf("error getting supervisor: %w", err)
-	}
-
-	switch supervisor.Type {
+func (p *Processor) processReview(ctx context.Context, supervisorType SupervisorType, supervisionRequest SupervisionRequest) error {
+	switch supervisorType {
 	case HumanSupervisor:
 		return p.processHumanReview(ctx, supervisionRequest)
 	case ClientSupervisor:
@@ -75,19 +274,17 @@ func (p *Processor) processReview(ctx context.Context, supervisionRequest Superv
 	case NoSupervisor:
 		return p.processNoSupervisionReview(ctx, supervisionRequest)
 	default:
-		return fmt.Errorf("unknown supervisor type: %s", supervisor.Type)
+		return fmt.Errorf("unknown supervisor type: %s", supervisorType)
 	}
 }
 
 func (p *Processor) processHumanReview(ctx context.Context, supervisionRequest SupervisionRequest) error {
-	// Send to supervisor channel for human processing
+	// Send to supervisor channel for human processing, waiting for the hub to take it
 	select {
 	case p.humanReviewChan <- supervisionRequest:
 		return nil
 	case <-ctx.Done():
 		return ctx.Err()
-	default:
-		return fmt.Errorf("supervisor channel is full")
 	}
 }
 
@@ -0,0 +1,325 @@
+package asteroid
+
+import (
+	"container/heap"
+	"sync"
+	"time"
+
+	"github.com/google/uuid"
+)
+
+// Scheduler hands supervision requests to reviewers. Reviewers are kept in a min-heap by how full they
+// are, so each request goes to the least loaded reviewer. Requests that arrive when every reviewer is at
+// capacity wait, oldest first, until one finishes a review or a new reviewer connects.
+//
+// Each reviewer's queue is buffered to its capacity and a reviewer never has more requests outstanding
+// than its capacity, so delivery never blocks, however slow the reviewer's connection is.
+type Scheduler struct {
+	mu        sync.Mutex
+	reviewers reviewerHeap
+	waiting   waitingHeap
+	// queued holds the IDs of the waiting requests
+	queued map[uuid.UUID]bool
+	// assigned maps the requests handed out to the reviewer holding them
+	assigned map[uuid.UUID]*Reviewer
+	// capacity is the total capacity of the reviewers
+	capacity int
+	// seq orders reviewers and requests that would otherwise tie
+	seq uint64
+}
+
+// Reviewer is a connected reviewer as seen by the Scheduler
+type Reviewer struct {
+	// Queue receives the requests assigned to the reviewer. It is closed when the reviewer is removed.
+	Queue <-chan SupervisionRequest
+
+	queue    chan SupervisionRequest
+	capacity int
+	assigned map[uuid.UUID]SupervisionRequest
+	seq      uint64
+	// index is the reviewer's position in the heap
+	index int
+}
+
+// ReviewerLoad is the number of requests a reviewer holds against its capacity
+type ReviewerLoad struct {
+	Reviewer *Reviewer
+	Assigned int
+	Capacity int
+}
+
+func NewScheduler() *Scheduler {
+	return &Scheduler{
+		queued:   make(map[uuid.UUID]bool),
+		assigned: make(map[uuid.UUID]*Reviewer),
+	}
+}
+
+// Add registers a reviewer that can hold up to capacity requests at once and hands it any requests that
+// are waiting
+func (s *Scheduler) Add(capacity int) *Reviewer {
+	if capacity < 1 {
+		capacity = 1
+	}
+	queue := make(chan SupervisionRequest, capacity)
+
+	s.mu.Lock()
+	defer s.mu.Unlock()
+
+	s.seq++
+	r := &Reviewer{
+		Queue:    queue,
+		queue:    queue,
+		capacity: capacity,
+		assigned: make(map[uuid.UUID]SupervisionRequest),
+		seq:      s.seq,
+	}
+	heap.Push(&s.reviewers, r)
+	s.capacity += capacity
+	s.drain()
+
+	return r
+}
+
+// Remove unregisters a reviewer and closes its queue. The requests it still held are returned rather
+// than handed out again, so that the caller can record them as pending before giving them back with
+// Requeue. Handing them out first would let the new reviewer's assignment be overwritten.
+func (s *Scheduler) Remove(r *Reviewer) []SupervisionRequest {
+	s.mu.Lock()
+	defer s.mu.Unlock()
+
+	if r.index < 0 {
+		return nil
+	}
+	heap.Remove(&s.reviewers, r.index)
+	r.index = -1
+	s.capacity -= r.capacity
+	close(r.queue)
+
+	released := make([]SupervisionRequest, 0, len(r.assigned))
+	for id, request := range r.assigned {
+		delete(s.assigned, id)
+		released = append(released, request)
+	}
+	r.assigned = nil
+
+	return released
+}
+
+// Requeue puts requests taken from a removed reviewer back in front of the queue and hands them to the
+// remaining reviewers. Requests that have been submitted again in the meantime are left where they are.
+func (s *Scheduler) Requeue(requests []SupervisionRequest) {
+	s.mu.Lock()
+	defer s.mu.Unlock()
+
+	// They were the oldest requests when they were assigned, so they go ahead of anything newer
+	for _, request := range requests {
+		if s.assigned[*request.Id] != nil || s.queued[*request.Id] {
+			continue
+		}
+		s.enqueue(request, time.Time{})
+	}
+	s.drain()
+}
+
+// Submit assigns a request to the least loaded reviewer, or queues it if they are all at capacity. It
+// reports whether the request was assigned now. A request that is already assigned or waiting, e.g.
+// one delivered again by a sweep, is ignored.
+func (s *Scheduler) Submit(request SupervisionRequest) bool {
+	if request.Id == nil {
+		return false
+	}
+
+	s.mu.Lock()
+	defer s.mu.Unlock()
+
+	if s.assigned[*request.Id] != nil || s.queued[*request.Id] {
+		return false
+	}
+
+	if s.assign(request) {
+		return true
+	}
+	s.enqueue(request, time.Now())
+	return false
+}
+
+// Complete releases a request the reviewer has finished with and hands the reviewer the next waiting
+// request
+func (s *Scheduler) Complete(r *Reviewer, id uuid.UUID) {
+	s.mu.Lock()
+	defer s.mu.Unlock()
+
+	if s.assigned[id] != r {
+		return
+	}
+	delete(s.assigned, id)
+	delete(r.assigned, id)
+	heap.Fix(&s.reviewers, r.index)
+	s.drain()
+}
+
+// Loads returns the number of requests each reviewer holds
+func (s *Scheduler) Loads() []ReviewerLoad {
+	s.mu.Lock()
+	defer s.mu.Unlock()
+
+	loads := make([]ReviewerLoad, 0, len(s.reviewers))
+	for _, r := range s.reviewers {
+		loads = append(loads, ReviewerLoad{Reviewer: r, Assigned: len(r.assigned), Capacity: r.capacity})
+	}
+	return loads
+}
+
+// Waiting returns the number of requests waiting for a reviewer
+func (s *Scheduler) Waiting() int {
+	s.mu.Lock()
+	defer s.mu.Unlock()
+
+	return len(s.waiting)
+}
+
+// Free returns how many more requests the reviewers can take on, after the waiting requests
+func (s *Scheduler) Free() int {
+	s.mu.Lock()
+	defer s.mu.Unlock()
+
+	return max(s.capacity-len(s.assigned)-len(s.waiting), 0)
+}
+
+// Held returns the IDs of the requests that are assigned or waiting
+func (s *Scheduler) Held() []uuid.UUID {
+	s.mu.Lock()
+	defer s.mu.Unlock()
+
+	ids := make([]uuid.UUID, 0, len(s.assigned)+len(s.waiting))
+	for id := range s.assigned {
+		ids = append(ids, id)
+	}
+	for _, w := range s.waiting {
+		ids = append(ids, *w.request.Id)
+	}
+	return ids
+}
+
+// TakeWaiting removes the waiting requests and returns them, oldest first
+func (s *Scheduler) TakeWaiting() []SupervisionRequest {
+	s.mu.Lock()
+	defer s.mu.Unlock()
+
+	requests := make([]SupervisionRequest, 0, len(s.waiting))
+	for len(s.waiting) > 0 {
+		w := heap.Pop(&s.waiting).(waitingRequest)
+		delete(s.queued, *w.request.Id)
+		requests = append(requests, w.request)
+	}
+	return requests
+}
+
+// assign hands a request to the least loaded reviewer if it has room. The send can't block, as the
+// reviewer's queue has room for everything it holds.
+func (s *Scheduler) assign(request SupervisionRequest) bool {
+	if len(s.reviewers) == 0 {
+		return false
+	}
+	r := s.reviewers[0]
+	if len(r.assigned) >= r.capacity {
+		return false
+	}
+
+	r.assigned[*request.Id] = request
+	s.assigned[*request.Id] = r
+	heap.Fix(&s.reviewers, r.index)
+	r.queue <- request
+	return true
+}
+
+// enqueue adds a request to the waiting queue. A zero since puts it ahead of every request that arrived
+// with a time.
+func (s *Scheduler) enqueue(request SupervisionRequest, since time.Time) {
+	s.seq++
+	s.queued[*request.Id] = true
+	heap.Push(&s.waiting, waitingRequest{request: request, since: since, seq: s.seq})
+}
+
+// drain assigns waiting requests, oldest first, until the reviewers are full
+func (s *Scheduler) drain() {
+	for len(s.waiting) > 0 {
+		next := s.waiting[0]
+		if !s.assign(next.request) {
+			return
+		}
+		heap.Pop(&s.waiting)
+		delete(s.queued, *next.request.Id)
+	}
+}
+
+// reviewerHeap orders reviewers by the fraction of their capacity in use, then by fewest requests held,
+// then by who connected first
+type reviewerHeap []*Reviewer
+
+func (h reviewerHeap) Len() int { return len(h) }
+
+func (h reviewerHeap) Less(i, j int) bool {
+	a, b := h[i], h[j]
+	// Compare assigned/capacity without dividing
+	loadA, loadB := len(a.assigned)*b.capacity, len(b.assigned)*a.capacity
+	if loadA != loadB {
+		return loadA < loadB
+	}
+	if len(a.assigned) != len(b.assigned) {
+		return len(a.assigned) < len(b.assigned)
+	}
+	return a.seq < b.seq
+}
+
+func (h reviewerHeap) Swap(i, j int) {
+	h[i], h[j] = h[j], h[i]
+	h[i].index = i
+	h[j].index = j
+}
+
+func (h *reviewerHeap) Push(x any) {
+	r := x.(*Reviewer)
+	r.index = len(*h)
+	*h = append(*h, r)
+}
+
+func (h *reviewerHeap) Pop() any {
+	old := *h
+	n := len(old)
+	r := old[n-1]
+	old[n-1] = nil
+	*h = old[:n-1]
+	return r
+}
+
+type waitingRequest struct {
+	request SupervisionRequest
+	since   time.Time
+	seq     uint64
+}
+
+// waitingHeap orders waiting requests by when they arrived
+type waitingHeap []waitingRequest
+
+func (h waitingHeap) Len() int { return len(h) }
+
+func (h waitingHeap) Less(i, j int) bool {
+	if !h[i].since.Equal(h[j].since) {
+		return h[i].since.Before(h[j].since)
+	}
+	return h[i].seq < h[j].seq
+}
+
+func (h waitingHeap) Swap(i, j int) { h[i], h[j] = h[j], h[i] }
+
+func (h *waitingHeap) Push(x any) { *h = append(*h, x.(waitingRequest)) }
+
+func (h *waitingHeap) Pop() any {
+	old := *h
+	n := len(old)
+	w := old[n-1]
+	*h = old[:n-1]
+	return w
+}
@@ -0,0 +1,234 @@
+package asteroid
+
+import (
+	"bytes"
+	"context"
+	"encoding/json"
+	"fmt"
+	"log"
+	"net/http"
+	"sync"
+	"time"
+
+	"github.com/google/uuid"
+)
+
+// How often a comment line is written to idle tool call state streams so proxies keep them open
+const TOOL_CALL_STREAM_KEEPALIVE = 15 * time.Second
+
+// Default interval at which a tool call state stream reads the state again without being notified.
+// Only results committed on this server notify its streams, so this is how long a result committed on
+// another server sharing the database can take to reach them.
+const DEFAULT_TOOL_CALL_STREAM_POLL_INTERVAL = 2 * time.Second
+
+// ToolCallSubscriptions wakes the clients waiting on the supervision decision of a tool call whenever
+// its state changes, so they don't have to poll the tool call state endpoint. Subscribers are only
+// told that the state changed and read it themselves: results are notified from separate goroutines,
+// so a state read while notifying could reach the subscriber after a newer one.
+type ToolCallSubscriptions struct {
+	// subscribers maps a tool call ID to the channels of the clients subscribed to it
+	subscribers map[uuid.UUID]map[chan struct{}]struct{}
+	mutex       sync.Mutex
+	Store       Store
+	// pollInterval is how often streams read the state again on their own, to pick up results
+	// committed on other servers. Zero when no other server can commit results.
+	pollInterval time.Duration
+}
+
+// NewToolCallSubscriptions creates the subscriptions of this server. When shared is set, other servers
+// can commit results to the same store, so streams also read the state every
+// TOOL_CALL_STREAM_POLL_INTERVAL (DEFAULT_TOOL_CALL_STREAM_POLL_INTERVAL unless set). Otherwise every
+// result notifies the streams and they never poll.
+func NewToolCallSubscriptions(store Store, shared bool) *ToolCallSubscriptions {
+	subscriptions := &ToolCallSubscriptions{
+		subscribers: make(map[uuid.UUID]map[chan struct{}]struct{}),
+		Store:       store,
+	}
+	if shared {
+		subscriptions.pollInterval = durationFromEnv("TOOL_CALL_STREAM_POLL_INTERVAL", DEFAULT_TOOL_CALL_STREAM_POLL_INTERVAL)
+	}
+	return subscriptions
+}
+
+// Subscribe registers a subscriber for a tool call. The returned channel receives a signal every time
+// the state of the tool call changes, and the returned function removes the subscription.
+func (t *ToolCallSubscriptions) Subscribe(toolCallId uuid.UUID) (<-chan struct{}, func()) {
+	// Changes the subscriber hasn't woken up for yet are covered by its next read, so a single
+	// pending signal is enough
+	ch := make(chan struct{}, 1)
+
+	t.mutex.Lock()
+	if _, ok := t.subscribers[toolCallId]; !ok {
+		t.subscribers[toolCallId] = make(map[chan struct{}]struct{})
+	}
+	t.subscribers[toolCallId][ch] = struct{}{}
+	t.mutex.Unlock()
+
+	unsubscribe := func() {
+		t.mutex.Lock()
+		defer t.mutex.Unlock()
+
+		delete(t.subscribers[toolCallId], ch)
+		if len(t.subscribers[toolCallId]) == 0 {
+			delete(t.subscribers, toolCallId)
+		}
+	}
+
+	return ch, unsubscribe
+}
+
+func (t *ToolCallSubscriptions) hasSubscribers(toolCallId *uuid.UUID) bool {
+	t.mutex.Lock()
+	defer t.mutex.Unlock()
+
+	if toolCallId == nil {
+		return len(t.subscribers) > 0
+	}
+	return len(t.subscribers[*toolCallId]) > 0
+}
+
+// publish signals all subscribers of a tool call that its state changed, without blocking
+func (t *ToolCallSubscriptions) publish(toolCallId uuid.UUID) {
+	t.mutex.Lock()
+	defer t.mutex.Unlock()
+
+	for ch := range t.subscribers[toolCallId] {
+		// A signal still pending already makes the subscriber read the state
+		select {
+		case ch <- struct{}{}:
+		default:
+		}
+	}
+}
+
+// NotifySupervisionResult wakes the subscribers of the tool call a supervision request belongs to.
+// Call it once a supervision result for the request has been committed.
+func (t *ToolCallSubscriptions) NotifySupervisionResult(ctx context.Context, supervisionRequestId uuid.UUID) {
+	// Nobody is waiting, skip the lookups
+	if !t.hasSubscribers(nil) {
+		return
+	}
+
+	if err := t.notifySupervisionResult(ctx, supervisionRequestId); err != nil {
+		log.Printf("Error notifying tool call state for supervision request %s: %v", supervisionRequestId, err)
+	}
+}
+
+func (t *ToolCallSubscriptions) notifySupervisionResult(ctx context.Context, supervisionRequestId uuid.UUID) error {
+	request, err := t.Store.GetSupervisionRequest(ctx, supervisionRequestId)
+	if err != nil {
+		return fmt.Errorf("error getting supervision request: %w", err)
+	}
+	if request == nil || request.ChainexecutionId == nil {
+		return fmt.Errorf("supervision request %s has no chain execution", supervisionRequestId)
+	}
+
+	_, toolCallId, err := t.Store.GetChainExecution(ctx, *request.ChainexecutionId)
+	if err != nil {
+		return fmt.Errorf("error getting chain execution: %w", err)
+	}
+	if toolCallId == nil {
+		return nil
+	}
+
+	t.publish(*toolCallId)
+	return nil
+}
+
+// writeToolCallStateEvent writes a RunExecution as a server-sent event and flushes it to the client,
+// unless it is the same as the state last written. It returns the state written.
+func writeToolCallStateEvent(w http.ResponseWriter, flusher http.Flusher, execution RunExecution, last []byte) ([]byte, error) {
+	data, err := json.Marshal(execution)
+	if err != nil {
+		return last, fmt.Errorf("error encoding tool call state: %w", err)
+	}
+	if bytes.Equal(data, last) {
+		return last, nil
+	}
+
+	if _, err := fmt.Fprintf(w, "event: state\ndata: %s\n\n", data); err != nil {
+		return last, err
+	}
+	flusher.Flush()
+
+	return data, nil
+}
+
+func apiStreamToolCallStateHandler(w http.ResponseWriter, r *http.Request, toolCallId string, store Store, subscriptions *ToolCallSubscriptions) {
+	ctx := r.Context()
+
+	toolCall, err := store.GetToolCallFromCallId(ctx, toolCallId)
+	if err != nil {
+		sendErrorResponse(w, http.StatusInternalServerError, "error getting tool call", err.Error())
+		return
+	}
+	if toolCall == nil {
+		sendErrorResponse(w, http.StatusNotFound, "Tool call was not found", "")
+		return
+	}
+
+	flusher, ok := w.(http.Flusher)
+	if !ok {
+		sendErrorResponse(w, http.StatusInternalServerError, "streaming is not supported", "")
+		return
+	}
+
+	// Subscribe before reading the current state so that no result committed in between is missed
+	updates, unsubscribe := subscriptions.Subscribe(toolCall.Id)
+	defer unsubscribe()
+
+	execution, err := getRunExecution(ctx, *toolCall, store)
+	if err != nil {
+		sendErrorResponse(w, http.StatusInternalServerError, "error getting tool call state", err.Error())
+		return
+	}
+
+	w.Header().Set("Content-Type", "text/event-stream")
+	w.Header().Set("Cache-Control", "no-cache")
+	w.Header().Set("Connection", "keep-alive")
+	w.WriteHeader(http.StatusOK)
+
+	last, err := writeToolCallStateEvent(w, flusher, *execution, nil)
+	if err != nil || execution.Status == Completed {
+		return
+	}
+
+	keepalive := time.NewTicker(TOOL_CALL_STREAM_KEEPALIVE)
+	defer keepalive.Stop()
+
+	// Notifications only come from results committed on this server, so when other servers share the
+	// store the state is also read periodically to pick up the ones they commit
+	var polls <-chan time.Time
+	if subscriptions.pollInterval > 0 {
+		poll := time.NewTicker(subscriptions.pollInterval)
+		defer poll.Stop()
+		polls = poll.C
+	}
+
+	for {
+		select {
+		case <-ctx.Done():
+			return
+		case <-updates:
+		case <-polls:
+		case <-keepalive.C:
+			if _, err := fmt.Fprint(w, ": keepalive\n\n"); err != nil {
+				return
+			}
+			flusher.Flush()
+			continue
+		}
+
+		// Read the state now rather than taking it from the notifier, so the stream never goes back to
+		// an older state than the one it last wrote
+		execution, err := getRunExecution(ctx, *toolCall, store)
+		if err != nil {
+			log.Printf("Error getting state of tool call %s: %v", toolCall.Id, err)
+			return
+		}
+		last, err = writeToolCallStateEvent(w, flusher, *execution, last)
+		if err != nil || execution.Status == Completed {
+			return
+		}
+	}
+}
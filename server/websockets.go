@@ -14,8 +14,12 @@ import (
 	"github.com/gorilla/websocket"
 )
 
+// Number of reviews a reviewer holds at once, unless it asks for another capacity when connecting
 const MAX_SUPERVISORS_PER_CLIENT = 8
 
+// The most reviews a reviewer can ask to hold at once
+const MAX_REVIEWER_CAPACITY = 100
+
 // Upgrade HTTP connection to WebSocket with proper settings
 var upgrader = websocket.Upgrader{
 	ReadBufferSize:  1024,
@@ -33,30 +37,72 @@ type Hub struct {
 	// Register and Unregister are used when a new client connects and disconnects
 	Register   chan *Client
 	Unregister chan *Client
-	// AssignedReviews is a map of clients to the reviews they are currently processing
-	AssignedReviews      map[*Client]map[string]bool
-	AssignedReviewsMutex sync.RWMutex
+	// Scheduler hands reviews to the least loaded client and holds them while every client is busy
+	Scheduler *Scheduler
 
 	// CompletedReviewCount is used to count the number of reviews that have been completed
 	CompletedReviewCount int
 	Store                Store
+
+	// ToolCallSubscriptions pushes tool call states to clients waiting on a supervision decision
+	ToolCallSubscriptions *ToolCallSubscriptions
+
+	// Decisions remembers the decisions of supervisors that reuse them on identical tool calls
+	Decisions *DecisionCache
+
+	// Processor is woken up when pending reviews should be dispatched again
+	Processor *Processor
+
+	// Leases lets several servers share the review queue when the store supports it. Each server then
+	// only hands its clients the reviews it has leased, and claims more as its clients have room.
+	Leases      LeaseStore
+	LeaseHolder string
+
+	leaseTTL      time.Duration
+	claimInterval time.Duration
+	claimNow      chan struct{}
 }
 
-func NewHub(store Store, humanReviewChan chan SupervisionRequest) *Hub {
+func NewHub(store Store, humanReviewChan chan SupervisionRequest, processor *Processor) *Hub {
+	// A store that leases reviews can be shared with other servers
+	leases := leaseStoreOf(store)
+	subscriptions := NewToolCallSubscriptions(store, leases != nil)
+
 	return &Hub{
 		Clients:    make(map[*Client]bool),
 		ReviewChan: humanReviewChan,
 		Register:   make(chan *Client),
 		Unregister: make(chan *Client),
 
-		AssignedReviews: make(map[*Client]map[string]bool),
+		Scheduler: NewScheduler(),
 
 		Store: store,
+
+		ToolCallSubscriptions: subscriptions,
+		Decisions:             NewDecisionCache(store, subscriptions),
+		Processor:             processor,
+
+		Leases:        leases,
+		LeaseHolder:   leaseHolder(),
+		leaseTTL:      durationFromEnv("REVIEW_LEASE_TTL", DEFAULT_REVIEW_LEASE_TTL),
+		claimInterval: durationFromEnv("REVIEW_CLAIM_INTERVAL", DEFAULT_REVIEW_CLAIM_INTERVAL),
+		claimNow:      make(chan struct{}, 1),
 	}
 }
 
-// serveWs upgrades the HTTP connection to a WebSocket connection and registers the client with the hub
+// serveWs upgrades the HTTP connection to a WebSocket connection and registers the client with the hub.
+// The client can ask to hold up to ?capacity= reviews at once.
 func serveWs(hub *Hub, w http.ResponseWriter, r *http.Request) {
+	capacity := MAX_SUPERVISORS_PER_CLIENT
+	if value := r.URL.Query().Get("capacity"); value != "" {
+		parsed, err := strconv.Atoi(value)
+		if err != nil || parsed < 1 || parsed > MAX_REVIEWER_CAPACITY {
+			http.Error(w, fmt.Sprintf("capacity must be between 1 and %d", MAX_REVIEWER_CAPACITY), http.StatusBadRequest)
+			return
+		}
+		capacity = parsed
+	}
+
 	conn, err := upgrader.Upgrade(w, r, nil)
 	if err != nil {
 		log.Println("upgrade error:", err)
@@ -64,9 +110,9 @@ func serveWs(hub *Hub, w http.ResponseWriter, r *http.Request) {
 	}
 
 	client := &Client{
-		Hub:  hub,
-		Conn: conn,
-		Send: make(chan SupervisionRequest),
+		Hub:      hub,
+		Conn:     conn,
+		Reviewer: hub.Scheduler.Add(capacity),
 	}
 	hub.Register <- client
 
@@ -76,6 +122,11 @@ func serveWs(hub *Hub, w http.ResponseWriter, r *http.Request) {
 
 // Run starts the hub and handles client connections/disconnections and supervisor assignments
 func (h *Hub) Run() {
+	if h.Leases != nil {
+		log.Printf("Sharing the review queue as %s", h.LeaseHolder)
+		go h.maintainLeases(context.Background())
+	}
+
 	for {
 		select {
 		case client := <-h.Register:
@@ -88,16 +139,20 @@ func (h *Hub) Run() {
 	}
 }
 
-// registerClient adds a new client to the hub and initializes their assigned reviews map
+// registerClient adds a new client to the hub. The scheduler has already handed it any waiting reviews.
 func (h *Hub) registerClient(client *Client) {
 	h.ClientsMutex.Lock()
-	h.AssignedReviewsMutex.Lock()
 	h.Clients[client] = true
-	h.AssignedReviews[client] = make(map[string]bool)
-	h.AssignedReviewsMutex.Unlock()
 	h.ClientsMutex.Unlock()
 
 	log.Println("Client registered.")
+
+	// Pending reviews the hub hasn't seen, e.g. from before a restart, are picked up by a claim or a sweep
+	if h.Leases != nil {
+		h.nudgeClaims()
+	} else {
+		h.Processor.Wake()
+	}
 }
 
 // unregisterClient removes a client from the hub and handles the cleanup of their assigned reviews
@@ -107,90 +162,58 @@ func (h *Hub) unregisterClient(client *Client) {
 		delete(h.Clients, client)
 		h.ClientsMutex.Unlock()
 
-		// Remove the client from the AssignedReviews map and requeue their reviews
-		h.AssignedReviewsMutex.Lock()
-		h.requeueAssignedReviews(client)
-		delete(h.AssignedReviews, client)
-		h.AssignedReviewsMutex.Unlock()
-
-		close(client.Send)
+		// The scheduler closes the client's queue and gives back its reviews. They are recorded as pending
+		// before they go to the remaining clients, which record them as assigned again.
+		reviews := h.Scheduler.Remove(client.Reviewer)
+		h.markReviewsPending(reviews)
+		h.Scheduler.Requeue(reviews)
+
+		// Reviews the remaining clients have no room for are left to whichever server has
+		if h.Leases != nil {
+			waiting := h.Scheduler.TakeWaiting()
+			ids := make([]uuid.UUID, 0, len(waiting))
+			for _, review := range waiting {
+				ids = append(ids, *review.Id)
+			}
+			h.releaseReviews(ids)
+		}
 		log.Println("Client unregistered.")
 	} else {
 		h.ClientsMutex.Unlock()
 	}
 }
 
-// assignReview assigns a supervisor to a client if they have capacity, otherwise it queues the supervisor
+// assignReview hands a review to the least loaded client, or leaves it with the scheduler until a client
+// has capacity. Its status is set to assigned just before it is written to the client.
 func (h *Hub) assignReview(supervisionRequest SupervisionRequest) {
 	if supervisionRequest.Id == nil {
 		log.Fatalf("can't assign supervisor with nil ID")
 	}
 
-	h.ClientsMutex.RLock()
-	defer h.ClientsMutex.RUnlock()
-
-	// Attempt to assign the supervisor to a client. Does nothing if no client is available
-	h.assignReviewToClient(supervisionRequest)
-}
-
-// assignReviewToClient attempts to assign a supervisor to a client if they have capacity
-func (h *Hub) assignReviewToClient(supervisionRequest SupervisionRequest) bool {
-	h.AssignedReviewsMutex.Lock()
-	defer h.AssignedReviewsMutex.Unlock()
-
-	// Iterate over all clients and assign the supervisor if they have capacity
-	for client := range h.Clients {
-		assignedReviewsCount := len(h.AssignedReviews[client])
-
-		if assignedReviewsCount < MAX_SUPERVISORS_PER_CLIENT {
-			client.Send <- supervisionRequest
-
-			h.AssignedReviews[client][supervisionRequest.Id.String()] = true
-			log.Printf("Assigned supervisor.RequestId %s to client.", supervisionRequest.Id)
-
-			status := SupervisionStatus{
-				Status:               Assigned,
-				CreatedAt:            time.Now(),
-				SupervisionRequestId: supervisionRequest.Id,
-			}
-			// Update the supervisor status to assigned
-			err := h.Store.CreateSupervisionStatus(context.Background(), *supervisionRequest.Id, status)
-			if err != nil {
-				fmt.Printf("Error creating supervisor status: %v\n", err)
-			}
-
-			return true // Supervisor assigned
-		}
+	// With several servers, the review is only this server's to assign once it holds the lease
+	if h.Leases != nil && !h.claimReview(supervisionRequest) {
+		return
 	}
 
-	return false // No client available
+	if h.Scheduler.Submit(supervisionRequest) {
+		log.Printf("Assigned supervisor.RequestId %s to client.", supervisionRequest.Id)
+	}
 }
 
-// requeueAssignedReviews removes all reviews from a client and requeues them
-func (h *Hub) requeueAssignedReviews(client *Client) {
-	if assignedReviews, ok := h.AssignedReviews[client]; ok {
-		for reviewID := range assignedReviews {
-			reviewID, err := uuid.Parse(reviewID)
-			if err != nil {
-				fmt.Printf("Error parsing supervisor ID: %v\n", err)
-				continue
-			}
-
-			status := SupervisionStatus{
-				Status:               Pending,
-				CreatedAt:            time.Now(),
-				SupervisionRequestId: &reviewID,
-			}
-
-			err = h.Store.CreateSupervisionStatus(context.Background(), reviewID, status)
-			if err != nil {
-				fmt.Printf("Error getting supervisor from store: %v\n", err)
-				continue
-			}
+// markReviewsPending marks the reviews a client held when it disconnected as pending again, so that
+// they are recovered by a sweep if the hub goes away before handing them to another client
+func (h *Hub) markReviewsPending(reviews []SupervisionRequest) {
+	for _, review := range reviews {
+		status := SupervisionStatus{
+			Status:               Pending,
+			CreatedAt:            time.Now(),
+			SupervisionRequestId: review.Id,
 		}
 
-		// Remove the client from the AssignedReviews map
-		delete(h.AssignedReviews, client)
+		err := h.Store.CreateSupervisionStatus(context.Background(), *review.Id, status)
+		if err != nil {
+			log.Printf("Error setting supervision request %s back to pending: %v", *review.Id, err)
+		}
 	}
 }
 
@@ -198,7 +221,8 @@ func (h *Hub) requeueAssignedReviews(client *Client) {
 type Client struct {
 	Hub  *Hub
 	Conn *websocket.Conn
-	Send chan SupervisionRequest
+	// Reviewer receives the reviews the scheduler assigns to the client
+	Reviewer *Reviewer
 }
 
 // WritePump handles the sending of reviews to the client
@@ -208,18 +232,19 @@ func (c *Client) WritePump() {
 		c.Hub.Unregister <- c
 	}()
 
-	for supervisionRequest := range c.Send {
-		if err := c.Conn.WriteJSON(supervisionRequest); err != nil {
-			log.Println("Error sending supervisionRequest to client:", err)
-			break
-		}
-
-		// Log the supervisionrequest_status entry for the supervision request
+	for supervisionRequest := range c.Reviewer.Queue {
+		// Log the supervisionrequest_status entry for the supervision request before the client can
+		// answer it, so the assignment is never recorded after the result
 		rs := SupervisionStatus{Status: Assigned, CreatedAt: time.Now()}
 		err := c.Hub.Store.CreateSupervisionStatus(context.Background(), *supervisionRequest.Id, rs)
 		if err != nil {
 			fmt.Printf("Error creating supervisionrequest_status entry for supervisionRequest.RequestId %s: %v\n", *supervisionRequest.Id, err)
 		}
+
+		if err := c.Conn.WriteJSON(supervisionRequest); err != nil {
+			log.Println("Error sending supervisionRequest to client:", err)
+			break
+		}
 	}
 }
 
@@ -264,14 +289,16 @@ func (c *Client) ReadPump() {
 			if err := c.Hub.Store.CreateSupervisionStatus(context.Background(), response.SupervisionRequestId, status); err != nil {
 				log.Printf("Error resetting supervision status: %v", err)
 			}
-		}
+		} else {
+			c.Hub.Decisions.Record(context.Background(), response.SupervisionRequestId, response)
 
-		// Always remove the review from assigned reviews, whether it succeeded or failed
-		c.Hub.AssignedReviewsMutex.Lock()
-		if _, exists := c.Hub.AssignedReviews[c]; exists {
-			delete(c.Hub.AssignedReviews[c], response.SupervisionRequestId.String())
+			// Push the decision to any client waiting on this tool call
+			go c.Hub.ToolCallSubscriptions.NotifySupervisionResult(context.Background(), response.SupervisionRequestId)
 		}
-		c.Hub.AssignedReviewsMutex.Unlock()
+
+		// Always release the review, whether it succeeded or failed, so the client gets the next one
+		c.Hub.Scheduler.Complete(c.Reviewer, response.SupervisionRequestId)
+		c.Hub.releaseReviews([]uuid.UUID{response.SupervisionRequestId})
 	}
 }
 
@@ -303,14 +330,15 @@ func (h *Hub) getStats() (HubStats, error) {
 		PendingReviewsCount:   pendingCount,
 		CompletedReviewsCount: completedCount,
 		AssignedReviewsCount:  assignedCount,
+		WaitingReviewsCount:   h.Scheduler.Waiting(),
+		DecisionCache:         h.Decisions.Stats(),
 	}
 
 	totalAssignedReviews := 0
 
-	h.AssignedReviewsMutex.RLock()
-	for client, reviews := range h.AssignedReviews {
-		clientKey := fmt.Sprintf("%p", client)
-		assignedCount := len(reviews)
+	for _, load := range h.Scheduler.Loads() {
+		clientKey := fmt.Sprintf("%p", load.Reviewer)
+		assignedCount := load.Assigned
 
 		// Annoyingly the ReviewDistribution map is a map[string]int so we need to
 		// convert the assignedCount to a string
@@ -319,22 +347,12 @@ func (h *Hub) getStats() (HubStats, error) {
 		stats.AssignedReviews[clientKey] = assignedCount
 		stats.ReviewDistribution[assignedCountStr]++
 		totalAssignedReviews += assignedCount
-	}
-	h.AssignedReviewsMutex.RUnlock()
-
-	stats.BusyClients = 0
-	stats.FreeClients = 0
 
-	for assignedCountStr, count := range stats.ReviewDistribution {
-		assignedCount, err := strconv.Atoi(assignedCountStr)
-		if err != nil {
-			log.Printf("Error converting assignedCountStr to int: %v", err)
-			continue
-		}
-		if assignedCount < MAX_SUPERVISORS_PER_CLIENT {
-			stats.FreeClients += count
+		// Clients choose their own capacity, so free and busy are judged against each one's
+		if assignedCount < load.Capacity {
+			stats.FreeClients++
 		} else {
-			stats.BusyClients += count
+			stats.BusyClients++
 		}
 	}
 